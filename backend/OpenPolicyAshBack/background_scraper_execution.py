@@ -28,6 +28,8 @@ import psutil
 # Add scrapers path to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../scrapers/scrapers-ca'))
 
+from src.scrapers.concurrency import AdaptiveConcurrencyController, AIMDConfig, scraper_host
+
 class ScraperStatus(Enum):
     RUNNING = "running"
     STOPPED = "stopped"
@@ -115,6 +117,11 @@ class BackgroundScraperExecution:
         self.running_processes: Dict[str, subprocess.Popen] = {}
         self.stop_flag = False
         
+        # Scheduled groups run concurrently under an adaptive pool/per-host limit
+        self.concurrency = AdaptiveConcurrencyController(
+            "background_execution", AIMDConfig(max_limit=8, initial_limit=2)
+        )
+        
         # Initialize executions
         self.initialize_executions()
 
@@ -232,33 +239,42 @@ class BackgroundScraperExecution:
             if scraper_path in self.running_processes:
                 del self.running_processes[scraper_path]
 
+    def run_scheduled_scrapers(self, schedule_type: ScraperSchedule):
+        """Run every scraper on a schedule through the adaptive concurrency controller."""
+        scraper_paths = [path for path, execution in self.executions.items() if execution.schedule == schedule_type]
+        outcomes = self.concurrency.map(
+            self.run_scraper,
+            scraper_paths,
+            host_of=lambda path: scraper_host(self.base_path / path),
+            ok_of=bool,
+        )
+        try:
+            for _ in outcomes:
+                if self.stop_flag:
+                    break
+        finally:
+            outcomes.close()
+        self.logger.info(f"⚖️ {schedule_type.value} scrapers finished, concurrency limit now {self.concurrency.limit}")
+
     def run_daily_scrapers(self):
         """Run daily scrapers."""
         self.logger.info("📅 Running daily scrapers...")
-        for scraper_path, execution in self.executions.items():
-            if execution.schedule == ScraperSchedule.DAILY:
-                self.run_scraper(scraper_path)
+        self.run_scheduled_scrapers(ScraperSchedule.DAILY)
 
     def run_weekly_scrapers(self):
         """Run weekly scrapers."""
         self.logger.info("📅 Running weekly scrapers...")
-        for scraper_path, execution in self.executions.items():
-            if execution.schedule == ScraperSchedule.WEEKLY:
-                self.run_scraper(scraper_path)
+        self.run_scheduled_scrapers(ScraperSchedule.WEEKLY)
 
     def run_monthly_scrapers(self):
         """Run monthly scrapers."""
         self.logger.info("📅 Running monthly scrapers...")
-        for scraper_path, execution in self.executions.items():
-            if execution.schedule == ScraperSchedule.MONTHLY:
-                self.run_scraper(scraper_path)
+        self.run_scheduled_scrapers(ScraperSchedule.MONTHLY)
 
     def run_continuous_scrapers(self):
         """Run continuous scrapers."""
         self.logger.info("🔄 Running continuous scrapers...")
-        for scraper_path, execution in self.executions.items():
-            if execution.schedule == ScraperSchedule.CONTINUOUS:
-                self.run_scraper(scraper_path)
+        self.run_scheduled_scrapers(ScraperSchedule.CONTINUOUS)
 
     def monitor_system_resources(self):
         """Monitor system resources."""
@@ -269,7 +285,7 @@ class BackgroundScraperExecution:
             self.logger.info(f"💻 System Resources - CPU: {cpu_percent}%, Memory: {memory.percent}%")
             
             # Update resource usage for running processes
-            for scraper_path, process in self.running_processes.items():
+            for scraper_path, process in list(self.running_processes.items()):
                 try:
                     process_info = psutil.Process(process.pid)
                     execution = self.executions[scraper_path]
@@ -291,6 +307,7 @@ class BackgroundScraperExecution:
                 'completed': len([e for e in self.executions.values() if e.status == ScraperStatus.COMPLETED]),
                 'failed': len([e for e in self.executions.values() if e.status == ScraperStatus.FAILED]),
                 'scheduled': len([e for e in self.executions.values() if e.status == ScraperStatus.SCHEDULED]),
+                'concurrency': self.concurrency.snapshot(),
                 'executions': [asdict(execution) for execution in self.executions.values()]
             }
             
@@ -350,7 +367,7 @@ class BackgroundScraperExecution:
         self.stop_flag = True
         
         # Stop all running processes
-        for scraper_path, process in self.running_processes.items():
+        for scraper_path, process in list(self.running_processes.items()):
             try:
                 process.terminate()
                 self.logger.info(f"🛑 Terminated process for {scraper_path}")
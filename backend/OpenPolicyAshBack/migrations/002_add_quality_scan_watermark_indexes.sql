@@ -0,0 +1,30 @@
+-- Migration: Add indexes on data quality scan watermark columns
+-- Version: 002
+-- Description: Incremental quality scans select rows by updated_at (created_at for votes);
+--              without these indexes every incremental scan is a sequential scan
+-- Created: 2026-10-18
+
+-- CONCURRENTLY cannot run inside a transaction block, so each statement stands alone
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jurisdiction_updated_at ON jurisdictions (updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_representative_updated_at ON representatives (updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bill_updated_at ON bills (updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_committee_updated_at ON committees (updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_event_updated_at ON events (updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vote_created_at ON votes (created_at);
+
+-- Refresh planner statistics for the new indexes
+ANALYZE jurisdictions;
+ANALYZE representatives;
+ANALYZE bills;
+ANALYZE committees;
+ANALYZE events;
+ANALYZE votes;
+
+/*
+-- Verification queries
+
+SELECT tablename, indexname FROM pg_indexes
+WHERE indexname IN ('idx_jurisdiction_updated_at', 'idx_representative_updated_at', 'idx_bill_updated_at',
+                    'idx_committee_updated_at', 'idx_event_updated_at', 'idx_vote_created_at')
+ORDER BY tablename;
+*/
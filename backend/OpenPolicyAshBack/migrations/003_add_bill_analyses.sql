@@ -0,0 +1,36 @@
+-- Migration: Add stored AI bill analyses
+-- Version: 003
+-- Description: Creates bill_analyses (src/database/models.py BillAnalysis), which holds one
+--              analysis per bill, kind, content hash and model so analyses are reused until
+--              the bill's content changes
+-- Created: 2026-10-18
+
+BEGIN TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS bill_analyses (
+    id UUID PRIMARY KEY,
+    bill_id UUID NOT NULL REFERENCES bills(id),
+    kind VARCHAR(50) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    analysis JSON NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- Lookups by current content (AnalysisStore.get_many) and concurrent writers
+    -- (AnalysisStore.save_many) both rely on this key
+    CONSTRAINT uq_bill_analysis_content UNIQUE (bill_id, kind, content_hash, model)
+);
+
+-- Latest analysis of a kind for a bill (AnalysisStore.get_latest)
+CREATE INDEX IF NOT EXISTS idx_bill_analysis_bill_kind ON bill_analyses (bill_id, kind, created_at);
+
+COMMIT;
+
+/*
+-- Verification queries
+
+SELECT table_name FROM information_schema.tables
+WHERE table_schema = 'public' AND table_name = 'bill_analyses';
+
+SELECT indexname FROM pg_indexes WHERE tablename = 'bill_analyses' ORDER BY indexname;
+*/
@@ -11,7 +11,7 @@ This framework tests all scrapers in the OpenPolicy Merge platform:
 5. Update scripts (Regular maintenance)
 
 Each scraper is tested with sample data, monitored for errors, and results are tracked.
-NOW WITH OPTIMIZED PARALLEL EXECUTION - Dynamic worker scaling (10-20) based on scraper size!
+NOW WITH OPTIMIZED PARALLEL EXECUTION - Adaptive (AIMD) worker scaling with per-host limits!
 """
 
 import os
@@ -82,6 +82,7 @@ from src.database.models import (
     ScrapingRun, DataQualityIssue, JurisdictionType, RepresentativeRole
 )
 from src.database.config import get_database_url, get_session_factory
+from src.scrapers.concurrency import AdaptiveConcurrencyController, AIMDConfig, scraper_host
 
 # Configure logging
 logging.basicConfig(
@@ -141,6 +142,10 @@ class ScraperTestResult:
 class ScraperTestingFramework:
     """Comprehensive scraper testing framework with optimized parallel execution"""
     
+    # Hard per-scraper ceilings and relative weights used to normalise latency for AIMD
+    SIZE_TIMEOUTS = {ScraperSize.LARGE: 180, ScraperSize.MEDIUM: 90, ScraperSize.SMALL: 45}
+    SIZE_COST = {ScraperSize.LARGE: 4.0, ScraperSize.MEDIUM: 2.0, ScraperSize.SMALL: 1.0}
+    
     def __init__(self, database_url: str, max_sample_records: int = 5, 
                  min_workers: int = 10, max_workers: int = 20):
         self.database_url = database_url
@@ -151,6 +156,7 @@ class ScraperTestingFramework:
         self.SessionLocal = get_session_factory()  # Get session factory
         self.results: List[ScraperTestResult] = []
         self.results_lock = threading.Lock()  # Thread-safe results storage
+        self.concurrency: Dict[str, AdaptiveConcurrencyController] = {}  # Per-category adaptive pools
         
         # Performance tracking
         self.system_resources = {
@@ -226,7 +232,7 @@ class ScraperTestingFramework:
         }
     
     def calculate_optimal_workers(self, scrapers: List[Tuple[str, str, ScraperSize]]) -> int:
-        """Calculate optimal number of workers based on scraper sizes and system resources"""
+        """Initial worker estimate from scraper sizes and system resources (the adaptive limit starts here)"""
         # Count scraper sizes
         small_count = sum(1 for _, _, size in scrapers if size == ScraperSize.SMALL)
         medium_count = sum(1 for _, _, size in scrapers if size == ScraperSize.MEDIUM)
@@ -755,91 +761,78 @@ class ScraperTestingFramework:
         
         logger.info(f"Found {len(scrapers)} scrapers to test")
         
-        # Calculate optimal number of workers
-        optimal_workers = self.calculate_optimal_workers(scrapers)
+        # Seed the adaptive limit from the size/resource heuristic; AIMD takes over from there
+        initial_workers = self.calculate_optimal_workers(scrapers)
+        controller = AdaptiveConcurrencyController(
+            f"scraper_testing_{category.value}",
+            AIMDConfig(min_limit=1, max_limit=self.max_workers, initial_limit=initial_workers),
+        )
+        self.concurrency[category.value] = controller
         
-        # Run scrapers in parallel using ThreadPoolExecutor with strict timeouts
         results = []
         start_time = time.time()
         overall_timeout = 300  # 5 minutes total for all scrapers in category
+        completed = 0
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=optimal_workers) as executor:
-            # Submit all scraper tests with individual timeouts
-            future_to_scraper = {}
-            for scraper_path, scraper_name, size in scrapers:
-                # Calculate individual timeout based on size
-                if size == ScraperSize.LARGE:
-                    individual_timeout = 180  # 3 minutes max
-                elif size == ScraperSize.MEDIUM:
-                    individual_timeout = 90   # 1.5 minutes max
-                else:
-                    individual_timeout = 45   # 45 seconds max
-                
-                future = executor.submit(self.test_scraper, scraper_path, scraper_name, category, size)
-                future_to_scraper[future] = (scraper_path, scraper_name, size, individual_timeout)
-            
-            # Collect results with strict timeouts
-            completed = 0
-            for future in concurrent.futures.as_completed(future_to_scraper, timeout=overall_timeout):
-                scraper_path, scraper_name, size, individual_timeout = future_to_scraper[future]
-                
-                # Check overall timeout
-                if time.time() - start_time > overall_timeout:
-                    logger.warning(f"⏰ Overall timeout reached for {category.value} scrapers")
-                    break
+        outcomes = controller.map(
+            lambda scraper: self.test_scraper(scraper[0], scraper[1], category, scraper[2]),
+            scrapers,
+            host_of=lambda scraper: scraper_host(scraper[0]),
+            cost_of=lambda scraper: self.SIZE_COST[scraper[2]],
+            timeout_of=lambda scraper: self.SIZE_TIMEOUTS[scraper[2]],
+            ok_of=lambda result: result.status == TestStatus.SUCCESS,
+        )
+        try:
+            for outcome in outcomes:
+                scraper_path, scraper_name, size = outcome.item
+                completed += 1
                 
-                try:
-                    result = future.result(timeout=individual_timeout)
-                    
-                    # Insert sample data to database if successful
-                    if result.status == TestStatus.SUCCESS and result.sample_data:
-                        inserted_count = self.insert_sample_data_to_db(result)
-                        result.records_inserted = inserted_count
-                        logger.info(f"💾 {scraper_name}: Inserted {inserted_count} records to database")
-                    
-                    # Store result thread-safely
-                    with self.results_lock:
-                        self.results.append(result)
-                        results.append(result)
-                    
-                    # Progress update with size information
-                    logger.info(f"Progress: {completed}/{len(scrapers)} scrapers completed ({size.value})")
-                    completed += 1
-                    
-                except concurrent.futures.TimeoutError:
-                    logger.warning(f"⏰ {scraper_name}: Individual timeout after {individual_timeout}s")
-                    failed_result = ScraperTestResult(
+                if outcome.timed_out:
+                    logger.warning(f"⏰ {scraper_name}: Individual timeout after {self.SIZE_TIMEOUTS[size]}s")
+                    result = ScraperTestResult(
                         scraper_name=scraper_name,
                         category=category,
                         size=size,
                         status=TestStatus.FAILED,
                         start_time=datetime.utcnow(),
                         end_time=datetime.utcnow(),
-                        error_message=f"Individual timeout after {individual_timeout}s"
+                        error_message=f"Individual timeout after {self.SIZE_TIMEOUTS[size]}s"
                     )
-                    with self.results_lock:
-                        self.results.append(failed_result)
-                        results.append(failed_result)
-                    completed += 1
-                    
-                except Exception as e:
-                    logger.error(f"❌ {scraper_name}: Exception in parallel execution - {str(e)}")
-                    # Create failed result
-                    failed_result = ScraperTestResult(
+                elif outcome.error is not None:
+                    logger.error(f"❌ {scraper_name}: Exception in parallel execution - {str(outcome.error)}")
+                    result = ScraperTestResult(
                         scraper_name=scraper_name,
                         category=category,
                         size=size,
                         status=TestStatus.FAILED,
                         start_time=datetime.utcnow(),
                         end_time=datetime.utcnow(),
-                        error_message=f"Parallel execution error: {str(e)}"
+                        error_message=f"Parallel execution error: {str(outcome.error)}"
                     )
-                    with self.results_lock:
-                        self.results.append(failed_result)
-                        results.append(failed_result)
-                    completed += 1
+                else:
+                    result = outcome.result
+                    # Insert sample data to database if successful
+                    if result.status == TestStatus.SUCCESS and result.sample_data:
+                        inserted_count = self.insert_sample_data_to_db(result)
+                        result.records_inserted = inserted_count
+                        logger.info(f"💾 {scraper_name}: Inserted {inserted_count} records to database")
+                
+                # Store result thread-safely
+                with self.results_lock:
+                    self.results.append(result)
+                    results.append(result)
+                
+                # Progress update with size information and the current adaptive limit
+                logger.info(f"Progress: {completed}/{len(scrapers)} scrapers completed ({size.value}), "
+                            f"limit {controller.limit}")
+                
+                if time.time() - start_time > overall_timeout:
+                    logger.warning(f"⏰ Overall timeout reached for {category.value} scrapers")
+                    break
+        finally:
+            outcomes.close()
         
-        logger.info(f"✅ Completed testing {len(results)} {category.value} scrapers with {optimal_workers} workers")
+        logger.info(f"✅ Completed testing {len(results)} {category.value} scrapers (adaptive limit {initial_workers} -> {controller.limit})")
         return results
     
     def run_all_tests_parallel(self) -> Dict[ScraperCategory, List[ScraperTestResult]]:
@@ -933,6 +926,7 @@ class ScraperTestingFramework:
             },
             'category_stats': category_stats,
             'failed_scrapers': failed_scrapers,
+            'concurrency': {name: controller.snapshot() for name, controller in self.concurrency.items()},
             'detailed_results': [{
             'scraper_name': r.scraper_name,
             'category': r.category.value,
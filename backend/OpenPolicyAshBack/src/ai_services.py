@@ -2,95 +2,119 @@
 AI Services for OpenPolicy Backend Ash Aug 2025
 
 Provides AI-powered bill summaries, analysis, and insights using OpenAI's API.
+Analyses are stored by bill content hash (see bill_analysis) and refreshed in
+the background; request handlers read the stored results.
 """
 
 import os
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-import openai
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 import asyncio
 import json
 
-from database import Bill, Jurisdiction, JurisdictionType
+from database import Bill, BillAnalysis, Jurisdiction, JurisdictionType
 from database import get_session_factory, get_database_config, create_engine_from_config
+from bill_analysis import (
+    SUMMARY, CRITICALITY, STAKEHOLDERS, DEFAULT_CONCURRENCY,
+    AnalysisStore, analyze_batch, bill_content_hash, bill_identifier, get_provider
+)
 
 logger = logging.getLogger(__name__)
 
-# OpenAI configuration
-openai.api_key = os.getenv("OPENAI_API_KEY")
 AI_SUMMARIES_ENABLED = os.getenv("AI_SUMMARIES_ENABLED", "false").lower() == "true"
 
 class AIBillAnalyzer:
     """AI-powered bill analysis and summarization"""
     
-    def __init__(self):
-        config = get_database_config()
-        engine = create_engine_from_config(config.get_url())
-        self.SessionLocal = get_session_factory(engine)
-        self.model = "gpt-4o-mini"  # Cost-effective model for summaries
+    def __init__(self, provider=None, session_factory=None, concurrency: int = DEFAULT_CONCURRENCY):
+        if session_factory is None:
+            config = get_database_config()
+            engine = create_engine_from_config(config.get_url())
+            session_factory = get_session_factory(engine)
+        self.SessionLocal = session_factory
+        self.provider = provider or get_provider()
+        self.model = self.provider.model
+        self.store = AnalysisStore(self.SessionLocal, BillAnalysis)
+        self.concurrency = concurrency
+        self.last_batch_stats: Dict[str, Any] = {}
+        self._background: Dict[Any, asyncio.Task] = {}
+        self._background_semaphore: Optional[asyncio.Semaphore] = None
     
-    async def summarize_bill(self, bill: Bill) -> Dict[str, Any]:
+    def enabled(self) -> bool:
+        return AI_SUMMARIES_ENABLED and self.provider.available()
+    
+    async def summarize_bill(self, bill: Bill, refresh: bool = False) -> Dict[str, Any]:
+        """AI summary for a bill, from the store unless the bill's content changed"""
+        results = await self.analyze_bills([bill], refresh=refresh)
+        return results[0]
+    
+    async def analyze_bills(self, bills: List[Bill], kind: str = SUMMARY,
+                            refresh: bool = False) -> List[Dict[str, Any]]:
+        """Analyses of one kind for many bills, computing missing ones with bounded concurrency"""
+        if not self.enabled():
+            return [{"error": "AI summaries not enabled or API key not configured"} for _ in bills]
+        analyzers = {
+            SUMMARY: self._summarize_uncached,
+            CRITICALITY: self._rate_importance,
+            STAKEHOLDERS: self._identify_stakeholders,
+        }
+        results, stats = await analyze_batch(bills, kind, analyzers[kind], self.store, self.model,
+                                             concurrency=self.concurrency, refresh=refresh)
+        self.last_batch_stats[kind] = stats.to_dict()
+        return results
+    
+    async def _summarize_uncached(self, bill: Bill) -> Dict[str, Any]:
         """Generate AI summary for a bill"""
-        if not AI_SUMMARIES_ENABLED or not openai.api_key:
-            return {"error": "AI summaries not enabled or API key not configured"}
+        # Prepare bill text for analysis
+        bill_text = self._prepare_bill_text(bill)
         
-        try:
-            # Prepare bill text for analysis
-            bill_text = self._prepare_bill_text(bill)
-            
-            # Generate summary
-            summary_prompt = f"""
-            Please analyze this Canadian legislative bill and provide a comprehensive summary:
+        # Generate summary
+        summary_prompt = f"""
+        Please analyze this Canadian legislative bill and provide a comprehensive summary:
 
-            Bill: {bill.identifier}
-            Title: {bill.title}
-            Status: {bill.status}
-            Content: {bill_text}
+        Bill: {bill_identifier(bill)}
+        Title: {bill.title}
+        Status: {bill.status}
+        Content: {bill_text}
 
-            Provide a JSON response with the following structure:
-            {{
-                "executive_summary": "Brief 2-3 sentence overview",
-                "key_provisions": ["List of main provisions"],
-                "impact_analysis": "Who and what will be affected",
-                "parliamentary_stage": "Current stage in legislative process",
-                "controversy_level": "Low/Medium/High with explanation",
-                "public_interest": "Low/Medium/High with explanation",
-                "implementation_timeline": "When changes would take effect",
-                "related_legislation": "Any related or conflicting bills",
-                "stakeholder_impact": {{
-                    "citizens": "Impact on general public",
-                    "businesses": "Impact on business sector",
-                    "government": "Impact on government operations"
-                }}
+        Provide a JSON response with the following structure:
+        {{
+            "executive_summary": "Brief 2-3 sentence overview",
+            "key_provisions": ["List of main provisions"],
+            "impact_analysis": "Who and what will be affected",
+            "parliamentary_stage": "Current stage in legislative process",
+            "controversy_level": "Low/Medium/High with explanation",
+            "public_interest": "Low/Medium/High with explanation",
+            "implementation_timeline": "When changes would take effect",
+            "related_legislation": "Any related or conflicting bills",
+            "stakeholder_impact": {{
+                "citizens": "Impact on general public",
+                "businesses": "Impact on business sector",
+                "government": "Impact on government operations"
             }}
-            """
-            
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert Canadian parliamentary analyst. Provide accurate, objective analysis of legislative bills."},
-                    {"role": "user", "content": summary_prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.3
-            )
-            
-            # Parse AI response
-            ai_analysis = json.loads(response.choices[0].message.content)
-            
-            # Add metadata
-            ai_analysis["generated_at"] = datetime.now().isoformat()
-            ai_analysis["model_used"] = self.model
-            ai_analysis["bill_id"] = bill.id
-            ai_analysis["confidence_score"] = self._calculate_confidence(bill_text, ai_analysis)
-            
-            return ai_analysis
-            
-        except Exception as e:
-            logger.error(f"Failed to generate AI summary for bill {bill.identifier}: {e}")
-            return {"error": f"AI analysis failed: {str(e)}"}
+        }}
+        """
+        
+        response = await self.provider.complete(
+            "You are an expert Canadian parliamentary analyst. Provide accurate, objective analysis of legislative bills.",
+            summary_prompt,
+            max_tokens=1500,
+            temperature=0.3
+        )
+        
+        # Parse AI response
+        ai_analysis = json.loads(response)
+        
+        # Add metadata
+        ai_analysis["generated_at"] = datetime.now().isoformat()
+        ai_analysis["model_used"] = self.model
+        ai_analysis["bill_id"] = str(bill.id)
+        ai_analysis["confidence_score"] = self._calculate_confidence(bill_text, ai_analysis)
+        
+        return ai_analysis
     
     def _prepare_bill_text(self, bill: Bill) -> str:
         """Prepare bill text for AI analysis"""
@@ -116,32 +140,34 @@ class AIBillAnalyzer:
         
         return round((text_length_score + analysis_completeness) / 2, 2)
     
-    async def analyze_federal_bills(self, days_back: int = 7) -> List[Dict[str, Any]]:
+    def _recent_federal_bills(self, db: Session, days_back: int, limit: int) -> List[Bill]:
+        federal_jurisdiction = db.query(Jurisdiction).filter(
+            Jurisdiction.jurisdiction_type == JurisdictionType.FEDERAL
+        ).first()
+        
+        if not federal_jurisdiction:
+            return []
+        
+        return db.query(Bill).filter(
+            Bill.jurisdiction_id == federal_jurisdiction.id,
+            Bill.updated_at >= datetime.now() - timedelta(days=days_back)
+        ).limit(limit).all()
+    
+    async def analyze_federal_bills(self, days_back: int = 7, limit: int = 10) -> List[Dict[str, Any]]:
         """Analyze recent federal bills with AI"""
         with self.SessionLocal() as db:
-            # Get recent federal bills
-            federal_jurisdiction = db.query(Jurisdiction).filter(
-                Jurisdiction.jurisdiction_type == JurisdictionType.FEDERAL
-            ).first()
-            
-            if not federal_jurisdiction:
-                return []
-            
-            recent_bills = db.query(Bill).filter(
-                Bill.jurisdiction_id == federal_jurisdiction.id,
-                Bill.updated_at >= datetime.now() - timedelta(days=days_back)
-            ).limit(10).all()  # Limit to prevent excessive API calls
+            # Limit to prevent excessive API calls
+            recent_bills = self._recent_federal_bills(db, days_back, limit)
             
             analyses = []
-            for bill in recent_bills:
-                analysis = await self.summarize_bill(bill)
+            for bill, analysis in zip(recent_bills, await self.analyze_bills(recent_bills)):
                 if "error" not in analysis:
                     analyses.append({
                         "bill": {
-                            "id": bill.id,
-                            "identifier": bill.identifier,
+                            "id": str(bill.id),
+                            "identifier": bill_identifier(bill),
                             "title": bill.title,
-                            "status": bill.status
+                            "status": getattr(bill.status, "value", bill.status)
                         },
                         "ai_analysis": analysis
                     })
@@ -150,55 +176,117 @@ class AIBillAnalyzer:
     
     async def detect_critical_bills(self, bills: List[Bill]) -> List[Dict[str, Any]]:
         """Use AI to detect potentially critical bills"""
-        if not AI_SUMMARIES_ENABLED:
+        if not self.enabled():
             return []
         
         critical_bills = []
-        
-        for bill in bills:
+        for bill, analysis in zip(bills, await self.analyze_bills(bills, CRITICALITY)):
+            if "error" in analysis:
+                continue
             try:
-                prompt = f"""
-                Analyze this Canadian bill and determine if it's critically important for public interest:
+                importance_score = int(analysis.get("importance_score", 0))
+            except (TypeError, ValueError):
+                logger.warning(f"Unusable importance score for bill {bill_identifier(bill)}: "
+                               f"{analysis.get('importance_score')!r}")
+                continue
+            if importance_score >= 7:  # High importance threshold
+                critical_bills.append({
+                    "bill": bill,
+                    "importance_score": importance_score,
+                    "reasoning": analysis.get("reasoning", ""),
+                    "category": analysis.get("category", "general")
+                })
+        
+        return sorted(critical_bills, key=lambda x: x["importance_score"], reverse=True)
+    
+    async def _rate_importance(self, bill: Bill) -> Dict[str, Any]:
+        prompt = f"""
+        Analyze this Canadian bill and determine if it's critically important for public interest:
 
-                Bill: {bill.identifier}
-                Title: {bill.title}
-                Summary: {bill.summary or "No summary available"}
+        Bill: {bill_identifier(bill)}
+        Title: {bill.title}
+        Summary: {bill.summary or "No summary available"}
 
-                Rate the bill's importance on a scale of 1-10 and provide reasoning.
-                Consider factors like:
-                - Public impact scope
-                - Economic implications
-                - Constitutional significance
-                - Social policy changes
-                - Emergency/urgent nature
+        Rate the bill's importance on a scale of 1-10 and provide reasoning.
+        Consider factors like:
+        - Public impact scope
+        - Economic implications
+        - Constitutional significance
+        - Social policy changes
+        - Emergency/urgent nature
 
-                Respond with JSON: {{"importance_score": 1-10, "reasoning": "explanation", "category": "budget/healthcare/security/etc"}}
-                """
-                
-                response = await openai.ChatCompletion.acreate(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a Canadian policy expert. Rate bill importance objectively."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.2
-                )
-                
-                analysis = json.loads(response.choices[0].message.content)
-                
-                if analysis.get("importance_score", 0) >= 7:  # High importance threshold
-                    critical_bills.append({
-                        "bill": bill,
-                        "importance_score": analysis["importance_score"],
-                        "reasoning": analysis["reasoning"],
-                        "category": analysis.get("category", "general")
-                    })
-                    
+        Respond with JSON: {{"importance_score": 1-10, "reasoning": "explanation", "category": "budget/healthcare/security/etc"}}
+        """
+        
+        response = await self.provider.complete(
+            "You are a Canadian policy expert. Rate bill importance objectively.",
+            prompt,
+            max_tokens=300,
+            temperature=0.2
+        )
+        return json.loads(response)
+    
+    async def _identify_stakeholders(self, bill: Bill) -> Dict[str, Any]:
+        """Identify key stakeholders affected by the bill"""
+        prompt = f"""
+        Identify the key stakeholders affected by this Canadian bill:
+        
+        Title: {bill.title}
+        Summary: {bill.summary or "No summary available"}
+        
+        List the main groups, organizations, or sectors that would be impacted.
+        Respond with a JSON array of stakeholder names.
+        """
+        
+        response = await self.provider.complete(
+            "Identify stakeholders affected by Canadian legislation.",
+            prompt,
+            max_tokens=200,
+            temperature=0.3
+        )
+        stakeholders = json.loads(response)
+        return {"stakeholders": stakeholders if isinstance(stakeholders, list) else ["General Public"]}
+    
+    async def get_stored_analysis(self, bill: Bill, kind: str = SUMMARY) -> Optional[Dict[str, Any]]:
+        """Stored analysis for the bill's current content, without calling the provider.
+        If there is none, a refresh is queued and the latest (outdated) analysis, if any, is returned."""
+        hashes = {bill.id: bill_content_hash(bill, kind)}
+        current = (await run_in_threadpool(self.store.get_many, kind, self.model, hashes)).get(bill.id)
+        if current is not None:
+            return current
+        self.schedule_refresh(bill.id, kind)
+        return await run_in_threadpool(self.store.get_latest, bill.id, kind)
+    
+    async def refresh_analyses(self, days_back: int = 7, limit: int = 100) -> Dict[str, Any]:
+        """Bring stored summaries of recently updated federal bills up to date"""
+        with self.SessionLocal() as db:
+            bills = self._recent_federal_bills(db, days_back, limit)
+            await self.analyze_bills(bills)
+        return self.last_batch_stats.get(SUMMARY, {})
+    
+    def schedule_refresh(self, bill_id, kind: str = SUMMARY) -> bool:
+        """Queue a background analysis of one bill; at most ``concurrency`` run at once.
+        Returns False if AI is disabled or the bill is already queued."""
+        key = (bill_id, kind)
+        if not self.enabled() or key in self._background:
+            return False
+        if self._background_semaphore is None:
+            self._background_semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def _refresh():
+            try:
+                async with self._background_semaphore:
+                    with self.SessionLocal() as db:
+                        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+                        if bill is not None:
+                            await self.analyze_bills([bill], kind)
             except Exception as e:
-                logger.error(f"Failed to analyze bill criticality for {bill.identifier}: {e}")
+                logger.error(f"Background {kind} analysis failed for bill {bill_id}: {e}")
+            finally:
+                self._background.pop(key, None)
         
-        return sorted(critical_bills, key=lambda x: x["importance_score"], reverse=True)
+        self._background[key] = asyncio.get_running_loop().create_task(_refresh())
+        return True
     
     async def generate_daily_briefing(self) -> Dict[str, Any]:
         """Generate daily AI briefing of parliamentary activity"""
@@ -223,17 +311,14 @@ class AIBillAnalyzer:
             }}
             """
             
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a parliamentary correspondent creating daily briefings for informed citizens."},
-                    {"role": "user", "content": briefing_prompt}
-                ],
+            response = await self.provider.complete(
+                "You are a parliamentary correspondent creating daily briefings for informed citizens.",
+                briefing_prompt,
                 max_tokens=1000,
                 temperature=0.4
             )
             
-            briefing = json.loads(response.choices[0].message.content)
+            briefing = json.loads(response)
             briefing["generated_at"] = datetime.now().isoformat()
             briefing["bills_analyzed"] = len(analyses)
             
@@ -246,10 +331,9 @@ class AIBillAnalyzer:
 class DataEnricher:
     """Cross-reference and enrich civic data with external sources"""
     
-    def __init__(self):
-        config = get_database_config()
-        engine = create_engine_from_config(config.get_url())
-        self.SessionLocal = get_session_factory(engine)
+    def __init__(self, analyzer: AIBillAnalyzer):
+        self.analyzer = analyzer
+        self.SessionLocal = analyzer.SessionLocal
     
     async def enrich_bill_data(self, bill: Bill) -> Dict[str, Any]:
         """Enrich bill data with external sources"""
@@ -258,16 +342,17 @@ class DataEnricher:
             "enriched_at": datetime.now().isoformat(),
             "sources": []
         }
+        identifier = bill_identifier(bill)
         
         try:
             # Parliamentary website link
             if bill.jurisdiction and bill.jurisdiction.jurisdiction_type == JurisdictionType.FEDERAL:
-                parl_link = f"https://www.parl.ca/legisinfo/en/bill/{bill.identifier.lower()}"
+                parl_link = f"https://www.parl.ca/legisinfo/en/bill/{identifier.lower()}"
                 enrichment["parliamentary_link"] = parl_link
                 enrichment["sources"].append("Parliament of Canada")
             
             # OpenParliament.ca integration
-            openparl_link = f"https://openparliament.ca/bills/{bill.identifier.lower()}/"
+            openparl_link = f"https://openparliament.ca/bills/{identifier.lower()}/"
             enrichment["openparliament_link"] = openparl_link
             enrichment["sources"].append("OpenParliament.ca")
             
@@ -275,12 +360,12 @@ class DataEnricher:
             enrichment["related_news"] = await self._fetch_related_news(bill)
             
             # Stakeholder analysis
-            enrichment["stakeholders"] = await self._identify_stakeholders(bill)
+            enrichment["stakeholders"] = await self._stored_stakeholders(bill)
             
             return enrichment
             
         except Exception as e:
-            logger.error(f"Failed to enrich bill data for {bill.identifier}: {e}")
+            logger.error(f"Failed to enrich bill data for {identifier}: {e}")
             return {"error": f"Data enrichment failed: {str(e)}"}
     
     async def _fetch_related_news(self, bill: Bill) -> List[Dict[str, str]]:
@@ -294,45 +379,18 @@ class DataEnricher:
             {
                 "title": f"Analysis: {bill.title}",
                 "source": "CBC News",
-                "url": f"https://cbc.ca/news/politics/bill-{bill.identifier.lower()}",
+                "url": f"https://cbc.ca/news/politics/bill-{bill_identifier(bill).lower()}",
                 "date": datetime.now().strftime("%Y-%m-%d")
             }
         ]
     
-    async def _identify_stakeholders(self, bill: Bill) -> List[str]:
-        """Identify key stakeholders affected by the bill"""
-        # Use AI to identify stakeholders
-        if not AI_SUMMARIES_ENABLED:
-            return ["General Public"]
-        
-        try:
-            prompt = f"""
-            Identify the key stakeholders affected by this Canadian bill:
-            
-            Title: {bill.title}
-            Summary: {bill.summary or "No summary available"}
-            
-            List the main groups, organizations, or sectors that would be impacted.
-            Respond with a JSON array of stakeholder names.
-            """
-            
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Identify stakeholders affected by Canadian legislation."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            stakeholders = json.loads(response.choices[0].message.content)
-            return stakeholders if isinstance(stakeholders, list) else ["General Public"]
-            
-        except Exception as e:
-            logger.error(f"Failed to identify stakeholders for {bill.identifier}: {e}")
+    async def _stored_stakeholders(self, bill: Bill) -> List[str]:
+        """Stakeholders from the stored analysis; a missing one is generated in the background"""
+        if not self.analyzer.enabled():
             return ["General Public"]
+        stored = await self.analyzer.get_stored_analysis(bill, STAKEHOLDERS)
+        return (stored or {}).get("stakeholders") or ["General Public"]
 
 # Global instances
 ai_analyzer = AIBillAnalyzer()
-data_enricher = DataEnricher()
\ No newline at end of file
+data_enricher = DataEnricher(ai_analyzer)
\ No newline at end of file
@@ -366,15 +366,15 @@ class Query:
     
     @strawberry.field
     async def ai_analysis(self, bill_id: str) -> Optional[AIAnalysisType_GQL]:
-        """Get AI analysis for a bill"""
+        """Get the stored AI analysis for a bill (generated in the background when missing)"""
         db = get_db()
         try:
             bill = db.query(Bill).filter(Bill.id == bill_id).first()
             if not bill:
                 return None
             
-            analysis = await ai_analyzer.summarize_bill(bill)
-            if "error" in analysis:
+            analysis = await ai_analyzer.get_stored_analysis(bill)
+            if not analysis or "error" in analysis:
                 return None
             
             return AIAnalysisType_GQL(
@@ -0,0 +1,256 @@
+"""
+Bill Analysis Pipeline
+
+Content-addressed storage for AI bill analyses, pluggable completion providers
+(including a deterministic offline stub) and bounded-concurrency batch runs.
+An analysis is computed once per (bill, kind, content hash, model) and served
+from the database until the bill's content changes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+SUMMARY = "summary"
+CRITICALITY = "criticality"
+STAKEHOLDERS = "stakeholders"
+
+# Bump when prompts change so stored analyses are regenerated
+PROMPT_VERSION = "1"
+
+DEFAULT_CONCURRENCY = int(os.getenv("AI_ANALYSIS_CONCURRENCY", "4"))
+
+
+def bill_identifier(bill) -> str:
+    return getattr(bill, "identifier", None) or bill.bill_number
+
+
+def bill_content_hash(bill, kind: str) -> str:
+    """Hash of everything an analysis of this kind is generated from"""
+    status = getattr(bill.status, "value", bill.status)
+    payload = [PROMPT_VERSION, kind, bill_identifier(bill), bill.title, bill.summary, str(status)]
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+
+class AnalysisProvider(ABC):
+    """Chat-completion backend; ``complete`` returns the raw response text"""
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def complete(self, system: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        ...
+
+
+class OpenAIProvider(AnalysisProvider):
+    name = "openai"
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        super().__init__(model)
+
+    def available(self) -> bool:
+        return bool(os.getenv("OPENAI_API_KEY"))
+
+    async def complete(self, system: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        import openai
+
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+        response = await openai.ChatCompletion.acreate(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+
+class StubProvider(AnalysisProvider):
+    """Offline provider for tests and benchmarks: the same prompt always gets the
+    same well-formed answer, after an optional simulated latency"""
+
+    name = "stub"
+
+    def __init__(self, model: str = "stub", latency: float = 0.0):
+        super().__init__(model)
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, system: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        level = rng.choice(["Low", "Medium", "High"])
+        if '"importance_score"' in prompt:
+            return json.dumps({
+                "importance_score": rng.randint(1, 10),
+                "reasoning": "Stub rating",
+                "category": rng.choice(["budget", "healthcare", "security", "environment"])
+            })
+        if "stakeholders" in prompt:
+            return json.dumps(rng.sample(["General Public", "Businesses", "Provinces", "Indigenous Communities",
+                                          "Workers", "Municipalities"], 3))
+        return json.dumps({
+            "executive_summary": "Stub summary",
+            "key_provisions": ["Provision %d" % i for i in range(1, rng.randint(2, 4))],
+            "impact_analysis": "Stub impact analysis",
+            "parliamentary_stage": "Stub stage",
+            "controversy_level": level,
+            "public_interest": level,
+            "implementation_timeline": "Stub timeline",
+            "related_legislation": "None",
+            "stakeholder_impact": {"citizens": "Stub", "businesses": "Stub", "government": "Stub"}
+        })
+
+
+def get_provider(name: Optional[str] = None) -> AnalysisProvider:
+    """Provider selected by ``AI_PROVIDER`` (openai or stub)"""
+    name = (name or os.getenv("AI_PROVIDER", "openai")).lower()
+    if name == "stub":
+        return StubProvider(latency=float(os.getenv("AI_STUB_LATENCY", "0")))
+    if name == "openai":
+        return OpenAIProvider(os.getenv("AI_MODEL", "gpt-4o-mini"))
+    raise ValueError(f"Unknown AI provider: {name}")
+
+
+class AnalysisStore:
+    """Stored analyses, looked up by bill, kind, content hash and model"""
+
+    def __init__(self, session_factory, model_class):
+        self.SessionLocal = session_factory
+        self.BillAnalysis = model_class
+
+    def get_many(self, kind: str, model: str, hashes: Dict[Any, str]) -> Dict[Any, Dict[str, Any]]:
+        """Current analyses for {bill_id: content_hash}, in one query"""
+        if not hashes:
+            return {}
+        BillAnalysis = self.BillAnalysis
+        with self.SessionLocal() as db:
+            rows = db.query(BillAnalysis.bill_id, BillAnalysis.content_hash, BillAnalysis.analysis).filter(
+                BillAnalysis.kind == kind,
+                BillAnalysis.model == model,
+                BillAnalysis.bill_id.in_(list(hashes)),
+                BillAnalysis.content_hash.in_(set(hashes.values()))
+            ).all()
+        return {bill_id: analysis for bill_id, content_hash, analysis in rows if hashes.get(bill_id) == content_hash}
+
+    def get_latest(self, bill_id, kind: str) -> Optional[Dict[str, Any]]:
+        BillAnalysis = self.BillAnalysis
+        with self.SessionLocal() as db:
+            row = db.query(BillAnalysis.analysis).filter(
+                BillAnalysis.bill_id == bill_id, BillAnalysis.kind == kind
+            ).order_by(BillAnalysis.created_at.desc()).first()
+        return row[0] if row else None
+
+    def save_many(self, kind: str, model: str, analyses: Iterable[tuple]):
+        """Persist (bill_id, content_hash, analysis) tuples in one transaction"""
+        rows = [self.BillAnalysis(bill_id=bill_id, kind=kind, content_hash=content_hash, model=model,
+                                  analysis=analysis)
+                for bill_id, content_hash, analysis in analyses]
+        if not rows:
+            return
+        with self.SessionLocal() as db:
+            try:
+                db.add_all(rows)
+                db.commit()
+                return
+            except IntegrityError:
+                db.rollback()
+            # Another worker stored some of these first; keep the rest
+            for row in rows:
+                try:
+                    db.merge(row)
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()
+
+
+@dataclass
+class BatchStats:
+    requested: int = 0
+    cached: int = 0
+    computed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cached / self.requested if self.requested else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requested": self.requested,
+            "cached": self.cached,
+            "computed": self.computed,
+            "failed": self.failed,
+            "hit_rate": round(self.hit_rate, 3),
+            "seconds": round(self.seconds, 3),
+            "bills_per_second": round(self.computed / self.seconds, 2) if self.seconds else None,
+        }
+
+
+async def analyze_batch(
+    bills: Sequence,
+    kind: str,
+    analyze_one: Callable[[Any], Awaitable[Dict[str, Any]]],
+    store: AnalysisStore,
+    model: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    refresh: bool = False,
+) -> tuple:
+    """Analyses for ``bills`` in input order, computing at most ``concurrency`` at once.
+
+    Stored analyses whose content hash still matches are reused unless ``refresh``.
+    ``analyze_one`` may raise; failures come back as ``{"error": ...}`` and are not stored.
+    """
+    started = time.perf_counter()
+    stats = BatchStats(requested=len(bills))
+    hashes = {bill.id: bill_content_hash(bill, kind) for bill in bills}
+    # The store is synchronous; keep its queries off the event loop
+    results = {} if refresh else await run_in_threadpool(store.get_many, kind, model, hashes)
+    stats.cached = len(results)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    fresh = []
+
+    async def _run(bill):
+        async with semaphore:
+            try:
+                analysis = await analyze_one(bill)
+            except Exception as e:
+                logger.error(f"{kind} analysis failed for bill {bill_identifier(bill)}: {e}")
+                stats.failed += 1
+                stats.errors.append(str(e))
+                results[bill.id] = {"error": f"AI analysis failed: {str(e)}"}
+                return
+            results[bill.id] = analysis
+            fresh.append((bill.id, hashes[bill.id], analysis))
+
+    pending = {bill.id: bill for bill in bills if bill.id not in results}
+    await asyncio.gather(*(_run(bill) for bill in pending.values()))
+    await run_in_threadpool(store.save_many, kind, model, fresh)
+    stats.computed = len(fresh)
+    stats.seconds = time.perf_counter() - started
+    return [results[bill.id] for bill in bills], stats
@@ -6,7 +6,7 @@ This package provides database models, configuration, and utilities for the Open
 
 from .models import (
     Base, Jurisdiction, Representative, Bill, BillSponsorship, Committee,
-    CommitteeMembership, Event, Vote, ScrapingRun, DataQualityIssue,
+    CommitteeMembership, Event, Vote, ScrapingRun, DataQualityIssue, BillAnalysis,
     JurisdictionType, RepresentativeRole, BillStatus, EventType, VoteResult,
     create_engine_from_config, create_all_tables, get_session_factory
 )
@@ -15,7 +15,7 @@ from .config import DatabaseConfig, get_database_config
 __all__ = [
     'Base', 'Jurisdiction', 'Representative', 'Bill', 'BillSponsorship', 
     'Committee', 'CommitteeMembership', 'Event', 'Vote', 'ScrapingRun', 
-    'DataQualityIssue', 'JurisdictionType', 'RepresentativeRole', 'BillStatus', 
+    'DataQualityIssue', 'BillAnalysis', 'JurisdictionType', 'RepresentativeRole', 'BillStatus', 
     'EventType', 'VoteResult', 'create_engine_from_config', 'create_all_tables', 
     'get_session_factory', 'DatabaseConfig', 'get_database_config'
 ]
\ No newline at end of file
@@ -85,6 +85,11 @@ class Jurisdiction(Base):
     scraping_runs = relationship("ScrapingRun", back_populates="jurisdiction")
     data_quality_issues = relationship("DataQualityIssue", back_populates="jurisdiction")
 
+    # Indexes
+    __table_args__ = (
+        Index('idx_jurisdiction_updated_at', 'updated_at'),
+    )
+
 
 class Representative(Base):
     """Representative model (MPs, MLAs, Councillors, etc.)"""
@@ -115,6 +120,7 @@ class Representative(Base):
         Index('idx_representative_jurisdiction', 'jurisdiction_id'),
         Index('idx_representative_party', 'party'),
         Index('idx_representative_riding', 'riding'),
+        Index('idx_representative_updated_at', 'updated_at'),
     )
 
 
@@ -146,6 +152,7 @@ class Bill(Base):
         Index('idx_bill_number', 'bill_number'),
         Index('idx_bill_status', 'status'),
         Index('idx_bill_introduced_date', 'introduced_date'),
+        Index('idx_bill_updated_at', 'updated_at'),
         UniqueConstraint('jurisdiction_id', 'bill_number', name='uq_bill_jurisdiction_number'),
     )
 
@@ -192,6 +199,7 @@ class Committee(Base):
     __table_args__ = (
         Index('idx_committee_jurisdiction', 'jurisdiction_id'),
         Index('idx_committee_name', 'name'),
+        Index('idx_committee_updated_at', 'updated_at'),
     )
 
 
@@ -251,6 +259,7 @@ class Event(Base):
         Index('idx_event_start_time', 'start_time'),
         Index('idx_event_bill', 'bill_id'),
         Index('idx_event_committee', 'committee_id'),
+        Index('idx_event_updated_at', 'updated_at'),
     )
 
 
@@ -278,6 +287,7 @@ class Vote(Base):
         Index('idx_vote_representative', 'representative_id'),
         Index('idx_vote_result', 'vote_result'),
         Index('idx_vote_time', 'vote_time'),
+        Index('idx_vote_created_at', 'created_at'),
     )
 
 
@@ -335,6 +345,28 @@ class DataQualityIssue(Base):
     )
 
 
+class BillAnalysis(Base):
+    """Stored AI analysis of a bill, keyed by a hash of the content it was generated from"""
+    __tablename__ = 'bill_analyses'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bill_id = Column(UUID(as_uuid=True), ForeignKey('bills.id'), nullable=False)
+    kind = Column(String(50), nullable=False)  # summary, criticality, stakeholders
+    content_hash = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    analysis = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    bill = relationship("Bill")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_bill_analysis_bill_kind', 'bill_id', 'kind', 'created_at'),
+        UniqueConstraint('bill_id', 'kind', 'content_hash', 'model', name='uq_bill_analysis_content'),
+    )
+
+
 # Database utility functions
 def create_engine_from_config(database_url: str):
     """Create database engine with optimal settings"""
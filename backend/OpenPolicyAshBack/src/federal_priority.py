@@ -14,9 +14,29 @@ import re
 
 from database import Bill, Jurisdiction, JurisdictionType, BillStatus
 from database import get_session_factory, get_database_config, create_engine_from_config
+from validation.rule_engine import compile_rules, length, one_of, pattern, required
 
 logger = logging.getLogger(__name__)
 
+FEDERAL_IDENTIFIER_RE = re.compile(r'^[CS]-\d+$')
+VALID_STATUSES = ['introduced', 'first_reading', 'second_reading',
+                  'committee', 'third_reading', 'senate', 'royal_assent',
+                  'passed', 'failed', 'withdrawn']
+_VALID_STATUS_SET = frozenset(VALID_STATUSES)
+CRITICAL_KEYWORDS = [
+    'budget', 'tax', 'healthcare', 'climate', 'environment',
+    'immigration', 'defence', 'security', 'election', 'charter'
+]
+# One pass over the text decides whether any keyword is present at all
+_CRITICAL_KEYWORDS_RE = re.compile('|'.join(map(re.escape, CRITICAL_KEYWORDS)))
+
+# Batch counterpart of the per-bill checks, used for the report's per-field failure counts
+FEDERAL_BILL_RULES = compile_rules({
+    'identifier': [required(), pattern(FEDERAL_IDENTIFIER_RE.pattern, name='federal_format')],
+    'title': [required(), length(10, 200, name='title_length')],
+    'status': [one_of(VALID_STATUSES, name='known_status')],
+})
+
 @dataclass
 class FederalBillCheck:
     """Represents a spot check result for a federal bill"""
@@ -39,6 +59,7 @@ class FederalMonitoringReport:
     failures: int
     checks: List[FederalBillCheck]
     recommendations: List[str]
+    field_failures: Dict[str, Dict[str, int]] = None
 
 class FederalBillsMonitor:
     """Enhanced monitoring for Federal Canadian bills"""
@@ -67,18 +88,17 @@ class FederalBillsMonitor:
         
         return bills
     
-    def check_bill_identifier_format(self, bill: Bill) -> FederalBillCheck:
+    def check_bill_identifier_format(self, bill: Bill, checked_at: Optional[datetime] = None) -> FederalBillCheck:
         """Validate federal bill identifier format (e.g., C-1, S-1)"""
-        federal_pattern = r'^[CS]-\d+$'
-        
-        if re.match(federal_pattern, bill.identifier):
+        checked_at = checked_at or datetime.now()
+        if FEDERAL_IDENTIFIER_RE.match(bill.identifier):
             return FederalBillCheck(
                 bill_id=bill.id,
                 bill_identifier=bill.identifier,
                 check_type="identifier_format",
                 status="pass",
                 message="Bill identifier follows correct federal format",
-                checked_at=datetime.now()
+                checked_at=checked_at
             )
         else:
             return FederalBillCheck(
@@ -87,12 +107,13 @@ class FederalBillsMonitor:
                 check_type="identifier_format",
                 status="fail",
                 message=f"Bill identifier '{bill.identifier}' does not match federal format (C-# or S-#)",
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 details={"expected_pattern": "C-# or S-# (e.g., C-1, S-15)"}
             )
     
-    def check_bill_title_quality(self, bill: Bill) -> FederalBillCheck:
+    def check_bill_title_quality(self, bill: Bill, checked_at: Optional[datetime] = None) -> FederalBillCheck:
         """Check if bill title meets quality standards"""
+        checked_at = checked_at or datetime.now()
         if not bill.title:
             return FederalBillCheck(
                 bill_id=bill.id,
@@ -100,7 +121,7 @@ class FederalBillsMonitor:
                 check_type="title_quality",
                 status="fail",
                 message="Bill title is missing",
-                checked_at=datetime.now()
+                checked_at=checked_at
             )
         
         title_length = len(bill.title)
@@ -112,7 +133,7 @@ class FederalBillsMonitor:
                 check_type="title_quality",
                 status="warning",
                 message=f"Bill title is very short ({title_length} characters)",
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 details={"title_length": title_length}
             )
         elif title_length > 200:
@@ -122,7 +143,7 @@ class FederalBillsMonitor:
                 check_type="title_quality",
                 status="warning",
                 message=f"Bill title is very long ({title_length} characters)",
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 details={"title_length": title_length}
             )
         else:
@@ -132,25 +153,22 @@ class FederalBillsMonitor:
                 check_type="title_quality",
                 status="pass",
                 message="Bill title length is appropriate",
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 details={"title_length": title_length}
             )
     
-    def check_bill_status_progression(self, bill: Bill) -> FederalBillCheck:
+    def check_bill_status_progression(self, bill: Bill, checked_at: Optional[datetime] = None) -> FederalBillCheck:
         """Validate bill status follows logical progression"""
-        valid_statuses = ['introduced', 'first_reading', 'second_reading', 
-                         'committee', 'third_reading', 'senate', 'royal_assent', 
-                         'passed', 'failed', 'withdrawn']
-        
-        if bill.status not in valid_statuses:
+        checked_at = checked_at or datetime.now()
+        if bill.status not in _VALID_STATUS_SET:
             return FederalBillCheck(
                 bill_id=bill.id,
                 bill_identifier=bill.identifier,
                 check_type="status_progression",
                 status="warning",
                 message=f"Unusual bill status: '{bill.status}'",
-                checked_at=datetime.now(),
-                details={"current_status": bill.status, "valid_statuses": valid_statuses}
+                checked_at=checked_at,
+                details={"current_status": bill.status, "valid_statuses": VALID_STATUSES}
             )
         
         return FederalBillCheck(
@@ -159,13 +177,14 @@ class FederalBillsMonitor:
             check_type="status_progression",
             status="pass",
             message="Bill status is valid",
-            checked_at=datetime.now(),
+            checked_at=checked_at,
             details={"current_status": bill.status}
         )
     
-    def check_data_freshness(self, bill: Bill) -> FederalBillCheck:
+    def check_data_freshness(self, bill: Bill, checked_at: Optional[datetime] = None) -> FederalBillCheck:
         """Check if bill data is recent enough"""
-        days_since_update = (datetime.now() - bill.updated_at).days
+        checked_at = checked_at or datetime.now()
+        days_since_update = (checked_at - bill.updated_at).days
         
         if days_since_update > 7:
             return FederalBillCheck(
@@ -174,7 +193,7 @@ class FederalBillsMonitor:
                 check_type="data_freshness",
                 status="warning",
                 message=f"Bill data is {days_since_update} days old",
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 details={"days_since_update": days_since_update}
             )
         
@@ -184,22 +203,20 @@ class FederalBillsMonitor:
             check_type="data_freshness",
             status="pass",
             message="Bill data is recent",
-            checked_at=datetime.now(),
+            checked_at=checked_at,
             details={"days_since_update": days_since_update}
         )
     
-    def check_critical_federal_bills(self, bill: Bill) -> FederalBillCheck:
+    def check_critical_federal_bills(self, bill: Bill, checked_at: Optional[datetime] = None) -> FederalBillCheck:
         """Identify potentially critical federal bills requiring special attention"""
-        critical_keywords = [
-            'budget', 'tax', 'healthcare', 'climate', 'environment',
-            'immigration', 'defence', 'security', 'election', 'charter'
-        ]
-        
+        checked_at = checked_at or datetime.now()
         title_lower = bill.title.lower() if bill.title else ""
         summary_lower = bill.summary.lower() if bill.summary else ""
         
-        found_keywords = [kw for kw in critical_keywords 
-                         if kw in title_lower or kw in summary_lower]
+        found_keywords = []
+        if _CRITICAL_KEYWORDS_RE.search(title_lower) or _CRITICAL_KEYWORDS_RE.search(summary_lower):
+            found_keywords = [kw for kw in CRITICAL_KEYWORDS
+                              if kw in title_lower or kw in summary_lower]
         
         if found_keywords:
             return FederalBillCheck(
@@ -208,7 +225,7 @@ class FederalBillsMonitor:
                 check_type="critical_bill_detection",
                 status="pass",
                 message=f"Critical federal bill detected (keywords: {', '.join(found_keywords)})",
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 details={"critical_keywords": found_keywords, "priority": "high"}
             )
         
@@ -218,7 +235,7 @@ class FederalBillsMonitor:
             check_type="critical_bill_detection",
             status="pass",
             message="Standard federal bill",
-            checked_at=datetime.now(),
+            checked_at=checked_at,
             details={"priority": "normal"}
         )
     
@@ -230,18 +247,25 @@ class FederalBillsMonitor:
             bills = self.get_federal_bills(db, days_back)
             
             all_checks = []
+            checked_at = datetime.now()
             
             for bill in bills:
                 # Run all checks on each bill
                 checks = [
-                    self.check_bill_identifier_format(bill),
-                    self.check_bill_title_quality(bill),
-                    self.check_bill_status_progression(bill),
-                    self.check_data_freshness(bill),
-                    self.check_critical_federal_bills(bill)
+                    self.check_bill_identifier_format(bill, checked_at),
+                    self.check_bill_title_quality(bill, checked_at),
+                    self.check_bill_status_progression(bill, checked_at),
+                    self.check_data_freshness(bill, checked_at),
+                    self.check_critical_federal_bills(bill, checked_at)
                 ]
                 all_checks.extend(checks)
             
+            batch = FEDERAL_BILL_RULES.validate_columns({
+                'identifier': [bill.identifier for bill in bills],
+                'title': [bill.title for bill in bills],
+                'status': [bill.status for bill in bills],
+            }, len(bills))
+            
             # Generate statistics
             total_checks = len(all_checks)
             passed = len([c for c in all_checks if c.status == 'pass'])
@@ -252,14 +276,15 @@ class FederalBillsMonitor:
             recommendations = self._generate_recommendations(all_checks)
             
             report = FederalMonitoringReport(
-                checked_at=datetime.now(),
+                checked_at=checked_at,
                 total_bills=len(bills),
                 checks_performed=total_checks,
                 passed_checks=passed,
                 warnings=warnings,
                 failures=failures,
                 checks=all_checks,
-                recommendations=recommendations
+                recommendations=recommendations,
+                field_failures=batch.field_failures
             )
             
             logger.info(f"Federal monitoring complete: {len(bills)} bills, "
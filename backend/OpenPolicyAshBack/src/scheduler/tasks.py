@@ -49,6 +49,10 @@ celery_app.conf.update(
             'task': 'scheduler.tasks.check_data_quality',
             'schedule': 60.0 * 60.0,  # Every hour
         },
+        'hourly-bill-analysis-refresh': {
+            'task': 'scheduler.tasks.refresh_bill_analyses',
+            'schedule': 60.0 * 60.0,  # Every hour
+        },
     },
 )
 
@@ -149,6 +153,19 @@ def run_test_scrapers(max_records: int = 5):
         test_mode=True
     )
 
+@celery_app.task
+def refresh_bill_analyses(days_back: int = 7, limit: int = 100):
+    """
+    Bring stored AI analyses of recently updated bills up to date; only bills
+    whose content changed since their last analysis reach the AI provider
+    """
+    import asyncio
+    from ai_services import ai_analyzer
+
+    stats = asyncio.run(ai_analyzer.refresh_analyses(days_back=days_back, limit=limit))
+    logger.info(f"Bill analysis refresh: {stats}")
+    return stats
+
 @celery_app.task
 def check_data_quality():
     """
@@ -0,0 +1,386 @@
+"""
+Adaptive Scraper Concurrency
+
+AIMD (additive increase, multiplicative decrease) concurrency limits shared by
+the scraper testing framework, the background executor and the scraper manager.
+A pool-wide limit reacts to latency, error rate, CPU and memory pressure, and
+each upstream host gets its own smaller limit so one slow site cannot soak up
+the pool or be hammered by sibling scrapers.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil is a hard dependency of the scraper tooling
+    psutil = None
+
+try:
+    from prometheus_client import Counter, Gauge
+except ImportError:
+    Counter = Gauge = None
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_HOST = "*"
+
+
+# The scraper tooling imports this module under each of these names; point them all at
+# the first copy loaded so the metrics below are registered with Prometheus only once.
+for _alias in ("src.scrapers.concurrency", "scrapers.concurrency", "backend.OpenPolicyAshBack.src.scrapers.concurrency"):
+    sys.modules.setdefault(_alias, sys.modules[__name__])
+
+
+if Gauge is not None:
+    CONCURRENCY_LIMIT = Gauge("scraper_concurrency_limit", "Current AIMD concurrency limit", ["pool", "host"])
+    CONCURRENCY_INFLIGHT = Gauge("scraper_concurrency_inflight", "Scraper tasks holding a slot", ["pool", "host"])
+    CONCURRENCY_DECISIONS = Counter(
+        "scraper_concurrency_decisions", "AIMD limit decisions", ["pool", "action", "reason"]
+    )
+else:
+    CONCURRENCY_LIMIT = CONCURRENCY_INFLIGHT = CONCURRENCY_DECISIONS = None
+
+
+@dataclass
+class AIMDConfig:
+    """Tuning for an adaptive pool; host limits share the step and decrease factor"""
+    min_limit: int = 1
+    max_limit: int = 20
+    initial_limit: int = 4
+    increase_step: float = 1.0
+    decrease_factor: float = 0.5
+    host_limit: int = 2
+    host_initial_limit: int = 1
+    window: int = 5                  # completed tasks per adjustment
+    latency_tolerance: float = 2.0   # back off when p90 exceeds tolerance x baseline
+    error_rate_threshold: float = 0.2
+    cpu_threshold: float = 85.0
+    memory_threshold: float = 85.0
+
+
+@dataclass
+class ConcurrencyDecision:
+    """One AIMD adjustment, kept for reports and exported as a metric"""
+    timestamp: str
+    pool: str
+    host: str
+    action: str          # increase, decrease or hold
+    reason: str
+    old_limit: float
+    new_limit: float
+    latency_p90: float
+    error_rate: float
+    cpu_percent: Optional[float] = None
+    memory_percent: Optional[float] = None
+
+
+@dataclass
+class TaskOutcome:
+    """Result of one task scheduled through AdaptiveConcurrencyController.map"""
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+    timed_out: bool = False
+
+
+class AIMDLimiter:
+    """A single AIMD limit fed with (latency, ok) samples"""
+
+    def __init__(self, min_limit: int, max_limit: int, initial_limit: int, config: AIMDConfig):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self.config = config
+        self.inflight = 0
+        self.baseline: Optional[float] = None
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._saturated = False
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def has_capacity(self) -> bool:
+        return self.inflight < self.capacity
+
+    def acquired(self):
+        self.inflight += 1
+        if self.inflight >= self.capacity:
+            self._saturated = True
+
+    def record(self, latency: float, ok: bool) -> bool:
+        """Add a sample; True once a full window is ready for adjust()"""
+        self._latencies.append(latency)
+        self._errors += not ok
+        return len(self._latencies) >= self.config.window
+
+    def adjust(self, pressure: Optional[str] = None) -> Tuple[str, str, float, float, float, float]:
+        """Apply AIMD to the current window; returns (action, reason, old, new, p90, error_rate)"""
+        latencies = sorted(self._latencies)
+        p90 = latencies[int(0.9 * (len(latencies) - 1))]
+        median = latencies[len(latencies) // 2]
+        error_rate = self._errors / len(latencies)
+        saturated = self._saturated
+        self._latencies, self._errors, self._saturated = [], 0, self.inflight >= self.capacity
+
+        old = self.limit
+        if error_rate > self.config.error_rate_threshold:
+            reason = "errors"
+        elif pressure:
+            reason = pressure
+        elif self.baseline and p90 > self.config.latency_tolerance * self.baseline:
+            reason = "latency"
+        else:
+            reason = None
+
+        # The baseline follows the fastest windows and drifts up slowly, so a
+        # permanently slower upstream stops being punished after a while.
+        if self.baseline is None or median < self.baseline:
+            self.baseline = median
+        else:
+            self.baseline += (median - self.baseline) * 0.1
+
+        if reason:
+            self.limit = max(float(self.min_limit), self.limit * self.config.decrease_factor)
+            action = "decrease"
+        elif not saturated:
+            action, reason = "hold", "underused"
+        elif self.limit >= self.max_limit:
+            action, reason = "hold", "at_max"
+        else:
+            self.limit = min(float(self.max_limit), self.limit + self.config.increase_step)
+            action, reason = "increase", "healthy"
+        return action, reason, old, self.limit, p90, error_rate
+
+
+def sample_system_resources() -> Tuple[Optional[float], Optional[float]]:
+    """Non-blocking CPU and memory percentages (CPU is measured since the previous call)"""
+    if psutil is None:
+        return None, None
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+
+_SOURCE_URL_RE = re.compile(r"""(?:COUNCIL_PAGE|csv_url|[A-Z_]*URL)\s*=\s*["'](https?://[^"']+)""")
+_ANY_URL_RE = re.compile(r"""["'](https?://[^"'\s]+)""")
+
+
+@lru_cache(maxsize=None)
+def _scraper_host(directory: str) -> str:
+    people_file = Path(directory) / "people.py"
+    try:
+        source = people_file.read_text(encoding="utf-8")
+    except OSError:
+        source = ""
+    match = _SOURCE_URL_RE.search(source) or _ANY_URL_RE.search(source)
+    if match:
+        host = urlparse(match.group(1)).netloc.lower()
+        return host[4:] if host.startswith("www.") else host
+    return Path(directory).name or directory
+
+
+def scraper_host(scraper_dir: Union[str, Path]) -> str:
+    """Upstream host a scraper directory talks to, falling back to the directory name"""
+    return _scraper_host(str(scraper_dir))
+
+
+class AdaptiveConcurrencyController:
+    """Pool-wide and per-host AIMD limits with a scheduler that respects both"""
+
+    POLL_INTERVAL = 0.5
+    MAX_DECISIONS = 500
+
+    def __init__(self, pool: str, config: Optional[AIMDConfig] = None,
+                 resource_sampler: Callable[[], Tuple[Optional[float], Optional[float]]] = sample_system_resources):
+        self.pool = pool
+        self.config = config or AIMDConfig()
+        self._sample_resources = resource_sampler
+        self._cond = threading.Condition()
+        self._global = AIMDLimiter(self.config.min_limit, self.config.max_limit, self.config.initial_limit, self.config)
+        self._hosts: Dict[str, AIMDLimiter] = {}
+        self.decisions: Deque[ConcurrencyDecision] = deque(maxlen=self.MAX_DECISIONS)
+        self._sample_resources()  # prime psutil's CPU counter so the first window reads a real value
+        self._export(GLOBAL_HOST, self._global)
+
+    @property
+    def limit(self) -> int:
+        return self._global.capacity
+
+    def host_limit(self, host: str) -> int:
+        with self._cond:
+            return self._host(host).capacity
+
+    def _host(self, host: str) -> AIMDLimiter:
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = AIMDLimiter(1, self.config.host_limit, self.config.host_initial_limit, self.config)
+            self._hosts[host] = limiter
+        return limiter
+
+    def _export(self, host: str, limiter: AIMDLimiter):
+        if CONCURRENCY_LIMIT is not None:
+            CONCURRENCY_LIMIT.labels(pool=self.pool, host=host).set(limiter.limit)
+            CONCURRENCY_INFLIGHT.labels(pool=self.pool, host=host).set(limiter.inflight)
+
+    def try_acquire(self, host: str) -> bool:
+        """Take a slot for host without blocking"""
+        with self._cond:
+            limiter = self._host(host)
+            if not (self._global.has_capacity() and limiter.has_capacity()):
+                return False
+            self._global.acquired()
+            limiter.acquired()
+            self._export(GLOBAL_HOST, self._global)
+            self._export(host, limiter)
+            return True
+
+    def acquire(self, host: str, timeout: Optional[float] = None) -> bool:
+        """Block until both the pool and host have room; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire(host):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            with self._cond:
+                self._cond.wait(self.POLL_INTERVAL if remaining is None else min(remaining, self.POLL_INTERVAL))
+        return True
+
+    def release(self, host: str, latency: Optional[float] = None, ok: bool = True):
+        """Free a slot; latency (seconds, cost-normalised) feeds the AIMD windows when given"""
+        with self._cond:
+            limiter = self._host(host)
+            self._global.inflight = max(0, self._global.inflight - 1)
+            limiter.inflight = max(0, limiter.inflight - 1)
+            if latency is not None:
+                self._observe(host, limiter, latency, ok)
+            self._export(GLOBAL_HOST, self._global)
+            self._export(host, limiter)
+            self._cond.notify_all()
+
+    def record_failure(self, host: str, latency: float):
+        """Count a failure (e.g. a timeout) for a task that still holds its slot"""
+        with self._cond:
+            self._observe(host, self._host(host), latency, False)
+
+    def _observe(self, host: str, limiter: AIMDLimiter, latency: float, ok: bool):
+        if limiter.record(latency, ok):
+            self._decide(host, limiter, *limiter.adjust())
+        if self._global.record(latency, ok):
+            cpu, memory = self._sample_resources()
+            pressure = None
+            if cpu is not None and cpu >= self.config.cpu_threshold:
+                pressure = "cpu"
+            elif memory is not None and memory >= self.config.memory_threshold:
+                pressure = "memory"
+            self._decide(GLOBAL_HOST, self._global, *self._global.adjust(pressure), cpu=cpu, memory=memory)
+
+    def _decide(self, host: str, limiter: AIMDLimiter, action: str, reason: str, old: float, new: float,
+                p90: float, error_rate: float, cpu: Optional[float] = None, memory: Optional[float] = None):
+        self.decisions.append(ConcurrencyDecision(
+            timestamp=datetime.utcnow().isoformat(), pool=self.pool, host=host, action=action, reason=reason,
+            old_limit=round(old, 2), new_limit=round(new, 2), latency_p90=round(p90, 3),
+            error_rate=round(error_rate, 3), cpu_percent=cpu, memory_percent=memory,
+        ))
+        if CONCURRENCY_DECISIONS is not None:
+            CONCURRENCY_DECISIONS.labels(pool=self.pool, action=action, reason=reason).inc()
+        if action != "hold":
+            logger.info(f"⚖️ {self.pool} [{host}] {action} limit {old:.1f} -> {new:.1f} ({reason})")
+
+    @contextmanager
+    def slot(self, host: str, cost: float = 1.0):
+        """Hold a slot for the duration of the block; exceptions count as errors"""
+        self.acquire(host)
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(host, (time.monotonic() - started) / cost, ok)
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any], host_of: Callable[[Any], str],
+            cost_of: Optional[Callable[[Any], float]] = None,
+            timeout_of: Optional[Callable[[Any], Optional[float]]] = None,
+            ok_of: Optional[Callable[[Any], bool]] = None) -> Iterator[TaskOutcome]:
+        """Run fn over items as slots free up, yielding outcomes in completion order.
+
+        Items whose host is at its limit wait while other hosts proceed. A task
+        that outlives timeout_of(item) is reported as timed out and counted as a
+        failure, but keeps its slot until its thread really finishes.
+        """
+        pending = deque(items)
+        running: Dict[Any, Tuple[Any, str, float, float, Optional[float]]] = {}
+        executor = ThreadPoolExecutor(max_workers=self.config.max_limit, thread_name_prefix=f"{self.pool}-worker")
+        try:
+            while pending or running:
+                for _ in range(len(pending)):
+                    item = pending.popleft()
+                    host = host_of(item)
+                    if not self.try_acquire(host):
+                        pending.append(item)
+                        continue
+                    cost = cost_of(item) if cost_of else 1.0
+                    timeout = timeout_of(item) if timeout_of else None
+                    started = time.monotonic()
+                    future = executor.submit(fn, item)
+                    running[future] = (item, host, cost, started, started + timeout if timeout else None)
+
+                if not running:
+                    # Every pending host is held by an abandoned (timed out) task
+                    with self._cond:
+                        self._cond.wait(self.POLL_INTERVAL)
+                    continue
+
+                now = time.monotonic()
+                wait_for = min([self.POLL_INTERVAL] + [max(0.0, deadline - now)
+                                                       for *_, deadline in running.values() if deadline])
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, host, cost, started, _ = running.pop(future)
+                    latency = time.monotonic() - started
+                    error = future.exception()
+                    result = None if error else future.result()
+                    ok = error is None and (ok_of is None or bool(ok_of(result)))
+                    self.release(host, latency / cost, ok)
+                    yield TaskOutcome(item=item, result=result, error=error, latency=latency)
+
+                now = time.monotonic()
+                for future, (item, host, cost, started, deadline) in list(running.items()):
+                    if deadline and now >= deadline and not future.done():
+                        del running[future]
+                        self.record_failure(host, (now - started) / cost)
+                        future.add_done_callback(lambda _f, h=host: self.release(h))
+                        yield TaskOutcome(item=item, error=TimeoutError(f"Timed out after {now - started:.0f}s"),
+                                          latency=now - started, timed_out=True)
+        finally:
+            # Stopped early (overall deadline, shutdown): let stragglers free their slots
+            for future, (_, host, *_rest) in running.items():
+                future.add_done_callback(lambda _f, h=host: self.release(h))
+            executor.shutdown(wait=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits and the most recent decisions, for reports and status endpoints"""
+        with self._cond:
+            return {
+                "pool": self.pool,
+                "limit": self._global.capacity,
+                "inflight": self._global.inflight,
+                "baseline_latency": self._global.baseline,
+                "hosts": {host: {"limit": limiter.capacity, "inflight": limiter.inflight}
+                          for host, limiter in self._hosts.items()},
+                "decisions": [asdict(decision) for decision in list(self.decisions)[-50:]],
+            }
@@ -24,6 +24,7 @@ from database import (
     Jurisdiction, Representative, ScrapingRun, DataQualityIssue,
     JurisdictionType, RepresentativeRole
 )
+from scrapers.concurrency import AdaptiveConcurrencyController, AIMDConfig, scraper_host
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -41,6 +42,7 @@ class ScraperManager:
         self.engine = create_engine_from_config(self.db_config.get_url())
         self.Session = get_session_factory(self.engine)
         self.scrapers_base_path = Path(scrapers_path)
+        self.concurrency = AdaptiveConcurrencyController("scraper_manager", AIMDConfig(max_limit=10))
         
     def load_regions_report(self) -> Dict[str, Any]:
         """Load the regions report from JSON file"""
@@ -310,14 +312,35 @@ class ScraperManager:
                 
                 logger.info(f"Found {len(jurisdiction_to_scraper)} jurisdiction-scraper mappings")
                 
-                # Run scrapers
+                # Run scrapers concurrently; the controller adapts the pool and per-host limits
+                tasks = []
                 for jurisdiction in jurisdictions:
                     if jurisdiction.id not in jurisdiction_to_scraper:
                         logger.warning(f"No scraper found for jurisdiction: {jurisdiction.name}")
                         continue
-                    
-                    scraper_dir = jurisdiction_to_scraper[jurisdiction.id]
-                    result = self.run_scraper(jurisdiction, scraper_dir, max_records_per_scraper, test_mode)
+                    tasks.append((jurisdiction, jurisdiction_to_scraper[jurisdiction.id]))
+                
+                outcomes = self.concurrency.map(
+                    lambda task: self.run_scraper(task[0], task[1], max_records_per_scraper, test_mode),
+                    tasks,
+                    host_of=lambda task: scraper_host(self.scrapers_base_path / task[1]),
+                    ok_of=lambda result: result['status'] == 'completed',
+                )
+                for outcome in outcomes:
+                    jurisdiction, scraper_dir = outcome.item
+                    result = outcome.result
+                    if outcome.error is not None:
+                        result = {
+                            'jurisdiction_id': str(jurisdiction.id),
+                            'jurisdiction_name': jurisdiction.name,
+                            'scraper_directory': scraper_dir,
+                            'status': 'failed',
+                            'error': f"Unexpected error: {str(outcome.error)}",
+                            'records_processed': 0,
+                            'records_created': 0,
+                            'records_updated': 0,
+                            'data_sample': []
+                        }
                     
                     results['jurisdiction_results'].append(result)
                     
@@ -342,6 +365,7 @@ class ScraperManager:
             results['errors'].append(f"Global error: {str(e)}")
         
         results['end_time'] = datetime.utcnow().isoformat()
+        results['concurrency'] = self.concurrency.snapshot()
         return results
     
     def _match_jurisdiction_to_scraper(self, jurisdiction: Jurisdiction, 
@@ -0,0 +1,9 @@
+"""
+Validation Package
+
+Compiled batch validation rules and the parliamentary data validator.
+
+Import the rule engine as ``validation.rule_engine`` (with ``src`` on the path),
+never as ``src.validation.rule_engine``: the two names would load separate module
+objects, each with its own compiled-rule cache and class identities.
+"""
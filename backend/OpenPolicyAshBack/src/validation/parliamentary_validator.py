@@ -10,9 +10,18 @@ from datetime import datetime, timedelta
 import logging
 
 from src.database.models import Bill, Representative, Jurisdiction
+from validation.rule_engine import compile_rules, length, one_of, pattern, required
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import instead of per bill
+_IDENTIFIER_RE = re.compile(r'^([CS])-(\d+)$')
+_GENERIC_TITLE_RES = [
+    re.compile(p, re.IGNORECASE)
+    for p in (r'^Bill\s+C-\d+$', r'^Bill\s+S-\d+$', r'^An Act$', r'^A Bill$')
+]
+_PARLIAMENTARY_LANGUAGE_RE = re.compile(r'An Act (to|respecting|concerning)', re.IGNORECASE)
+
 class ParliamentaryValidator:
     """
     Comprehensive validation system for Canadian parliamentary data
@@ -40,6 +49,7 @@ class ParliamentaryValidator:
         'Prorogued',
         'Died on Order Paper'
     ]
+    _VALID_STATUS_SET = frozenset(VALID_BILL_STATUSES)
     
     CRITICAL_BILL_KEYWORDS = [
         'budget', 'tax', 'taxation', 'fiscal', 'revenue',
@@ -54,6 +64,17 @@ class ParliamentaryValidator:
         'privacy', 'data protection', 'surveillance',
         'infrastructure', 'transportation', 'transit'
     ]
+    # Most bills match no keyword; one regex search rules that out before the per-keyword scan
+    _CRITICAL_KEYWORDS_RE = re.compile('|'.join(map(re.escape, CRITICAL_BILL_KEYWORDS)))
+
+    # Field-level rules checked across a whole batch in validate_bulk_bills
+    BILL_RULES = compile_rules({
+        'identifier': [required(), pattern(r'^\s*[CS]-\d+\s*$', re.IGNORECASE, name='format')],
+        'title': [required(), length(10, 300)],
+        'status': [required(), one_of(VALID_BILL_STATUSES, name='known_status')],
+        'summary': [required()],
+        'url': [required()],
+    })
     
     # Status progression rules (simplified - could be more complex)
     STATUS_PROGRESSION = {
@@ -66,7 +87,7 @@ class ParliamentaryValidator:
         'Consideration by House of Commons': ['Royal Assent', 'Defeated']
     }
     
-    def validate_federal_bill(self, bill: Bill) -> Dict:
+    def validate_federal_bill(self, bill: Bill, now: Optional[datetime] = None) -> Dict:
         """
         Comprehensive validation of federal bill data
         Returns detailed validation results with scores and recommendations
@@ -119,7 +140,7 @@ class ParliamentaryValidator:
             validation_result['is_critical'] = critical_check['is_critical']
             
             # 5. Data freshness check
-            freshness_check = self._check_data_freshness(bill)
+            freshness_check = self._check_data_freshness(bill, now)
             validation_result['detailed_checks']['freshness'] = freshness_check
             validation_result['quality_score'] += freshness_check['score'] - 100
             
@@ -140,7 +161,7 @@ class ParliamentaryValidator:
             # Final quality score bounds
             validation_result['quality_score'] = max(0, min(100, validation_result['quality_score']))
             
-            logger.info(f"Validated bill {bill.identifier}: score {validation_result['quality_score']}")
+            logger.debug("Validated bill %s: score %s", bill.identifier, validation_result['quality_score'])
             
         except Exception as e:
             logger.error(f"Error validating bill {bill.id}: {e}")
@@ -166,26 +187,19 @@ class ParliamentaryValidator:
         
         identifier = identifier.strip().upper()
         
-        # Check Commons bills (C-#)
-        commons_match = re.match(r'^C-(\d+)$', identifier)
-        if commons_match:
-            bill_number = int(commons_match.group(1))
+        # Commons (C-#) and Senate (S-#) bills
+        match = _IDENTIFIER_RE.match(identifier)
+        if match:
+            bill_number = int(match.group(2))
             result['valid'] = True
-            result['bill_type'] = 'commons'
             result['bill_number'] = bill_number
             result['is_government_bill'] = bill_number <= 200  # Government bills typically C-1 to C-200
-            result['message'] = f"Valid House of Commons bill: {identifier}"
-            return result
-        
-        # Check Senate bills (S-#)
-        senate_match = re.match(r'^S-(\d+)$', identifier)
-        if senate_match:
-            bill_number = int(senate_match.group(1))
-            result['valid'] = True
-            result['bill_type'] = 'senate'
-            result['bill_number'] = bill_number
-            result['is_government_bill'] = bill_number <= 200  # Government bills typically S-1 to S-200
-            result['message'] = f"Valid Senate bill: {identifier}"
+            if match.group(1) == 'C':
+                result['bill_type'] = 'commons'
+                result['message'] = f"Valid House of Commons bill: {identifier}"
+            else:
+                result['bill_type'] = 'senate'
+                result['message'] = f"Valid Senate bill: {identifier}"
             return result
         
         # If we get here, format is invalid
@@ -225,15 +239,8 @@ class ParliamentaryValidator:
             issues.append("Title should end with 'Act' or proper punctuation")
         
         # Avoid too generic titles
-        generic_patterns = [
-            r'^Bill\s+C-\d+$',
-            r'^Bill\s+S-\d+$',
-            r'^An Act$',
-            r'^A Bill$'
-        ]
-        
-        for pattern in generic_patterns:
-            if re.match(pattern, title, re.IGNORECASE):
+        for generic in _GENERIC_TITLE_RES:
+            if generic.match(title):
                 score -= 40
                 issues.append("Title is too generic")
                 break
@@ -245,7 +252,7 @@ class ParliamentaryValidator:
             issues.append("Title lacks sufficient detail")
         
         # Check for common bill title patterns
-        if re.search(r'An Act (to|respecting|concerning)', title, re.IGNORECASE):
+        if _PARLIAMENTARY_LANGUAGE_RE.search(title):
             score += 10  # Proper parliamentary language
         
         # Penalize ALL CAPS titles
@@ -281,7 +288,7 @@ class ParliamentaryValidator:
             result['message'] = "Bill status is missing"
             return result
         
-        if bill.status not in self.VALID_BILL_STATUSES:
+        if bill.status not in self._VALID_STATUS_SET:
             result['valid'] = False
             result['message'] = f"Invalid bill status: {bill.status}"
             return result
@@ -310,9 +317,8 @@ class ParliamentaryValidator:
         text_to_check = f"{bill.title or ''} {bill.summary or ''}".lower()
         
         matching_keywords = []
-        for keyword in self.CRITICAL_BILL_KEYWORDS:
-            if keyword in text_to_check:
-                matching_keywords.append(keyword)
+        if self._CRITICAL_KEYWORDS_RE.search(text_to_check):
+            matching_keywords = [k for k in self.CRITICAL_BILL_KEYWORDS if k in text_to_check]
         
         result['matching_keywords'] = matching_keywords
         
@@ -322,7 +328,7 @@ class ParliamentaryValidator:
         
         return result
     
-    def _check_data_freshness(self, bill: Bill) -> Dict:
+    def _check_data_freshness(self, bill: Bill, now: Optional[datetime] = None) -> Dict:
         """Check how fresh the bill data is (0-100 score)"""
         result = {
             'score': 50,  # Neutral score if no update time
@@ -335,7 +341,7 @@ class ParliamentaryValidator:
             result['message'] = "No update timestamp available"
             return result
         
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
         age = now - bill.updated_at
         age_hours = age.total_seconds() / 3600
         
@@ -450,11 +456,20 @@ class ParliamentaryValidator:
         
         return recommendations[:5]  # Limit to top 5 recommendations
 
-    def validate_bulk_bills(self, bills: List[Bill]) -> Dict:
-        """Validate multiple bills and return aggregate statistics"""
+    def validate_bulk_bills(self, bills: List[Bill], include_results: bool = True) -> Dict:
+        """Validate multiple bills and return aggregate statistics.
+
+        Per-field failure counts come from BILL_RULES over the columns of the whole
+        batch; ``include_results=False`` drops the per-bill result dicts for large runs.
+        """
+        batch = self.BILL_RULES.validate_columns(
+            {name: [getattr(bill, name, None) for bill in bills] for name in self.BILL_RULES.fields},
+            len(bills),
+        )
         results = {
             'total_bills': len(bills),
             'validation_results': [],
+            'field_failures': batch.field_failures,
             'summary': {
                 'passed': 0,
                 'warnings': 0,
@@ -467,10 +482,12 @@ class ParliamentaryValidator:
         }
         
         total_score = 0
+        now = datetime.utcnow()
         
         for bill in bills:
-            validation = self.validate_federal_bill(bill)
-            results['validation_results'].append(validation)
+            validation = self.validate_federal_bill(bill, now)
+            if include_results:
+                results['validation_results'].append(validation)
             
             # Update summary statistics
             if validation['passes']:
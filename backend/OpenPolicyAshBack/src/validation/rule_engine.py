@@ -0,0 +1,256 @@
+"""
+Compiled Batch Validation Rules
+Rule sets are compiled once into per-field check callables (precompiled regexes,
+frozen membership sets) and applied to columnar batches of records. Batches go
+through pandas/NumPy when available and large enough, with a pure-Python fallback;
+both return the same per-field failure counts.
+
+This module has no project imports so both the scraper pipeline and the API can use it.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    pd = None
+
+# Below this many rows the pure-Python path is faster than building Series
+VECTORIZE_MIN_ROWS = 2000
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single field rule; build with required(), pattern(), one_of(), length() or predicate()"""
+    kind: str
+    arg: Any = None
+    name: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.name or self.kind
+
+
+def required(name: Optional[str] = None) -> Rule:
+    """Value must be present and truthy (non-empty)"""
+    return Rule("required", None, name)
+
+
+def pattern(regex: str, flags: int = 0, name: Optional[str] = None) -> Rule:
+    """String value must match ``regex`` from its start (re.match semantics)"""
+    return Rule("pattern", re.compile(regex, flags), name)
+
+
+def one_of(values: Sequence[Any], name: Optional[str] = None) -> Rule:
+    return Rule("one_of", frozenset(values), name)
+
+
+def length(min_len: int = 0, max_len: Optional[int] = None, name: Optional[str] = None) -> Rule:
+    """String length within [min_len, max_len] after stripping whitespace"""
+    return Rule("length", (min_len, max_len), name)
+
+
+def predicate(fn: Callable[[Any], bool], name: str) -> Rule:
+    return Rule("predicate", fn, name)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of validating a batch: row validity plus failure counts per field and rule"""
+    total: int
+    valid: List[bool]
+    field_failures: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Row validity per field (only for fields with at least one failure)
+    field_valid: Dict[str, List[bool]] = field(default_factory=dict, repr=False)
+
+    @property
+    def valid_count(self) -> int:
+        return sum(self.valid)
+
+    @property
+    def invalid_indices(self) -> List[int]:
+        return [i for i, ok in enumerate(self.valid) if not ok]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "valid": self.valid_count,
+            "invalid": self.total - self.valid_count,
+            "field_failures": self.field_failures,
+        }
+
+
+# Scalar checks: value -> bool, compiled once per rule. Missing values (None or NaN,
+# as pandas' isna sees them) only fail "required"; the other rules apply to present values.
+def _missing(v: Any) -> bool:
+    return v is None or (isinstance(v, float) and v != v)
+
+
+def _member(v: Any, allowed) -> bool:
+    try:
+        return v in allowed
+    except TypeError:
+        # Unhashable values (lists, dicts) can't be in a frozenset
+        return False
+
+
+def _scalar_check(rule: Rule) -> Callable[[Any], bool]:
+    if rule.kind == "required":
+        return lambda v: not _missing(v) and bool(v)
+    if rule.kind == "pattern":
+        match = rule.arg.match
+        return lambda v: _missing(v) or (isinstance(v, str) and match(v) is not None)
+    if rule.kind == "one_of":
+        allowed = rule.arg
+        return lambda v: _missing(v) or _member(v, allowed)
+    if rule.kind == "length":
+        low, high = rule.arg
+        if high is None:
+            return lambda v: _missing(v) or (isinstance(v, str) and low <= len(v.strip()))
+        return lambda v: _missing(v) or (isinstance(v, str) and low <= len(v.strip()) <= high)
+    if rule.kind == "predicate":
+        fn = rule.arg
+        return lambda v: _missing(v) or bool(fn(v))
+    raise ValueError(f"Unknown rule kind: {rule.kind}")
+
+
+def _as_strings(series: "pd.Series") -> Optional["pd.Series"]:
+    """String-dtype copy of a column holding only strings (and None), else None.
+
+    The string dtype runs regex and length checks natively (pyarrow-backed when
+    installed) instead of calling back into Python per value.
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+        return None
+    return series.astype("string")
+
+
+def _vector_check(rule: Rule, series: "pd.Series", strings: Optional["pd.Series"]) -> "np.ndarray":
+    """Vectorized equivalent of _scalar_check over an object-dtype Series.
+
+    ``strings`` is the column as string dtype (see _as_strings) or None when the
+    column holds non-string values; those columns use the object-dtype accessors.
+    """
+    missing = series.isna().to_numpy()
+    if rule.kind == "required":
+        return ~missing & series.astype(bool).to_numpy()
+    if rule.kind == "one_of":
+        return missing | series.isin(rule.arg).to_numpy()
+    try:
+        if rule.kind == "pattern":
+            regex = rule.arg
+            if strings is not None:
+                matched = strings.str.match(regex.pattern, flags=regex.flags & ~re.UNICODE, na=False)
+            else:
+                matched = series.str.match(regex, na=False)
+            return missing | matched.to_numpy(dtype=bool, na_value=False)
+        if rule.kind == "length":
+            low, high = rule.arg
+            column = strings if strings is not None else series
+            lengths = column.str.strip().str.len().to_numpy(dtype=float, na_value=np.nan)  # NaN for non-strings
+            ok = lengths >= low
+            if high is not None:
+                ok &= lengths <= high
+            return missing | ok
+    except AttributeError:
+        pass  # no string values at all: .str is unavailable
+    return series.map(_scalar_check(rule)).to_numpy(dtype=bool)
+
+
+class CompiledRuleSet:
+    """Rules for a record type, compiled for repeated single-record and batch validation"""
+
+    def __init__(self, rules: Mapping[str, Sequence[Rule]]):
+        self.rules = {name: list(field_rules) for name, field_rules in rules.items()}
+        self.fields = list(self.rules)
+        self._checks: List[Tuple[str, Rule, Callable[[Any], bool]]] = [
+            (name, rule, _scalar_check(rule)) for name, field_rules in self.rules.items() for rule in field_rules
+        ]
+
+    def is_valid(self, record: Mapping[str, Any]) -> bool:
+        """Single-record check, stopping at the first failure"""
+        get = record.get
+        for name, _, check in self._checks:
+            if not check(get(name)):
+                return False
+        return True
+
+    def failures(self, record: Mapping[str, Any]) -> List[Tuple[str, str]]:
+        """(field, rule) pairs the record fails"""
+        get = record.get
+        return [(name, rule.label) for name, rule, check in self._checks if not check(get(name))]
+
+    def validate_records(self, records: Sequence[Mapping[str, Any]], vectorized: Optional[bool] = None) -> BatchResult:
+        """Validate row-oriented records (transposed into columns once)"""
+        columns = {name: [record.get(name) for record in records] for name in self.fields}
+        return self.validate_columns(columns, len(records), vectorized)
+
+    def validate_columns(self,
+                         columns: Mapping[str, Sequence[Any]],
+                         size: Optional[int] = None,
+                         vectorized: Optional[bool] = None) -> BatchResult:
+        """Validate a columnar batch; missing columns are treated as all-None.
+
+        ``vectorized`` forces (True) or disables (False) the pandas path; by default it
+        is used when pandas is installed and the batch has at least VECTORIZE_MIN_ROWS rows.
+        """
+        if size is None:
+            size = max((len(column) for column in columns.values()), default=0)
+        if vectorized is None:
+            vectorized = pd is not None and size >= VECTORIZE_MIN_ROWS
+        if vectorized and pd is None:
+            raise RuntimeError("pandas is required for vectorized validation")
+        if vectorized:
+            return self._validate_vectorized(columns, size)
+        return self._validate_python(columns, size)
+
+    def _validate_python(self, columns: Mapping[str, Sequence[Any]], size: int) -> BatchResult:
+        field_valid: Dict[str, List[bool]] = {}
+        failures: Dict[str, Dict[str, int]] = {}
+        for name, rule, check in self._checks:
+            column = columns.get(name)
+            ok = list(map(check, column)) if column is not None else [check(None)] * size
+            failed = ok.count(False)
+            if not failed:
+                continue
+            failures.setdefault(name, {})[rule.label] = failed
+            previous = field_valid.get(name)
+            field_valid[name] = ok if previous is None else [a and b for a, b in zip(previous, ok)]
+        valid = [True] * size
+        for ok in field_valid.values():
+            valid = [a and b for a, b in zip(valid, ok)]
+        return BatchResult(total=size, valid=valid, field_failures=failures, field_valid=field_valid)
+
+    def _validate_vectorized(self, columns: Mapping[str, Sequence[Any]], size: int) -> BatchResult:
+        valid = np.ones(size, dtype=bool)
+        field_valid: Dict[str, "np.ndarray"] = {}
+        failures: Dict[str, Dict[str, int]] = {}
+        series_cache: Dict[str, Tuple["pd.Series", Optional["pd.Series"]]] = {}
+        for name, rule, _ in self._checks:
+            if name not in series_cache:
+                column = columns.get(name)
+                series = pd.Series([None] * size if column is None else column, dtype=object)
+                needs_strings = any(r.kind in ("pattern", "length") for r in self.rules[name])
+                series_cache[name] = (series, _as_strings(series) if needs_strings else None)
+            series, strings = series_cache[name]
+            ok = _vector_check(rule, series, strings)
+            failed = int(size - np.count_nonzero(ok))
+            if not failed:
+                continue
+            failures.setdefault(name, {})[rule.label] = failed
+            field_valid[name] = ok if name not in field_valid else field_valid[name] & ok
+            valid &= ok
+        return BatchResult(
+            total=size,
+            valid=valid.tolist(),
+            field_failures=failures,
+            field_valid={name: ok.tolist() for name, ok in field_valid.items()},
+        )
+
+
+def compile_rules(rules: Mapping[str, Sequence[Rule]]) -> CompiledRuleSet:
+    return CompiledRuleSet(rules)
@@ -67,11 +67,25 @@ class Settings(BaseSettings):
     # Optional directories to locate scraper artifacts (defaults to current working directory)
     scraper_reports_dir: str = ""
     scraper_logs_dir: str = ""
+    # Embedded time-series store written by monitoring_system.py and read by the dashboard
+    metrics_store_dir: str = os.getenv("METRICS_STORE_DIR", "timeseries")
+
+    # Health snapshots (refreshed in the background; ?fresh=1 is limited to one probe per interval)
+    health_database_interval: int = 30
+    health_system_interval: int = 15
+    health_scrapers_interval: int = 60
+    health_probe_timeout: int = 10
+    health_fresh_min_interval: int = 5
     
     # File upload
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     upload_dir: str = "uploads"
-    
+
+    # Data export (completed streaming exports are spooled here for resumable downloads)
+    export_dir: str = "exports"
+    export_spool_ttl_hours: int = 24
+    export_parquet_batch_rows: int = 50000
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": False
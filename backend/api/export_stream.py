@@ -0,0 +1,541 @@
+"""
+Streaming Table Export
+Streams tables out of Postgres with COPY ... TO STDOUT (or a server-side cursor for Parquet),
+optionally compressed, and spools completed exports so interrupted downloads can resume
+with HTTP byte ranges.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import psycopg
+from psycopg import sql
+
+from .config import settings
+
+logger = logging.getLogger("openpolicy.api.export")
+
+EXPORTABLE_TABLES = (
+    'core_politician', 'bills_bill', 'hansards_statement',
+    'bills_membervote', 'core_organization', 'core_membership'
+)
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# compression -> (media type, file suffix)
+EXPORT_COMPRESSIONS = {
+    "none": (None, ""),
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+}
+
+COPY_CHUNK_BYTES = 256 * 1024
+
+
+class ExportError(ValueError):
+    """Raised for invalid export requests (unknown table, column, format, ...)"""
+
+
+@dataclass
+class ExportSpec:
+    table_name: str
+    format: str = "csv"
+    compression: str = "none"
+    columns: List[str] = field(default_factory=list)
+    date_column: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    def validate(self) -> None:
+        if self.table_name not in EXPORTABLE_TABLES:
+            raise ExportError("Invalid table name")
+        if self.format not in EXPORT_FORMATS:
+            raise ExportError(f"Unsupported format: {self.format}")
+        if self.compression not in EXPORT_COMPRESSIONS:
+            raise ExportError(f"Unsupported compression: {self.compression}")
+        if (self.date_from or self.date_to) and not self.date_column:
+            raise ExportError("date_column is required with date_from/date_to")
+        # Fail before streaming starts if an optional dependency is missing
+        if self.format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise ExportError("Parquet export requires pyarrow")
+        if self.compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+            raise ExportError("zstd compression requires the zstandard package")
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_COMPRESSIONS[self.compression][0] or EXPORT_FORMATS[self.format][0]
+
+    @property
+    def extension(self) -> str:
+        return EXPORT_FORMATS[self.format][1] + EXPORT_COMPRESSIONS[self.compression][1]
+
+    def filename(self, etag: str) -> str:
+        return f"{self.table_name}-{etag}.{self.extension}"
+
+    def etag(self, table_version: str) -> str:
+        """Identify this export's exact bytes: request parameters plus the exported rows' version"""
+        key = json.dumps({
+            "table": self.table_name, "format": self.format, "compression": self.compression,
+            "columns": self.columns, "date_column": self.date_column,
+            "date_from": str(self.date_from or ""), "date_to": str(self.date_to or ""),
+            "version": table_version,
+        }, sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def conninfo_from_url(url: str) -> str:
+    """Turn a SQLAlchemy-style URL (``postgresql+psycopg://``) into a libpq URL"""
+    scheme, sep, rest = url.partition("://")
+    return f"{scheme.split('+', 1)[0]}{sep}{rest}"
+
+
+async def connect() -> psycopg.AsyncConnection:
+    return await psycopg.AsyncConnection.connect(
+        conninfo_from_url(settings.resolved_app_database_url), autocommit=False
+    )
+
+
+async def describe_table(conn: psycopg.AsyncConnection, table_name: str) -> Tuple[List[str], List[str]]:
+    """Return (columns, primary key columns) for ``table_name``"""
+    async with conn.cursor() as cur:
+        await cur.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = %s ORDER BY ordinal_position",
+            (table_name,),
+        )
+        columns = [row[0] for row in await cur.fetchall()]
+        await cur.execute(
+            "SELECT a.attname FROM pg_index i "
+            "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+            "WHERE i.indrelid = %s::regclass AND i.indisprimary",
+            (table_name,),
+        )
+        primary_key = [row[0] for row in await cur.fetchall()]
+    return columns, primary_key
+
+
+async def content_version(conn: psycopg.AsyncConnection, spec: ExportSpec) -> str:
+    """Version of the rows ``spec`` exports: their count and newest ``xmin``.
+
+    Every insert or update writes a row version with a newer transaction ID and every
+    delete lowers the count, so unlike the (approximate, asynchronously updated)
+    statistics collector counters this changes whenever the exported rows do. It
+    costs one scan of the selected rows, far less than producing the export again.
+    """
+    query = sql.SQL("SELECT count(*), max(xmin::text::bigint) FROM {}").format(sql.Identifier(spec.table_name))
+    where, params = _where(spec)
+    if where is not None:
+        query = query + where
+    async with conn.cursor() as cur:
+        await cur.execute(query, params or None)
+        count, newest = await cur.fetchone()
+    return f"{count}:{newest or 0}"
+
+
+def _where(spec: ExportSpec) -> Tuple[Optional[sql.Composed], Dict]:
+    """The date filter as a `` WHERE ...`` clause (or None) and its parameters"""
+    params: Dict = {}
+    conditions = []
+    if spec.date_from:
+        conditions.append(sql.SQL("{} >= %(date_from)s").format(sql.Identifier(spec.date_column)))
+        params["date_from"] = spec.date_from
+    if spec.date_to:
+        # date_to is inclusive of the whole day
+        conditions.append(sql.SQL("{} < %(date_to)s::date + 1").format(sql.Identifier(spec.date_column)))
+        params["date_to"] = spec.date_to
+    if not conditions:
+        return None, params
+    return sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions), params
+
+
+def build_select(spec: ExportSpec, table_columns: List[str], primary_key: List[str]) -> Tuple[sql.Composed, Dict]:
+    """Build the column-projected, date-filtered, deterministically ordered SELECT"""
+    unknown = [c for c in spec.columns + ([spec.date_column] if spec.date_column else []) if c not in table_columns]
+    if unknown:
+        raise ExportError(f"Unknown columns for {spec.table_name}: {', '.join(unknown)}")
+    columns = spec.columns or table_columns
+    query = sql.SQL("SELECT {cols} FROM {table}").format(
+        cols=sql.SQL(", ").join(sql.Identifier(c) for c in columns),
+        table=sql.Identifier(spec.table_name),
+    )
+    where, params = _where(spec)
+    if where is not None:
+        query = query + where
+    # Stable ordering keeps the byte stream reproducible for resumed downloads
+    order = primary_key or columns[:1]
+    query = query + sql.SQL(" ORDER BY ") + sql.SQL(", ").join(sql.Identifier(c) for c in order)
+    return query, params
+
+
+def build_copy(spec: ExportSpec, select: sql.Composed) -> sql.Composed:
+    if spec.format == "csv":
+        return sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true)").format(select)
+    # One JSON object per line. CSV mode with control-character quote/delimiter stops
+    # COPY from escaping backslashes inside the JSON text.
+    return sql.SQL(
+        "COPY (SELECT row_to_json(t) FROM ({}) t) TO STDOUT "
+        "WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')"
+    ).format(select)
+
+
+async def iter_copy(conn: psycopg.AsyncConnection, statement: sql.Composed, params: Dict) -> AsyncIterator[bytes]:
+    """Yield COPY output in roughly ``COPY_CHUNK_BYTES`` chunks"""
+    buffer = bytearray()
+    async with conn.cursor() as cur:
+        async with cur.copy(statement, params or None) as copy:
+            async for data in copy:
+                buffer += data
+                if len(buffer) >= COPY_CHUNK_BYTES:
+                    yield bytes(buffer)
+                    buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back out in chunks.
+
+    ``tell`` reports the absolute position so Parquet footers carry correct offsets
+    even though earlier bytes have already been drained.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(pa, type_name: str):
+    return {
+        "int2": pa.int16(), "int4": pa.int32(), "int8": pa.int64(),
+        "float4": pa.float32(), "float8": pa.float64(), "bool": pa.bool_(),
+        "date": pa.date32(), "timestamp": pa.timestamp("us"),
+        "timestamptz": pa.timestamp("us", tz="UTC"),
+    }.get(type_name, pa.string())
+
+
+def _to_arrow_value(value, arrow_type, pa):
+    if value is None or not pa.types.is_string(arrow_type) or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+async def iter_parquet(
+    conn: psycopg.AsyncConnection,
+    select: sql.Composed,
+    params: Dict,
+    batch_rows: int,
+) -> AsyncIterator[bytes]:
+    """Yield a Parquet file written one row group per ``batch_rows`` rows from a server-side cursor"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportError("Parquet export requires pyarrow") from e
+
+    sink = _ChunkSink()
+    writer = None
+    schema = None
+    async with conn.cursor(name="export_parquet") as cur:
+        await cur.execute(select, params or None)
+        while True:
+            rows = await cur.fetchmany(batch_rows)
+            if schema is None:
+                types = conn.adapters.types
+                schema = pa.schema([
+                    (col.name, _arrow_type(pa, getattr(types.get(col.type_code), "name", "text")))
+                    for col in cur.description
+                ])
+                writer = pq.ParquetWriter(sink, schema)
+            if not rows:
+                break
+            arrays = [
+                pa.array([_to_arrow_value(v, fld.type, pa) for v in values], type=fld.type)
+                for fld, values in zip(schema, zip(*rows))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+class _Compressor:
+    """Deterministic incremental compressor (gzip header carries no mtime)"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        if kind == "gzip":
+            self._obj = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif kind == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ExportError("zstd compression requires the zstandard package") from e
+            self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            self._obj = None
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) if self._obj else data
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if self._obj else b""
+
+
+async def iter_export(conn: psycopg.AsyncConnection, spec: ExportSpec, select: sql.Composed, params: Dict) -> AsyncIterator[bytes]:
+    """Yield the (compressed) export body"""
+    compressor = _Compressor(spec.compression)
+    if spec.format == "parquet":
+        source = iter_parquet(conn, select, params, settings.export_parquet_batch_rows)
+    else:
+        source = iter_copy(conn, build_copy(spec, select), params)
+    async for chunk in source:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    tail = compressor.flush()
+    if tail:
+        yield tail
+
+
+@dataclass
+class _SpoolJob:
+    path: str
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+    done: bool = False
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+
+
+class ExportStreamError(RuntimeError):
+    """Raised into a live export stream when its producer failed, so the response is
+    aborted instead of ending as if complete"""
+
+
+# etag -> job currently writing its spool file
+_active_jobs: Dict[str, _SpoolJob] = {}
+
+
+def spool_path(spec: ExportSpec, etag: str) -> str:
+    return os.path.join(settings.export_dir, spec.filename(etag))
+
+
+def _prune_spool(directory: str) -> None:
+    cutoff = time.time() - settings.export_spool_ttl_hours * 3600
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff and not name.endswith(".part"):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _write_chunk(f, data: bytes) -> None:
+    f.write(data)
+    f.flush()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def _produce(job: _SpoolJob, etag: str, conn: psycopg.AsyncConnection, spec: ExportSpec,
+                   select: sql.Composed, params: Dict) -> None:
+    """Write the export to ``<path>.part`` and rename it into place when complete.
+
+    Runs independently of any client so an interrupted download still leaves a
+    complete spool file to resume from. File I/O runs in worker threads.
+    """
+    part = job.path + ".part"
+    try:
+        f = await asyncio.to_thread(open, part, "wb")
+        try:
+            async for chunk in iter_export(conn, spec, select, params):
+                await asyncio.to_thread(_write_chunk, f, chunk)
+                async with job.changed:
+                    job.changed.notify_all()
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, part, job.path)
+        await asyncio.to_thread(_prune_spool, os.path.dirname(job.path))
+    except Exception as e:
+        logger.error("Export of %s failed: %s", spec.table_name, e)
+        job.error = str(e) or type(e).__name__
+        await asyncio.to_thread(_remove, part)
+    finally:
+        await conn.close()
+        job.done = True
+        async with job.changed:
+            job.changed.notify_all()
+        _active_jobs.pop(etag, None)
+
+
+def _read_chunk(path: str, offset: int, size: int) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+    except FileNotFoundError:
+        return b""
+
+
+async def _follow_spool(job: _SpoolJob) -> AsyncIterator[bytes]:
+    """Stream the spool file as it is being written, from the start.
+
+    Raises ExportStreamError if the producer fails, so the client sees an aborted
+    (incomplete) response rather than a short one that looks complete.
+    """
+    part = job.path + ".part"
+    offset = 0
+    while True:
+        async with job.changed:
+            if not job.done:
+                await job.changed.wait_for(lambda: job.done or _spooled_size(part) > offset)
+        if job.done and job.error is not None:
+            raise ExportStreamError(f"Export failed after {offset} bytes: {job.error}")
+        path = job.path if job.done else part
+        data = await asyncio.to_thread(_read_chunk, path, offset, COPY_CHUNK_BYTES)
+        if data:
+            offset += len(data)
+            yield data
+        elif job.done:
+            return
+
+
+def _spooled_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _job_finished(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Export producer crashed", exc_info=task.exception())
+
+
+async def start_export(spec: ExportSpec) -> Tuple[str, str, Optional[AsyncIterator[bytes]]]:
+    """Resolve an export to ``(etag, spool path, live stream)``.
+
+    The live stream is ``None`` when a complete spool file for the same etag already
+    exists and can be served (or range-sliced) straight from disk.
+    """
+    spec.validate()
+    conn = await connect()
+    try:
+        table_columns, primary_key = await describe_table(conn, spec.table_name)
+        if not table_columns:
+            raise ExportError(f"Table not found: {spec.table_name}")
+        select, params = build_select(spec, table_columns, primary_key)
+        version = await content_version(conn, spec)
+        await conn.rollback()
+    except BaseException:
+        await conn.close()
+        raise
+    etag = spec.etag(version)
+    path = spool_path(spec, etag)
+    if await asyncio.to_thread(os.path.exists, path):
+        await conn.close()
+        return etag, path, None
+    job = _active_jobs.get(etag)
+    if job is None:
+        await asyncio.to_thread(os.makedirs, settings.export_dir, exist_ok=True)
+        job = _active_jobs[etag] = _SpoolJob(path=path)
+        # The job holds the task so it isn't garbage-collected mid-export
+        job.task = asyncio.create_task(_produce(job, etag, conn, spec, select, params))
+        job.task.add_done_callback(_job_finished)
+    else:
+        await conn.close()
+    return etag, path, _follow_spool(job)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range against ``size``; returns inclusive (start, end).
+
+    Raises ``ValueError`` for unsatisfiable ranges; returns ``None`` when absent or
+    not a single byte range (the full body is served).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[6:].strip().partition("-")
+    try:
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+        else:
+            start, end = max(size - int(end_s), 0), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+async def iter_file_range(path: str, start: int, end: int, chunk_size: int = COPY_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = await asyncio.to_thread(f.read, min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+async def export_to_file(spec: ExportSpec, path: str) -> int:
+    """Write an export straight to ``path``; returns bytes written"""
+    spec.validate()
+    conn = await connect()
+    written = 0
+    try:
+        table_columns, primary_key = await describe_table(conn, spec.table_name)
+        select, params = build_select(spec, table_columns, primary_key)
+        f = await asyncio.to_thread(open, path, "wb")
+        try:
+            async for chunk in iter_export(conn, spec, select, params):
+                await asyncio.to_thread(f.write, chunk)
+                written += len(chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+    finally:
+        await conn.close()
+    return written
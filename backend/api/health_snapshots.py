@@ -0,0 +1,148 @@
+"""
+Health Snapshot Collector
+Refreshes each health dimension in the background on its own interval so health
+endpoints serve the latest snapshot instead of probing the database per request.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("openpolicy.api.health")
+
+
+@dataclass
+class Snapshot:
+    data: Dict[str, Any]
+    collected_at: float  # wall clock (time.time())
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.collected_at)
+
+
+@dataclass
+class _Probe:
+    name: str
+    collect: Callable[[], Dict[str, Any]]
+    interval: float
+    timeout: float
+    fallback: Callable[[str], Dict[str, Any]]
+
+
+class HealthSnapshotCollector:
+    """Background collector holding the latest snapshot per health dimension.
+
+    Probes run on a dedicated thread pool with a timeout, never on the event loop, and
+    at most one probe per dimension is in flight: a hung database probe yields a
+    timeout snapshot instead of piling up threads or stalling other endpoints.
+    """
+
+    def __init__(self, fresh_min_interval: float = 5.0):
+        self.fresh_min_interval = fresh_min_interval
+        self._probes: Dict[str, _Probe] = {}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._started: Dict[str, float] = {}
+        self._last_fresh: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(
+        self,
+        name: str,
+        collect: Callable[[], Dict[str, Any]],
+        interval: float,
+        timeout: float,
+        fallback: Callable[[str], Dict[str, Any]],
+    ) -> None:
+        self._probes[name] = _Probe(name, collect, interval, timeout, fallback)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, len(self._probes)), thread_name_prefix="health-probe"
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        for probe in self._probes.values():
+            self._tasks.append(asyncio.create_task(self._run(probe), name=f"health-{probe.name}"))
+        logger.info("Health snapshot collector started: %s", ", ".join(self._probes))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, probe: _Probe) -> None:
+        while True:
+            try:
+                await self.refresh(probe.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Health probe %s failed: %s", probe.name, e)
+            await asyncio.sleep(probe.interval)
+
+    async def refresh(self, name: str) -> Snapshot:
+        """Run (or join the in-flight run of) a probe and store its snapshot"""
+        probe = self._probes[name]
+        future = self._inflight.get(name)
+        if future is None or future.done():
+            future = self._inflight[name] = self._pool().submit(probe.collect)
+            self._started[name] = time.time()
+        started = self._started[name]
+        try:
+            data = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), probe.timeout)
+            snapshot = Snapshot(data=data, collected_at=time.time(), duration=time.time() - started)
+        except asyncio.TimeoutError:
+            error = f"{name} probe timed out after {probe.timeout:.0f}s"
+            snapshot = Snapshot(data=probe.fallback(error), collected_at=time.time(),
+                                duration=time.time() - started, error=error)
+        except Exception as e:
+            snapshot = Snapshot(data=probe.fallback(str(e)), collected_at=time.time(),
+                                duration=time.time() - started, error=str(e))
+        self._snapshots[name] = snapshot
+        return snapshot
+
+    async def get(self, name: str, fresh: bool = False) -> Snapshot:
+        """Latest snapshot for ``name``.
+
+        ``fresh`` forces a probe run unless one was forced within ``fresh_min_interval``
+        seconds, which keeps ``?fresh=1`` from turning into per-request DB load. A
+        dimension that has never been collected is probed on demand.
+        """
+        snapshot = self._snapshots.get(name)
+        if fresh:
+            now = time.monotonic()
+            if now - self._last_fresh.get(name, float("-inf")) >= self.fresh_min_interval:
+                self._last_fresh[name] = now
+                return await self.refresh(name)
+        if snapshot is None:
+            return await self.refresh(name)
+        return snapshot
+
+    async def get_many(self, names: List[str], fresh: bool = False) -> Dict[str, Snapshot]:
+        snapshots = await asyncio.gather(*(self.get(n, fresh) for n in names))
+        return dict(zip(names, snapshots))
+
+
+def snapshot_timestamp(snapshot: Snapshot) -> str:
+    return datetime.fromtimestamp(snapshot.collected_at).isoformat()
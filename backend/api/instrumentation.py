@@ -0,0 +1,105 @@
+"""
+Request Instrumentation
+Prometheus histograms per route template, in-flight gauges and per-request
+database query count/time collected from SQLAlchemy cursor events
+"""
+
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+UNMATCHED_ROUTE = "<unmatched>"
+OTHER_METHOD = "OTHER"
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+# The API package is importable as both ``api`` and ``backend.api``; point both names at the
+# first copy loaded so the metrics below are registered with Prometheus only once.
+for _alias in ("api.instrumentation", "backend.api.instrumentation"):
+    sys.modules.setdefault(_alias, sys.modules[__name__])
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served", ["method"])
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries executed per HTTP request",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Database time spent per HTTP request",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+
+
+@dataclass
+class RequestDBStats:
+    """Mutable per-request counters; shared with threadpool workers through the context"""
+    queries: int = 0
+    seconds: float = 0.0
+
+
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def begin_request_stats() -> RequestDBStats:
+    """Start collecting database stats for the current request context"""
+    stats = RequestDBStats()
+    _request_db_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestDBStats]:
+    return _request_db_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_times")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def install_db_instrumentation():
+    """Listen on every Engine (the API creates engines per session factory); idempotent"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_template(scope) -> str:
+    """Route path template (``/api/v1/policies/{policy_id}``) matched for this request"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+def method_label(method: str) -> str:
+    """Request method as a metric label; arbitrary client-sent methods share one series"""
+    return method if method in HTTP_METHODS else OTHER_METHOD
+
+
+def observe_request(method: str, route: str, status: int, elapsed: float, stats: Optional[RequestDBStats]):
+    REQUEST_LATENCY.labels(method=method, route=route, status=str(status)).observe(elapsed)
+    if stats is not None:
+        REQUEST_DB_QUERIES.labels(method=method, route=route).observe(stats.queries)
+        REQUEST_DB_SECONDS.labels(method=method, route=route).observe(stats.seconds)
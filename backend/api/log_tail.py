@@ -0,0 +1,154 @@
+"""
+Log Tailing Helpers
+Reads scraper logs from the end (or from a byte-offset cursor) without loading whole files
+"""
+
+import asyncio
+import json
+import os
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_MAX_READ_BYTES = 1024 * 1024
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def tail_lines(
+    path: str,
+    limit: int,
+    predicate: Optional[Callable[[str], bool]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Tuple[List[str], int]:
+    """Return the last ``limit`` non-empty lines of ``path`` (oldest first) and the file size.
+
+    The file is read backwards in ``block_size`` chunks, so the cost is proportional to
+    the amount of tail needed rather than the size of the file. When ``predicate`` is
+    given only matching lines are counted. The returned size is a cursor that can be
+    passed to :func:`read_from_offset` to fetch lines appended later.
+    """
+    found: List[str] = []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if limit <= 0:
+            return found, end
+        pos = end
+        remainder = b""
+        while pos > 0 and len(found) < limit:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + remainder
+            parts = chunk.split(b"\n")
+            # The first piece may be a partial line unless we reached the start of the file
+            remainder = parts.pop(0) if pos > 0 else b""
+            for raw in reversed(parts):
+                line = _decode(raw)
+                if not line.strip():
+                    continue
+                if predicate is None or predicate(line):
+                    found.append(line)
+                    if len(found) >= limit:
+                        break
+    found.reverse()
+    return found, end
+
+
+def read_from_offset(
+    path: str,
+    offset: int,
+    max_bytes: int = DEFAULT_MAX_READ_BYTES,
+    limit: Optional[int] = None,
+    predicate: Optional[Callable[[str], bool]] = None,
+) -> Tuple[List[str], int]:
+    """Return complete lines appended after byte ``offset`` and the next cursor.
+
+    At most ``limit`` lines (matching ``predicate``, if given) are returned, and the
+    cursor points just past the last line consumed, so nothing is skipped by the next
+    call. A trailing line without a newline is left for the next call so writers caught
+    mid-line are never returned truncated, unless it alone exceeds ``max_bytes``; then
+    it is returned in ``max_bytes`` pieces so the cursor keeps moving. If the file
+    shrank below ``offset`` (rotation/truncation) reading restarts from the beginning.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if offset < 0 or offset > size:
+            offset = 0
+        f.seek(offset)
+        data = f.read(min(max_bytes, size - offset))
+    if b"\n" not in data:
+        if data and len(data) >= max_bytes:
+            line = _decode(data)
+            keep = line.strip() and (predicate is None or predicate(line))
+            return ([line] if keep and limit != 0 else []), offset + len(data)
+        return [], offset
+    found: List[str] = []
+    pos = 0
+    while limit is None or len(found) < limit:
+        cut = data.find(b"\n", pos)
+        if cut < 0:
+            break
+        line = _decode(data[pos:cut])
+        pos = cut + 1
+        if line.strip() and (predicate is None or predicate(line)):
+            found.append(line)
+    return found, offset + pos
+
+
+def resolve_log_file(logs_dir: str, name: str) -> Optional[str]:
+    """Resolve ``name`` to a ``.log`` file directly inside ``logs_dir`` (no traversal)"""
+    if not name or os.path.basename(name) != name or not name.endswith(".log"):
+        return None
+    path = os.path.join(logs_dir, name)
+    return path if os.path.isfile(path) else None
+
+
+def format_sse(data: dict, event_id: Optional[int] = None, event: Optional[str] = None) -> str:
+    """Serialize a Server-Sent Events message"""
+    parts = []
+    if event_id is not None:
+        parts.append(f"id: {event_id}")
+    if event:
+        parts.append(f"event: {event}")
+    parts.append(f"data: {json.dumps(data)}")
+    return "\n".join(parts) + "\n\n"
+
+
+async def follow(
+    path: str,
+    offset: int,
+    poll_interval: float = 1.0,
+    heartbeat_interval: float = 15.0,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncIterator[str]:
+    """Yield SSE messages for lines appended to ``path`` after ``offset``.
+
+    Only the last line of each batch carries an ``id`` (the byte cursor after the
+    batch), so a reconnecting ``EventSource`` resumes via ``Last-Event-ID`` without
+    skipping lines. Comment heartbeats keep idle proxies from closing the connection.
+    """
+    name = os.path.basename(path)
+    idle = 0.0
+    while True:
+        if is_disconnected is not None and await is_disconnected():
+            return
+        try:
+            lines, offset = await asyncio.to_thread(read_from_offset, path, offset)
+        except FileNotFoundError:
+            yield format_sse({"file": name, "error": "log file removed"}, event="error")
+            return
+        if lines:
+            idle = 0.0
+            last = len(lines) - 1
+            for i, line in enumerate(lines):
+                yield format_sse({"file": name, "line": line}, event_id=offset if i == last else None)
+            continue
+        idle += poll_interval
+        if idle >= heartbeat_interval:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(poll_interval)
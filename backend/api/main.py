@@ -102,10 +102,13 @@ async def lifespan(app: FastAPI):
         if settings.environment.lower() == "production":
             raise
         logger.warning("Central config validation: %s", e)
+    # Background health snapshots
+    await health.collector.start()
     
     yield
     
     # Shutdown
+    await health.collector.stop()
     logger.info("🛑 Shutting down Open Policy Platform API…")
 
 def create_app() -> FastAPI:
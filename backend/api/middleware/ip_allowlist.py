@@ -1,27 +1,83 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from ipaddress import ip_network, ip_address
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 from backend.config.central import get_service_config
 from backend.api.config import settings
 
-class IPAllowlistMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, service_name: str = "api"):
-        super().__init__(app)
+
+class NetworkSet:
+    """Membership test for a set of CIDR networks.
+
+    Networks are bucketed by (IP version, prefix length) as integer network addresses,
+    so a lookup costs one mask-and-hash per distinct prefix length instead of a scan
+    over every configured network. Either ``0.0.0.0/0`` or ``::/0`` allows every
+    client; otherwise hosts that aren't IP addresses (unix sockets, test clients)
+    are not members.
+    """
+
+    def __init__(self, cidrs: List[str]):
+        self.buckets: Dict[Tuple[int, int], Set[int]] = {}
+        for cidr in cidrs:
+            net = ip_network(cidr, strict=False)
+            self.buckets.setdefault((net.version, net.prefixlen), set()).add(int(net.network_address))
+        self.allow_all = (4, 0) in self.buckets or (6, 0) in self.buckets
+        self._lookups = {
+            version: [
+                (self._mask(version, prefixlen), nets)
+                for (v, prefixlen), nets in sorted(self.buckets.items(), key=lambda kv: -kv[0][1])
+                if v == version
+            ]
+            for version in (4, 6)
+        }
+
+    @staticmethod
+    def _mask(version: int, prefixlen: int) -> int:
+        bits = 32 if version == 4 else 128
+        return ((1 << prefixlen) - 1) << (bits - prefixlen)
+
+    def __contains__(self, address: str) -> bool:
+        if self.allow_all:
+            return True
+        try:
+            ip = ip_address(address)
+        except ValueError:
+            # Not an IP address, so it can't be in a specific network
+            return False
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        value = int(ip)
+        return any(value & mask in nets for mask, nets in self._lookups[ip.version])
+
+
+class IPAllowlistMiddleware:
+    """Pure ASGI middleware rejecting clients outside the service's allowed networks"""
+
+    FORBIDDEN_BODY = b"Forbidden by IP allowlist"
+
+    def __init__(self, app: ASGIApp, service_name: str = "api"):
+        self.app = app
         self.service_name = service_name
         svc = get_service_config(service_name)
         self.allowed_cidrs: List[str] = list(svc.get("allowed_ips") or [])
         # If no allowlist configured, default allow all
-        if not self.allowed_cidrs:
-            self.allowed_networks = [ip_network("0.0.0.0/0")]
-        else:
-            self.allowed_networks = [ip_network(c) for c in self.allowed_cidrs]
-
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host if request.client else None
-        if client_ip:
-            ip = ip_address(client_ip)
-            if not any(ip in net for net in self.allowed_networks):
-                return PlainTextResponse("Forbidden by IP allowlist", status_code=403)
-        return await call_next(request)
\ No newline at end of file
+        self.allowed_networks = NetworkSet(self.allowed_cidrs or ["0.0.0.0/0", "::/0"])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.allowed_networks.allow_all:
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        client_host: Optional[str] = client[0] if client else None
+        # Clients without an IP address (or any address) can't be matched, so are refused
+        if client_host is None or client_host not in self.allowed_networks:
+            await send({
+                "type": "http.response.start",
+                "status": 403,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(self.FORBIDDEN_BODY)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": self.FORBIDDEN_BODY})
+            return
+        await self.app(scope, receive, send)
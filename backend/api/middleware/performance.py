@@ -1,70 +1,65 @@
 """
 Performance Middleware
-Provides caching and performance optimizations
+Records request timing without buffering response bodies
 """
 
-import hashlib
-import json
 import time
-from typing import Optional, AsyncIterator
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, StreamingResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
+from ..instrumentation import (
+    REQUESTS_IN_FLIGHT, begin_request_stats, install_db_instrumentation, method_label, observe_request,
+    route_template,
+)
+
 logger = logging.getLogger(__name__)
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, cache_ttl: int = 60, rate_limit_per_minute: int = 60):
-        super().__init__(app)
+class PerformanceMiddleware:
+    """Pure ASGI middleware reporting request processing time.
+
+    The time to the response start is sent as ``X-Process-Time``; the full request
+    time (including streamed bodies) is logged once the response completes and
+    recorded in Prometheus by route template, together with the request's database
+    query count and time. Bodies pass straight through, so streaming and Server-Sent
+    Event responses are unaffected.
+    """
+
+    def __init__(self, app: ASGIApp, cache_ttl: int = 60, rate_limit_per_minute: int = 60):
+        self.app = app
+        # Kept for configuration compatibility; responses are no longer buffered for caching
         self.cache_ttl = cache_ttl
-        self.cache = {}
-        self.timestamps = {}
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        cache_key = self._generate_cache_key(request)
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"Request processed in {process_time:.3f}s: {request.method} {request.url}")
-        await self._cache_response(cache_key, response)
-        return response
-    
-    def _generate_cache_key(self, request: Request) -> str:
-        key_data = f"{request.method}:{request.url}:{request.headers.get('authorization','')}"
-        return hashlib.md5(key_data.encode()).hexdigest()
-    
-    async def _cache_response(self, cache_key: str, response: Response):
-        """Cache response for future use"""
+        install_db_instrumentation()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start_time = time.perf_counter()
+        method = scope["method"]
+        stats = begin_request_stats()
+        status_code = 500
+        in_flight = REQUESTS_IN_FLIGHT.labels(method=method_label(method))
+        in_flight.inc()
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - start_time
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-process-time", f"{elapsed:.6f}".encode())
+                ]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Request processed in %.3fs: %s %s",
+                        time.perf_counter() - start_time, method, scope["path"],
+                    )
+            await send(message)
+
         try:
-            content_bytes: Optional[bytes] = None
-            if hasattr(response, "body_iterator") and isinstance(response, StreamingResponse):
-                # Buffer the iterator into bytes safely
-                body = b""
-                chunks = []
-                async for chunk in response.body_iterator:  # type: ignore[attr-defined]
-                    if isinstance(chunk, bytes):
-                        chunks.append(chunk)
-                    else:
-                        chunks.append(chunk.encode())
-                body = b"".join(chunks)
-                content_bytes = body
-                # Reset the iterator with an async generator
-                async def _aiter() -> AsyncIterator[bytes]:
-                    yield content_bytes  # type: ignore[misc]
-                response.body_iterator = _aiter()  # type: ignore[attr-defined]
-            elif hasattr(response, "body"):
-                # FastAPI Response has .body attribute, not awaitable
-                content_bytes = getattr(response, "body", None)
-                if content_bytes is None and hasattr(response, "render"):
-                    content_bytes = await response.render()
-            if content_bytes is None:
-                return
-            self.cache[cache_key] = {
-                "timestamp": time.time(),
-                "content": content_bytes,
-                "headers": dict(response.headers),
-                "status_code": response.status_code,
-            }
-        except Exception as e:
-            logger.debug(f"Skip caching due to error: {e}")
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            in_flight.dec()
+            observe_request(method_label(method), route_template(scope), status_code,
+                            time.perf_counter() - start_time, stats)
@@ -3,10 +3,12 @@ Security Middleware
 Provides authentication, authorization, and security headers for the API
 """
 
-from fastapi import Request, Response, HTTPException, Depends
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from collections import deque
 from typing import Optional, Dict, Any
+import codecs
 import jwt
 import hashlib
 import secrets
@@ -24,26 +26,38 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 security = HTTPBearer()
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, secret_key: str = SECRET_KEY):
-        super().__init__(app)
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"content-security-policy", b"default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+]
+
+class SecurityMiddleware:
+    """Pure ASGI middleware adding security headers to every HTTP response"""
+
+    blacklisted_tokens: set = set()
+
+    def __init__(self, app: ASGIApp, secret_key: str = SECRET_KEY):
+        self.app = app
         self.secret_key = secret_key
-        self.blacklisted_tokens: set = set()
-        
-    async def dispatch(self, request: Request, call_next):
-        # Add security headers
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        return response
+        self._header_names = {name for name, _ in SECURITY_HEADERS}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = [h for h in message.get("headers", []) if h[0].lower() not in self._header_names]
+                message["headers"] = headers + SECURITY_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -106,82 +120,150 @@ def require_admin(user: Dict[str, Any] = Depends(get_current_user)):
         )
     return user
 
-class InputValidationMiddleware(BaseHTTPMiddleware):
-    """Middleware for input validation and sanitization"""
-    
-    def __init__(self, app):
-        super().__init__(app)
-        self.suspicious_patterns = [
-            r"<script[^>]*>.*?</script>",  # XSS
-            r"javascript:",  # JavaScript injection
-            r"on\w+\s*=",  # Event handlers
-            r"union\s+select",  # SQL injection
-            r"drop\s+table",  # SQL injection
-            r"delete\s+from",  # SQL injection
-            r"exec\s*\(",  # Command injection
-            r"system\s*\(",  # Command injection
-        ]
-    
-    async def dispatch(self, request: Request, call_next):
-        # Validate and sanitize input
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                if body:
-                    body_str = body.decode("utf-8")
-                    if await self._contains_suspicious_content(body_str):
-                        logger.warning(f"Suspicious content detected in request from {request.client.host}")
-                        return Response(
-                            content='{"error": "Invalid input detected"}',
-                            status_code=400,
-                            media_type="application/json"
-                        )
-            except Exception as e:
-                logger.error(f"Error processing request body: {e}")
-        
-        response = await call_next(request)
-        return response
-    
+def _client_host(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+async def _send_json_error(send: Send, status_code: int, body: bytes):
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class InputValidationMiddleware:
+    """Pure ASGI middleware for input validation.
+
+    Request bodies are scanned chunk by chunk as they arrive with a single compiled
+    alternation of the suspicious patterns. Each chunk is scanned together with the
+    tail of the previous one so matches spanning a chunk boundary are still found.
+    Text bodies (JSON, form-urlencoded, ``text/*``, or no content type) larger than
+    ``max_scan_bytes`` are rejected with 413 rather than forwarded partly unscanned;
+    other bodies, such as file uploads, are scanned up to that size and the rest is
+    streamed through.
+    """
+
+    SUSPICIOUS_PATTERNS = [
+        r"<script[^>]*>.*?</script>",  # XSS
+        r"javascript:",  # JavaScript injection
+        r"on\w+\s*=",  # Event handlers
+        r"union\s+select",  # SQL injection
+        r"drop\s+table",  # SQL injection
+        r"delete\s+from",  # SQL injection
+        r"exec\s*\(",  # Command injection
+        r"system\s*\(",  # Command injection
+    ]
+    SCANNED_METHODS = frozenset({"POST", "PUT", "PATCH"})
+    TEXT_CONTENT_TYPES = frozenset({b"application/json", b"application/x-www-form-urlencoded"})
+    INVALID_INPUT_BODY = b'{"error": "Invalid input detected"}'
+    TOO_LARGE_BODY = b'{"error": "Request body too large"}'
+
+    def __init__(self, app: ASGIApp, max_scan_bytes: int = 1024 * 1024, overlap_chars: int = 8192):
+        self.app = app
+        self.max_scan_bytes = max_scan_bytes
+        self.overlap_chars = overlap_chars
+        self.suspicious_patterns = list(self.SUSPICIOUS_PATTERNS)
+        # Case-sensitive alternation over lowercased text lets the regex engine use its
+        # first-character prefilter, which IGNORECASE disables
+        self.suspicious_regex = re.compile("|".join(f"(?:{p})" for p in self.suspicious_patterns))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in self.SCANNED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        is_text = self._is_text_content(headers.get(b"content-type"))
+        content_length = headers.get(b"content-length", b"")
+        if is_text and content_length.isdigit() and int(content_length) > self.max_scan_bytes:
+            await _send_json_error(send, 413, self.TOO_LARGE_BODY)
+            return
+
+        buffered: list = []
+        scanned = 0
+        tail = ""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                buffered.append(message)
+                if message["type"] != "http.request":
+                    break
+                more_body = message.get("more_body", False)
+                chunk = message.get("body", b"")
+                scanned += len(chunk)
+                if scanned > self.max_scan_bytes:
+                    if is_text:
+                        await _send_json_error(send, 413, self.TOO_LARGE_BODY)
+                        return
+                    break
+                if not chunk:
+                    continue
+                try:
+                    text = decoder.decode(chunk, final=not more_body).lower()
+                except UnicodeDecodeError:
+                    # Non-text bodies (uploads) are not scanned; stream the rest through
+                    break
+                window = tail + text
+                if self.suspicious_regex.search(window):
+                    logger.warning("Suspicious content detected in request from %s", _client_host(scope))
+                    await _send_json_error(send, 400, self.INVALID_INPUT_BODY)
+                    return
+                tail = window[-self.overlap_chars:]
+        except Exception as e:
+            logger.error(f"Error processing request body: {e}")
+
+        async def replay_receive() -> Message:
+            if buffered:
+                return buffered.pop(0)
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    @classmethod
+    def _is_text_content(cls, content_type: Optional[bytes]) -> bool:
+        """Whether a body of this content type is text that must be scanned in full"""
+        if not content_type:
+            return True
+        media_type = content_type.split(b";", 1)[0].strip().lower()
+        return (media_type in cls.TEXT_CONTENT_TYPES or media_type.startswith(b"text/")
+                or media_type.endswith(b"+json"))
+
     async def _contains_suspicious_content(self, content: str) -> bool:
         """Check if content contains suspicious patterns"""
-        content_lower = content.lower()
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                return True
-        return False
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Enhanced rate limiting middleware"""
+        return self.suspicious_regex.search(content.lower()) is not None
+
+class RateLimitMiddleware:
+    """Pure ASGI sliding-window rate limiting per client IP"""
     
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
+    RATE_LIMITED_BODY = b'{"error": "Rate limit exceeded"}'
+
+    def __init__(self, app: ASGIApp, requests_per_minute: int = 60):
+        self.app = app
         self.requests_per_minute = requests_per_minute
-        self.request_counts: Dict[str, list] = {}
+        self.request_counts: Dict[str, deque] = {}
     
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host if request.client else "unknown"
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        client_ip = _client_host(scope)
         
-        # Clean old requests
+        # Drop requests that left the one-minute window
         now = time.time()
-        if client_ip in self.request_counts:
-            self.request_counts[client_ip] = [
-                req_time for req_time in self.request_counts[client_ip]
-                if now - req_time < 60
-            ]
+        window = self.request_counts.get(client_ip)
+        if window is None:
+            window = self.request_counts[client_ip] = deque()
+        while window and now - window[0] >= 60:
+            window.popleft()
         
         # Check rate limit
-        if client_ip in self.request_counts and len(self.request_counts[client_ip]) >= self.requests_per_minute:
-            logger.warning(f"Rate limit exceeded for {client_ip}")
-            return Response(
-                content='{"error": "Rate limit exceeded"}',
-                status_code=429,
-                media_type="application/json"
-            )
-        
-        # Add current request
-        if client_ip not in self.request_counts:
-            self.request_counts[client_ip] = []
-        self.request_counts[client_ip].append(now)
+        if len(window) >= self.requests_per_minute:
+            logger.warning("Rate limit exceeded for %s", client_ip)
+            await _send_json_error(send, 429, self.RATE_LIMITED_BODY)
+            return
         
-        response = await call_next(request)
-        return response
+        window.append(now)
+        await self.app(scope, receive, send)
@@ -0,0 +1,106 @@
+"""
+Sampling Profiler
+Samples every thread's Python stack from a background thread and aggregates the
+samples as collapsed stacks (``frame;frame;frame count``), the input format of
+flamegraph.pl, speedscope and similar tools
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+DEFAULT_INTERVAL = 0.01  # 100 Hz keeps overhead to a few percent of one core
+
+# Leaf frames of threads that are parked rather than doing work
+IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Low-overhead statistical profiler for the live worker process.
+
+    Only one profile runs at a time; the sampler thread never includes itself.
+    """
+
+    _active_lock = threading.Lock()
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if not SamplingProfiler._active_lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            SamplingProfiler._active_lock.release()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _sample_once(self, own_ident: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self._sample_once(own_ident)
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.perf_counter()  # fell behind; don't burst to catch up
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, heaviest first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Tuple[int, int]:
+        return self.samples, sum(self.stacks.values())
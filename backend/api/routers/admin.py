@@ -3,10 +3,12 @@ Enhanced Admin Router
 Provides comprehensive administrative functionality for system management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 import subprocess
+import asyncio
 import json
 import os
 import psutil
@@ -17,6 +19,7 @@ from pathlib import Path
 
 from ..dependencies import get_db, require_admin
 from ..config import settings
+from ..profiler import ProfilerBusy, SamplingProfiler
 from . import health as health_router
 from . import scraper_admin as scraper_admin_router
 from . import dashboard as dashboard_router
@@ -571,6 +574,30 @@ async def get_admin_audit(limit: int = 100, offset: int = 0, current_user = Depe
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading audit log: {e}")
 
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(10.0, ge=1, le=100),
+    include_idle: bool = False,
+    current_user = Depends(require_admin)
+):
+    """Sample this worker's stacks for ``seconds`` and return flamegraph-compatible collapsed stacks"""
+    profiler = SamplingProfiler(interval=interval_ms / 1000.0, include_idle=include_idle)
+    try:
+        profiler.start()
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    samples, stacks = profiler.summary()
+    logger.info("Profiled worker %s for %.1fs: %d samples, %d stacks", os.getpid(), seconds, samples, stacks)
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"X-Profile-Samples": str(samples), "X-Profile-Pid": str(os.getpid())},
+    )
+
 async def restart_system_services(restart_request: SystemRestartRequest):
     """Background task to restart system services"""
     try:
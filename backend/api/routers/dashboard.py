@@ -3,16 +3,28 @@ Dashboard API Endpoints
 Provides comprehensive dashboard functionality for the OpenPolicy platform
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any, List
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Any, List, Optional
 import psutil
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel
 
+from ..config import settings
+from ..timeseries import AGGREGATES, TimeSeriesStore, now_ms
+
 router = APIRouter(prefix="/api/v1/dashboard", tags=["dashboard"])
 
+_metrics_store: Optional[TimeSeriesStore] = None
+
+def get_metrics_store() -> TimeSeriesStore:
+    """Shared reader for the monitoring time-series store"""
+    global _metrics_store
+    if _metrics_store is None or _metrics_store.root != settings.metrics_store_dir:
+        _metrics_store = TimeSeriesStore(settings.metrics_store_dir)
+    return _metrics_store
+
 # Data models
 class DashboardOverview(BaseModel):
     system_status: str
@@ -480,3 +492,38 @@ async def get_performance_metrics():
         return performance
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting performance metrics: {str(e)}")
+
+@router.get("/trends/metrics")
+async def list_trend_metrics():
+    """List metrics recorded by the monitoring system"""
+    store = get_metrics_store()
+    return {"metrics": store.metrics()}
+
+@router.get("/trends")
+async def get_metric_trend(
+    metric: str,
+    hours: float = Query(24, gt=0, le=24 * 366 * 5),
+    resolution: Optional[str] = Query(None, pattern="^(raw|1m|1h|1d)$"),
+    agg: str = Query("avg", pattern=f"^({'|'.join(AGGREGATES)})$"),
+    max_points: int = Query(500, ge=1, le=5000),
+):
+    """Get a metric's trend and summary over the last ``hours`` from the time-series store"""
+    try:
+        store = get_metrics_store()
+        if metric not in store.metrics():
+            raise HTTPException(status_code=404, detail=f"Unknown metric: {metric}")
+        end = now_ms()
+        start = end - int(hours * 3600 * 1000)
+        used, points = store.query(metric, start, end, resolution=resolution, agg=agg, max_points=max_points)
+        return {
+            "metric": metric,
+            "resolution": used,
+            "aggregate": agg,
+            "points": [{"timestamp": datetime.fromtimestamp(ts / 1000, timezone.utc).isoformat(), "value": v} for ts, v in points],
+            "summary": store.aggregate(metric, start, end),
+            "latest": store.latest(metric),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting metric trend: {str(e)}")
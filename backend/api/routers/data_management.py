@@ -3,15 +3,22 @@ Data Management API Endpoints
 Provides comprehensive data management, analysis, and export functionality
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 import subprocess
 import json
 import csv
 import io
-from datetime import datetime, timedelta
+import os
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 
+from ..export_stream import (
+    EXPORTABLE_TABLES, ExportError, ExportSpec, export_to_file, iter_file_range,
+    parse_range, start_export,
+)
+
 router = APIRouter(prefix="/api/v1/data", tags=["data-management"])
 
 # Data models
@@ -23,7 +30,12 @@ class TableInfo(BaseModel):
 
 class DataExportRequest(BaseModel):
     table_name: str
-    format: str = "json"  # json, csv, sql
+    format: str = "json"  # json, jsonl, csv, parquet, sql
+    compression: str = "none"  # none, gzip, zstd
+    columns: Optional[List[str]] = None
+    date_column: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
     limit: Optional[int] = None
     filters: Optional[Dict[str, Any]] = None
 
@@ -128,12 +140,7 @@ async def export_data(request: DataExportRequest, background_tasks: BackgroundTa
     """Export data from a specific table"""
     try:
         # Validate table name
-        valid_tables = [
-            'core_politician', 'bills_bill', 'hansards_statement',
-            'bills_membervote', 'core_organization', 'core_membership'
-        ]
-        
-        if request.table_name not in valid_tables:
+        if request.table_name not in EXPORTABLE_TABLES:
             raise HTTPException(status_code=400, detail="Invalid table name")
         
         # Add export task to background
@@ -148,6 +155,66 @@ async def export_data(request: DataExportRequest, background_tasks: BackgroundTa
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error initiating export: {str(e)}")
 
+@router.get("/export/{table_name}/stream")
+async def stream_export(
+    request: Request,
+    table_name: str,
+    format: str = Query("csv", pattern="^(csv|jsonl|parquet)$"),
+    compression: str = Query("none", pattern="^(none|gzip|zstd)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated column list"),
+    date_column: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """Stream a table export straight from Postgres.
+
+    Rows are produced with ``COPY ... TO STDOUT`` (Parquet uses row-group batches from a
+    server-side cursor) and sent as a chunked response. Each export is also spooled to
+    disk under its ``ETag``; a ``Range`` request for a completed export is served from
+    the spool so interrupted downloads can resume.
+    """
+    spec = ExportSpec(
+        table_name=table_name,
+        format=format,
+        compression=compression,
+        columns=[c.strip() for c in columns.split(",") if c.strip()] if columns else [],
+        date_column=date_column,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    try:
+        etag, path, live = await start_export(spec)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error starting export: {str(e)}")
+
+    headers = {
+        "ETag": f'"{etag}"',
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{os.path.basename(path)}"',
+    }
+    if live is not None:
+        # Still being produced: ranges can only be honoured once the spool is complete
+        return StreamingResponse(live, media_type=spec.media_type, headers=headers)
+
+    size = os.path.getsize(path)
+    if_range = request.headers.get("if-range")
+    range_header = request.headers.get("range") if if_range in (None, f'"{etag}"') else None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_file_range(path, 0, size - 1), media_type=spec.media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(iter_file_range(path, start, end), status_code=206,
+                             media_type=spec.media_type, headers=headers)
+
 @router.get("/analysis/politicians")
 async def analyze_politicians():
     """Analyze politician data"""
@@ -373,30 +440,32 @@ async def get_database_size():
 
 async def export_data_background(request: DataExportRequest):
     """Background task to export data"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         export_file = f"export_{request.table_name}_{timestamp}"
         
-        if request.format == "csv":
-            export_file += ".csv"
-            cmd = [
-                "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-                "-c", f"\\COPY {request.table_name} TO '{export_file}' CSV HEADER;"
-            ]
-        elif request.format == "json":
-            export_file += ".json"
-            cmd = [
-                "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-                "-c", f"\\COPY (SELECT row_to_json(t) FROM {request.table_name} t) TO '{export_file}';"
-            ]
-        else:  # sql
+        if request.format == "sql":
             export_file += ".sql"
             cmd = [
                 "pg_dump", "-h", "localhost", "-U", "ashishtandon", 
                 "-t", request.table_name, "openpolicy", "-f", export_file
             ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            return_code, output, error = result.returncode, result.stdout, result.stderr
+        else:
+            # csv / json(l) / parquet stream through COPY without shelling out to psql
+            spec = ExportSpec(
+                table_name=request.table_name,
+                format="jsonl" if request.format == "json" else request.format,
+                compression=request.compression,
+                columns=request.columns or [],
+                date_column=request.date_column,
+                date_from=request.date_from,
+                date_to=request.date_to,
+            )
+            export_file += f".{spec.extension}"
+            written = await export_to_file(spec, export_file)
+            return_code, output, error = 0, f"{written} bytes written", ""
         
         # Log the export result
         log_file = f"export_log_{timestamp}.log"
@@ -404,9 +473,9 @@ async def export_data_background(request: DataExportRequest):
             f.write(f"Export: {request.table_name}\n")
             f.write(f"Format: {request.format}\n")
             f.write(f"File: {export_file}\n")
-            f.write(f"Return code: {result.returncode}\n")
-            f.write(f"Output: {result.stdout}\n")
-            f.write(f"Error: {result.stderr}\n")
+            f.write(f"Return code: {return_code}\n")
+            f.write(f"Output: {output}\n")
+            f.write(f"Error: {error}\n")
         
     except Exception as e:
         # Log error
@@ -3,8 +3,7 @@ Enhanced Health Check Router
 Provides comprehensive health checks, system diagnostics, and monitoring functionality
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException
 from typing import Dict, Any, List, Optional
 import subprocess
 import psutil
@@ -13,8 +12,8 @@ import os
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
-from ..dependencies import get_db
 from ..config import settings
+from ..health_snapshots import HealthSnapshotCollector, Snapshot, snapshot_timestamp
 
 router = APIRouter()
 
@@ -36,6 +35,7 @@ class DetailedHealthStatus(BaseModel):
     timestamp: str
     uptime: str
     system_metrics: Dict[str, Any]
+    snapshot_age_seconds: Optional[float] = None
 
 class SystemDiagnostics(BaseModel):
     cpu_usage: float
@@ -45,6 +45,7 @@ class SystemDiagnostics(BaseModel):
     active_processes: int
     load_average: List[float]
     uptime: str
+    snapshot_age_seconds: Optional[float] = None
 
 class DatabaseHealth(BaseModel):
     status: str
@@ -54,6 +55,7 @@ class DatabaseHealth(BaseModel):
     politician_records: Optional[int] = None
     timestamp: Optional[str] = None
     error: Optional[str] = None
+    snapshot_age_seconds: Optional[float] = None
 
 class ScraperHealth(BaseModel):
     status: str
@@ -64,6 +66,7 @@ class ScraperHealth(BaseModel):
     report_file: Optional[str] = None
     timestamp: str
     message: Optional[str] = None
+    snapshot_age_seconds: Optional[float] = None
 
 class ApiHealth(BaseModel):
     status: str
@@ -79,6 +82,7 @@ class ComprehensiveHealth(BaseModel):
     components: Dict[str, Any]
     summary: Dict[str, int]
     timestamp: str
+    snapshot_age_seconds: Optional[float] = None
 
 class Metrics(BaseModel):
     system: Dict[str, Any]
@@ -86,6 +90,7 @@ class Metrics(BaseModel):
     scrapers: Dict[str, Any]
     network: Dict[str, Any]
     timestamp: str
+    snapshot_age_seconds: Optional[float] = None
 
 @router.get("/health", response_model=HealthStatus)
 async def health_check() -> Dict[str, Any]:
@@ -113,271 +118,241 @@ async def health_check() -> Dict[str, Any]:
             "uptime": "0:00:00"
         }
 
-@router.get("/health/detailed", response_model=DetailedHealthStatus)
-async def detailed_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Detailed health check with database connectivity and system metrics"""
+
+# Probes run on the snapshot collector's threads, never in request handlers
+def _psql(query: str) -> subprocess.CompletedProcess:
+    return subprocess.run([
+        "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
+        "-c", query,
+        "-t", "-A"
+    ], capture_output=True, text=True, timeout=settings.health_probe_timeout)
+
+def _collect_database() -> Dict[str, Any]:
+    """Database connectivity, size and record counts"""
+    # Connectivity, size and table count in one round trip
+    result = _psql(
+        "SELECT pg_size_pretty(pg_database_size('openpolicy')), "
+        "(SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public');"
+    )
+    if result.returncode != 0:
+        return _database_fallback(result.stderr)
+
+    db_size, table_count = "Unknown", 0
+    if result.stdout.strip():
+        size_text, _, count_text = result.stdout.strip().partition("|")
+        db_size = size_text or "Unknown"
+        table_count = int(count_text or 0)
+
+    # Get record count for main tables
+    politician_count = 0
     try:
-        # Test database connection
-        db_status = "healthy"
-        try:
-            result = subprocess.run([
-                "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-                "-c", "SELECT 1;",
-                "-t", "-A"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                db_status = f"unhealthy: {result.stderr}"
-        except Exception as e:
-            db_status = f"unhealthy: {str(e)}"
-        
-        # Get system metrics
-        system_metrics = {
-            "cpu_percent": psutil.cpu_percent(),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": psutil.disk_usage('/').percent,
-            "active_processes": len(psutil.pids())
-        }
-        
-        # Get system uptime
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
-        uptime = str(datetime.now() - boot_time).split('.')[0]
-        
-        # Determine overall status
-        overall_status = "healthy"
-        if db_status != "healthy" or system_metrics["cpu_percent"] > 90 or system_metrics["memory_percent"] > 90:
-            overall_status = "unhealthy"
-        elif system_metrics["cpu_percent"] > 80 or system_metrics["memory_percent"] > 80:
-            overall_status = "warning"
-        
-        return {
-            "status": overall_status,
-            "service": "Open Policy Platform API",
-            "version": settings.version,
-            "environment": settings.environment,
-            "database": db_status,
-            "timestamp": datetime.now().isoformat(),
-            "uptime": uptime,
-            "system_metrics": system_metrics
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "service": "Open Policy Platform API",
-            "version": settings.version,
-            "environment": settings.environment,
-            "database": f"unhealthy: {str(e)}",
-            "timestamp": datetime.now().isoformat(),
-            "uptime": "0:00:00",
-            "system_metrics": {}
-        }
+        politician_result = _psql("SELECT COUNT(*) FROM core_politician;")
+        if politician_result.returncode == 0 and politician_result.stdout.strip():
+            politician_count = int(politician_result.stdout.strip())
+    except Exception:
+        pass
 
-@router.get("/health/database", response_model=DatabaseHealth)
-async def database_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Database-specific health check"""
+    return {
+        "status": "healthy",
+        "connectivity": "successful",
+        "database_size": db_size,
+        "table_count": table_count,
+        "politician_records": politician_count,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _database_fallback(error: str) -> Dict[str, Any]:
+    return {
+        "status": "unhealthy",
+        "connectivity": "failed",
+        "error": error,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _collect_system() -> Dict[str, Any]:
+    """CPU, memory, disk, network and process metrics"""
+    # Non-blocking: CPU usage since the previous probe
+    cpu_percent = psutil.cpu_percent()
+    memory_percent = psutil.virtual_memory().percent
+    disk_percent = psutil.disk_usage('/').percent
+    network_io = psutil.net_io_counters()
+
+    # Load average (Unix-like systems)
     try:
-        # Test basic connectivity
-        connectivity_result = subprocess.run([
-            "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-            "-c", "SELECT 1;",
-            "-t", "-A"
-        ], capture_output=True, text=True, timeout=10)
-        
-        if connectivity_result.returncode != 0:
-            return {
-                "status": "unhealthy",
-                "connectivity": "failed",
-                "error": connectivity_result.stderr,
-                "timestamp": datetime.now().isoformat()
-            }
-        
-        # Get database size
-        size_result = subprocess.run([
-            "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-            "-c", "SELECT pg_size_pretty(pg_database_size('openpolicy'));",
-            "-t", "-A"
-        ], capture_output=True, text=True, timeout=10)
-        
-        db_size = "Unknown"
-        if size_result.returncode == 0 and size_result.stdout.strip():
-            db_size = size_result.stdout.strip()
-        
-        # Get table count
-        table_result = subprocess.run([
-            "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-            "-c", "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public';",
-            "-t", "-A"
-        ], capture_output=True, text=True, timeout=10)
-        
-        table_count = 0
-        if table_result.returncode == 0 and table_result.stdout.strip():
-            table_count = int(table_result.stdout.strip())
-        
-        # Get record count for main tables
-        politician_count = 0
-        try:
-            politician_result = subprocess.run([
-                "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-                "-c", "SELECT COUNT(*) FROM core_politician;",
-                "-t", "-A"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if politician_result.returncode == 0 and politician_result.stdout.strip():
-                politician_count = int(politician_result.stdout.strip())
-        except:
-            pass
-        
-        return {
-            "status": "healthy",
-            "connectivity": "successful",
-            "database_size": db_size,
-            "table_count": table_count,
-            "politician_records": politician_count,
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
+        load_average = list(os.getloadavg())
+    except Exception:
+        load_average = [0.0, 0.0, 0.0]
+
+    boot_time = datetime.fromtimestamp(psutil.boot_time())
+    uptime = str(datetime.now() - boot_time).split('.')[0]
+
+    # Determine status
+    status = "healthy"
+    if cpu_percent > 90 or memory_percent > 90 or disk_percent > 90:
+        status = "unhealthy"
+    elif cpu_percent > 80 or memory_percent > 80 or disk_percent > 80:
+        status = "warning"
+
+    return {
+        "status": status,
+        "cpu_usage": cpu_percent,
+        "memory_usage": memory_percent,
+        "disk_usage": disk_percent,
+        "network_io": {
+            "bytes_sent": network_io.bytes_sent,
+            "bytes_recv": network_io.bytes_recv,
+            "packets_sent": network_io.packets_sent,
+            "packets_recv": network_io.packets_recv
+        },
+        "active_processes": len(psutil.pids()),
+        "load_average": load_average,
+        "uptime": uptime
+    }
+
+def _system_fallback(error: str) -> Dict[str, Any]:
+    return {
+        "status": "unhealthy",
+        "cpu_usage": 0,
+        "memory_usage": 0,
+        "disk_usage": 0,
+        "network_io": {},
+        "active_processes": 0,
+        "load_average": [0, 0, 0],
+        "uptime": "0:00:00"
+    }
+
+def _collect_scrapers() -> Dict[str, Any]:
+    """Summary of the latest scraper test report"""
+    reports_dir = settings.scraper_reports_dir or '.'
+    scraper_files = [f for f in os.listdir(reports_dir) if f.startswith('scraper_test_report_')]
+
+    if not scraper_files:
         return {
-            "status": "unhealthy",
-            "connectivity": "failed",
-            "error": str(e),
+            "status": "warning",
+            "message": "No scraper reports found",
+            "total_scrapers": 0,
+            "active_scrapers": 0,
+            "success_rate": 0.0,
+            "last_run": None,
             "timestamp": datetime.now().isoformat()
         }
 
-@router.get("/health/scrapers", response_model=ScraperHealth)
-async def scraper_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Scraper-specific health check"""
+    # Get latest report
+    latest_report = max(scraper_files)
     try:
-        # Check for scraper reports
-        scraper_files = [f for f in os.listdir('.') if f.startswith('scraper_test_report_')]
-        
-        if not scraper_files:
-            return {
-                "status": "warning",
-                "message": "No scraper reports found",
-                "total_scrapers": 0,
-                "active_scrapers": 0,
-                "success_rate": 0.0,
-                "last_run": None,
-                "timestamp": datetime.now().isoformat()
-            }
-        
-        # Get latest report
-        latest_report = max(scraper_files)
-        try:
-            with open(latest_report, 'r') as f:
-                report_data = json.load(f)
-            
-            summary = report_data.get('summary', {})
-            total_scrapers = summary.get('total_scrapers', 0)
-            active_scrapers = summary.get('successful', 0)
-            success_rate = summary.get('success_rate', 0.0)
-            last_run = report_data.get('timestamp')
-            
-            # Determine status
-            status = "healthy"
-            if success_rate < 50:
-                status = "unhealthy"
-            elif success_rate < 70:
-                status = "warning"
-            
-            return {
-                "status": status,
-                "total_scrapers": total_scrapers,
-                "active_scrapers": active_scrapers,
-                "success_rate": success_rate,
-                "last_run": last_run,
-                "report_file": latest_report,
-                "timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            return {
-                "status": "warning",
-                "message": f"Error reading scraper report: {str(e)}",
-                "report_file": latest_report,
-                "total_scrapers": 0,
-                "active_scrapers": 0,
-                "success_rate": 0.0,
-                "last_run": None,
-                "timestamp": datetime.now().isoformat()
-            }
+        with open(os.path.join(reports_dir, latest_report), 'r') as f:
+            report_data = json.load(f)
     except Exception as e:
         return {
-            "status": "unhealthy",
+            "status": "warning",
+            "message": f"Error reading scraper report: {str(e)}",
+            "report_file": latest_report,
             "total_scrapers": 0,
             "active_scrapers": 0,
             "success_rate": 0.0,
+            "last_run": None,
             "timestamp": datetime.now().isoformat()
         }
 
+    summary = report_data.get('summary', {})
+    success_rate = summary.get('success_rate', 0.0)
+
+    # Determine status
+    status = "healthy"
+    if success_rate < 50:
+        status = "unhealthy"
+    elif success_rate < 70:
+        status = "warning"
+
+    return {
+        "status": status,
+        "total_scrapers": summary.get('total_scrapers', 0),
+        "active_scrapers": summary.get('successful', 0),
+        "success_rate": success_rate,
+        "last_run": report_data.get('timestamp'),
+        "report_file": latest_report,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _scrapers_fallback(error: str) -> Dict[str, Any]:
+    return {
+        "status": "unhealthy",
+        "message": error,
+        "total_scrapers": 0,
+        "active_scrapers": 0,
+        "success_rate": 0.0,
+        "timestamp": datetime.now().isoformat()
+    }
+
+# Started and stopped by the app lifespan (see main.py); until then, snapshots are
+# collected on first request
+collector = HealthSnapshotCollector(fresh_min_interval=settings.health_fresh_min_interval)
+collector.register("database", _collect_database, settings.health_database_interval,
+                   settings.health_probe_timeout, _database_fallback)
+collector.register("system", _collect_system, settings.health_system_interval,
+                   settings.health_probe_timeout, _system_fallback)
+collector.register("scrapers", _collect_scrapers, settings.health_scrapers_interval,
+                   settings.health_probe_timeout, _scrapers_fallback)
+
+def _with_age(snapshot: Snapshot) -> Dict[str, Any]:
+    return {**snapshot.data, "snapshot_age_seconds": round(snapshot.age, 3)}
+
+def _oldest_age(snapshots: Dict[str, Snapshot]) -> float:
+    return round(max(s.age for s in snapshots.values()), 3)
+
+@router.get("/health/detailed", response_model=DetailedHealthStatus)
+async def detailed_health_check(fresh: bool = False) -> Dict[str, Any]:
+    """Detailed health check with database connectivity and system metrics"""
+    snapshots = await collector.get_many(["database", "system"], fresh=fresh)
+    database, system = snapshots["database"].data, snapshots["system"].data
+
+    db_status = "healthy"
+    if database.get("status") != "healthy":
+        db_status = f"unhealthy: {database.get('error', 'unknown error')}"
+
+    system_metrics = {
+        "cpu_percent": system.get("cpu_usage", 0),
+        "memory_percent": system.get("memory_usage", 0),
+        "disk_percent": system.get("disk_usage", 0),
+        "active_processes": system.get("active_processes", 0)
+    }
+
+    # Determine overall status
+    overall_status = "healthy"
+    if db_status != "healthy" or system_metrics["cpu_percent"] > 90 or system_metrics["memory_percent"] > 90:
+        overall_status = "unhealthy"
+    elif system_metrics["cpu_percent"] > 80 or system_metrics["memory_percent"] > 80:
+        overall_status = "warning"
+
+    return {
+        "status": overall_status,
+        "service": "Open Policy Platform API",
+        "version": settings.version,
+        "environment": settings.environment,
+        "database": db_status,
+        "timestamp": snapshot_timestamp(snapshots["database"]),
+        "uptime": system.get("uptime", "0:00:00"),
+        "system_metrics": system_metrics,
+        "snapshot_age_seconds": _oldest_age(snapshots)
+    }
+
+@router.get("/health/database", response_model=DatabaseHealth)
+async def database_health_check(fresh: bool = False) -> Dict[str, Any]:
+    """Database-specific health check"""
+    return _with_age(await collector.get("database", fresh=fresh))
+
+@router.get("/health/scrapers", response_model=ScraperHealth)
+async def scraper_health_check(fresh: bool = False) -> Dict[str, Any]:
+    """Scraper-specific health check"""
+    return _with_age(await collector.get("scrapers", fresh=fresh))
+
 @router.get("/health/system", response_model=SystemDiagnostics)
-async def system_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def system_health_check(fresh: bool = False) -> Dict[str, Any]:
     """System-specific health check"""
-    try:
-        # CPU usage
-        cpu_percent = psutil.cpu_percent()
-        
-        # Memory usage
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        
-        # Disk usage
-        disk = psutil.disk_usage('/')
-        disk_percent = disk.percent
-        
-        # Network I/O
-        network_io = psutil.net_io_counters()
-        
-        # Active processes
-        active_processes = len(psutil.pids())
-        
-        # Load average (Unix-like systems)
-        load_average = []
-        try:
-            load_avg = os.getloadavg()
-            load_average = list(load_avg)
-        except:
-            load_average = [0.0, 0.0, 0.0]
-        
-        # System uptime
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
-        uptime = str(datetime.now() - boot_time).split('.')[0]
-        
-        # Determine status
-        status = "healthy"
-        if cpu_percent > 90 or memory_percent > 90 or disk_percent > 90:
-            status = "unhealthy"
-        elif cpu_percent > 80 or memory_percent > 80 or disk_percent > 80:
-            status = "warning"
-        
-        return {
-            "status": status,
-            "cpu_usage": cpu_percent,
-            "memory_usage": memory_percent,
-            "disk_usage": disk_percent,
-            "network_io": {
-                "bytes_sent": network_io.bytes_sent,
-                "bytes_recv": network_io.bytes_recv,
-                "packets_sent": network_io.packets_sent,
-                "packets_recv": network_io.packets_recv
-            },
-            "active_processes": active_processes,
-            "load_average": load_average,
-            "uptime": uptime
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "cpu_usage": 0,
-            "memory_usage": 0,
-            "disk_usage": 0,
-            "network_io": {},
-            "active_processes": 0,
-            "load_average": [0, 0, 0],
-            "uptime": "0:00:00"
-        }
+    return _with_age(await collector.get("system", fresh=fresh))
 
 @router.get("/health/api", response_model=ApiHealth)
-async def api_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def api_health_check() -> Dict[str, Any]:
     """API-specific health check"""
     try:
         # Check API version
@@ -420,22 +395,16 @@ async def api_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
         }
 
 @router.get("/health/comprehensive", response_model=ComprehensiveHealth)
-async def comprehensive_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def comprehensive_health_check(fresh: bool = False) -> Dict[str, Any]:
     """Comprehensive health check covering all components"""
     try:
-        # Get all health checks
-        api_health = await api_health_check(db)
-        database_health = await database_health_check(db)
-        scraper_health = await scraper_health_check(db)
-        system_health = await system_health_check(db)
+        api_health = await api_health_check()
+        snapshots = await collector.get_many(["database", "scrapers", "system"], fresh=fresh)
+        components = {"api": api_health}
+        components.update({name: _with_age(snapshot) for name, snapshot in snapshots.items()})
         
         # Determine overall status
-        all_statuses = [
-            api_health.get("status"),
-            database_health.get("status"),
-            scraper_health.get("status"),
-            system_health.get("status")
-        ]
+        all_statuses = [components[name].get("status") for name in ("api", "database", "scrapers", "system")]
         
         overall_status = "healthy"
         if "unhealthy" in all_statuses:
@@ -446,19 +415,15 @@ async def comprehensive_health_check(db: Session = Depends(get_db)) -> Dict[str,
         # Compile comprehensive report
         comprehensive_report = {
             "status": overall_status,
-            "components": {
-                "api": api_health,
-                "database": database_health,
-                "scrapers": scraper_health,
-                "system": system_health
-            },
+            "components": {name: components[name] for name in ("api", "database", "scrapers", "system")},
             "summary": {
                 "total_components": 4,
                 "healthy_components": all_statuses.count("healthy"),
                 "warning_components": all_statuses.count("warning"),
                 "unhealthy_components": all_statuses.count("unhealthy")
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "snapshot_age_seconds": _oldest_age(snapshots)
         }
         
         return comprehensive_report
@@ -471,66 +436,33 @@ async def comprehensive_health_check(db: Session = Depends(get_db)) -> Dict[str,
         }
 
 @router.get("/health/metrics", response_model=Metrics)
-async def health_metrics(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def health_metrics(fresh: bool = False) -> Dict[str, Any]:
     """Get health metrics for monitoring"""
     try:
-        # System metrics
-        cpu_percent = psutil.cpu_percent()
-        memory_percent = psutil.virtual_memory().percent
-        disk_percent = psutil.disk_usage('/').percent
-        
-        # Database metrics
-        db_connected = False
-        politician_count = 0
-        try:
-            result = subprocess.run([
-                "psql", "-h", "localhost", "-U", "ashishtandon", "-d", "openpolicy",
-                "-c", "SELECT COUNT(*) FROM core_politician;",
-                "-t", "-A"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0 and result.stdout.strip():
-                db_connected = True
-                politician_count = int(result.stdout.strip())
-        except:
-            pass
-        
-        # Scraper metrics
-        scraper_success_rate = 0.0
-        scraper_files = [f for f in os.listdir('.') if f.startswith('scraper_test_report_')]
-        if scraper_files:
-            try:
-                latest_report = max(scraper_files)
-                with open(latest_report, 'r') as f:
-                    report_data = json.load(f)
-                
-                summary = report_data.get('summary', {})
-                scraper_success_rate = summary.get('success_rate', 0.0)
-            except:
-                pass
-        
-        # Network metrics
-        network_io = psutil.net_io_counters()
+        snapshots = await collector.get_many(["database", "scrapers", "system"], fresh=fresh)
+        database, scrapers, system = (snapshots[n].data for n in ("database", "scrapers", "system"))
+        network_io = system.get("network_io", {})
         
         metrics = {
             "system": {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory_percent,
-                "disk_percent": disk_percent,
-                "active_processes": len(psutil.pids())
+                "cpu_percent": system.get("cpu_usage", 0),
+                "memory_percent": system.get("memory_usage", 0),
+                "disk_percent": system.get("disk_usage", 0),
+                "active_processes": system.get("active_processes", 0)
             },
             "database": {
-                "connected": db_connected,
-                "politician_records": politician_count
+                "connected": database.get("status") == "healthy",
+                "politician_records": database.get("politician_records") or 0
             },
             "scrapers": {
-                "success_rate": scraper_success_rate
+                "success_rate": scrapers.get("success_rate", 0.0)
             },
             "network": {
-                "bytes_sent": network_io.bytes_sent,
-                "bytes_recv": network_io.bytes_recv
+                "bytes_sent": network_io.get("bytes_sent", 0),
+                "bytes_recv": network_io.get("bytes_recv", 0)
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "snapshot_age_seconds": _oldest_age(snapshots)
         }
         
         return metrics
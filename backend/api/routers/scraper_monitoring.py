@@ -3,7 +3,8 @@ Scraper Monitoring API Endpoints
 Provides comprehensive monitoring and control for scraper operations
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 import psutil
 import json
@@ -12,6 +13,8 @@ from datetime import datetime, timedelta
 from pydantic import BaseModel
 import logging
 
+from ..log_tail import follow, read_from_offset, resolve_log_file, tail_lines
+
 router = APIRouter(prefix="/api/v1/scrapers", tags=["scraper-monitoring"])
 logger = logging.getLogger("openpolicy.api.scrapers")
 
@@ -162,34 +165,88 @@ async def run_scrapers(request: Request, background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Error initiating scraper run: {str(e)}")
 
 @router.get("/logs")
-async def get_scraper_logs(request: Request, limit: int = 50):
-    """Get recent scraper logs"""
+async def get_scraper_logs(
+    request: Request,
+    limit: int = 50,
+    file: Optional[str] = None,
+    cursor: Optional[int] = Query(None, ge=0),
+):
+    """Get recent scraper logs.
+
+    Lines are tailed from the end of each file. The response carries a byte-offset
+    cursor per file; pass ``file`` and ``cursor`` back to fetch only newer lines.
+    """
     try:
         logs: list[dict] = []
+        cursors: dict[str, int] = {}
         logs_dir = getattr(request.app.state, "scraper_logs_dir", os.getcwd())
-        log_files = [
-            os.path.join(logs_dir, f)
-            for f in os.listdir(logs_dir)
-            if f.endswith('.log') and ('scraper' in f or 'collection' in f)
-        ]
-        for log_file in sorted(log_files, reverse=True)[:5]:
+        if file is not None:
+            log_path = resolve_log_file(logs_dir, file)
+            if log_path is None:
+                raise HTTPException(status_code=404, detail=f"Log file not found: {file}")
+            log_files = [log_path]
+        else:
+            log_files = sorted((
+                os.path.join(logs_dir, f)
+                for f in os.listdir(logs_dir)
+                if f.endswith('.log') and ('scraper' in f or 'collection' in f)
+            ), reverse=True)[:5]
+        for log_file in log_files:
+            name = os.path.basename(log_file)
             try:
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                for line in lines[-limit:]:
-                    if line.strip():
-                        logs.append({
-                            "file": os.path.basename(log_file),
-                            "line": line.strip(),
-                            "timestamp": datetime.now().isoformat()
-                        })
+                if cursor is not None and file is not None:
+                    lines, cursors[name] = read_from_offset(log_file, cursor, limit=limit)
+                else:
+                    lines, cursors[name] = tail_lines(log_file, limit)
+                for line in lines:
+                    logs.append({
+                        "file": name,
+                        "line": line.strip(),
+                        "timestamp": datetime.now().isoformat()
+                    })
             except Exception as e:
                 logger.warning("Skipping log file %s: %s", log_file, e)
-        return {"logs": logs[-limit:]}
+        return {"logs": logs[-limit:], "cursors": cursors}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error reading scraper logs: %s", e)
         raise HTTPException(status_code=500, detail=f"Error getting scraper logs: {str(e)}")
 
+@router.get("/logs/stream")
+async def stream_scraper_logs(
+    request: Request,
+    file: Optional[str] = None,
+    cursor: Optional[int] = Query(None, ge=0),
+):
+    """Stream lines appended to a scraper log as Server-Sent Events.
+
+    Defaults to the most recent scraper log and starts at its current end. A
+    reconnecting ``EventSource`` resumes from its ``Last-Event-ID`` cursor.
+    """
+    logs_dir = getattr(request.app.state, "scraper_logs_dir", os.getcwd())
+    if file is None:
+        candidates = sorted(
+            f for f in os.listdir(logs_dir)
+            if f.endswith('.log') and ('scraper' in f or 'collection' in f)
+        )
+        if not candidates:
+            raise HTTPException(status_code=404, detail="No scraper logs found")
+        file = candidates[-1]
+    log_path = resolve_log_file(logs_dir, file)
+    if log_path is None:
+        raise HTTPException(status_code=404, detail=f"Log file not found: {file}")
+    last_event_id = request.headers.get("last-event-id")
+    if cursor is None and last_event_id and last_event_id.isdigit():
+        cursor = int(last_event_id)
+    if cursor is None:
+        cursor = os.path.getsize(log_path)
+    return StreamingResponse(
+        follow(log_path, cursor, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/failures")
 async def get_failure_analysis():
     """Get detailed failure analysis"""
@@ -14,6 +14,7 @@ from pydantic import BaseModel
 
 from ..dependencies import get_db, require_admin
 from ..config import settings
+from ..log_tail import read_from_offset, resolve_log_file, tail_lines
 
 router = APIRouter()
 
@@ -254,41 +255,59 @@ async def get_scraper_status(scraper_id: str, db: Session = Depends(get_db)):
 async def get_scraper_logs(
     scraper_id: str, 
     limit: int = Query(50, ge=1, le=200),
+    file: Optional[str] = None,
+    cursor: Optional[int] = Query(None, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Get logs for a specific scraper"""
+    """Get logs for a specific scraper.
+
+    The most recent matching lines are tailed from the end of each log file. Pass a
+    ``file`` and its ``cursor`` from a previous response to fetch only newer lines.
+    """
     try:
         logs = []
+        cursors: Dict[str, int] = {}
+        needle = scraper_id.lower()
+        matches = lambda line: needle in line.lower()
         
         # Search for scraper in log files
-        log_files = [f for f in os.listdir('.') if f.endswith('.log') and 'scraper' in f]
+        if file is not None:
+            if resolve_log_file('.', file) is None:
+                raise HTTPException(status_code=404, detail=f"Log file not found: {file}")
+            log_files = [file]
+        else:
+            log_files = sorted(
+                (f for f in os.listdir('.') if f.endswith('.log') and 'scraper' in f),
+                reverse=True
+            )[:10]
         
-        for log_file in sorted(log_files, reverse=True)[:10]:
+        for log_file in log_files:
+            remaining = limit - len(logs)
+            if remaining <= 0:
+                break
             try:
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    
-                    for line in lines:
-                        if scraper_id.lower() in line.lower():
-                            logs.append({
-                                "log_file": log_file,
-                                "line": line.strip(),
-                                "timestamp": datetime.now().isoformat()
-                            })
-                            
-                            if len(logs) >= limit:
-                                break
-                    
-                    if len(logs) >= limit:
-                        break
+                if cursor is not None and file is not None:
+                    lines, cursors[log_file] = read_from_offset(
+                        log_file, cursor, limit=remaining, predicate=matches)
+                else:
+                    lines, cursors[log_file] = tail_lines(log_file, remaining, predicate=matches)
+                for line in lines:
+                    logs.append({
+                        "log_file": log_file,
+                        "line": line.strip(),
+                        "timestamp": datetime.now().isoformat()
+                    })
             except:
                 continue
         
         return {
             "scraper_id": scraper_id,
             "logs": logs[:limit],
-            "total_logs": len(logs)
+            "total_logs": len(logs),
+            "cursors": cursors
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving scraper logs: {str(e)}")
 
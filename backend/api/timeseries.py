@@ -0,0 +1,370 @@
+"""
+Embedded Time-Series Store
+Append-only columnar segments per metric with 1m/1h/1d rollups, retention and range queries.
+
+Layout on disk (one directory per metric)::
+
+    <root>/<metric>/raw-<segment_start_ms>.ts    int64 timestamps (ms)
+    <root>/<metric>/raw-<segment_start_ms>.val   float64 values
+    <root>/<metric>/1m-<segment_start_ms>.{ts,count,sum,min,max}
+
+Each column is a flat little-endian array, so appends are a few bytes per point and
+range reads are a binary search plus one slice per column. Only completed rollup
+buckets are written; readers rebuild the still-open tail bucket from raw points, so a
+reader in another process never sees partial rollups.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+ROLLUP_COLUMNS = (("count", "q"), ("sum", "d"), ("min", "d"), ("max", "d"))
+AGGREGATES = ("avg", "min", "max", "sum", "count")
+
+_METRIC_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@dataclass(frozen=True)
+class Resolution:
+    name: str
+    step_ms: int  # 0 for raw points
+    segment_ms: int
+    retention_ms: Optional[int]  # None keeps data forever
+
+
+DEFAULT_RESOLUTIONS = (
+    Resolution("raw", 0, DAY_MS, 7 * DAY_MS),
+    Resolution("1m", MINUTE_MS, DAY_MS, 30 * DAY_MS),
+    Resolution("1h", HOUR_MS, 30 * DAY_MS, 400 * DAY_MS),
+    Resolution("1d", DAY_MS, 366 * DAY_MS, None),
+)
+
+
+def metric_name(name: str) -> str:
+    """Normalize a metric name into a safe directory name"""
+    cleaned = _METRIC_NAME.sub("_", name).strip("._")
+    if not cleaned:
+        raise ValueError(f"Invalid metric name: {name!r}")
+    return cleaned
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _read_column(path: str, typecode: str) -> array:
+    values = array(typecode)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return values
+    usable = len(data) - len(data) % values.itemsize
+    values.frombytes(data[:usable])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _append_column(path: str, typecode: str, values: Iterable) -> None:
+    column = array(typecode, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    with open(path, "ab") as f:
+        f.write(column.tobytes())
+
+
+@dataclass
+class Bucket:
+    start: int
+    count: int = 0
+    sum: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def value(self, agg: str) -> float:
+        if agg == "avg":
+            return self.sum / self.count if self.count else 0.0
+        return float(getattr(self, agg))
+
+
+@dataclass
+class _MetricState:
+    last_ts: int
+    pending: Dict[str, Bucket] = field(default_factory=dict)
+
+
+class TimeSeriesStore:
+    """Embedded time-series store; safe for one writer process and many readers"""
+
+    def __init__(self, root: str, resolutions: Tuple[Resolution, ...] = DEFAULT_RESOLUTIONS):
+        self.root = root
+        self.resolutions = {r.name: r for r in resolutions}
+        self.rollups = [r for r in resolutions if r.step_ms]
+        self._states: Dict[str, _MetricState] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # ------------------------------------------------------------------ paths
+    def _metric_dir(self, metric: str) -> str:
+        return os.path.join(self.root, metric_name(metric))
+
+    def _segments(self, metric: str, resolution: Resolution) -> List[int]:
+        """Sorted segment start times for ``resolution``"""
+        prefix = f"{resolution.name}-"
+        try:
+            names = os.listdir(self._metric_dir(metric))
+        except FileNotFoundError:
+            return []
+        return sorted({
+            int(n[len(prefix):].split(".", 1)[0])
+            for n in names
+            if n.startswith(prefix) and n.endswith(".ts")
+        })
+
+    def _segment_base(self, metric: str, resolution: Resolution, segment: int) -> str:
+        return os.path.join(self._metric_dir(metric), f"{resolution.name}-{segment}")
+
+    # ----------------------------------------------------------------- writes
+    def write(self, metric: str, value: float, ts: Optional[int] = None) -> None:
+        """Append one point; ``ts`` is epoch milliseconds and must not go backwards"""
+        self.write_many({metric: value}, ts)
+
+    def write_many(self, values: Dict[str, float], ts: Optional[int] = None) -> None:
+        """Append one point per metric at the same timestamp.
+
+        Every point is checked before any is written, so an invalid or out-of-order
+        point raises ``ValueError`` and leaves the whole batch unwritten.
+        """
+        ts = now_ms() if ts is None else int(ts)
+        points = []
+        for metric, value in values.items():
+            if value is None:
+                continue
+            metric_name(metric)
+            try:
+                points.append((metric, float(value)))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for {metric}: {value!r}") from None
+        with self._lock:
+            for metric, _ in points:
+                last_ts = self._load_state(metric).last_ts
+                if ts < last_ts:
+                    raise ValueError(f"Out-of-order point for {metric}: {ts} < {last_ts}")
+            for metric, value in points:
+                self._write_point(metric, value, ts)
+
+    def _write_point(self, metric: str, value: float, ts: int) -> None:
+        state = self._load_state(metric)
+        os.makedirs(self._metric_dir(metric), exist_ok=True)
+        raw = self.resolutions["raw"]
+        base = self._segment_base(metric, raw, ts - ts % raw.segment_ms)
+        _append_column(base + ".ts", "q", [ts])
+        _append_column(base + ".val", "d", [value])
+        state.last_ts = ts
+        for resolution in self.rollups:
+            start = ts - ts % resolution.step_ms
+            bucket = state.pending.get(resolution.name)
+            if bucket is not None and bucket.start != start:
+                self._flush_bucket(metric, resolution, bucket)
+                bucket = None
+            if bucket is None:
+                bucket = state.pending[resolution.name] = Bucket(start)
+            bucket.add(value)
+
+    def _flush_bucket(self, metric: str, resolution: Resolution, bucket: Bucket) -> None:
+        base = self._segment_base(metric, resolution, bucket.start - bucket.start % resolution.segment_ms)
+        _append_column(base + ".ts", "q", [bucket.start])
+        for column, typecode in ROLLUP_COLUMNS:
+            _append_column(f"{base}.{column}", typecode, [getattr(bucket, column)])
+
+    def _load_state(self, metric: str) -> _MetricState:
+        """Recover writer state: last timestamp and open buckets rebuilt from raw points"""
+        state = self._states.get(metric)
+        if state is not None:
+            return state
+        raw_ts, raw_vals = self._read_raw(metric, None, None)
+        state = _MetricState(last_ts=raw_ts[-1] if raw_ts else 0)
+        for resolution in self.rollups:
+            flushed = self._read_rollup(metric, resolution, None, None)
+            after = flushed[-1].start + resolution.step_ms if flushed else None
+            buckets = self._bucketize(raw_ts, raw_vals, resolution.step_ms, after)
+            # Buckets completed before a crash are flushed now; the newest stays open
+            for bucket in buckets[:-1]:
+                self._flush_bucket(metric, resolution, bucket)
+            if buckets:
+                state.pending[resolution.name] = buckets[-1]
+        self._states[metric] = state
+        return state
+
+    # ------------------------------------------------------------------ reads
+    def _read_raw(self, metric: str, start: Optional[int], end: Optional[int]) -> Tuple[array, array]:
+        raw = self.resolutions["raw"]
+        out_ts, out_vals = array("q"), array("d")
+        for segment in self._segments(metric, raw):
+            if end is not None and segment >= end:
+                break
+            if start is not None and segment + raw.segment_ms <= start:
+                continue
+            base = self._segment_base(metric, raw, segment)
+            ts, vals = _read_column(base + ".ts", "q"), _read_column(base + ".val", "d")
+            n = min(len(ts), len(vals))
+            lo = bisect_left(ts, start, 0, n) if start is not None else 0
+            hi = bisect_left(ts, end, 0, n) if end is not None else n
+            out_ts.extend(ts[lo:hi])
+            out_vals.extend(vals[lo:hi])
+        return out_ts, out_vals
+
+    def _read_rollup(self, metric: str, resolution: Resolution, start: Optional[int], end: Optional[int]) -> List[Bucket]:
+        buckets: List[Bucket] = []
+        for segment in self._segments(metric, resolution):
+            if end is not None and segment >= end:
+                break
+            if start is not None and segment + resolution.segment_ms <= start:
+                continue
+            base = self._segment_base(metric, resolution, segment)
+            ts = _read_column(base + ".ts", "q")
+            columns = {c: _read_column(f"{base}.{c}", t) for c, t in ROLLUP_COLUMNS}
+            n = min([len(ts)] + [len(v) for v in columns.values()])
+            lo = bisect_left(ts, start, 0, n) if start is not None else 0
+            hi = bisect_left(ts, end, 0, n) if end is not None else n
+            for i in range(lo, hi):
+                buckets.append(Bucket(ts[i], int(columns["count"][i]), columns["sum"][i],
+                                      columns["min"][i], columns["max"][i]))
+        return buckets
+
+    @staticmethod
+    def _bucketize(ts: array, vals: array, step_ms: int, after: Optional[int]) -> List[Bucket]:
+        buckets: List[Bucket] = []
+        lo = bisect_left(ts, after) if after is not None else 0
+        for i in range(lo, len(ts)):
+            start = ts[i] - ts[i] % step_ms
+            if not buckets or buckets[-1].start != start:
+                buckets.append(Bucket(start))
+            buckets[-1].add(vals[i])
+        return buckets
+
+    def buckets(self, metric: str, resolution: str, start: int, end: int) -> List[Bucket]:
+        """Rollup buckets in ``[start, end)``, including the open tail rebuilt from raw points"""
+        res = self.resolutions[resolution]
+        if not res.step_ms:
+            raise ValueError("raw has no buckets; use query(resolution='raw')")
+        aligned = start - start % res.step_ms
+        stored = self._read_rollup(metric, res, aligned, end)
+        all_stored = stored or self._read_rollup(metric, res, None, end)[-1:]
+        tail_from = all_stored[-1].start + res.step_ms if all_stored else aligned
+        raw_ts, raw_vals = self._read_raw(metric, max(tail_from, aligned), end)
+        return stored + self._bucketize(raw_ts, raw_vals, res.step_ms, None)
+
+    def choose_resolution(self, start: int, end: int, max_points: int, now: Optional[int] = None) -> str:
+        """Finest rollup whose retention covers ``start`` and yields at most ``max_points`` buckets"""
+        now = now_ms() if now is None else now
+        for res in self.rollups:
+            covers = res.retention_ms is None or start >= now - res.retention_ms
+            if covers and (end - start) / res.step_ms <= max_points:
+                return res.name
+        return self.rollups[-1].name
+
+    def query(
+        self,
+        metric: str,
+        start: int,
+        end: Optional[int] = None,
+        resolution: Optional[str] = None,
+        agg: str = "avg",
+        max_points: int = 500,
+    ) -> Tuple[str, List[Tuple[int, float]]]:
+        """Return ``(resolution, [(ts_ms, value), ...])`` for ``[start, end)``.
+
+        ``resolution`` is ``raw``, a rollup name, or ``None`` to pick automatically.
+        """
+        end = now_ms() if end is None else end
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unsupported aggregate: {agg}")
+        if resolution is None:
+            resolution = self.choose_resolution(start, end, max_points)
+        if resolution not in self.resolutions:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        if resolution == "raw":
+            ts, vals = self._read_raw(metric, start, end)
+            return resolution, list(zip(ts, vals))
+        return resolution, [(b.start, b.value(agg)) for b in self.buckets(metric, resolution, start, end)]
+
+    def aggregate(self, metric: str, start: int, end: Optional[int] = None) -> Dict[str, Optional[float]]:
+        """count/sum/min/max/avg over ``[start, end)`` from the finest resolution still retained"""
+        end = now_ms() if end is None else end
+        now = now_ms()
+        total = Bucket(start)
+        for name, res in self.resolutions.items():
+            if res.retention_ms is not None and start < now - res.retention_ms:
+                continue
+            if res.step_ms:
+                for bucket in self.buckets(metric, name, start, end):
+                    total.count += bucket.count
+                    total.sum += bucket.sum
+                    total.min = min(total.min, bucket.min)
+                    total.max = max(total.max, bucket.max)
+            else:
+                for value in self._read_raw(metric, start, end)[1]:
+                    total.add(value)
+            break
+        if not total.count:
+            return {"count": 0, "sum": 0.0, "min": None, "max": None, "avg": None}
+        return {"count": total.count, "sum": total.sum, "min": total.min,
+                "max": total.max, "avg": total.sum / total.count}
+
+    def latest(self, metric: str) -> Optional[Tuple[int, float]]:
+        raw = self.resolutions["raw"]
+        for segment in reversed(self._segments(metric, raw)):
+            base = self._segment_base(metric, raw, segment)
+            ts, vals = _read_column(base + ".ts", "q"), _read_column(base + ".val", "d")
+            n = min(len(ts), len(vals))
+            if n:
+                return ts[n - 1], vals[n - 1]
+        return None
+
+    def metrics(self) -> List[str]:
+        try:
+            return sorted(
+                name for name in os.listdir(self.root)
+                if os.path.isdir(os.path.join(self.root, name))
+            )
+        except FileNotFoundError:
+            return []
+
+    # -------------------------------------------------------------- retention
+    def enforce_retention(self, now: Optional[int] = None) -> int:
+        """Delete segments entirely older than their resolution's retention; returns files removed"""
+        now = now_ms() if now is None else now
+        removed = 0
+        for metric in self.metrics():
+            directory = self._metric_dir(metric)
+            for res in self.resolutions.values():
+                if res.retention_ms is None:
+                    continue
+                cutoff = now - res.retention_ms
+                for segment in self._segments(metric, res):
+                    if segment + res.segment_ms > cutoff:
+                        break
+                    prefix = f"{res.name}-{segment}."
+                    for name in os.listdir(directory):
+                        if name.startswith(prefix):
+                            os.remove(os.path.join(directory, name))
+                            removed += 1
+        return removed
@@ -4,20 +4,29 @@
 
 This module provides comprehensive load testing capabilities for the OpenPolicy platform,
 including performance testing, stress testing, and scalability validation.
+
+Besides the closed-model thread pool tests, it includes an asyncio open-model load
+generator: requests are issued on a fixed (or linearly ramped) arrival schedule
+regardless of how fast responses come back, and latency is measured from each
+request's intended send time so queueing is not hidden (coordinated omission).
+Results can be saved as a JSON baseline and later runs compared against it.
 """
 
 import asyncio
+import math
+import random
 import time
 import statistics
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import httpx
 import requests
 import psutil
 import threading
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,12 +55,189 @@ class LoadTestResult:
     status_codes: Dict[int, int]
     errors: List[str]
 
+class LatencyHistogram:
+    """HDR-style latency histogram (integer microseconds, 3 significant digits).
+
+    Values below 2048µs get exact buckets; above that each power-of-two range is
+    split into 1024 linear sub-buckets, so the relative error stays under 0.1% with a
+    few thousand counters instead of a list of every sample.
+    """
+
+    SUB_BUCKET_BITS = 11
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.total_count = 0
+        self.total_value = 0
+        self.min_value: Optional[int] = None
+        self.max_value = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        return (shift + 1) * self.SUB_BUCKET_HALF + (value >> shift) - self.SUB_BUCKET_HALF
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self.SUB_BUCKET_COUNT:
+            return index
+        shift = index // self.SUB_BUCKET_HALF - 1
+        sub_bucket = index % self.SUB_BUCKET_HALF + self.SUB_BUCKET_HALF
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value_us: int, count: int = 1):
+        """Record a latency in microseconds"""
+        value_us = max(0, int(value_us))
+        index = self._index(value_us)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += count
+        self.total_count += count
+        self.total_value += value_us * count
+        self.min_value = value_us if self.min_value is None else min(self.min_value, value_us)
+        self.max_value = max(self.max_value, value_us)
+
+    def record_seconds(self, seconds: float):
+        self.record(round(seconds * 1_000_000))
+
+    def merge(self, other: 'LatencyHistogram'):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total_count += other.total_count
+        self.total_value += other.total_value
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+
+    def percentile(self, percentile: float) -> int:
+        """Value (µs) at or below which ``percentile`` percent of samples fall"""
+        if not self.total_count:
+            return 0
+        target = max(1, math.ceil(percentile / 100.0 * self.total_count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_value)
+        return self.max_value
+
+    @property
+    def mean(self) -> float:
+        return self.total_value / self.total_count if self.total_count else 0.0
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Mean, min, max and common percentiles in milliseconds"""
+        summary = {'count': self.total_count, 'mean': round(self.mean / 1000, 3),
+                   'min': round((self.min_value or 0) / 1000, 3), 'max': round(self.max_value / 1000, 3)}
+        for label, p in (('p50', 50), ('p90', 90), ('p95', 95), ('p99', 99), ('p999', 99.9)):
+            summary[label] = round(self.percentile(p) / 1000, 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON-serialisable encoding (used in baselines)"""
+        return {
+            'counts': [[index, count] for index, count in enumerate(self.counts) if count],
+            'total_value': self.total_value,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls()
+        for index, count in data.get('counts', []):
+            if index >= len(histogram.counts):
+                histogram.counts.extend([0] * (index + 1 - len(histogram.counts)))
+            histogram.counts[index] += count
+            histogram.total_count += count
+        histogram.total_value = data.get('total_value', 0)
+        histogram.min_value = data.get('min_value')
+        histogram.max_value = data.get('max_value', 0)
+        return histogram
+
+@dataclass
+class Scenario:
+    """One request type in a weighted open-model scenario mix"""
+    name: str
+    method: str
+    path: str  # relative to base_url, or an absolute URL for another service
+    weight: float = 1.0
+    body: Optional[Dict[str, Any]] = None
+
+# Default mix across the routers backend.api.main serves: policies list/search and health
+DEFAULT_SCENARIOS: List[Scenario] = [
+    Scenario('policies_list', 'GET', '/api/v1/policies/?limit=50', weight=4),
+    Scenario('policies_search', 'GET', '/api/v1/policies/search?q=parliament', weight=3),
+    Scenario('health', 'GET', '/api/v1/health', weight=1),
+]
+
+def graphql_scenario(graphql_url: str, weight: float = 2.0) -> Scenario:
+    """Representatives query against the GraphQL service (OpenPolicyAshBack's API).
+
+    backend.api.main has no /graphql route, so this is opt-in (--graphql-url) and takes
+    the full URL of the service's endpoint rather than a path under --base-url.
+    """
+    return Scenario('graphql_representatives', 'POST', graphql_url, weight=weight,
+                    body={'query': '{ representatives(pagination: {limit: 20}) { id name party } }'})
+
+def load_scenarios(path: str) -> List[Scenario]:
+    """Load a scenario mix from a JSON list of {name, method, path, weight, body}"""
+    with open(path, 'r') as f:
+        return [Scenario(**item) for item in json.load(f)]
+
+def arrival_offsets(rate: float, duration: float, ramp_to: Optional[float] = None) -> Iterator[float]:
+    """Intended send times (seconds from start) for a constant or linearly ramped rate.
+
+    With a ramp from r0 to r1 over T seconds the cumulative arrivals are
+    N(t) = r0*t + (r1 - r0)*t^2 / (2T); the k-th request is sent when N(t) = k.
+    """
+    end_rate = rate if ramp_to is None else ramp_to
+    a = (end_rate - rate) / (2 * duration)
+    total = int((rate + end_rate) / 2 * duration)
+    for k in range(total):
+        if k == 0:
+            yield 0.0
+        elif a == 0:
+            yield k / rate
+        else:
+            # Stable root of a*t^2 + rate*t - k = 0 (also for ramp-downs, a < 0)
+            yield 2 * k / (rate + math.sqrt(max(0.0, rate * rate + 4 * a * k)))
+
+@dataclass
+class OpenModelResult:
+    """Results from an open-model (arrival-rate driven) load test"""
+    test_name: str
+    target_rps: float
+    ramp_to_rps: Optional[float]
+    duration: float
+    total_requests: int
+    successful_requests: int
+    failed_requests: int
+    error_rate: float
+    throughput_rps: float
+    peak_in_flight: int
+    # Measured from the intended send time (corrected for coordinated omission)
+    latency_ms: Dict[str, float]
+    # Measured from the actual send time (server + network only)
+    service_time_ms: Dict[str, float]
+    scenarios: Dict[str, Dict[str, Any]]
+    status_codes: Dict[int, int]
+    errors: List[str]
+    histogram: Dict[str, Any] = field(default_factory=dict, repr=False)
+
 class LoadTestingSuite:
     """Comprehensive load testing suite for OpenPolicy platform"""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = base_url
         self.results: List[LoadTestResult] = []
+        self.open_results: List[OpenModelResult] = []
+        # Optional httpx transport for the open-model generator (e.g. ASGITransport in tests)
+        self.transport = transport
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'OpenPolicy-LoadTester/1.0',
@@ -96,16 +282,17 @@ class LoadTestingSuite:
         if not response_times:
             return {}
         
-        sorted_times = sorted(response_times)
-        n = len(sorted_times)
+        histogram = LatencyHistogram()
+        for response_time in response_times:
+            histogram.record_seconds(response_time)
         
         return {
             'average': statistics.mean(response_times),
-            'median': statistics.median(response_times),
+            'median': histogram.percentile(50) / 1_000_000,
             'min': min(response_times),
             'max': max(response_times),
-            'p95': sorted_times[int(0.95 * n)] if n > 0 else 0,
-            'p99': sorted_times[int(0.99 * n)] if n > 0 else 0
+            'p95': histogram.percentile(95) / 1_000_000,
+            'p99': histogram.percentile(99) / 1_000_000
         }
     
     def run_load_test(self, 
@@ -219,6 +406,159 @@ class LoadTestingSuite:
         
         return result
     
+    async def _run_open_model(self,
+                              scenarios: List[Scenario],
+                              rate: float,
+                              duration: float,
+                              ramp_to: Optional[float],
+                              max_in_flight: int,
+                              timeout: float,
+                              seed: Optional[int]) -> Dict[str, Any]:
+        """Issue requests on the arrival schedule and record latencies"""
+        rng = random.Random(seed)
+        weights = [scenario.weight for scenario in scenarios]
+        latency = LatencyHistogram()
+        service_time = LatencyHistogram()
+        per_scenario = {s.name: {'histogram': LatencyHistogram(), 'errors': 0} for s in scenarios}
+        status_codes: Dict[int, int] = {}
+        errors: List[str] = []
+        counters = {'successful': 0, 'failed': 0, 'in_flight': 0, 'peak_in_flight': 0}
+        # Caps open sockets only; time spent waiting here still counts toward latency
+        semaphore = asyncio.Semaphore(max_in_flight)
+        loop = asyncio.get_running_loop()
+        
+        async def fire(client: httpx.AsyncClient, scenario: Scenario, intended: float):
+            counters['in_flight'] += 1
+            counters['peak_in_flight'] = max(counters['peak_in_flight'], counters['in_flight'])
+            error = None
+            async with semaphore:
+                sent = loop.time()
+                try:
+                    response = await client.request(scenario.method, scenario.path, json=scenario.body)
+                    status_code = response.status_code
+                except Exception as e:
+                    status_code = 0
+                    error = f"{scenario.name}: {type(e).__name__}: {e}"
+            done = loop.time()
+            counters['in_flight'] -= 1
+            
+            latency.record_seconds(done - intended)
+            service_time.record_seconds(done - sent)
+            per_scenario[scenario.name]['histogram'].record_seconds(done - intended)
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+            if 200 <= status_code < 400:
+                counters['successful'] += 1
+            else:
+                counters['failed'] += 1
+                per_scenario[scenario.name]['errors'] += 1
+                if error and len(errors) < 10:
+                    errors.append(error)
+        
+        limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        headers = {'User-Agent': 'OpenPolicy-LoadTester/1.0', 'Accept': 'application/json'}
+        async with httpx.AsyncClient(base_url=self.base_url, headers=headers, limits=limits,
+                                     timeout=timeout, transport=self.transport) as client:
+            pending = set()
+            start = loop.time()
+            for offset in arrival_offsets(rate, duration, ramp_to):
+                intended = start + offset
+                delay = intended - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                scenario = rng.choices(scenarios, weights)[0]
+                task = asyncio.create_task(fire(client, scenario, intended))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            elapsed = loop.time() - start
+        
+        return {
+            'latency': latency,
+            'service_time': service_time,
+            'per_scenario': per_scenario,
+            'status_codes': status_codes,
+            'errors': errors,
+            'elapsed': elapsed,
+            **counters
+        }
+    
+    def run_open_model_test(self,
+                            test_name: str,
+                            scenarios: Optional[List[Scenario]] = None,
+                            rate: float = 50.0,
+                            duration: float = 30.0,
+                            ramp_to: Optional[float] = None,
+                            max_in_flight: int = 1000,
+                            timeout: float = 30.0,
+                            seed: Optional[int] = None) -> OpenModelResult:
+        """Run an open-model load test at a constant or ramped arrival rate"""
+        scenarios = scenarios or DEFAULT_SCENARIOS
+        logger.info(f"🚀 Starting open-model load test: {test_name}")
+        logger.info(f"   Arrival rate: {rate:g} rps" + (f" → {ramp_to:g} rps" if ramp_to is not None else ""))
+        logger.info(f"   Duration: {duration:g}s, scenarios: {', '.join(s.name for s in scenarios)}")
+        
+        start_time = datetime.now()
+        run = asyncio.run(self._run_open_model(scenarios, rate, duration, ramp_to, max_in_flight, timeout, seed))
+        end_time = datetime.now()
+        
+        latency: LatencyHistogram = run['latency']
+        total_requests = latency.total_count
+        elapsed = run['elapsed']
+        result = OpenModelResult(
+            test_name=test_name,
+            target_rps=rate,
+            ramp_to_rps=ramp_to,
+            duration=elapsed,
+            total_requests=total_requests,
+            successful_requests=run['successful'],
+            failed_requests=run['failed'],
+            error_rate=run['failed'] / total_requests if total_requests else 0,
+            throughput_rps=run['successful'] / elapsed if elapsed > 0 else 0,
+            peak_in_flight=run['peak_in_flight'],
+            latency_ms=latency.summary_ms(),
+            service_time_ms=run['service_time'].summary_ms(),
+            scenarios={
+                name: {'errors': stats['errors'], 'latency_ms': stats['histogram'].summary_ms()}
+                for name, stats in run['per_scenario'].items()
+            },
+            status_codes=run['status_codes'],
+            errors=run['errors'],
+            histogram=latency.to_dict()
+        )
+        self.open_results.append(result)
+        
+        # Also keep a LoadTestResult so generate_report/save_results cover open-model runs
+        self.results.append(LoadTestResult(
+            test_name=test_name,
+            total_requests=total_requests,
+            successful_requests=result.successful_requests,
+            failed_requests=result.failed_requests,
+            average_response_time=latency.mean / 1_000_000,
+            median_response_time=latency.percentile(50) / 1_000_000,
+            min_response_time=(latency.min_value or 0) / 1_000_000,
+            max_response_time=latency.max_value / 1_000_000,
+            p95_response_time=latency.percentile(95) / 1_000_000,
+            p99_response_time=latency.percentile(99) / 1_000_000,
+            requests_per_second=result.throughput_rps,
+            error_rate=result.error_rate,
+            start_time=start_time,
+            end_time=end_time,
+            duration=elapsed,
+            concurrent_users=result.peak_in_flight,
+            target_endpoint=", ".join(s.path for s in scenarios),
+            status_codes=result.status_codes,
+            errors=result.errors
+        ))
+        
+        logger.info(f"✅ Open-model load test completed: {test_name}")
+        logger.info(f"   Throughput: {result.throughput_rps:.1f} rps (peak in flight: {result.peak_in_flight})")
+        logger.info(f"   Latency p50/p99/p99.9: {result.latency_ms['p50']:.1f}/"
+                    f"{result.latency_ms['p99']:.1f}/{result.latency_ms['p999']:.1f} ms")
+        logger.info(f"   Error rate: {result.error_rate*100:.1f}%")
+        
+        return result
+    
     def run_performance_test_suite(self) -> Dict[str, Any]:
         """Run comprehensive performance test suite"""
         logger.info("🎯 Starting comprehensive performance test suite")
@@ -332,33 +672,39 @@ class LoadTestingSuite:
     
     def run_scalability_test(self, 
                            endpoint: str = '/api/v1/health',
-                           base_concurrent_users: int = 10,
+                           base_rps: float = 50.0,
                            scaling_factor: float = 2.0,
-                           max_iterations: int = 5) -> List[LoadTestResult]:
-        """Run scalability test to measure system scaling"""
+                           max_iterations: int = 5,
+                           step_duration: float = 20.0) -> List[LoadTestResult]:
+        """Run scalability test by stepping up the open-model arrival rate"""
         logger.info(f"📈 Starting scalability test on {endpoint}")
         
         scalability_results = []
-        current_concurrent_users = base_concurrent_users
+        current_rps = base_rps
+        scenarios = [Scenario(endpoint.strip('/').replace('/', '_') or 'root', 'GET', endpoint)]
         
         for iteration in range(max_iterations):
-            logger.info(f"   Iteration {iteration + 1}: {current_concurrent_users} concurrent users")
+            logger.info(f"   Iteration {iteration + 1}: {current_rps:g} requests/second")
             
             try:
-                result = self.run_load_test(
+                self.run_open_model_test(
                     test_name=f"Scalability Test - Iteration {iteration + 1}",
-                    endpoint=endpoint,
-                    concurrent_users=current_concurrent_users,
-                    total_requests=current_concurrent_users * 20
+                    scenarios=scenarios,
+                    rate=current_rps,
+                    duration=step_duration
                 )
+                result = self.results[-1]
                 scalability_results.append(result)
                 
                 # Check if performance is degrading
                 if result.error_rate > 0.05:  # 5% error rate
                     logger.warning(f"⚠️ Performance degradation detected: {result.error_rate*100:.1f}% error rate")
                     break
+                if result.requests_per_second < current_rps * 0.9:
+                    logger.warning(f"⚠️ Throughput saturated at {result.requests_per_second:.1f} rps")
+                    break
                 
-                current_concurrent_users = int(current_concurrent_users * scaling_factor)
+                current_rps = current_rps * scaling_factor
                 
             except Exception as e:
                 logger.error(f"❌ Scalability test failed at iteration {iteration + 1}: {e}")
@@ -366,6 +712,82 @@ class LoadTestingSuite:
         
         return scalability_results
     
+    def save_baseline(self, output_file: str = "load_test_baseline.json"):
+        """Save open-model results as a machine-readable baseline"""
+        baseline = {
+            'version': 1,
+            'created_at': datetime.now().isoformat(),
+            'base_url': self.base_url,
+            'tests': {
+                result.test_name: {
+                    'target_rps': result.target_rps,
+                    'ramp_to_rps': result.ramp_to_rps,
+                    'throughput_rps': result.throughput_rps,
+                    'error_rate': result.error_rate,
+                    'latency_ms': result.latency_ms,
+                    'histogram': result.histogram
+                }
+                for result in self.open_results
+            }
+        }
+        
+        with open(output_file, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        
+        logger.info(f"💾 Baseline saved to {output_file}")
+    
+    def compare_with_baseline(self,
+                              baseline_file: str,
+                              p99_threshold: float = 0.10,
+                              throughput_threshold: float = 0.10) -> Dict[str, Any]:
+        """Compare open-model results against a baseline.
+        
+        A test regresses when its p99 latency grows, or its throughput drops, by more
+        than the given fraction of the baseline value.
+        """
+        with open(baseline_file, 'r') as f:
+            baseline = json.load(f)
+        
+        comparisons = []
+        regressions = []
+        for result in self.open_results:
+            base = baseline.get('tests', {}).get(result.test_name)
+            if base is None:
+                comparisons.append({'test_name': result.test_name, 'status': 'missing_baseline'})
+                continue
+            
+            base_p99 = base['latency_ms']['p99']
+            base_throughput = base['throughput_rps']
+            checks = {
+                'p99_ms': (base_p99, result.latency_ms['p99'],
+                           result.latency_ms['p99'] > base_p99 * (1 + p99_threshold)),
+                'throughput_rps': (base_throughput, result.throughput_rps,
+                                   result.throughput_rps < base_throughput * (1 - throughput_threshold)),
+            }
+            comparison = {'test_name': result.test_name, 'status': 'ok'}
+            for metric, (before, after, regressed) in checks.items():
+                comparison[metric] = {
+                    'baseline': before,
+                    'current': after,
+                    'change': (after - before) / before if before else 0.0
+                }
+                if regressed:
+                    comparison['status'] = 'regressed'
+                    regressions.append(f"{result.test_name}: {metric} {before:.3f} → {after:.3f}")
+            comparisons.append(comparison)
+        
+        for regression in regressions:
+            logger.error(f"❌ Regression: {regression}")
+        
+        return {
+            'passed': not regressions,
+            'baseline_file': baseline_file,
+            'p99_threshold': p99_threshold,
+            'throughput_threshold': throughput_threshold,
+            'comparisons': comparisons,
+            'regressions': regressions
+        }
+    
     def generate_report(self, output_file: Optional[str] = None) -> str:
         """Generate comprehensive load testing report"""
         logger.info("📊 Generating load testing report")
@@ -472,10 +894,22 @@ def main():
     
     parser = argparse.ArgumentParser(description="OpenPolicy Platform Load Testing Suite")
     parser.add_argument("--base-url", default="http://localhost:8000", help="Base URL for testing")
-    parser.add_argument("--test-type", choices=["performance", "stress", "scalability", "all"], 
+    parser.add_argument("--test-type", choices=["performance", "stress", "scalability", "open", "all"], 
                        default="all", help="Type of test to run")
     parser.add_argument("--output", default="load_test_report.md", help="Output report file")
     parser.add_argument("--results", default="load_test_results.json", help="Results JSON file")
+    # Open-model load generator
+    parser.add_argument("--rate", type=float, default=50.0, help="Arrival rate (requests/second)")
+    parser.add_argument("--ramp-to", type=float, default=None, help="Ramp the arrival rate linearly to this value")
+    parser.add_argument("--duration", type=float, default=30.0, help="Open-model test duration (seconds)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Maximum concurrent connections")
+    parser.add_argument("--scenarios", default=None, help="JSON file with a weighted scenario mix")
+    parser.add_argument("--graphql-url", default=None,
+                        help="Add a GraphQL scenario against this endpoint, e.g. http://localhost:8001/graphql")
+    parser.add_argument("--save-baseline", default=None, help="Write open-model results as a baseline")
+    parser.add_argument("--compare-baseline", default=None, help="Fail if results regress against this baseline")
+    parser.add_argument("--p99-threshold", type=float, default=0.10, help="Allowed relative p99 increase")
+    parser.add_argument("--throughput-threshold", type=float, default=0.10, help="Allowed relative throughput drop")
     
     args = parser.parse_args()
     
@@ -495,15 +929,41 @@ def main():
             logger.info("📈 Running scalability test...")
             suite.run_scalability_test()
         
+        if args.test_type in ["open", "all"]:
+            logger.info("🌊 Running open-model load test...")
+            scenarios = load_scenarios(args.scenarios) if args.scenarios else list(DEFAULT_SCENARIOS)
+            if args.graphql_url:
+                scenarios.append(graphql_scenario(args.graphql_url))
+            suite.run_open_model_test(
+                test_name="Open Model - Scenario Mix",
+                scenarios=scenarios,
+                rate=args.rate,
+                duration=args.duration,
+                ramp_to=args.ramp_to,
+                max_in_flight=args.max_in_flight
+            )
+        
         # Generate and save report
         report = suite.generate_report(args.output)
         suite.save_results(args.results)
+        if args.save_baseline:
+            suite.save_baseline(args.save_baseline)
         
         print("\n" + "="*80)
         print("🎯 LOAD TESTING COMPLETE")
         print("="*80)
         print(report)
         
+        if args.compare_baseline:
+            comparison = suite.compare_with_baseline(
+                args.compare_baseline,
+                p99_threshold=args.p99_threshold,
+                throughput_threshold=args.throughput_threshold
+            )
+            print(json.dumps(comparison, indent=2))
+            if not comparison['passed']:
+                return 1
+        
     except KeyboardInterrupt:
         logger.info("⚠️ Load testing interrupted by user")
     except Exception as e:
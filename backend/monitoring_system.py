@@ -26,7 +26,7 @@ import logging
 import asyncio
 import threading
 import schedule
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -40,12 +40,15 @@ from pathlib import Path
 # Add project paths
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scrapers'))
+# src.database lives in OpenPolicyAshBack; appended so the backend's own api package wins
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'OpenPolicyAshBack'))
 
 from src.database.models import (
     Base, Jurisdiction, Representative, ScrapingRun, DataQualityIssue,
     JurisdictionType, RepresentativeRole
 )
 from src.database.config import get_database_url, SessionLocal
+from api.timeseries import TimeSeriesStore
 
 # Configure logging
 logging.basicConfig(
@@ -104,12 +107,17 @@ class DataQualityMetrics:
 class MonitoringSystem:
     """Comprehensive monitoring system for OpenPolicy platform"""
     
-    def __init__(self, database_url: str, alert_webhook: Optional[str] = None):
+    def __init__(self, database_url: str, alert_webhook: Optional[str] = None,
+                 metrics_store_dir: Optional[str] = None):
         self.database_url = database_url
         self.alert_webhook = alert_webhook
+        self.metrics_store = TimeSeriesStore(
+            metrics_store_dir or os.getenv('METRICS_STORE_DIR', 'timeseries')
+        )
         self.metrics_history: List[SystemMetrics] = []
         self.scraper_metrics: Dict[str, ScraperMetrics] = {}
         self.data_quality_metrics: Optional[DataQualityMetrics] = None
+        self._last_report_state: Optional[Dict[str, Any]] = None
         self.monitoring_interval = 300  # 5 minutes
         self.alert_thresholds = {
             'cpu_usage': 80.0,
@@ -147,13 +155,19 @@ class MonitoringSystem:
                 memory_usage=memory_usage,
                 disk_usage=disk_usage,
                 network_io=network_metrics,
-                timestamp=datetime.utcnow()
+                timestamp=datetime.now(timezone.utc)
             )
             
             self.metrics_history.append(metrics)
+            self._record_metrics({
+                'system.cpu_usage': cpu_usage,
+                'system.memory_usage': memory_usage,
+                'system.disk_usage': disk_usage,
+                **{f'system.network.{k}': v for k, v in network_metrics.items()}
+            })
             
             # Keep only last 24 hours of metrics
-            cutoff_time = datetime.utcnow() - timedelta(hours=24)
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
             self.metrics_history = [
                 m for m in self.metrics_history 
                 if m.timestamp > cutoff_time
@@ -163,7 +177,7 @@ class MonitoringSystem:
             
         except Exception as e:
             logger.error(f"Failed to collect system metrics: {str(e)}")
-            return SystemMetrics(0.0, 0.0, 0.0, {}, datetime.utcnow())
+            return SystemMetrics(0.0, 0.0, 0.0, {}, datetime.now(timezone.utc))
     
     def collect_scraper_metrics(self) -> Dict[str, ScraperMetrics]:
         """Collect scraper performance metrics from database"""
@@ -216,6 +230,20 @@ class MonitoringSystem:
             
             session.close()
             self.scraper_metrics = scraper_metrics
+            points = {'scrapers.total': len(scraper_metrics)}
+            if scraper_metrics:
+                points['scrapers.average_success_rate'] = (
+                    sum(m.success_rate for m in scraper_metrics.values()) / len(scraper_metrics)
+                )
+            for name, m in scraper_metrics.items():
+                points.update({
+                    f'scraper.{name}.success_rate': m.success_rate,
+                    f'scraper.{name}.records_collected': m.records_collected,
+                    f'scraper.{name}.records_inserted': m.records_inserted,
+                    f'scraper.{name}.execution_time': m.execution_time,
+                    f'scraper.{name}.error_count': m.error_count,
+                })
+            self._record_metrics(points)
             return scraper_metrics
             
         except Exception as e:
@@ -275,6 +303,7 @@ class MonitoringSystem:
             
             session.close()
             self.data_quality_metrics = metrics
+            self._record_metrics({f'data_quality.{k}': v for k, v in asdict(metrics).items()})
             return metrics
             
         except Exception as e:
@@ -308,7 +337,7 @@ class MonitoringSystem:
                     'connection': 'successful',
                     'representatives': rep_count,
                     'jurisdictions': jur_count,
-                    'last_check': datetime.utcnow().isoformat()
+                    'last_check': datetime.now(timezone.utc).isoformat()
                 }
                 
                 logger.info(f"✅ Database healthy: {rep_count} representatives, {jur_count} jurisdictions")
@@ -347,7 +376,7 @@ class MonitoringSystem:
             avg_success_rate = 0.0
         
         report = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'overall_status': overall_status.value,
             'system_metrics': {
                 'cpu_usage': system_metrics.cpu_usage,
@@ -444,16 +473,11 @@ class MonitoringSystem:
         else:
             logger.warning(f"Alert (no webhook configured): {alert['message']}")
     
-    def run_monitoring_cycle(self):
-        """Run a complete monitoring cycle"""
+    def run_monitoring_cycle(self, force_report: bool = False):
+        """Run a complete monitoring cycle; ``force_report`` writes the report file even if unchanged"""
         logger.info("🔄 Starting monitoring cycle...")
         
-        # Collect metrics
-        system_metrics = self.collect_system_metrics()
-        scraper_metrics = self.collect_scraper_metrics()
-        data_quality_metrics = self.collect_data_quality_metrics()
-        
-        # Generate report
+        # Generate report (collects and records system, scraper and data quality metrics once)
         report = self.generate_monitoring_report()
         
         # Send alerts
@@ -461,21 +485,58 @@ class MonitoringSystem:
             self.send_alert(alert)
         
         # Save report
-        self.save_monitoring_report(report)
+        self.save_monitoring_report(report, force=force_report)
         
         logger.info(f"✅ Monitoring cycle completed. Status: {report['overall_status']}")
         return report
     
-    def save_monitoring_report(self, report: Dict[str, Any]):
-        """Save monitoring report to file"""
+    def _record_metrics(self, points: Dict[str, float]):
+        """Append metric points to the time-series store"""
+        try:
+            self.metrics_store.write_many(points)
+        except Exception as e:
+            logger.error(f"Failed to record metrics: {str(e)}")
+    
+    @staticmethod
+    def _report_state(report: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a report that mark a change worth writing to disk.
+
+        Live readings (system metrics, the figures in alert messages) are left out;
+        they are in the time-series store every cycle.
+        """
+        return {
+            'overall_status': report['overall_status'],
+            'database_status': report['database_status'],
+            'scrapers_by_status': report['scraper_metrics']['scrapers_by_status'],
+            'data_quality_metrics': report['data_quality_metrics'],
+            'alerts': sorted(
+                (alert['type'], alert['severity'], alert['message'].split(':')[0])
+                for alert in report['alerts']
+            ),
+        }
+    
+    def save_monitoring_report(self, report: Dict[str, Any], force: bool = False):
+        """Save the latest monitoring report and apply metric retention.
+
+        Trend data lives in the time-series store, so only the most recent report is
+        kept on disk (replaced atomically), and it is only rewritten when its status,
+        alerts or data quality change, or when ``force`` is set.
+        """
         try:
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            filename = f"monitoring_report_{timestamp}.json"
+            filename = "monitoring_report_latest.json"
+            state = self._report_state(report)
             
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            if force or state != self._last_report_state or not os.path.exists(filename):
+                tmp_filename = f"{filename}.tmp"
+                with open(tmp_filename, 'w') as f:
+                    json.dump(report, f, default=str)
+                os.replace(tmp_filename, filename)
+                self._last_report_state = state
+                logger.info(f"📄 Monitoring report saved to {filename}")
             
-            logger.info(f"📄 Monitoring report saved to {filename}")
+            removed = self.metrics_store.enforce_retention()
+            if removed:
+                logger.info(f"🧹 {removed} expired metric segments removed")
             
         except Exception as e:
             logger.error(f"Failed to save monitoring report: {str(e)}")
@@ -487,8 +548,8 @@ class MonitoringSystem:
         # Schedule monitoring every 5 minutes
         schedule.every(self.monitoring_interval).seconds.do(self.run_monitoring_cycle)
         
-        # Run initial monitoring cycle
-        self.run_monitoring_cycle()
+        # Run initial monitoring cycle, always writing its report
+        self.run_monitoring_cycle(force_report=True)
         
         # Start continuous monitoring
         while True:
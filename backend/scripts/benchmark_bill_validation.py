@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Bill Validation Benchmark
+Validates synthetic federal bills (100k by default) with the per-bill validator and
+with the compiled batch rules (row-by-row, columnar pure Python, columnar pandas),
+reporting wall time and bills per second for each path.
+
+Usage:
+    python scripts/benchmark_bill_validation.py [--bills 100000] [--seed 7]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+OPENPOLICY_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "OpenPolicyAshBack"))
+# src.* for the validator's own imports; src/ itself so the rule engine loads as validation.rule_engine
+for path in (OPENPOLICY_ROOT, os.path.join(OPENPOLICY_ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from validation import rule_engine
+from src.validation.parliamentary_validator import ParliamentaryValidator
+
+TITLE_WORDS = ["budget", "privacy", "transit", "fisheries", "heritage", "employment", "climate",
+               "citizenship", "railway", "museums", "tax", "court", "agriculture", "postal"]
+
+
+def synthetic_bills(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    statuses = ParliamentaryValidator.VALID_BILL_STATUSES + ["Unknown", None]
+    bills = []
+    for i in range(count):
+        chamber = rng.choice("CS")
+        identifier = f"{chamber}-{rng.randint(1, 400)}" if rng.random() > 0.03 else f"X{i}"
+        words = rng.sample(TITLE_WORDS, rng.randint(1, 5))
+        title = "An Act respecting " + " and ".join(words) if rng.random() > 0.05 else "Bill " + identifier
+        bills.append(SimpleNamespace(
+            id=i,
+            identifier=identifier,
+            title=title,
+            summary=("This enactment amends the " + words[0] + " regime.") if rng.random() > 0.2 else None,
+            status=rng.choice(statuses),
+            updated_at=now - timedelta(hours=rng.randint(0, 24 * 60)),
+            url=f"https://www.parl.ca/legisinfo/bill/{identifier}" if rng.random() > 0.1 else "",
+        ))
+    return bills
+
+
+def legacy_field_checks(bills: list) -> int:
+    """The pre-compiled style: uncompiled re.match and list membership per bill"""
+    valid = 0
+    for bill in bills:
+        ok = bool(bill.identifier) and re.match(r'^\s*[CS]-\d+\s*$', bill.identifier, re.IGNORECASE) is not None
+        ok = ok and bool(bill.title) and 10 <= len(bill.title.strip()) <= 300
+        ok = ok and bill.status in ParliamentaryValidator.VALID_BILL_STATUSES
+        ok = ok and bool(bill.summary) and bool(bill.url)
+        valid += ok
+    return valid
+
+
+def timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark federal bill validation paths")
+    parser.add_argument("--bills", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    bills = synthetic_bills(args.bills, args.seed)
+    validator = ParliamentaryValidator()
+    rules = ParliamentaryValidator.BILL_RULES
+    records = [vars(bill) for bill in bills]
+
+    # Built once: the columnar paths are timed on validation alone
+    columns = {name: [getattr(bill, name) for bill in bills] for name in rules.fields}
+
+    paths = {
+        "per_bill_full_validation": lambda: validator.validate_bulk_bills(bills, include_results=False)["summary"]["passed"],
+        "legacy_field_checks": lambda: legacy_field_checks(bills),
+        "compiled_row_by_row": lambda: sum(rules.is_valid(record) for record in records),
+        "compiled_columnar_python": lambda: rules.validate_columns(columns, len(bills), vectorized=False).valid_count,
+    }
+    if rule_engine.pd is not None:
+        paths["compiled_columnar_pandas"] = lambda: rules.validate_columns(columns, len(bills), vectorized=True).valid_count
+
+    results = {}
+    for name, fn in paths.items():
+        elapsed, valid = timed(fn)
+        results[name] = {
+            "seconds": round(elapsed, 3),
+            "bills_per_second": round(len(bills) / elapsed),
+            "valid": valid,
+        }
+    results["field_failures"] = rules.validate_columns(columns, len(bills)).field_failures
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Microbenchmark
+Measures per-request overhead of the API middleware stack by driving the ASGI app
+in-process (no sockets). The same endpoint is run bare, wrapped in the previous
+BaseHTTPMiddleware stack (scripts/baseline_middleware.py) and wrapped in the current
+pure-ASGI stack, so the before/after overhead is reported side by side.
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests 5000] [--body-kb 16]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from fastapi import FastAPI
+
+from backend.api.middleware import performance, security, ip_allowlist
+from backend.scripts import baseline_middleware as baseline
+
+STACKS = {
+    "baseline": (baseline.SecurityMiddleware, baseline.InputValidationMiddleware, baseline.RateLimitMiddleware,
+                 baseline.IPAllowlistMiddleware, baseline.PerformanceMiddleware),
+    "asgi": (security.SecurityMiddleware, security.InputValidationMiddleware, security.RateLimitMiddleware,
+             ip_allowlist.IPAllowlistMiddleware, performance.PerformanceMiddleware),
+}
+
+
+def build_app(stack: Optional[str]) -> FastAPI:
+    app = FastAPI()
+    if stack:
+        sec, input_validation, rate_limit, allowlist, perf = STACKS[stack]
+        # Same order as backend.api.main.create_app
+        app.add_middleware(sec)
+        app.add_middleware(input_validation)
+        app.add_middleware(rate_limit, requests_per_minute=10**9)
+        app.add_middleware(allowlist, service_name="api")
+        app.add_middleware(perf, cache_ttl=300, rate_limit_per_minute=100)
+
+    @app.get("/bench")
+    async def bench_get():
+        return {"ok": True}
+
+    @app.post("/bench")
+    async def bench_post():
+        return {"ok": True}
+
+    return app
+
+
+async def call(app, method: str, body: bytes) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": "/bench", "raw_path": b"/bench",
+        "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+async def measure(app, method: str, body: bytes, requests: int) -> list:
+    for _ in range(min(200, requests)):  # warm-up
+        await call(app, method, body)
+    return [await call(app, method, body) for _ in range(requests)]
+
+
+def summarize(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p99_us": round(samples[int(len(samples) * 0.99)] * 1e6, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark API middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--body-kb", type=int, default=16)
+    args = parser.parse_args()
+
+    body = json.dumps({"text": "x" * (args.body_kb * 1024)}).encode()
+    results = {}
+    for method, payload in (("GET", b""), ("POST", body)):
+        bare = summarize(await measure(build_app(None), method, payload, args.requests))
+        results[method] = {"bare": bare}
+        for stack in STACKS:
+            stacked = summarize(await measure(build_app(stack), method, payload, args.requests))
+            results[method][stack] = dict(stacked, overhead_us=round(stacked["mean_us"] - bare["mean_us"], 1))
+        before, after = results[method]["baseline"]["overhead_us"], results[method]["asgi"]["overhead_us"]
+        results[method]["overhead_reduction"] = f"{before / after:.1f}x" if after > 0 else None
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
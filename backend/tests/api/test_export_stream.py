@@ -0,0 +1,115 @@
+import gzip
+import io
+from datetime import date
+
+import pytest
+
+from backend.api.export_stream import (
+    ExportError, ExportSpec, _ChunkSink, _Compressor, build_select, parse_range,
+)
+
+
+def test_spec_validation():
+    ExportSpec("bills_bill", format="parquet", compression="zstd").validate()
+    with pytest.raises(ExportError):
+        ExportSpec("users_user").validate()
+    with pytest.raises(ExportError):
+        ExportSpec("bills_bill", format="xml").validate()
+    with pytest.raises(ExportError):
+        ExportSpec("bills_bill", date_from=date(2024, 1, 1)).validate()
+
+
+def test_etag_depends_on_parameters_and_table_version():
+    spec = ExportSpec("bills_bill", columns=["id"])
+    assert spec.etag("1:0:0") == ExportSpec("bills_bill", columns=["id"]).etag("1:0:0")
+    assert spec.etag("1:0:0") != spec.etag("2:0:0")
+    assert spec.etag("1:0:0") != ExportSpec("bills_bill", columns=["id", "title"]).etag("1:0:0")
+    assert spec.filename("abc") == "bills_bill-abc.csv"
+    assert ExportSpec("bills_bill", format="jsonl", compression="gzip").extension == "jsonl.gz"
+
+
+def test_build_select_rejects_unknown_columns():
+    spec = ExportSpec("bills_bill", columns=["id", "password"])
+    with pytest.raises(ExportError):
+        build_select(spec, ["id", "title"], ["id"])
+
+
+def test_build_select_binds_date_filters():
+    spec = ExportSpec("bills_bill", columns=["id"], date_column="introduced",
+                      date_from=date(2024, 1, 1), date_to=date(2024, 2, 1))
+    _, params = build_select(spec, ["id", "introduced"], ["id"])
+    assert params == {"date_from": date(2024, 1, 1), "date_to": date(2024, 2, 1)}
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=10-", 100) == (10, 99)
+    assert parse_range("bytes=10-19", 100) == (10, 19)
+    assert parse_range("bytes=-5", 100) == (95, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+
+
+def test_gzip_output_is_deterministic():
+    def run():
+        c = _Compressor("gzip")
+        return c.compress(b"a,b\n" * 1000) + c.flush()
+    assert run() == run()
+    assert gzip.decompress(run()) == b"a,b\n" * 1000
+
+
+def test_chunk_sink_keeps_absolute_offsets_for_parquet():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = _ChunkSink()
+    schema = pa.schema([("id", pa.int64())])
+    out = b""
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, 30, 10):
+            writer.write_table(pa.table({"id": list(range(start, start + 10))}, schema=schema))
+            out += sink.drain()
+    out += sink.drain()
+    parquet = pq.ParquetFile(io.BytesIO(out))
+    assert parquet.num_row_groups == 3
+    assert parquet.read().column("id").to_pylist() == list(range(30))
+
+
+def test_follow_spool_streams_chunks_and_aborts_on_failure(tmp_path):
+    import asyncio
+    from backend.api import export_stream
+    from backend.api.export_stream import ExportStreamError, _SpoolJob, _follow_spool
+
+    async def follow(job, finish):
+        received = []
+        async def producer():
+            await asyncio.sleep(0.01)
+            finish(job)
+            job.done = True
+            async with job.changed:
+                job.changed.notify_all()
+        task = asyncio.create_task(producer())
+        try:
+            async for chunk in _follow_spool(job):
+                received.append(chunk)
+        finally:
+            await task
+        return received
+
+    def complete(job):
+        with open(job.path, "wb") as f:
+            f.write(b"x" * 10)
+
+    job = _SpoolJob(path=str(tmp_path / "ok.csv"))
+    export_stream.COPY_CHUNK_BYTES, saved = 4, export_stream.COPY_CHUNK_BYTES
+    try:
+        assert asyncio.run(follow(job, complete)) == [b"xxxx", b"xxxx", b"xx"]
+    finally:
+        export_stream.COPY_CHUNK_BYTES = saved
+
+    def fail(job):
+        job.error = "connection lost"
+
+    job = _SpoolJob(path=str(tmp_path / "failed.csv"))
+    with pytest.raises(ExportStreamError):
+        asyncio.run(follow(job, fail))
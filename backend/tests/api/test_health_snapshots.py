@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+from backend.api.health_snapshots import HealthSnapshotCollector
+
+
+def _fallback(error):
+    return {"status": "unhealthy", "error": error}
+
+
+def test_fresh_requests_are_rate_limited():
+    calls = []
+    collector = HealthSnapshotCollector(fresh_min_interval=60)
+    collector.register("system", lambda: calls.append(1) or {"status": "healthy", "n": len(calls)},
+                       interval=60, timeout=5, fallback=_fallback)
+
+    async def run():
+        first = await collector.get("system")  # never collected: probed on demand
+        forced = await collector.get("system", fresh=True)
+        limited = await collector.get("system", fresh=True)
+        return first, forced, limited
+
+    first, forced, limited = asyncio.run(run())
+    assert first.data["n"] == 1 and forced.data["n"] == 2
+    assert limited is forced and len(calls) == 2
+
+
+def test_slow_probe_times_out_without_piling_up_threads():
+    release = threading.Event()
+    started = []
+
+    def slow_database():
+        started.append(1)
+        release.wait(5)
+        return {"status": "healthy"}
+
+    collector = HealthSnapshotCollector(fresh_min_interval=0)
+    collector.register("database", slow_database, interval=60, timeout=0.05, fallback=_fallback)
+    collector.register("system", lambda: {"status": "healthy"}, interval=60, timeout=5, fallback=_fallback)
+
+    async def run():
+        begin = time.monotonic()
+        database = await collector.get("database")
+        again = await collector.get("database", fresh=True)
+        system = await collector.get("system")
+        elapsed = time.monotonic() - begin
+        probes_started = len(started)
+        release.set()
+        await asyncio.sleep(0.05)
+        recovered = await collector.get("database", fresh=True)
+        await collector.stop()
+        return database, again, system, recovered, elapsed, probes_started
+
+    database, again, system, recovered, elapsed, probes_started = asyncio.run(run())
+    assert database.data["status"] == "unhealthy" and "timed out" in database.error
+    assert again.error and probes_started == 1  # joined the in-flight probe
+    assert system.data == {"status": "healthy"}
+    assert elapsed < 1
+    assert recovered.data == {"status": "healthy"} and recovered.error is None
+
+
+def test_background_loop_and_health_endpoints(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api.routers import health
+
+    collector = HealthSnapshotCollector(fresh_min_interval=60)
+    collector.register("database", lambda: {"status": "healthy", "connectivity": "successful",
+                                            "politician_records": 7}, 0.01, 5, _fallback)
+    collector.register("system", lambda: {"status": "healthy", "cpu_usage": 10.0, "memory_usage": 20.0,
+                                          "disk_usage": 30.0, "network_io": {}, "active_processes": 3,
+                                          "load_average": [0.0, 0.0, 0.0], "uptime": "1:00:00"},
+                       0.01, 5, _fallback)
+    collector.register("scrapers", lambda: {"status": "warning", "total_scrapers": 0, "active_scrapers": 0,
+                                            "success_rate": 0.0, "timestamp": "t"}, 0.01, 5, _fallback)
+    monkeypatch.setattr(health, "collector", collector)
+
+    app = FastAPI()
+    app.include_router(health.router, prefix="/api/v1")
+    with TestClient(app) as client:
+        client.portal.call(collector.start)
+        assert collector.running
+        detailed = client.get("/api/v1/health/detailed").json()
+        assert detailed["status"] == "healthy" and detailed["database"] == "healthy"
+        assert detailed["snapshot_age_seconds"] >= 0
+        comprehensive = client.get("/api/v1/health/comprehensive", params={"fresh": 1}).json()
+        assert comprehensive["status"] == "warning"
+        assert comprehensive["summary"]["healthy_components"] == 3
+        metrics = client.get("/api/v1/health/metrics").json()
+        assert metrics["database"] == {"connected": True, "politician_records": 7}
+        client.portal.call(collector.stop)
+    assert not collector.running
@@ -0,0 +1,99 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routers import scraper_monitoring
+from backend.api.log_tail import format_sse, read_from_offset, resolve_log_file, tail_lines
+
+
+def _write(path, lines):
+    with open(path, "w") as f:
+        f.writelines(f"{line}\n" for line in lines)
+
+
+def test_tail_lines_reads_backwards_across_blocks(tmp_path):
+    log = tmp_path / "scraper_run.log"
+    _write(log, [f"line {i}" for i in range(1000)])
+    lines, cursor = tail_lines(str(log), 5, block_size=16)
+    assert lines == [f"line {i}" for i in range(995, 1000)]
+    assert cursor == os.path.getsize(log)
+
+
+def test_tail_lines_with_predicate_and_short_file(tmp_path):
+    log = tmp_path / "scraper_run.log"
+    _write(log, ["ottawa start", "toronto start", "", "ottawa done"])
+    lines, _ = tail_lines(str(log), 10, predicate=lambda l: "ottawa" in l, block_size=8)
+    assert lines == ["ottawa start", "ottawa done"]
+
+
+def test_read_from_offset_returns_only_complete_new_lines(tmp_path):
+    log = tmp_path / "scraper_run.log"
+    _write(log, ["one", "two"])
+    _, cursor = tail_lines(str(log), 10)
+    with open(log, "a") as f:
+        f.write("three\nfour-partial")
+    lines, cursor = read_from_offset(str(log), cursor)
+    assert lines == ["three"]
+    with open(log, "a") as f:
+        f.write("\n")
+    lines, cursor = read_from_offset(str(log), cursor)
+    assert lines == ["four-partial"]
+    assert cursor == os.path.getsize(log)
+    # Truncated files restart from the beginning
+    _write(log, ["fresh"])
+    assert read_from_offset(str(log), cursor)[0] == ["fresh"]
+
+
+def test_read_from_offset_limit_keeps_unread_lines(tmp_path):
+    log = tmp_path / "scraper_run.log"
+    _write(log, [f"line {i}" for i in range(10)])
+    lines, cursor = read_from_offset(str(log), 0, limit=3, predicate=lambda l: l != "line 1")
+    assert lines == ["line 0", "line 2", "line 3"]
+    lines, cursor = read_from_offset(str(log), cursor, limit=100)
+    assert lines == [f"line {i}" for i in range(4, 10)]
+    assert cursor == os.path.getsize(log)
+
+
+def test_read_from_offset_advances_past_oversized_line(tmp_path):
+    log = tmp_path / "scraper_run.log"
+    with open(log, "w") as f:
+        f.write("x" * 20 + "\nafter\n")
+    lines, cursor = read_from_offset(str(log), 0, max_bytes=8)
+    assert lines == ["x" * 8] and cursor == 8
+    pieces = lines
+    while cursor < os.path.getsize(log):
+        lines, cursor = read_from_offset(str(log), cursor, max_bytes=8)
+        pieces += lines
+    assert "".join(pieces[:-1]) == "x" * 20 and pieces[-1] == "after"
+
+
+def test_resolve_log_file_rejects_traversal(tmp_path):
+    _write(tmp_path / "scraper_run.log", ["x"])
+    assert resolve_log_file(str(tmp_path), "scraper_run.log")
+    assert resolve_log_file(str(tmp_path), "../scraper_run.log") is None
+    assert resolve_log_file(str(tmp_path), "secrets.txt") is None
+
+
+def test_format_sse():
+    assert format_sse({"line": "a"}, event_id=7) == 'id: 7\ndata: {"line": "a"}\n\n'
+
+
+def test_monitoring_logs_endpoint_cursor(tmp_path):
+    log = tmp_path / "scraper_run.log"
+    _write(log, ["first", "second"])
+    app = FastAPI()
+    app.include_router(scraper_monitoring.router)
+    app.state.scraper_logs_dir = str(tmp_path)
+    with TestClient(app) as client:
+        r = client.get("/api/v1/scrapers/logs", params={"limit": 1})
+        assert r.status_code == 200
+        body = r.json()
+        assert [entry["line"] for entry in body["logs"]] == ["second"]
+        cursor = body["cursors"]["scraper_run.log"]
+        with open(log, "a") as f:
+            f.write("third\n")
+        r = client.get("/api/v1/scrapers/logs", params={"file": "scraper_run.log", "cursor": cursor})
+        assert [entry["line"] for entry in r.json()["logs"]] == ["third"]
+        r = client.get("/api/v1/scrapers/logs", params={"file": "../etc/passwd.log"})
+        assert r.status_code == 404
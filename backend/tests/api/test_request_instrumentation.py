@@ -0,0 +1,97 @@
+import importlib
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from backend.api.main import app
+from backend.api.middleware.performance import PerformanceMiddleware
+from backend.api.profiler import SamplingProfiler
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_route_template_latency_and_db_time():
+    engine = create_engine("sqlite://")
+    test_app = FastAPI()
+    test_app.add_middleware(PerformanceMiddleware)
+
+    @test_app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT :id"), {"id": item_id})
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before_count = _sample("http_request_duration_seconds_count", status="200", **labels)
+    before_queries = _sample("http_request_db_queries_sum", **labels)
+
+    client = TestClient(test_app)
+    for item_id in (1, 2, 3):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert _sample("http_request_duration_seconds_count", status="200", **labels) == before_count + 3
+    assert _sample("http_request_db_queries_sum", **labels) == before_queries + 6
+    assert _sample("http_request_db_seconds_count", **labels) >= 3
+    assert _sample("http_request_duration_seconds_count", method="GET", route="<unmatched>", status="404") >= 1
+    assert _sample("http_requests_in_flight", method="GET") == 0
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    worker.start()
+    profiler = SamplingProfiler(interval=0.002)
+    profiler.start()
+    time.sleep(0.2)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    samples, total = profiler.summary()
+    assert samples > 10 and total > 0
+    busy = [line for line in profiler.collapsed().splitlines() if line.startswith("busy-worker;")]
+    assert busy and "_spin (test_request_instrumentation.py:" in busy[0]
+    assert int(busy[0].rsplit(" ", 1)[1]) > 0
+
+
+def test_profile_endpoint_requires_admin(auth_headers):
+    client = TestClient(app)
+    assert client.get("/api/v1/admin/profile?seconds=0.1").status_code == 401
+    r = client.get("/api/v1/admin/profile?seconds=0.1&include_idle=true", headers=auth_headers)
+    assert r.status_code == 200
+    assert int(r.headers["X-Profile-Samples"]) > 0
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in r.text.splitlines())
+
+
+def test_instrumentation_is_one_module_under_both_package_names():
+    # A second copy would try to register the same metric names again and fail
+    api_copy = importlib.import_module("api.instrumentation")
+    assert api_copy is importlib.import_module("backend.api.instrumentation")
+    assert api_copy.REQUEST_LATENCY is importlib.import_module("backend.api.instrumentation").REQUEST_LATENCY
+
+
+def test_nonstandard_methods_share_one_label():
+    test_app = FastAPI()
+    test_app.add_middleware(PerformanceMiddleware)
+    labels = {"route": "<unmatched>", "status": "404"}
+    before = _sample("http_request_duration_seconds_count", method="OTHER", **labels)
+
+    client = TestClient(test_app)
+    for method in ("PURGE", "X-RANDOM-1", "X-RANDOM-2"):
+        assert client.request(method, "/missing").status_code == 404
+
+    assert _sample("http_request_duration_seconds_count", method="OTHER", **labels) == before + 3
+    assert _sample("http_request_duration_seconds_count", method="PURGE", **labels) == 0
@@ -0,0 +1,104 @@
+import pytest
+
+from backend.api.timeseries import DAY_MS, HOUR_MS, MINUTE_MS, TimeSeriesStore, metric_name
+
+T0 = 1_700_000_000_000 - 1_700_000_000_000 % DAY_MS  # aligned to a day
+
+
+def _fill(store, metric="system.cpu_usage", minutes=180, every_s=30):
+    for i in range(minutes * 60 // every_s):
+        store.write(metric, float(i % 10), T0 + i * every_s * 1000)
+
+
+def test_raw_query_and_latest(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    _fill(store, minutes=10)
+    resolution, points = store.query("system.cpu_usage", T0, T0 + 60_000, resolution="raw")
+    assert resolution == "raw"
+    assert points == [(T0, 0.0), (T0 + 30_000, 1.0)]
+    assert store.latest("system.cpu_usage") == (T0 + 19 * 30_000, 9.0)
+
+
+def test_rollups_match_raw_including_open_bucket(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    _fill(store)
+    _, minutes = store.query("system.cpu_usage", T0, T0 + 3 * HOUR_MS, resolution="1m", agg="count")
+    assert len(minutes) == 180 and all(v == 2 for _, v in minutes)
+    _, hours = store.query("system.cpu_usage", T0, T0 + 3 * HOUR_MS, resolution="1h", agg="max")
+    assert [ts for ts, _ in hours] == [T0, T0 + HOUR_MS, T0 + 2 * HOUR_MS]
+    assert all(v == 9.0 for _, v in hours)
+    # A fresh reader (another process) sees the same data, rebuilding the open buckets from raw
+    reader = TimeSeriesStore(str(tmp_path))
+    assert reader.query("system.cpu_usage", T0, T0 + 3 * HOUR_MS, resolution="1h", agg="max")[1] == hours
+
+
+def test_aggregate_and_auto_resolution(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    _fill(store, minutes=60)
+    stats = store.aggregate("system.cpu_usage", T0, T0 + HOUR_MS)
+    assert stats["count"] == 120
+    assert stats["min"] == 0.0 and stats["max"] == 9.0
+    assert store.choose_resolution(T0, T0 + HOUR_MS, 500, now=T0 + HOUR_MS) == "1m"
+    assert store.choose_resolution(T0, T0 + 20 * DAY_MS, 500, now=T0 + 20 * DAY_MS) == "1h"
+
+
+def test_writer_recovers_state_after_restart(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.write("m", 1.0, T0)
+    store.write("m", 3.0, T0 + 10_000)
+    restarted = TimeSeriesStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        restarted.write("m", 0.0, T0)
+    restarted.write("m", 5.0, T0 + MINUTE_MS)
+    _, minutes = restarted.query("m", T0, T0 + 2 * MINUTE_MS, resolution="1m", agg="avg")
+    assert minutes == [(T0, 2.0), (T0 + MINUTE_MS, 5.0)]
+
+
+
+def test_write_many_is_all_or_nothing(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.write("b", 1.0, T0 + 10_000)
+    with pytest.raises(ValueError):
+        store.write_many({"a": 1.0, "b": 2.0, "c": 3.0}, T0)
+    with pytest.raises(ValueError):
+        store.write_many({"a": 1.0, "c": "n/a"}, T0 + 20_000)
+    assert store.metrics() == ["b"] and store.latest("b") == (T0 + 10_000, 1.0)
+    store.write_many({"a": 1.0, "b": 2.0, "c": 3.0}, T0 + 20_000)
+    assert store.latest("a") == (T0 + 20_000, 1.0)
+
+def test_retention_drops_old_segments(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.write("m", 1.0, T0)
+    store.write("m", 2.0, T0 + 10 * DAY_MS)
+    assert store.enforce_retention(now=T0 + 10 * DAY_MS) == 2  # raw .ts/.val of day one
+    assert store.query("m", T0, T0 + DAY_MS, resolution="raw")[1] == []
+    assert store.query("m", T0, T0 + DAY_MS, resolution="1d", agg="sum")[1] == [(T0, 1.0)]
+
+
+def test_metric_name_sanitized():
+    assert metric_name("scraper.Toronto City/Council.success_rate") == "scraper.Toronto_City_Council.success_rate"
+    with pytest.raises(ValueError):
+        metric_name("../..")
+
+
+def test_dashboard_trends_endpoint(tmp_path, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api.config import settings
+    from backend.api.routers import dashboard
+    from backend.api.timeseries import now_ms
+
+    monkeypatch.setattr(settings, "metrics_store_dir", str(tmp_path))
+    store = TimeSeriesStore(str(tmp_path))
+    start = now_ms() - 10 * MINUTE_MS
+    for i in range(10):
+        store.write("system.cpu_usage", float(i), start + i * MINUTE_MS)
+
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    client = TestClient(app)
+    assert client.get("/api/v1/dashboard/trends/metrics").json() == {"metrics": ["system.cpu_usage"]}
+    body = client.get("/api/v1/dashboard/trends", params={"metric": "system.cpu_usage", "hours": 1}).json()
+    assert body["resolution"] == "1m"
+    assert body["summary"]["count"] == 10
+    assert client.get("/api/v1/dashboard/trends", params={"metric": "nope"}).status_code == 404
@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.OpenPolicyAshBack.src.bill_analysis import (
+    CRITICALITY,
+    SUMMARY,
+    AnalysisStore,
+    StubProvider,
+    analyze_batch,
+    bill_content_hash,
+)
+from backend.OpenPolicyAshBack.src.database.models import (
+    Base,
+    Bill,
+    BillAnalysis,
+    BillStatus,
+    Jurisdiction,
+    JurisdictionType,
+)
+
+
+def make_store():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Jurisdiction.__table__, Bill.__table__, BillAnalysis.__table__])
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+    with SessionLocal() as db:
+        jurisdiction = Jurisdiction(id=uuid.uuid4(), name="Canada", code="ca", jurisdiction_type=JurisdictionType.FEDERAL)
+        db.add(jurisdiction)
+        bills = [
+            Bill(id=uuid.uuid4(), jurisdiction_id=jurisdiction.id, bill_number=f"C-{n}", title=f"Bill {n}",
+                 summary="An Act", status=BillStatus.INTRODUCED)
+            for n in range(1, 7)
+        ]
+        db.add_all(bills)
+        db.commit()
+    return AnalysisStore(SessionLocal, BillAnalysis), bills
+
+
+def run_batch(store, provider, bills, kind=SUMMARY, concurrency=3):
+    async def analyze_one(bill):
+        return {"text": await provider.complete("system", f"{kind} {bill.bill_number} {bill.summary}", 100, 0.0)}
+
+    return asyncio.run(analyze_batch(bills, kind, analyze_one, store, provider.model, concurrency=concurrency))
+
+
+def test_analyses_are_stored_by_content_hash():
+    store, bills = make_store()
+    provider = StubProvider(latency=0.01)
+
+    results, stats = run_batch(store, provider, bills)
+    assert stats.computed == 6 and stats.cached == 0 and provider.calls == 6
+
+    results_again, stats = run_batch(store, provider, bills)
+    assert results_again == results
+    assert stats.cached == 6 and stats.hit_rate == 1.0 and provider.calls == 6
+
+    # A changed bill is reanalyzed; the other kinds of analysis are kept separately
+    old_hash = bill_content_hash(bills[0], SUMMARY)
+    bills[0].summary = "An Act, as amended"
+    assert bill_content_hash(bills[0], SUMMARY) != old_hash
+    updated, stats = run_batch(store, provider, bills)
+    assert stats.computed == 1 and stats.cached == 5
+    assert updated[1:] == results[1:]
+    assert store.get_many(SUMMARY, "stub", {bills[0].id: bill_content_hash(bills[0], SUMMARY)}) == {
+        bills[0].id: updated[0]}
+    _, stats = run_batch(store, provider, bills, kind=CRITICALITY)
+    assert stats.computed == 6
+
+
+def test_batch_bounds_concurrency_and_skips_failures():
+    store, bills = make_store()
+    active = peak = 0
+
+    async def analyze_one(bill):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if bill.bill_number == "C-2":
+            raise ValueError("bad response")
+        return {"ok": bill.bill_number}
+
+    results, stats = asyncio.run(analyze_batch(bills, SUMMARY, analyze_one, store, "stub", concurrency=2))
+    assert peak == 2
+    assert stats.failed == 1 and stats.computed == 5
+    assert "error" in results[1] and results[0] == {"ok": "C-1"}
+    # Failures are not stored, so the next run retries only them
+    _, stats = asyncio.run(analyze_batch(bills, SUMMARY, analyze_one, store, "stub", concurrency=2))
+    assert stats.cached == 5 and stats.failed == 1
+
+
+def test_stub_provider_is_deterministic():
+    provider = StubProvider()
+    prompt = 'Respond with JSON: {"importance_score": 1-10}'
+    first = asyncio.run(provider.complete("s", prompt, 100, 0.2))
+    assert first == asyncio.run(provider.complete("s", prompt, 100, 0.2))
+    assert '"importance_score"' in first
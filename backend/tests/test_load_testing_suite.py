@@ -0,0 +1,100 @@
+import random
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.load_testing_suite import (
+    DEFAULT_SCENARIOS,
+    LatencyHistogram,
+    LoadTestingSuite,
+    Scenario,
+    arrival_offsets,
+    graphql_scenario,
+)
+
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(7)
+    values = [rng.randint(50, 2_000_000) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for p in (50, 90, 99, 99.9):
+        exact = values[max(0, int(len(values) * p / 100 + 0.5) - 1)]
+        assert abs(histogram.percentile(p) - exact) <= exact * 0.002
+    assert histogram.percentile(100) == values[-1]
+
+    restored = LatencyHistogram.from_dict(histogram.to_dict())
+    restored.merge(histogram)
+    assert restored.total_count == 40000
+    assert restored.percentile(99) == histogram.percentile(99)
+
+
+def test_arrival_offsets_constant_and_ramped():
+    constant = list(arrival_offsets(10, 2))
+    assert len(constant) == 20 and constant[1] == pytest.approx(0.1)
+    ramped = list(arrival_offsets(10, 10, ramp_to=30))
+    assert len(ramped) == 200
+    assert all(b > a for a, b in zip(ramped, ramped[1:])) and ramped[-1] < 10
+    # The rate at the end of the ramp is roughly three times the rate at the start
+    assert (ramped[1] - ramped[0]) / (ramped[-1] - ramped[-2]) == pytest.approx(3, rel=0.05)
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/graphql")
+    async def graphql():
+        return {"data": {}}
+
+    return app
+
+
+def test_open_model_run_and_baseline_gate(tmp_path):
+    suite = LoadTestingSuite(base_url="http://test", transport=httpx.ASGITransport(app=_app()))
+    scenarios = [Scenario("health", "GET", "/api/v1/health", weight=3),
+                 Scenario("graphql", "POST", "/graphql", weight=1, body={"query": "{ x }"}),
+                 Scenario("missing", "GET", "/nope", weight=1)]
+    result = suite.run_open_model_test("mix", scenarios=scenarios, rate=200, duration=0.5, seed=1)
+
+    assert result.total_requests == 100
+    assert result.failed_requests == result.scenarios["missing"]["errors"] > 0
+    assert result.status_codes[404] == result.failed_requests
+    assert result.latency_ms["p99"] >= result.service_time_ms["p50"]
+    assert suite.results[-1].test_name == "mix"
+
+    baseline = tmp_path / "baseline.json"
+    suite.save_baseline(str(baseline))
+    assert suite.compare_with_baseline(str(baseline))["passed"]
+
+    result.latency_ms = dict(result.latency_ms, p99=result.latency_ms["p99"] * 2 + 1)
+    comparison = suite.compare_with_baseline(str(baseline), p99_threshold=0.10)
+    assert not comparison["passed"]
+    assert comparison["comparisons"][0]["status"] == "regressed"
+
+
+def test_graphql_scenario_is_opt_in_and_targets_its_service():
+    assert all(not scenario.path.startswith("/graphql") for scenario in DEFAULT_SCENARIOS)
+
+    requests = []
+
+    async def graphql_service(scope, receive, send):
+        # Stands in for the separate GraphQL service; the base URL's host must not be used
+        requests.append((scope["headers"], scope["path"]))
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"data": {}}'})
+
+    suite = LoadTestingSuite(base_url="http://api.test", transport=httpx.ASGITransport(app=graphql_service))
+    result = suite.run_open_model_test(
+        "graphql", scenarios=[graphql_scenario("http://graphql.test:8001/graphql")], rate=100, duration=0.1, seed=1)
+
+    assert result.failed_requests == 0
+    assert requests and all(path == "/graphql" for _, path in requests)
+    assert all((b"host", b"graphql.test:8001") in headers for headers, _ in requests)
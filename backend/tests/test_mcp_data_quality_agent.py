@@ -0,0 +1,98 @@
+from backend.mcp_data_quality_agent import (
+    TABLE_QUALITY_CHECKS,
+    MCPDataQualityAgent,
+    ValidationResult,
+    build_quality_scan_query,
+)
+
+
+def test_scan_query_is_single_aggregate_with_filters():
+    checks = TABLE_QUALITY_CHECKS["representatives"]
+    full = build_quality_scan_query("representatives", checks, incremental=False, max_tracked=100)
+    assert full.startswith("SELECT COUNT(*) AS scanned") and full.count('FROM "representatives" t') == 1
+    assert "COUNT(*) FILTER (WHERE NOT (" in full
+    assert "fk_jurisdiction_id_count" in full and "duplicate_ids" in full
+    assert "[1:100]" in full and "WHERE t.\"updated_at\"" not in full
+
+    incremental = build_quality_scan_query("representatives", checks, incremental=True, max_tracked=100)
+    assert incremental.endswith('WHERE t."updated_at" >= :since OR t.id = ANY(CAST(:tracked AS uuid[]))')
+    votes = build_quality_scan_query("votes", TABLE_QUALITY_CHECKS["votes"], incremental=True, max_tracked=100)
+    assert "FILTER" not in votes and 't."created_at" >= :since' in votes
+
+
+def test_table_validations_from_running_totals():
+    agent = MCPDataQualityAgent.__new__(MCPDataQualityAgent)
+    validations = agent._table_validations(
+        "representatives", TABLE_QUALITY_CHECKS["representatives"], 100,
+        {"invalid": 10, "fk:jurisdiction_id": 3, "duplicate": 2},
+    )
+    table, fk, unique = validations
+    assert (table.records_count, table.records_valid) == (100, 90)
+    assert table.foreign_key_issues == 3 and table.constraint_violations == 2
+    assert table.validation_result == ValidationResult.WARNING
+    assert fk.table_name == "representatives_jurisdictions_fk" and fk.foreign_key_issues == 3
+    assert unique.table_name == "representatives_uniqueness"
+    assert not table.records_count_estimated
+    estimated = agent._table_validations("votes", TABLE_QUALITY_CHECKS["votes"], 50, {}, estimated=True)
+    assert estimated[0].records_count_estimated
+
+
+def test_record_rules_compiled_and_batched():
+    agent = MCPDataQualityAgent.__new__(MCPDataQualityAgent)
+    agent._setup_validation_rules()
+    good = {"name": "Jane", "role": "mp", "jurisdiction_id": 1, "email": "jane@parl.gc.ca", "phone": None}
+    bad_email = dict(good, email="not-an-email")
+    missing = dict(good, name="")
+    assert agent._validate_record("representatives", good)
+    assert not agent._validate_record("representatives", bad_email)
+    assert agent._validate_record("unknown", {})
+
+    batch = agent._validate_batch("representatives", [good, bad_email, missing])
+    assert batch.invalid_indices == [1, 2]
+    assert batch.field_failures == {"name": {"required": 1}, "email": {"pattern": 1}}
+
+
+def test_python_and_vectorized_batches_agree():
+    from validation.rule_engine import compile_rules, length, one_of, pattern, required
+
+    rules = compile_rules({
+        "identifier": [required(), pattern(r"^[CS]-\d+$")],
+        "title": [length(10, 30)],
+        "status": [one_of(["passed", "introduced"])],
+    })
+    rows = [
+        {"identifier": "C-12", "title": "An Act respecting transit", "status": "passed"},
+        {"identifier": "X-1", "title": "Short", "status": "unknown"},
+        {"identifier": None, "title": None, "status": None},
+        {"identifier": 7, "title": 42, "status": "introduced"},
+    ] * 50
+    python = rules.validate_records(rows, vectorized=False)
+    vectorized = rules.validate_records(rows, vectorized=True)
+    assert python.valid == vectorized.valid
+    assert python.field_failures == vectorized.field_failures == {
+        "identifier": {"required": 50, "pattern": 100},
+        "title": {"length": 100},
+        "status": {"one_of": 50},
+    }
+
+
+def test_python_and_vectorized_batches_agree_on_nan_and_unhashable_values():
+    from validation.rule_engine import compile_rules, one_of, pattern, required
+
+    rules = compile_rules({
+        "identifier": [required(), pattern(r"^[CS]-\d+$")],
+        "status": [one_of(["passed", "introduced"])],
+    })
+    rows = [
+        {"identifier": float("nan"), "status": ["passed"]},
+        {"identifier": "C-1", "status": {"a": 1}},
+        {"identifier": "C-2", "status": float("nan")},
+    ] * 10
+    python = rules.validate_records(rows, vectorized=False)
+    vectorized = rules.validate_records(rows, vectorized=True)
+    assert python.valid == vectorized.valid
+    assert python.valid_count == 10
+    assert python.field_failures == vectorized.field_failures == {
+        "identifier": {"required": 10},
+        "status": {"one_of": 20},
+    }
@@ -65,18 +65,16 @@ class TestSecurityMiddleware:
 class TestPerformanceMiddleware:
     """Test performance middleware functionality"""
     
-    def test_caching(self, client):
-        """Test response caching"""
-        # First request should be cache miss
+    def test_process_time(self, client):
+        """Test every response is timed and none are served from a cache"""
         response1 = client.get("/test")
-        assert response1.headers["X-Cache"] == "MISS"
-        
-        # Second request should be cache hit
         response2 = client.get("/test")
-        assert response2.headers["X-Cache"] == "HIT"
-        
+        assert "X-Cache" not in response1.headers
+        assert "X-Cache" not in response2.headers
+
         # Process time should be recorded
-        assert "X-Process-Time" in response1.headers
+        assert float(response1.headers["X-Process-Time"]) >= 0
+        assert float(response2.headers["X-Process-Time"]) >= 0
     
     def test_rate_limiting(self, client):
         """Test rate limiting"""
@@ -163,7 +161,6 @@ class TestMiddlewareIntegration:
         # Check all headers are present
         assert "X-Content-Type-Options" in response.headers
         assert "X-Process-Time" in response.headers
-        assert "X-Cache" in response.headers
     
     def test_error_handling(self, client):
         """Test error handling in middleware"""
@@ -177,3 +174,102 @@ class TestMiddlewareIntegration:
         
         response = client.get("/test")
         assert response.status_code == 429
+
+class TestASGIMiddleware:
+    """Test pure-ASGI specific behaviour (chunked bodies, streaming, allowlists)"""
+
+    @staticmethod
+    async def _post_chunks(middleware, chunks, headers=()):
+        """Drive ``middleware`` with a POST whose body arrives in ``chunks``"""
+        received = []
+        sent = []
+
+        async def app(scope, receive, send):
+            while True:
+                message = await receive()
+                received.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    break
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        messages = [
+            {"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+            for i, c in enumerate(chunks)
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": "/", "client": ("127.0.0.1", 1), "headers": list(headers)}
+        await middleware(app)(scope, receive, send)
+        return sent[0]["status"], b"".join(received)
+
+    def test_pattern_split_across_chunks_is_detected(self):
+        import asyncio
+        status, _ = asyncio.run(self._post_chunks(InputValidationMiddleware, [b'{"q": "union se', b'lect 1"}']))
+        assert status == 400
+
+    def test_chunked_body_is_replayed_to_app(self):
+        import asyncio
+        chunks = [b'{"q": "normal ', b'content"}']
+        status, body = asyncio.run(self._post_chunks(InputValidationMiddleware, chunks))
+        assert status == 200
+        assert body == b"".join(chunks)
+
+    def test_body_over_size_cap_is_rejected(self):
+        import asyncio
+        from functools import partial
+        capped = partial(InputValidationMiddleware, max_scan_bytes=8)
+        status, body = asyncio.run(self._post_chunks(capped, [b"a" * 8, b"drop table x"]))
+        assert status == 413
+        assert body == b""
+        status, body = asyncio.run(self._post_chunks(capped, [b"a" * 4, b"b" * 4]))
+        assert status == 200
+        assert body == b"a" * 4 + b"b" * 4
+        json_headers = [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", b"9")]
+        status, _ = asyncio.run(self._post_chunks(capped, [b"a" * 9], json_headers))
+        assert status == 413
+
+    def test_large_binary_body_passes_through(self):
+        import asyncio
+        from functools import partial
+        capped = partial(InputValidationMiddleware, max_scan_bytes=8)
+        chunks = [b"a" * 8, b"drop table x"]
+        headers = [(b"content-type", b"application/octet-stream"), (b"content-length", b"20")]
+        status, body = asyncio.run(self._post_chunks(capped, chunks, headers))
+        assert status == 200
+        assert body == b"".join(chunks)
+
+    def test_streaming_response_passes_through(self, app_with_middleware):
+        from fastapi.responses import StreamingResponse
+
+        @app_with_middleware.get("/stream")
+        async def stream():
+            async def gen():
+                for i in range(3):
+                    yield f"data: {i}\n\n"
+            return StreamingResponse(gen(), media_type="text/event-stream")
+
+        response = TestClient(app_with_middleware).get("/stream")
+        assert response.status_code == 200
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+        assert "X-Process-Time" in response.headers
+
+    def test_network_set_lookup(self):
+        from api.middleware.ip_allowlist import NetworkSet
+        nets = NetworkSet(["10.0.0.0/8", "192.168.1.0/24", "2001:db8::/32"])
+        assert "10.1.2.3" in nets
+        assert "192.168.1.77" in nets
+        assert "192.168.2.1" not in nets
+        assert "2001:db8::1" in nets
+        assert "::ffff:10.0.0.1" in nets
+        assert "testclient" not in nets
+        assert "8.8.8.8" in NetworkSet(["0.0.0.0/0", "::/0"])
+        for allow_all in (["0.0.0.0/0"], ["::/0"]):
+            nets = NetworkSet(allow_all)
+            assert nets.allow_all
+            assert "2001:db8::1" in nets and "8.8.8.8" in nets and "testclient" in nets
@@ -0,0 +1,89 @@
+import importlib
+import threading
+import time
+
+from backend.OpenPolicyAshBack.src.scrapers.concurrency import (
+    AdaptiveConcurrencyController,
+    AIMDConfig,
+    scraper_host,
+)
+
+
+def make_controller(resources=(10.0, 10.0), **overrides):
+    config = AIMDConfig(**{"max_limit": 8, "initial_limit": 2, "window": 2, **overrides})
+    return AdaptiveConcurrencyController("test", config, resource_sampler=lambda: resources)
+
+
+def run_window(controller, host, latency, ok=True, count=2):
+    for _ in range(count):
+        assert controller.try_acquire(host)
+    for _ in range(count):
+        controller.release(host, latency, ok)
+
+
+def test_additive_increase_and_multiplicative_decrease():
+    controller = make_controller(host_limit=8, host_initial_limit=2)
+    run_window(controller, "a.example", 1.0)
+    assert controller.limit == 3
+    run_window(controller, "a.example", 1.0, count=3)  # only a saturated window grows the limit
+    assert controller.limit == 4
+
+    run_window(controller, "a.example", 1.0, ok=False, count=1)
+    assert controller.limit == 2
+    assert [d.action for d in controller.decisions if d.host == "*"] == ["increase", "increase", "decrease"]
+    assert controller.decisions[-1].reason == "errors"
+
+    run_window(controller, "a.example", 5.0)
+    assert controller.decisions[-1].reason == "latency"
+
+
+def test_resource_pressure_and_idle_windows():
+    busy = make_controller(resources=(97.0, 40.0), host_limit=8, host_initial_limit=2)
+    run_window(busy, "a.example", 1.0)
+    assert busy.limit == 1 and busy.decisions[-1].reason == "cpu"
+
+    idle = make_controller(host_limit=8)
+    idle.try_acquire("a.example")
+    idle.release("a.example", 1.0)
+    idle.try_acquire("a.example")
+    idle.release("a.example", 1.0)
+    assert idle.limit == 2 and idle.decisions[-1].reason == "underused"
+
+
+def test_map_respects_per_host_limit_and_times_out():
+    controller = make_controller(max_limit=6, initial_limit=6, window=50)
+    active, peak, lock = {}, {}, threading.Lock()
+
+    def work(item):
+        host, delay = item
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(delay)
+        with lock:
+            active[host] -= 1
+        return host
+
+    items = [("slow.example", 0.05)] * 3 + [("fast.example", 0.01)] * 3 + [("hung.example", 1.0)]
+    outcomes = list(controller.map(work, items, host_of=lambda item: item[0],
+                                   timeout_of=lambda item: 0.2 if item[0] == "hung.example" else None))
+
+    assert len(outcomes) == len(items)
+    assert peak["slow.example"] == 1 and peak["fast.example"] == 1
+    hung = [o for o in outcomes if o.item[0] == "hung.example"]
+    assert hung[0].timed_out and isinstance(hung[0].error, TimeoutError)
+    assert controller.host_limit("hung.example") == 1
+
+
+def test_scraper_host_reads_people_source(tmp_path):
+    scraper = tmp_path / "ca_on_example"
+    scraper.mkdir()
+    (scraper / "people.py").write_text('COUNCIL_PAGE = "https://www.example.ca/council"\n')
+    assert scraper_host(scraper) == "example.ca"
+    assert scraper_host(tmp_path / "ca_missing") == "ca_missing"
+
+
+def test_module_loads_once_under_its_import_names():
+    module = importlib.import_module("backend.OpenPolicyAshBack.src.scrapers.concurrency")
+    assert importlib.import_module("src.scrapers.concurrency") is module
+    assert module.AIMDConfig is AIMDConfig
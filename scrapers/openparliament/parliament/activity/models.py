@@ -1,5 +1,6 @@
 from django.db import models
 
+from parliament.core import generations
 from parliament.core.models import Politician
 from parliament.core.utils import ActiveManager
 
@@ -25,5 +26,7 @@ class Activity(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         super(Activity, self).save(*args, **kwargs)
+        # Covers save_activity, pruning and hiding: the politician page lists recent activity
+        generations.bump_scopes([('politician', self.politician_id)])
         
         
\ No newline at end of file
@@ -2,19 +2,25 @@ import datetime
 from hashlib import sha1
 
 from django.conf import settings
+from django.db import transaction
 from django.template import loader
 
 from parliament.activity.models import Activity
+from parliament.core import generations
+
+def _guid(obj, variety, guid=None):
+    if not guid:
+        guid = variety + str(obj.id)
+    if len(guid) > 50:
+        guid = sha1(guid.encode('utf8')).hexdigest()
+    return guid
 
 def save_activity(obj, politician, date, guid=None, variety=None):
     if not getattr(settings, 'PARLIAMENT_SAVE_ACTIVITIES', True):
         return
     if not variety:
         variety = obj.__class__.__name__.lower()
-    if not guid:
-        guid = variety + str(obj.id)
-    if len(guid) > 50:
-        guid = sha1(guid.encode('utf8')).hexdigest()
+    guid = _guid(obj, variety, guid)
     if Activity.objects.filter(guid=guid).exists():
         return False
     t = loader.get_template("activity/%s.html" % variety.lower())
@@ -26,6 +32,43 @@ def save_activity(obj, politician, date, guid=None, variety=None):
         payload = t.render(c)).save()
     return True
 
+def save_activities(items, variety=None):
+    """Bulk save_activity() for an iterable of (obj, politician, date) or
+    (obj, politician, date, guid), using one query to skip existing activities
+    (and duplicates within the batch) and one to insert the rest.
+    Returns the number created."""
+    if not getattr(settings, 'PARLIAMENT_SAVE_ACTIVITIES', True):
+        return 0
+    items = [(obj, politician, date, variety or obj.__class__.__name__.lower(), guid[0] if guid else None)
+             for obj, politician, date, *guid in items]
+    guids = [_guid(obj, v, guid) for obj, _, _, v, guid in items]
+    existing = set(Activity.objects.filter(guid__in=guids).values_list('guid', flat=True))
+    templates = {}
+    new = []
+    for (obj, politician, date, v, _), guid in zip(items, guids):
+        if guid in existing:
+            continue
+        existing.add(guid)
+        if v not in templates:
+            templates[v] = loader.get_template("activity/%s.html" % v)
+        new.append(Activity(variety=v,
+            date=date,
+            politician=politician,
+            guid=guid,
+            payload=templates[v].render({'obj': obj, 'politician': politician})))
+    if not new:
+        return 0
+    # Rows another process inserted since the check above are silently skipped by
+    # ignore_conflicts, so count what's actually there rather than trusting len(new)
+    new_guids = [a.guid for a in new]
+    with transaction.atomic():
+        before = Activity.objects.filter(guid__in=new_guids).count()
+        Activity.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+        created = Activity.objects.filter(guid__in=new_guids).count() - before
+    # bulk_create skips Activity.save(), so bump the politicians' pages here
+    generations.bump_scopes(('politician', a.politician_id) for a in new)
+    return created
+
 ACTIVITY_MAX = {
     'twitter': 6,
     'gnews': 6,
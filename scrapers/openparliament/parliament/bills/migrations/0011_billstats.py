@@ -0,0 +1,29 @@
+# Generated by Django 5.1 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0010_bill_latest_debate_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillStats',
+            fields=[
+                ('bill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='bills.bill')),
+                ('words_by_stage', models.JSONField(default=dict)),
+                ('speeches_by_stage', models.JSONField(default=dict)),
+                ('mentions', models.PositiveIntegerField(default=0, help_text='Number of House debate statements mentioning the bill')),
+                ('first_debated', models.DateField(blank=True, null=True)),
+                ('last_debated', models.DateField(blank=True, null=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'bill stats',
+            },
+        ),
+    ]
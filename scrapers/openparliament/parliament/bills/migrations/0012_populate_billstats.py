@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-18 12:00
+
+from django.db import migrations
+
+from parliament.bills.models import update_bill_stats
+
+def populate_bill_stats(apps, schema_editor):
+    Bill = apps.get_model('bills', 'Bill')
+    BillStats = apps.get_model('bills', 'BillStats')
+    Statement = apps.get_model('hansards', 'Statement')
+    bill_ids = list(Bill.objects.values_list('id', flat=True))
+    for i in range(0, len(bill_ids), 500):
+        update_bill_stats(BillStats, Statement, bill_ids[i:i + 500])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0011_billstats'),
+        ('hansards', '0007_statement_content_plain'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_bill_stats, migrations.RunPython.noop),
+    ]
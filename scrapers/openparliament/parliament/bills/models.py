@@ -11,6 +11,7 @@ from django.utils.safestring import mark_safe
 
 from parliament.committees.models import Committee, CommitteeMeeting
 from parliament.core.models import Session, ElectedMember, Politician, Party
+from parliament.core import generations
 from parliament.core.utils import language_property, memoize_property
 from parliament.hansards.models import Document, Statement
 from parliament.activity import utils as activity
@@ -160,6 +161,13 @@ class Bill(models.Model):
     
     def __str__(self):
         return "%s - %s" % (self.number, self.name)
+
+    def generation_scope(self):
+        return ('bill', self.id)
+
+    @property
+    def cache_generation(self):
+        return generations.get_generation(*self.generation_scope())
         
     def get_absolute_url(self):
         return reverse('bill', kwargs={
@@ -220,6 +228,7 @@ class Bill(models.Model):
         if not self.law and self.status_code == 'RoyalAssentGiven':
             self.law = True
         super(Bill, self).save(*args, **kwargs)
+        generations.bump(self)
 
     def save_sponsor_activity(self):
         if self.sponsor_politician:
@@ -324,10 +333,94 @@ class Bill(models.Model):
                 private_member_bill=self.privatemember,
                 legisinfo_url=self.get_legisinfo_url(),
                 status_code=self.status_code,
-                status={'en': self.status}
+                status={'en': self.status},
+                debate_stats=BillStats.for_bill(self).to_api_dict(),
             )
         return d    
 
+class BillStats(models.Model):
+    """Debate statistics for a bill, kept up to date by the Hansard import
+    so bill pages don't have to aggregate over its statements."""
+    bill = models.OneToOneField(Bill, primary_key=True, on_delete=models.CASCADE, related_name='stats')
+    # {bill_debate_stage: n}, counting only non-procedural statements
+    words_by_stage = models.JSONField(default=dict)
+    speeches_by_stage = models.JSONField(default=dict)
+    mentions = models.PositiveIntegerField(default=0,
+        help_text="Number of House debate statements mentioning the bill")
+    first_debated = models.DateField(blank=True, null=True)
+    last_debated = models.DateField(blank=True, null=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'bill stats'
+
+    # Stages with less than this many words don't get their own tab
+    MIN_STAGE_WORDS = 150
+
+    def __str__(self):
+        return "Stats for %s" % self.bill_id
+
+    @property
+    def debate_stages(self) -> dict[str, int]:
+        """{stage: words} for the stages with a substantial debate."""
+        return {stage: words for stage, words in self.words_by_stage.items()
+                if words > self.MIN_STAGE_WORDS}
+
+    @classmethod
+    def update_for_bills(cls, bill_ids) -> int:
+        """Recompute stats for the given bill IDs, in three aggregate queries
+        and one upsert. Returns the number of bills updated."""
+        return update_bill_stats(cls, Statement, bill_ids)
+
+    @classmethod
+    def for_bill(cls, bill: Bill) -> 'BillStats':
+        """The bill's stats, or empty (unsaved) stats if it hasn't been debated.
+        Read-only: migration 0012 fills stats for existing bills, and the Hansard
+        import (or the bill_stats job) keeps them current."""
+        try:
+            return cls.objects.get(bill=bill)
+        except cls.DoesNotExist:
+            return cls(bill=bill)
+
+    def to_api_dict(self):
+        return {
+            'words_by_stage': self.words_by_stage,
+            'speeches_by_stage': self.speeches_by_stage,
+            'mentions': self.mentions,
+            'first_debated': str(self.first_debated) if self.first_debated else None,
+            'last_debated': str(self.last_debated) if self.last_debated else None,
+        }
+
+def update_bill_stats(stats_model, statement_model, bill_ids) -> int:
+    """BillStats.update_for_bills(), with the models passed in so that
+    data migrations can run it on their historical models."""
+    bill_ids = set(b for b in bill_ids if b is not None)
+    if not bill_ids:
+        return 0
+    stats = {bill_id: stats_model(bill_id=bill_id) for bill_id in bill_ids}
+
+    for r in statement_model.objects.filter(bill_debated__in=bill_ids, procedural=False).values(
+            'bill_debated', 'bill_debate_stage').annotate(words=models.Sum('wordcount'),
+                                                          speeches=models.Count('id')):
+        s = stats[r['bill_debated']]
+        s.words_by_stage[r['bill_debate_stage']] = r['words']
+        s.speeches_by_stage[r['bill_debate_stage']] = r['speeches']
+
+    for r in statement_model.objects.filter(bill_debated__in=bill_ids).values('bill_debated').annotate(
+            first=models.Min('document__date'), last=models.Max('document__date')):
+        stats[r['bill_debated']].first_debated = r['first']
+        stats[r['bill_debated']].last_debated = r['last']
+
+    for r in statement_model.mentioned_bills.through.objects.filter(
+            bill__in=bill_ids, statement__document__document_type=Document.DEBATE).values(
+            'bill').annotate(n=models.Count('statement')):
+        stats[r['bill']].mentions = r['n']
+
+    stats_model.objects.bulk_create(stats.values(), update_conflicts=True, unique_fields=['bill'],
+        update_fields=['words_by_stage', 'speeches_by_stage', 'mentions',
+                       'first_debated', 'last_debated', 'updated'])
+    return len(stats)
+
 class BillText(models.Model):
 
     bill = models.ForeignKey(Bill, on_delete=models.CASCADE)
@@ -407,26 +500,27 @@ class VoteQuestion(models.Model):
         return r
 
     def label_absent_members(self):
-        for member in ElectedMember.objects.on_date(self.date).exclude(membervote__votequestion=self):
-            MemberVote(votequestion=self, member=member, politician_id=member.politician_id, vote='A').save()
+        MemberVote.objects.bulk_create([
+            MemberVote(votequestion=self, member=member, politician_id=member.politician_id, vote='A')
+            for member in ElectedMember.objects.on_date(self.date).exclude(membervote__votequestion=self)
+        ])
             
     def label_party_votes(self):
         """Create PartyVote objects representing the party-line vote; label individual dissenting votes."""
-        membervotes = self.membervote_set.select_related('member', 'member__party').all()
         parties = defaultdict(lambda: defaultdict(int))
-        
-        for mv in membervotes:
-            if mv.member.party.name != 'Independent':
-                parties[mv.member.party][mv.vote] += 1
+        for row in self.membervote_set.exclude(member__party__name_en='Independent')\
+                .values('member__party', 'vote').annotate(n=models.Count('id')):
+            parties[row['member__party']][row['vote']] = row['n']
         
         partyvotes = {}
-        for party in parties:
+        new_partyvotes = []
+        for party_id in parties:
             # Find the most common vote
-            votes = sorted(list(parties[party].items()), key=lambda i: i[1])
-            partyvotes[party] = votes[-1][0]
+            votes = sorted(list(parties[party_id].items()), key=lambda i: i[1])
+            partyvotes[party_id] = votes[-1][0]
             
             # Find how many people voted with the majority
-            yn = (parties[party]['Y'], parties[party]['N'])
+            yn = (parties[party_id]['Y'], parties[party_id]['N'])
             try:
                 disagreement = float(min(yn))/sum(yn)
             except ZeroDivisionError:
@@ -435,19 +529,28 @@ class VoteQuestion(models.Model):
             # If more than 15% of the party voted against the party majority,
             # label this as a free vote.
             if disagreement >= 0.15:
-                partyvotes[party] = 'F'
+                partyvotes[party_id] = 'F'
             
-            PartyVote.objects.filter(party=party, votequestion=self).delete()
-            PartyVote.objects.create(party=party, votequestion=self, vote=partyvotes[party], disagreement=disagreement)
+            new_partyvotes.append(PartyVote(party_id=party_id, votequestion=self,
+                vote=partyvotes[party_id], disagreement=disagreement))
+        PartyVote.objects.filter(votequestion=self, party__in=list(parties)).delete()
+        PartyVote.objects.bulk_create(new_partyvotes)
         
-        for mv in membervotes:
-            if mv.member.party.name != 'Independent' \
-              and mv.vote != partyvotes[mv.member.party] \
-              and mv.vote in ('Y', 'N') \
-              and partyvotes[mv.member.party] in ('Y', 'N'):
-                mv.dissent = True
-                mv.save()
-            
+        # A dissent is a Y or N vote against a party's Y or N line; one UPDATE ... CASE for all members
+        dissent = [
+            models.When(vote=against, then=models.Value(True),
+                member__in=ElectedMember.objects.filter(party__in=party_ids).values('id'))
+            for line, against in (('Y', 'N'), ('N', 'Y'))
+            if (party_ids := [p for p, v in partyvotes.items() if v == line])
+        ]
+        self.membervote_set.update(dissent=models.Case(*dissent, default=models.Value(False)))
+
+    def save_member_activities(self):
+        """Activity items for every member vote, created in bulk."""
+        activity.save_activities(
+            (mv, mv.politician, self.date) for mv in self.membervote_set.select_related(
+                'politician', 'member__politician', 'votequestion__bill'))
+
     def get_absolute_url(self):
         return reverse('vote', kwargs={
             'session_id': self.session_id, 'number': self.number})
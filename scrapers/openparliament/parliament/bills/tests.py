@@ -0,0 +1,100 @@
+import datetime
+from collections import defaultdict
+
+from django.test import TestCase
+
+from parliament.bills.models import MemberVote, PartyVote, VoteQuestion
+from parliament.core.models import ElectedMember
+
+def label_votes_per_row(vq):
+    """The per-row labelling that label_absent_members and label_party_votes replaced."""
+    for member in ElectedMember.objects.on_date(vq.date).exclude(membervote__votequestion=vq):
+        MemberVote(votequestion=vq, member=member, politician_id=member.politician_id, vote='A').save()
+
+    membervotes = vq.membervote_set.select_related('member', 'member__party').all()
+    parties = defaultdict(lambda: defaultdict(int))
+    for mv in membervotes:
+        if mv.member.party.name != 'Independent':
+            parties[mv.member.party][mv.vote] += 1
+
+    partyvotes = {}
+    for party in parties:
+        votes = sorted(list(parties[party].items()), key=lambda i: i[1])
+        partyvotes[party] = votes[-1][0]
+        yn = (parties[party]['Y'], parties[party]['N'])
+        try:
+            disagreement = float(min(yn))/sum(yn)
+        except ZeroDivisionError:
+            disagreement = 0.0
+        if disagreement >= 0.15:
+            partyvotes[party] = 'F'
+        PartyVote.objects.filter(party=party, votequestion=vq).delete()
+        PartyVote.objects.create(party=party, votequestion=vq, vote=partyvotes[party], disagreement=disagreement)
+
+    for mv in membervotes:
+        if mv.member.party.name != 'Independent' \
+          and mv.vote != partyvotes[mv.member.party] \
+          and mv.vote in ('Y', 'N') \
+          and partyvotes[mv.member.party] in ('Y', 'N'):
+            mv.dissent = True
+            mv.save()
+
+class VoteLabellingTests(TestCase):
+
+    fixtures = ['parties', 'ridings', 'sessions', 'politicians']
+
+    def cast_votes(self, number):
+        date = datetime.date(2009, 6, 1)
+        vq = VoteQuestion.objects.create(session_id='40-2', number=number, date=date,
+            description_en='Test vote', result='Y', yea_total=0, nay_total=0, paired_total=0)
+        by_party = defaultdict(list)
+        for member in ElectedMember.objects.on_date(date).select_related('party').order_by('id'):
+            by_party[member.party.name_en].append(member)
+        # A clear Yes line with dissenters, a free vote, a No line with one dissenter,
+        # a line with pairs, and members left without a recorded vote
+        ballots = {
+            'Conservative Party of Canada': lambda i: 'N' if i % 10 == 3 else 'Y',
+            'Liberal Party of Canada': lambda i: 'N' if i % 3 == 0 else 'Y',
+            'New Democratic Party': lambda i: 'Y' if i == 1 else 'N',
+            'Bloc Québécois': lambda i: 'P' if i % 4 == 0 else 'Y',
+            'Independent': lambda i: 'N',
+        }
+        self.assertEqual(set(by_party), set(ballots))
+        MemberVote.objects.bulk_create([
+            MemberVote(votequestion=vq, member=member, politician_id=member.politician_id,
+                vote=ballots[party](i))
+            for party, members in by_party.items()
+            for i, member in enumerate(members)
+            if i % 7 != 6
+        ])
+        return vq
+
+    def results(self, vq):
+        return (
+            sorted(vq.membervote_set.values_list('member_id', 'vote', 'dissent')),
+            sorted(vq.partyvote_set.values_list('party_id', 'vote', 'disagreement')),
+        )
+
+    def test_bulk_labelling_matches_per_row(self):
+        expected = self.cast_votes(1)
+        label_votes_per_row(expected)
+
+        vq = self.cast_votes(2)
+        vq.label_absent_members()
+        vq.label_party_votes()
+
+        membervotes, partyvotes = self.results(vq)
+        self.assertEqual((membervotes, partyvotes), self.results(expected))
+        self.assertEqual({vote for party, vote, disagreement in partyvotes}, {'Y', 'N', 'F'})
+        self.assertTrue(any(dissent for member, vote, dissent in membervotes))
+        self.assertIn('A', {vote for member, vote, dissent in membervotes})
+
+    def test_relabelling_clears_dissent(self):
+        vq = self.cast_votes(1)
+        vq.label_absent_members()
+        vq.label_party_votes()
+        # The Conservative dissenters fall in line; only the NDP member voting Yes still dissents
+        vq.membervote_set.filter(dissent=True, vote='N').update(vote='Y')
+        vq.label_party_votes()
+        self.assertEqual(list(vq.membervote_set.filter(dissent=True).values_list('vote', flat=True)), ['Y'])
+        self.assertEqual(PartyVote.objects.filter(votequestion=vq).count(), 4)
@@ -5,7 +5,7 @@ from urllib.parse import urlencode
 from django.contrib.syndication.views import Feed
 from django.urls import reverse
 from django.core.paginator import Paginator, InvalidPage, EmptyPage
-from django.db.models import Count, Sum
+from django.db.models import Count
 from django.http import HttpResponse, Http404, HttpResponseRedirect, HttpResponsePermanentRedirect
 from django.shortcuts import get_object_or_404
 from django.template import loader
@@ -13,7 +13,7 @@ from django.template.defaultfilters import date as format_date
 from django.utils.safestring import mark_safe
 from django.views.decorators.vary import vary_on_headers
 
-from parliament.bills.models import Bill, VoteQuestion, MemberVote
+from parliament.bills.models import Bill, BillStats, VoteQuestion, MemberVote
 from parliament.core.api import ModelListView, ModelDetailView, APIFilters
 from parliament.core.models import Session
 from parliament.core.utils import is_ajax
@@ -64,14 +64,10 @@ class BillDetailView(ModelDetailView):
         mentions = Statement.objects.filter(mentioned_bills=bill, document__document_type=Document.DEBATE).order_by(
             '-time', '-sequence').select_related('member', 'member__politician', 'member__riding', 'member__party')
         
-        debate_stages = {
-            r['bill_debate_stage']: r['words']
-            for r in
-            Statement.objects.filter(bill_debated=bill, procedural=False).values('bill_debate_stage').annotate(words=Sum("wordcount"))
-            if r['words'] > 150
-        }
+        stats = BillStats.for_bill(bill)
+        debate_stages = stats.debate_stages
         meetings = bill.get_committee_meetings()
-        has_mentions = mentions.exists()
+        has_mentions = stats.mentions > 0
         has_meetings = meetings.exists()
 
         tab = request.GET.get('tab', '')
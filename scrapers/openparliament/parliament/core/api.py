@@ -1,3 +1,4 @@
+import copy
 import json
 import re
 
@@ -5,12 +6,15 @@ from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.http import HttpResponse, Http404, HttpResponseBadRequest
 from django.middleware.cache import FetchFromCacheMiddleware as DjangoFetchFromCacheMiddleware
+from django.middleware.cache import UpdateCacheMiddleware as DjangoUpdateCacheMiddleware
 from django.shortcuts import render
 from django.utils.html import escape
 from django.views.generic import View
 
 from webob.acceptparse import MIMEAccept
 
+from parliament.core import generations
+
 
 class APIView(View):
 
@@ -332,7 +336,26 @@ class FetchFromCacheMiddleware(DjangoFetchFromCacheMiddleware):
         if request.get_host().lower().startswith(settings.PARLIAMENT_API_HOST):
             request._cache_update_cache = False
             return None
-        return super(FetchFromCacheMiddleware, self).process_request(request)
+        # Politician, bill and debate pages are keyed on their generation counter,
+        # so a cached copy is replaced as soon as the underlying data changes.
+        request._cache_key_prefix = generations.page_key_prefix(request, self.key_prefix)
+        return super(FetchFromCacheMiddleware, _with_key_prefix(self, request)).process_request(request)
+
+
+class UpdateCacheMiddleware(DjangoUpdateCacheMiddleware):
+    # Stores responses under the key prefix chosen by FetchFromCacheMiddleware.
+
+    def process_response(self, request, response):
+        return super(UpdateCacheMiddleware, _with_key_prefix(self, request)).process_response(request, response)
+
+
+def _with_key_prefix(middleware, request):
+    key_prefix = getattr(request, '_cache_key_prefix', None)
+    if key_prefix is None or key_prefix == middleware.key_prefix:
+        return middleware
+    clone = copy.copy(middleware)  # middleware instances are shared between requests
+    clone.key_prefix = key_prefix
+    return clone
 
 
 class BadRequest(Exception):
@@ -78,27 +78,6 @@ def corpus_for_pol(pol):
         words.extend(re.split(r_splitter, s.text))
     return [w for w in words if len(w) > 0]
 
-r_splitter = re.compile(r'[^\w\'\-]+', re.UNICODE)
-def spark_index(bucketsize, bigrams=False):
-    
-    
-    index = defaultdict(int)
-    bucketidx = 0
-    bucketcount = 0
-    for s in Statement.objects.all().order_by('time'):
-        tokens = re.split(r_splitter, s.text.lower())
-        for t in tokens:
-            if t != '':
-                index[t[:15]] += 1
-        bucketcount += len(tokens)
-        if bucketcount >= bucketsize:
-            # save
-            for entry in index.items():
-                SparkIndex(token=entry[0], count=entry[1], bucket=bucketidx).save()
-            index = defaultdict(int)
-            bucketcount = 0
-            bucketidx += 1
-            
 def populate_members_by():
     for by in Election.objects.filter(byelection=True):
         print(str(by))
@@ -0,0 +1,158 @@
+"""Generation counters for exact cache invalidation.
+
+Each politician, bill and document has a counter in the cache that is bumped
+whenever something shown on its pages changes: a new activity, a saved
+statement, an import. Page and fragment cache keys include the counter, so
+cached output stays valid until the next change rather than expiring on a timer.
+"""
+import datetime
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import Resolver404, resolve
+
+FRAGMENT_CACHE_SECONDS = getattr(settings, 'PARLIAMENT_FRAGMENT_CACHE_SECONDS', 60 * 60 * 24 * 7)
+LOOKUP_CACHE_SECONDS = 60 * 60 * 24
+
+_local = threading.local()
+
+
+def _key(scope):
+    return 'gen:%s:%s' % scope
+
+
+def _seed():
+    # Microseconds: a counter lost from the cache restarts above any value it reached
+    return time.time_ns() // 1000
+
+
+def get_generations(scopes):
+    """Current counters for a list of (kind, id) scopes, creating missing ones."""
+    keys = [_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = [k for k in keys if k not in found]
+    if missing:
+        for k in missing:
+            cache.add(k, _seed(), timeout=None)  # add(): concurrent seeders agree on one value
+        found.update(cache.get_many(missing))
+    return [found.get(k, 0) for k in keys]
+
+
+def get_generation(kind, ident):
+    return get_generations([(kind, ident)])[0]
+
+
+def _apply(scopes):
+    for scope in scopes:
+        try:
+            cache.incr(_key(scope))
+        except ValueError:
+            cache.set(_key(scope), _seed(), timeout=None)
+
+
+def bump_scopes(scopes):
+    """Invalidate the given (kind, id) scopes once the current transaction commits."""
+    scopes = {scope for scope in scopes if scope[1] is not None}
+    if not scopes:
+        return
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending.update(scopes)
+    else:
+        transaction.on_commit(lambda: _apply(scopes))
+
+
+def bump(*objs):
+    """Invalidate cached pages and fragments for model instances with a generation_scope()."""
+    bump_scopes(obj.generation_scope() for obj in objs if obj is not None)
+
+
+@contextmanager
+def batched_bumps():
+    """Collect bumps made inside the block (e.g. by an importer saving thousands of
+    statements) and apply each distinct one once, after the transaction commits."""
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending = pending = set()
+    try:
+        yield
+    finally:
+        _local.pending = None
+    if pending:
+        transaction.on_commit(lambda: _apply(pending))
+
+
+def cached_fragment(obj, name, compute, timeout=FRAGMENT_CACHE_SECONDS):
+    """Low-level fragment cache: compute() once per generation of obj."""
+    key = 'frag:%s:%s:%s:%s' % (obj.generation_scope() + (obj.cache_generation, name))
+    return cache.get_or_set(key, compute, timeout)
+
+
+def _lookup(kind, lookup_key, query):
+    """Map a URL identifier (slug, date, ...) to a primary key, cached since these rarely change."""
+    key = 'genid:%s:%s' % (kind, lookup_key)
+    pk = cache.get(key)
+    if pk is None:
+        pk = query()
+        if pk is not None:
+            cache.set(key, pk, LOOKUP_CACHE_SECONDS)
+    return pk
+
+
+def _politician_scope(kwargs):
+    from parliament.core.models import Politician
+    if kwargs.get('pol_id'):
+        return int(kwargs['pol_id'])
+    return _lookup('politician', kwargs['pol_slug'], lambda: Politician.objects.filter(
+        slug=kwargs['pol_slug']).values_list('id', flat=True).first())
+
+
+def _bill_scope(kwargs):
+    from parliament.bills.models import Bill
+    lookup_key = '%s/%s' % (kwargs['session_id'], kwargs['bill_number'])
+    return _lookup('bill', lookup_key, lambda: Bill.objects.filter(
+        session=kwargs['session_id'], number=kwargs['bill_number']).values_list('id', flat=True).first())
+
+
+def _debate_scope(kwargs):
+    from parliament.hansards.models import Document
+    date = datetime.date(int(kwargs['year']), int(kwargs['month']), int(kwargs['day']))
+    return _lookup('document', 'debate/%s' % date.isoformat(), lambda: Document.debates.filter(
+        date=date).values_list('id', flat=True).first())
+
+
+# URL name -> (generation kind, function resolving the URL kwargs to a primary key)
+PAGE_SCOPES = {
+    'politician': ('politician', _politician_scope),
+    'bill': ('bill', _bill_scope),
+    'debate': ('document', _debate_scope),
+}
+
+
+def page_scope(path):
+    """The (kind, id) scope whose generation covers the page at path, if any."""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None
+    if match.url_name not in PAGE_SCOPES:
+        return None
+    kind, resolver = PAGE_SCOPES[match.url_name]
+    try:
+        pk = resolver(match.kwargs)
+    except (KeyError, ValueError):
+        return None
+    return (kind, pk) if pk is not None else None
+
+
+def page_key_prefix(request, key_prefix):
+    """Cache middleware key prefix for request, including its page's generation."""
+    scope = page_scope(request.path_info)
+    if scope is None:
+        return key_prefix
+    return '%s.%s-%s' % (key_prefix, scope[0], get_generation(*scope))
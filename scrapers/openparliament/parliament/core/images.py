@@ -0,0 +1,39 @@
+"""Politician headshot image processing.
+
+Pure functions of bytes, with no Django imports, so they can run in a process pool.
+"""
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+HEADSHOT_SIZE = (142, 230)
+THUMBNAIL_SIZE = (100, 125)
+
+
+def fit_headshot(content: bytes) -> tuple[bytes, tuple[int, int]]:
+    """The image as a HEADSHOT_SIZE JPEG (untouched if it already is that size),
+    and its original size."""
+    pil_img = Image.open(BytesIO(content))
+    if pil_img.size == HEADSHOT_SIZE:
+        return content, pil_img.size
+    bio = BytesIO()
+    ImageOps.fit(pil_img, HEADSHOT_SIZE, method=Image.Resampling.LANCZOS).save(bio, format='JPEG', quality=90)
+    return bio.getvalue(), pil_img.size
+
+
+def headshot_thumbnail(content: bytes) -> bytes:
+    pil_img = Image.open(BytesIO(content))
+    (w, h) = pil_img.size
+    if not (w, h) == HEADSHOT_SIZE:
+        raise ValueError(f'Headshot image is incorrect size, {pil_img.size}. Should be {HEADSHOT_SIZE}')
+    pil_img = pil_img.crop((10, 10, w - 10, h - 68))
+    pil_img.thumbnail(THUMBNAIL_SIZE, resample=Image.Resampling.LANCZOS)
+    bio = BytesIO()
+    pil_img.save(bio, format='JPEG', quality=90)
+    return bio.getvalue()
+
+
+def render_headshot(content: bytes) -> tuple[bytes, bytes, tuple[int, int]]:
+    """(headshot, thumbnail, original size) for a downloaded photo."""
+    headshot, size = fit_headshot(content)
+    return headshot, headshot_thumbnail(headshot), size
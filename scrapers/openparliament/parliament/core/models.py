@@ -3,7 +3,6 @@
 import datetime
 import re
 from urllib.parse import urljoin
-from io import BytesIO
 
 from django.conf import settings
 from django.core.cache import cache
@@ -17,9 +16,8 @@ import lxml.etree
 import lxml.html
 from markdown import markdown
 import requests
-from PIL import Image, ImageOps
 
-from parliament.core import parsetools
+from parliament.core import generations, images, parsetools
 from parliament.core.utils import memoize_property, ActiveManager, language_property
 from parliament.search.index import register_search_model
 
@@ -366,6 +364,14 @@ class Politician(Person):
     def save(self, *args, **kwargs):
         super(Politician, self).save(*args, **kwargs)
         self.add_alternate_name(self.name)
+
+    def generation_scope(self):
+        return ('politician', self.id)
+
+    @property
+    def cache_generation(self):
+        """Counter bumped whenever this politician's page changes; see core.generations."""
+        return generations.get_generation(*self.generation_scope())
             
     def get_absolute_url(self):
         if self.slug:
@@ -443,27 +449,22 @@ class Politician(Person):
     def download_headshot(self, url):
         resp = requests.get(url)
         resp.raise_for_status()
-        file = ContentFile(resp.content)
-        pil_img = Image.open(BytesIO(resp.content))
-        if not pil_img.size == (142, 230):
-            logger.warning(f'Headshot image for {self.name} is incorrect size, {pil_img.size}. Resizing to (142,230)')
-            bio = BytesIO()
-            ImageOps.fit(pil_img, (142, 230), method=Image.Resampling.LANCZOS).save(bio, format='JPEG', quality=90)
-            file = ContentFile(bio.getvalue())
-        self.headshot.save(str(self.identifier) + ".jpg", file)
+        headshot, size = images.fit_headshot(resp.content)
+        if size != images.HEADSHOT_SIZE:
+            logger.warning(f'Headshot image for {self.name} is incorrect size, {size}. Resizing to {images.HEADSHOT_SIZE}')
+        self.headshot.save(str(self.identifier) + ".jpg", ContentFile(headshot))
         self.save_headshot_thumbnail()
         self.save()
 
     def save_headshot_thumbnail(self):
-        pil_img = Image.open(self.headshot)
-        (w, h) = pil_img.size
-        if not (w == 142 and h == 230):
-            raise Exception(f'Headshot image for {self.name} is incorrect size, {pil_img.size}. Should be (142, 230)')
-        pil_img =  pil_img.crop((10, 10, w - 10, h - 68))
-        pil_img.thumbnail((100, 125), resample=Image.Resampling.LANCZOS)
-        bio = BytesIO()
-        pil_img.save(bio, format='JPEG', quality=90)
-        self.headshot_thumbnail.save(f'{self.identifier}-thumb.jpg', ContentFile(bio.getvalue()))
+        self.headshot.open('rb')
+        try:
+            thumbnail = images.headshot_thumbnail(self.headshot.read())
+        except ValueError as e:
+            raise Exception(f'{e} ({self.name})')
+        finally:
+            self.headshot.close()
+        self.headshot_thumbnail.save(f'{self.identifier}-thumb.jpg', ContentFile(thumbnail))
 
     @classmethod
     def search_get_qs(cls):
@@ -1,8 +1,24 @@
+import datetime
+import gzip
+import json
+import logging
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
-from parliament.core.models import Politician
+from django.db.models import Count, F, Max
+from django.http import Http404
+from django.urls import reverse
+from django.views import static
+
+from parliament.core.models import ElectedMember, Politician
 from parliament.hansards.models import Document
 from parliament.bills.models import Bill, VoteQuestion
 
+logger = logging.getLogger(__name__)
+
 class PoliticianSitemap(Sitemap):
 
     def items(self):
@@ -33,4 +49,162 @@ sitemaps = {
     'hansard': HansardSitemap,
     'bill': BillSitemap,
     'votequestion': VoteQuestionSitemap,
-}
\ No newline at end of file
+}
+
+# Static sitemaps
+#
+# build_sitemaps() writes each section as gzipped shards of SHARD_SIZE ids
+# (sitemap-<section>-<n>.xml.gz) plus an index at sitemap.xml, all under
+# PARLIAMENT_SITEMAP_ROOT. A shard is only rewritten when its row count or its
+# newest lastmod changes. Queries fetch just the columns the URLs are built from.
+
+SITEMAP_ROOT = getattr(settings, 'PARLIAMENT_SITEMAP_ROOT',
+    os.path.join(settings.MEDIA_ROOT, 'sitemaps'))
+SHARD_SIZE = 20000 # ids per shard; a sitemap can list up to 50,000 URLs
+STATE_FILENAME = 'sitemap-state.json'
+
+def _latest(*dates):
+    dates = [d.date() if isinstance(d, datetime.datetime) else d for d in dates if d]
+    return max(dates) if dates else None
+
+def _politician_url(id, slug):
+    if slug:
+        return reverse('politician', kwargs={'pol_slug': slug}), None
+    return reverse('politician', kwargs={'pol_id': id}), None
+
+def _debate_url(id, date):
+    return reverse('debate', kwargs={'year': date.year, 'month': date.month, 'day': date.day}), date
+
+def _evidence_url(id, date, session_id, committee_slug, number):
+    return reverse('committee_meeting', kwargs={
+        'session_id': session_id, 'committee_slug': committee_slug, 'number': number}), date
+
+def _bill_url(id, session_id, number, status_date, latest_debate_date, added):
+    return (reverse('bill', kwargs={'session_id': session_id, 'bill_number': number}),
+            _latest(status_date, latest_debate_date, added))
+
+def _vote_url(id, session_id, number, date):
+    return reverse('vote', kwargs={'session_id': session_id, 'number': number}), date
+
+# section name -> (queryset, columns, row -> (url, lastmod), columns whose Max marks a shard as changed)
+SITEMAP_SECTIONS = {
+    'politician': (lambda: Politician.objects.filter(
+            id__in=ElectedMember.objects.values('politician_id')),
+        ('id', 'slug'), _politician_url, ()),
+    'debate': (lambda: Document.debates.filter(date__isnull=False),
+        ('id', 'date'), _debate_url, ('date', 'last_imported')),
+    'evidence': (lambda: Document.evidence.filter(committeemeeting__isnull=False),
+        ('id', 'date', 'committeemeeting__session_id', 'committeemeeting__committee__slug',
+         'committeemeeting__number'), _evidence_url, ('date', 'last_imported')),
+    'bill': (lambda: Bill.objects.all(),
+        ('id', 'session_id', 'number', 'status_date', 'latest_debate_date', 'added'), _bill_url,
+        ('status_date', 'latest_debate_date', 'added')),
+    'votequestion': (lambda: VoteQuestion.objects.all(),
+        ('id', 'session_id', 'number', 'date'), _vote_url, ('date',)),
+}
+
+def _shard_filename(section, shard):
+    return 'sitemap-%s-%d.xml.gz' % (section, shard)
+
+def _write_atomic(path, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _shard_markers(queryset, marker_columns):
+    """{shard number: (row count, newest value of each marker column)}, in one query."""
+    rows = queryset.order_by().annotate(shard=F('id') / SHARD_SIZE).values('shard').annotate(
+        n=Count('id'), **{'max_%d' % i: Max(col) for i, col in enumerate(marker_columns)})
+    markers = {}
+    for row in rows:
+        newest = [row['max_%d' % i] for i in range(len(marker_columns))]
+        markers[row['shard']] = [row['n']] + [v.isoformat() if v else None for v in newest]
+    return markers
+
+def _render_shard(rows, url_func):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for row in rows:
+        url, lastmod = url_func(*row)
+        if lastmod:
+            lines.append('<url><loc>%s</loc><lastmod>%s</lastmod></url>' % (
+                escape(settings.SITE_URL + url), lastmod.isoformat()))
+        else:
+            lines.append('<url><loc>%s</loc></url>' % escape(settings.SITE_URL + url))
+    lines.append('</urlset>\n')
+    return gzip.compress('\n'.join(lines).encode('utf-8'), mtime=0)
+
+def build_sitemaps(root=SITEMAP_ROOT, force=False):
+    """Write the sitemap index and any shards that have changed since the last build.
+    Returns {section: (shards written, shards total)}."""
+    os.makedirs(root, exist_ok=True)
+    state_path = os.path.join(root, STATE_FILENAME)
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    new_state = {}
+    index_entries = []
+    result = {}
+    for section, (get_queryset, columns, url_func, marker_columns) in SITEMAP_SECTIONS.items():
+        queryset = get_queryset()
+        markers = _shard_markers(queryset, marker_columns)
+        written = 0
+        for shard, marker in sorted(markers.items()):
+            filename = _shard_filename(section, shard)
+            path = os.path.join(root, filename)
+            # Sections without a lastmod column have nothing to compare, so are always rewritten
+            if force or not marker_columns or state.get(filename) != marker or not os.path.exists(path):
+                rows = queryset.filter(id__gte=shard * SHARD_SIZE, id__lt=(shard + 1) * SHARD_SIZE)\
+                    .order_by('id').values_list(*columns)
+                _write_atomic(path, _render_shard(rows.iterator(), url_func))
+                written += 1
+            new_state[filename] = marker
+            newest = max((v for v in marker[1:] if v), default=None)
+            index_entries.append((filename, newest[:10] if newest else None))
+        result[section] = (written, len(markers))
+
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for filename, lastmod in index_entries:
+        loc = escape(settings.SITE_URL + '/' + filename)
+        if lastmod:
+            lines.append('<sitemap><loc>%s</loc><lastmod>%s</lastmod></sitemap>' % (loc, lastmod))
+        else:
+            lines.append('<sitemap><loc>%s</loc></sitemap>' % loc)
+    lines.append('</sitemapindex>\n')
+    _write_atomic(os.path.join(root, 'sitemap.xml'), '\n'.join(lines).encode('utf-8'))
+
+    # Shards for id ranges that no longer have any objects
+    for filename in set(state) - set(new_state):
+        try:
+            os.unlink(os.path.join(root, filename))
+        except FileNotFoundError:
+            pass
+    _write_atomic(state_path, json.dumps(new_state, indent=1).encode('utf-8'))
+    logger.info("Sitemaps: %s", result)
+    return result
+
+def serve_sitemap(request, path):
+    """Serve a file written by build_sitemaps(). In production the web server should
+    serve these from PARLIAMENT_SITEMAP_ROOT directly."""
+    if path == STATE_FILENAME:
+        raise Http404
+    if path == 'sitemap.xml' and not os.path.exists(os.path.join(SITEMAP_ROOT, path)):
+        # Not built yet
+        from django.contrib.sitemaps.views import sitemap as sitemap_view
+        return sitemap_view(request, sitemaps=sitemaps)
+    response = static.serve(request, path, document_root=SITEMAP_ROOT)
+    if path.endswith('.gz'):
+        # Served as the gzip file it is, not as compressed XML
+        del response['Content-Encoding']
+        response['Content-Type'] = 'application/gzip'
+    return response
@@ -0,0 +1,133 @@
+import datetime
+import gzip
+import os
+import re
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from parliament.bills.models import Bill
+from parliament.core import generations, sitemap
+from parliament.core.api import FetchFromCacheMiddleware
+from parliament.core.models import Politician
+
+class GenerationTests(TestCase):
+
+    fixtures = ['parties', 'ridings', 'sessions', 'politicians']
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_applies_after_commit(self):
+        before = generations.get_generation('bill', 1)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            generations.bump_scopes([('bill', 1)])
+            self.assertEqual(generations.get_generation('bill', 1), before)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(generations.get_generation('bill', 1), before + 1)
+
+    def test_batched_bumps_apply_once(self):
+        bill, politician = generations.get_generations([('bill', 1), ('politician', 2)])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with generations.batched_bumps():
+                for _ in range(3):
+                    generations.bump_scopes([('bill', 1), ('politician', 2)])
+                with generations.batched_bumps():
+                    generations.bump_scopes([('bill', 1), ('bill', None)])
+            self.assertEqual(generations.get_generation('bill', 1), bill)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(generations.get_generations([('bill', 1), ('politician', 2)]),
+            [bill + 1, politician + 1])
+
+    def test_evicted_counter_restarts_higher(self):
+        before = generations.get_generation('document', 5)
+        cache.delete('gen:document:5')
+        self.assertGreater(generations.get_generation('document', 5), before)
+
+    def test_page_key_changes_on_bump(self):
+        pol = Politician.objects.get(slug='hedy-fry')
+        request = RequestFactory().get('/politicians/hedy-fry/')
+        key = generations.page_key_prefix(request, 'parl')
+        self.assertEqual(key, 'parl.politician-%s' % pol.cache_generation)
+        self.assertEqual(generations.page_key_prefix(
+            RequestFactory().get('/politicians/%s/' % pol.id), 'parl'), key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            generations.bump(pol)
+        self.assertNotEqual(generations.page_key_prefix(request, 'parl'), key)
+
+        # Pages without a generation keep the plain prefix
+        self.assertEqual(generations.page_key_prefix(RequestFactory().get('/politicians/'), 'parl'), 'parl')
+        self.assertEqual(generations.page_key_prefix(RequestFactory().get('/politicians/no-such-mp/'), 'parl'), 'parl')
+
+    def test_cache_middleware_uses_generation_prefix(self):
+        pol = Politician.objects.get(slug='hedy-fry')
+        middleware = FetchFromCacheMiddleware(lambda request: None)
+        request = RequestFactory().get('/politicians/hedy-fry/')
+        middleware.process_request(request)
+        self.assertEqual(request._cache_key_prefix, '%s.politician-%s' % (
+            middleware.key_prefix, pol.cache_generation))
+
+    def test_cached_fragment(self):
+        pol = Politician.objects.get(slug='hedy-fry')
+        calls = []
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(generations.cached_fragment(pol, 'test', compute), 1)
+        self.assertEqual(generations.cached_fragment(pol, 'test', compute), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            generations.bump(pol)
+        self.assertEqual(generations.cached_fragment(pol, 'test', compute), 2)
+
+class SitemapTests(TestCase):
+
+    fixtures = ['parties', 'ridings', 'sessions', 'politicians']
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def read_shard(self, filename):
+        with gzip.open(os.path.join(self.root, filename), 'rt') as f:
+            return re.findall(r'<url><loc>([^<]+)</loc>(?:<lastmod>([^<]+)</lastmod>)?</url>', f.read())
+
+    def test_shard_contents(self):
+        bill = Bill.objects.create(session_id='40-2', number='C-10',
+            status_date=datetime.date(2009, 3, 12), added=datetime.date(2009, 3, 1))
+
+        result = sitemap.build_sitemaps(root=self.root)
+        self.assertEqual(result['bill'], (1, 1))
+        self.assertEqual(result['debate'], (0, 0))
+
+        expected = {settings.SITE_URL + pol.get_absolute_url()
+            for pol in Politician.objects.elected()}
+        urls = [url for url, lastmod in self.read_shard('sitemap-politician-0.xml.gz')]
+        self.assertEqual(len(urls), len(expected))
+        self.assertEqual(set(urls), expected)
+
+        self.assertEqual(self.read_shard('sitemap-bill-0.xml.gz'), [
+            (settings.SITE_URL + reverse('bill', kwargs={'session_id': '40-2', 'bill_number': 'C-10'}),
+             '2009-03-12')])
+
+        with open(os.path.join(self.root, 'sitemap.xml')) as f:
+            index = f.read()
+        self.assertIn('/sitemap-politician-0.xml.gz</loc>', index)
+        self.assertIn('/sitemap-bill-0.xml.gz</loc><lastmod>2009-03-12</lastmod>', index)
+
+        # Only shards whose markers changed are rewritten
+        self.assertEqual(sitemap.build_sitemaps(root=self.root)['bill'], (0, 1))
+        bill.status_date = datetime.date(2009, 4, 2)
+        bill.save()
+        self.assertEqual(sitemap.build_sitemaps(root=self.root)['bill'], (1, 1))
+        self.assertEqual(self.read_shard('sitemap-bill-0.xml.gz')[0][1], '2009-04-02')
+
+        # and shards left without objects are removed
+        bill.delete()
+        self.assertEqual(sitemap.build_sitemaps(root=self.root)['bill'], (0, 0))
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'sitemap-bill-0.xml.gz')))
@@ -123,6 +123,7 @@ def settings_context(request):
         'SENTRY_JS_ID': getattr(settings, 'SENTRY_JS_ID', None),
         'SENTRY_JS_OPTIONS': getattr(settings, 'SENTRY_JS_OPTIONS', None),
         'GLOBAL_BANNER': getattr(settings, 'PARLIAMENT_GLOBAL_BANNER', None),
+        'FRAGMENT_CACHE_SECONDS': getattr(settings, 'PARLIAMENT_FRAGMENT_CACHE_SECONDS', 60 * 60 * 24 * 7),
     }
 
 class AutoprefixerFilter(CompilerFilter):
@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Max, Min
+
+from parliament.hansards.models import Statement
+
+
+def _backfill_chunk(bounds, refill):
+    # Runs in a worker process, on its own database connection
+    start, end = bounds
+    try:
+        qs = Statement.objects.filter(id__gte=start, id__lt=end)
+        if not refill:
+            qs = qs.filter(content_plain_en='').exclude(content_en='')
+        statements = [
+            Statement(id=statement_id,
+                      content_plain_en=Statement.html_to_text(content_en),
+                      content_plain_fr=Statement.html_to_text(content_fr))
+            for statement_id, content_en, content_fr in qs.values_list('id', 'content_en', 'content_fr')
+        ]
+        Statement.objects.bulk_update(statements, ['content_plain_en', 'content_plain_fr'], batch_size=1000)
+        return len(statements)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Fills in the stored plain-text versions of statements, in parallel chunks of statement IDs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--chunk-size', type=int, default=20000,
+            help='Statement IDs per chunk')
+        parser.add_argument('--all', action='store_true', dest='refill',
+            help='Recompute text for every statement, not just those without it')
+
+    def handle(self, workers, chunk_size, refill, **options):
+        qs = Statement.objects.all()
+        if not refill:
+            qs = qs.filter(content_plain_en='').exclude(content_en='')
+        bounds = qs.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            self.stdout.write("Nothing to backfill.")
+            return
+        chunks = [(start, start + chunk_size)
+                  for start in range(bounds['first'], bounds['last'] + 1, chunk_size)]
+
+        # Forked workers mustn't share the parent's database connection
+        connections.close_all()
+        started = time.perf_counter()
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            for i, n in enumerate(executor.map(_backfill_chunk, chunks, [refill] * len(chunks)), 1):
+                done += n
+                if options['verbosity'] > 1 or i == len(chunks):
+                    self.stdout.write("%d/%d chunks, %d statements, %.1fs" % (
+                        i, len(chunks), done, time.perf_counter() - started))
@@ -0,0 +1,29 @@
+# Generated by Django 5.1 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hansards', '0005_add_bill_stage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSourceState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(choices=[('en', 'English'), ('fr', 'French')], max_length=2)),
+                ('etag', models.CharField(blank=True, max_length=200)),
+                ('last_modified', models.CharField(blank=True, max_length=100)),
+                ('content_digest', models.CharField(blank=True, help_text='SHA-256 of the XML with all whitespace removed; see parl_document.xml_digest', max_length=64)),
+                ('checked', models.DateTimeField(blank=True, null=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hansards.document')),
+            ],
+            options={
+                'unique_together': {('document', 'language')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hansards', '0006_documentsourcestate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statement',
+            name='content_plain_en',
+            field=models.TextField(blank=True, editable=False, help_text='content_en as plain text; set on save'),
+        ),
+        migrations.AddField(
+            model_name='statement',
+            name='content_plain_fr',
+            field=models.TextField(blank=True, editable=False, help_text='content_fr as plain text; set on save'),
+        ),
+    ]
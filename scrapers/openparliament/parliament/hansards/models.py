@@ -11,11 +11,12 @@ from django.db import models
 from django.conf import settings
 from django.urls import reverse
 from django.template.defaultfilters import slugify
-from django.utils.html import strip_tags
 from django.utils.safestring import mark_safe
+import lxml.etree
+import lxml.html
 
 from parliament.core.models import Session, ElectedMember, Politician
-from parliament.core import parsetools
+from parliament.core import generations, parsetools
 from parliament.core.utils import memoize_property, language_property
 from parliament.activity import utils as activity
 from parliament.search.index import register_search_model
@@ -99,6 +100,13 @@ class Document(models.Model):
         elif self.document_type == self.EVIDENCE:
             return self.committeemeeting.get_absolute_url()
 
+    def generation_scope(self):
+        return ('document', self.id)
+
+    @property
+    def cache_generation(self):
+        return generations.get_generation(*self.generation_scope())
+
     def get_text_analysis_url(self):
         # Let's violate DRY!
         return self.get_absolute_url() + 'text-analysis/'
@@ -331,6 +339,10 @@ class Statement(models.Model):
 
     content_en = models.TextField()
     content_fr = models.TextField(blank=True)
+    content_plain_en = models.TextField(blank=True, editable=False,
+        help_text="content_en as plain text; set on save")
+    content_plain_fr = models.TextField(blank=True, editable=False,
+        help_text="content_fr as plain text; set on save")
     sequence = models.IntegerField(db_index=True)
     wordcount = models.IntegerField()
     wordcount_en = models.PositiveSmallIntegerField(null=True,
@@ -372,6 +384,8 @@ class Statement(models.Model):
     def save(self, *args, **kwargs):
         self.content_en = self.content_en.replace('\n', '').replace('</p>', '</p>\n').strip()
         self.content_fr = self.content_fr.replace('\n', '').replace('</p>', '</p>\n').strip()
+        self.content_plain_en = self.html_to_text(self.content_en)
+        self.content_plain_fr = self.html_to_text(self.content_fr)
         if self.wordcount_en is None:
             self._generate_wordcounts()
         if ((not self.procedural) and self.wordcount <= 300
@@ -385,6 +399,11 @@ class Statement(models.Model):
         if not self.urlcache:
             self.generate_url()
         super(Statement, self).save(*args, **kwargs)
+        generations.bump_scopes([
+            ('document', self.document_id),
+            ('politician', self.politician_id),
+            ('bill', self.bill_debated_id),
+        ])
             
     @property
     def date(self):
@@ -438,6 +457,10 @@ class Statement(models.Model):
         return mark_safe(html)
 
     def text_plain(self, language=settings.LANGUAGE_CODE, include_paragraph_urls=False):
+        if not include_paragraph_urls:
+            stored = getattr(self, 'content_plain_' + language)
+            if stored:
+                return stored
         html = getattr(self, 'content_' + language)
         if include_paragraph_urls:
             html = re.sub(r'<p [^>]*id="([1-9][^"]+)"[^>]*>', rf'<p>[{self.urlcache}#\1] ', html)
@@ -445,13 +468,26 @@ class Statement(models.Model):
 
     @staticmethod
     def html_to_text(html):
-        return strip_tags(
-            html
-            .replace('\n', '')
-            .replace('<br>', '\n')
-            .replace('</p>', '\n\n')
-            .replace('&amp;', '&')
-        ).strip()
+        if '<' not in html and '&' not in html:
+            return html.replace('\n', '').strip()
+        try:
+            root = lxml.html.fragment_fromstring(html.replace('\n', ''), create_parent='div')
+        except lxml.etree.ParserError:
+            return ''
+        lxml.etree.strip_elements(root, lxml.etree.Comment, lxml.etree.ProcessingInstruction, with_tail=False)
+        parts = []
+        for event, el in lxml.etree.iterwalk(root, events=('start', 'end')):
+            if event == 'start':
+                if el.tag == 'br':
+                    parts.append('\n')
+                elif el.text:
+                    parts.append(el.text)
+            else:
+                if el.tag == 'p':
+                    parts.append('\n\n')
+                if el.tail and el is not root:
+                    parts.append(el.tail)
+        return ''.join(parts).strip()
 
     def search_dict(self):      
         name = self.name_info
@@ -637,3 +673,23 @@ class OldSlugMapping(models.Model):
 
     def __str__(self):
         return f"{self.old_slug} -> {self.new_slug}"
+
+
+class DocumentSourceState(models.Model):
+    """What we last saw of a document's source XML in one language, so that
+    rechecking it for updates is a conditional GET and a digest comparison."""
+    document = models.ForeignKey(Document, on_delete=models.CASCADE)
+    language = models.CharField(max_length=2, choices=(('en', 'English'), ('fr', 'French')))
+    etag = models.CharField(max_length=200, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    content_digest = models.CharField(max_length=64, blank=True,
+        help_text="SHA-256 of the XML with all whitespace removed; see parl_document.xml_digest")
+    checked = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = (
+            ('document', 'language')
+        )
+
+    def __str__(self):
+        return f"{self.document_id} {self.language} {self.content_digest[:12]}"
@@ -0,0 +1,49 @@
+import html
+
+from django.test import SimpleTestCase
+from django.utils.html import strip_tags
+
+from parliament.hansards.models import Statement
+
+def strip_tags_to_text(content):
+    """The string-replacement conversion html_to_text replaced."""
+    return strip_tags(
+        content
+        .replace('\n', '')
+        .replace('<br>', '\n')
+        .replace('</p>', '\n\n')
+        .replace('&amp;', '&')
+    ).strip()
+
+class HTMLToTextTests(SimpleTestCase):
+
+    def test_matches_strip_tags(self):
+        for content in [
+            '',
+            'No markup at all\n',
+            '<p>One paragraph</p>',
+            '<p>One</p><p>Two</p>\n<p>Three</p>\n',
+            '<p>First line<br>second line</p>\n<p>Next paragraph</p>',
+            '<p data-HoCid="1234" data-originallang="en">Mr. Speaker, <a href="/bills/44-1/C-2/">Bill C-2</a> '
+                'is <em>important</em>.</p>',
+            '<p>Fish &amp; chips</p><p>Salt &amp; pepper &amp; vinegar</p>',
+            '<div class="procedural">(Motion agreed to)</div><p>Text <!-- comment -->after</p>',
+        ]:
+            with self.subTest(content=content):
+                self.assertEqual(Statement.html_to_text(content), strip_tags_to_text(content))
+
+    def test_decodes_all_entities(self):
+        # strip_tags only turned &amp; back into text; other entities now are too
+        for content in [
+            '<p>5 &lt; 6 &gt; 4</p>',
+            '<p>Mr. Speaker &mdash; the &laquo;&nbsp;bill&nbsp;&raquo;</p>',
+            '<p>&#201;t&eacute; &amp; hiver<br>&#x2019;</p>',
+        ]:
+            with self.subTest(content=content):
+                self.assertEqual(Statement.html_to_text(content), html.unescape(strip_tags_to_text(content)))
+
+    def test_text_plain_uses_stored_text(self):
+        statement = Statement(content_en='<p>One</p><p>Two &amp; three</p>')
+        self.assertEqual(statement.text_plain(), 'One\n\nTwo & three')
+        statement.content_plain_en = 'Stored'
+        self.assertEqual(statement.text_plain(), 'Stored')
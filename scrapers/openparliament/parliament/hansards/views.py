@@ -10,6 +10,7 @@ from django.views.generic.dates import (ArchiveIndexView, YearArchiveView, Month
 from django.views.decorators.vary import vary_on_headers
 
 from parliament.committees.models import CommitteeMeeting
+from parliament.core import generations
 from parliament.core.api import ModelDetailView, ModelListView, APIFilters, BadRequest
 from parliament.core.utils import is_ajax
 from parliament.hansards.models import Document, Statement, OldSlugMapping
@@ -137,7 +138,8 @@ def document_view(request, document, meeting=None, slug=None):
     }
     if document.document_type == Document.DEBATE:
         ctx['hansard'] = document
-        topics_data, topics_ai_summary_obj = get_hansard_sections_or_summary(document)
+        topics_data, topics_ai_summary_obj = generations.cached_fragment(
+            document, 'topics', lambda: get_hansard_sections_or_summary(document))
         ctx['hansard_topics_data'] = topics_data
         ctx['hansard_topics_ai_summary'] = topics_ai_summary_obj
         if highlight_statement:
@@ -0,0 +1,176 @@
+"""Bulk headshot refresh for the MP import.
+
+Photos are downloaded concurrently with conditional requests; what we last
+saw of each photo (validators and a SHA-1 of the content) is kept in the
+politician's 'headshot_source' info. Unchanged photos and placeholders are
+skipped, resizing and thumbnailing run in a process pool, and the files are
+written to the media store atomically.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from parliament.core import images
+from parliament.core.models import Politician
+
+logger = logging.getLogger(__name__)
+
+IMAGE_PLACEHOLDER_SHA1 = ['e4060a9eeaf3b4f54e6c16f5fb8bf2c26962e15d']
+
+DOWNLOAD_WORKERS = getattr(settings, 'PARLIAMENT_HEADSHOT_DOWNLOAD_WORKERS', 8)
+RESIZE_WORKERS = getattr(settings, 'PARLIAMENT_HEADSHOT_RESIZE_WORKERS', os.cpu_count() or 2)
+SOURCE_INFO_KEY = 'headshot_source'
+
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=DOWNLOAD_WORKERS))
+
+
+@dataclass
+class _Download:
+    pol: Politician
+    url: str
+    source: dict  # previous headshot_source info
+    status: str = ''  # not_modified, unchanged, placeholder, changed or error
+    content: bytes = b''
+    new_source: dict = field(default_factory=dict)
+
+
+@dataclass
+class HeadshotStats:
+    checked: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    placeholder: int = 0
+    updated: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    def __str__(self):
+        return ("%d headshots checked in %.1fs: %d updated, %d not modified, %d unchanged, "
+                "%d placeholders, %d errors") % (
+            self.checked, self.seconds, self.updated, self.not_modified, self.unchanged,
+            self.placeholder, self.errors)
+
+
+def _get_source(pol: Politician) -> dict:
+    try:
+        return json.loads(pol.info().get(SOURCE_INFO_KEY) or '{}')
+    except ValueError:
+        return {}
+
+
+def _download(d: _Download) -> _Download:
+    # Runs on a worker thread: no database access
+    headers = {}
+    if d.source.get('url') == d.url and d.pol.headshot:
+        # Validators are only good for the URL they came from, and only if we still have the file
+        if d.source.get('etag'):
+            headers['If-None-Match'] = d.source['etag']
+        if d.source.get('last_modified'):
+            headers['If-Modified-Since'] = d.source['last_modified']
+    try:
+        resp = _http.get(d.url, headers=headers, timeout=60)
+        if resp.status_code == 304:
+            d.status = 'not_modified'
+            return d
+        resp.raise_for_status()
+    except requests.RequestException:
+        logger.exception("Error downloading headshot for %s", d.pol)
+        d.status = 'error'
+        return d
+    sha1 = hashlib.sha1(resp.content).hexdigest()
+    d.new_source = {
+        'url': d.url,
+        'etag': resp.headers.get('ETag', ''),
+        'last_modified': resp.headers.get('Last-Modified', ''),
+        'sha1': sha1,
+    }
+    if sha1 in IMAGE_PLACEHOLDER_SHA1:
+        d.status = 'placeholder'
+    elif sha1 == d.source.get('sha1') and d.pol.headshot:
+        d.status = 'unchanged'
+    else:
+        d.status = 'changed'
+        d.content = resp.content
+    return d
+
+
+def _atomic_save(field_file, name: str, content: bytes):
+    """Replace the file at name in field_file's storage without readers ever
+    seeing a partial file, and point field_file at it."""
+    storage = field_file.storage
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Not a local filesystem; the storage's own save is the best we can do
+        if storage.exists(name):
+            storage.delete(name)
+        field_file.name = storage.save(name, ContentFile(content))
+        return
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    field_file.name = name
+
+
+def update_headshots(photo_urls: dict[Politician, str], save=True) -> tuple[HeadshotStats, list[Politician]]:
+    """Refresh headshots from {politician: photo URL}.
+
+    Returns stats and the politicians whose photo is new or changed; if save is
+    False, nothing is written and those are just reported."""
+    start = time.perf_counter()
+    stats = HeadshotStats(checked=len(photo_urls))
+    downloads = [_Download(pol=pol, url=url, source=_get_source(pol)) for pol, url in photo_urls.items()]
+    if not downloads:
+        return stats, []
+
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(downloads))) as executor:
+        downloads = list(executor.map(_download, downloads))
+    counts = Counter(d.status for d in downloads)
+    stats.not_modified = counts['not_modified']
+    stats.unchanged = counts['unchanged']
+    stats.placeholder = counts['placeholder']
+    stats.errors = counts['error']
+
+    changed = [d for d in downloads if d.status == 'changed']
+    if save and changed:
+        with ProcessPoolExecutor(max_workers=min(RESIZE_WORKERS, len(changed))) as executor:
+            rendered = list(executor.map(images.render_headshot, [d.content for d in changed]))
+        for d, (headshot, thumbnail, size) in zip(changed, rendered):
+            pol = d.pol
+            if size != images.HEADSHOT_SIZE:
+                logger.warning(f'Headshot image for {pol.name} is incorrect size, {size}. Resizing to {images.HEADSHOT_SIZE}')
+            _atomic_save(pol.headshot, 'polpics/%s.jpg' % pol.identifier, headshot)
+            _atomic_save(pol.headshot_thumbnail, 'polpics/thumbnail/%s-thumb.jpg' % pol.identifier, thumbnail)
+            pol.save()
+            stats.updated += 1
+
+    if save:
+        # Placeholders and unchanged photos get fresh validators too, so next time they're a 304
+        for d in downloads:
+            if d.new_source and d.new_source != d.source:
+                d.pol.set_info(SOURCE_INFO_KEY, json.dumps(d.new_source))
+
+    stats.seconds = time.perf_counter() - start
+    logger.info("Headshot refresh: %s", stats)
+    return stats, [d.pol for d in changed]
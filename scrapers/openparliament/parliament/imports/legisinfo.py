@@ -8,6 +8,7 @@ from django.db import transaction
 import requests
 
 from parliament.bills.models import Bill, BillText, LEGISINFO_BILL_ID_URL
+from parliament.core import generations
 from parliament.core.models import Session, Politician, ElectedMember
 from parliament.imports import CannotScrapeException
 from parliament.imports.billtext import get_plain_bill_text
@@ -76,6 +77,7 @@ def get_bill_list(session: Session) -> list[BillData]:
     jd = resp.json()
     return [BillData(item) for item in jd]
     
+@generations.batched_bumps()
 @transaction.atomic
 def import_bills(session: Session):
     bill_list = get_bill_list(session)
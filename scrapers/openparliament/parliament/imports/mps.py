@@ -1,20 +1,26 @@
 # coding: utf-8
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import json
 import logging
+import os
 from parliament.core.models import Politician, Session, Riding, Party
+from parliament.core import parsetools
+from django.conf import settings
 from django.db import transaction
-from time import sleep
-import hashlib
 from urllib.parse import urljoin
 
 import lxml.html
 import requests
+from requests.adapters import HTTPAdapter
+
+from parliament.imports import headshots
 
 logger = logging.getLogger(__name__)
 
 
 OURCOMMONS_MPS_URL = 'https://www.ourcommons.ca/Members/en/search?caucusId=all&province=all'
-IMAGE_PLACEHOLDER_SHA1 = ['e4060a9eeaf3b4f54e6c16f5fb8bf2c26962e15d']
 
 """
 Importers for MP data, from ourcommons.ca or represent.opennorth.ca
@@ -45,6 +51,7 @@ def _import_mps(objs, download_headshots=False, update_all_headshots=False):
     errors = []
 
     pols_seen = set()
+    photo_urls = {}
 
     for mp_info in objs:
         try:
@@ -87,12 +94,7 @@ def _import_mps(objs, download_headshots=False, update_all_headshots=False):
             _update('constituency_offices', '\n\n'.join(constituency_offices))
 
         if mp_info.get('photo_url') and (update_all_headshots or (not pol.headshot)):
-            if is_photo_real(mp_info.get('photo_url')):
-                if update_all_headshots or download_headshots:
-                    pol.download_headshot(mp_info['photo_url'])
-                else:
-                    warnings.append("Photo available: %s for %s" %
-                                (mp_info.get('photo_url'), pol))
+            photo_urls[pol] = mp_info['photo_url']
 
         if mp_info.get('extra') and mp_info['extra'].get('twitter'):
             screen_name = mp_info['extra']['twitter'].split('/')[-1]
@@ -102,6 +104,13 @@ def _import_mps(objs, download_headshots=False, update_all_headshots=False):
                 warnings.append("Potential twitter change for %s: existing %s new %s" % (
                     pol, pol.info()['twitter'], screen_name))
 
+    # Downloaded together, concurrently, once the rest of the import is done
+    _, new_photos = headshots.update_headshots(
+        photo_urls, save=update_all_headshots or download_headshots)
+    if not (update_all_headshots or download_headshots):
+        for pol in new_photos:
+            warnings.append("Photo available: %s for %s" % (photo_urls[pol], pol))
+
     missing_pols = set(Politician.objects.current()) - pols_seen
     if missing_pols:
         for p in missing_pols:
@@ -113,34 +122,111 @@ def _import_mps(objs, download_headshots=False, update_all_headshots=False):
         logger.warning('\n\n'.join(warnings))
 
 
-@transaction.atomic
-def update_ridings_from_represent(boundary_set='federal-electoral-districts'):
+REPRESENT_URL = 'https://represent.opennorth.ca/'
+RIDING_FETCH_WORKERS = getattr(settings, 'PARLIAMENT_RIDING_FETCH_WORKERS', 6)
+
+_represent_http = requests.Session()
+_represent_http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=RIDING_FETCH_WORKERS))
+
 
-    Riding.objects.filter(current=True).update(current=False)
+@dataclass
+class RidingRefreshStats:
+    fetched: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    retired: int = 0
+    duplicates: int = 0
+
+    def __str__(self):
+        return ("%d ridings fetched: %d created, %d updated, %d unchanged, %d no longer current, "
+                "%d duplicates skipped") % (
+            self.fetched, self.created, self.updated, self.unchanged, self.retired, self.duplicates)
+
+
+def _get_represent_json(path):
+    resp = _represent_http.get(urljoin(REPRESENT_URL, path), timeout=60)
+    resp.raise_for_status()
+    return resp.json()
 
-    base_url = 'http://represent.opennorth.ca/'
-    riding_list = requests.get(
-        urljoin(base_url, f'/boundaries/{boundary_set}/?limit=500')).json()
+
+def fetch_represent_ridings(boundary_set='federal-electoral-districts', archive=None) -> list[dict]:
+    """Every boundary's detail document from Represent, fetched concurrently.
+
+    If archive is a path to an existing JSON file, the details are read from it
+    instead; if it doesn't exist yet, what's fetched is saved there."""
+    if archive and os.path.exists(archive):
+        with open(archive) as f:
+            return json.load(f)
+    riding_list = _get_represent_json(f'/boundaries/{boundary_set}/?limit=500')
     riding_urls = [r['url'] for r in riding_list['objects']]
-    for riding_url in riding_urls:
-        resp = requests.get(urljoin(base_url, riding_url))
-        resp.raise_for_status()
-        riding_data = resp.json()
-        edid = int(riding_data['external_id'])
-        name = riding_data['metadata']['ED_NAMEE']
-        name_fr = riding_data['metadata']['ED_NAMEF']
-        prov = riding_data['metadata'].get('PROVCODE')
-        try:
-            riding = Riding.objects.get_by_name(name, current=False)
-            riding.name_en = name  # just in case of slight punctuation differences
-        except Riding.DoesNotExist:
-            riding = Riding(name_en=name)
-        riding.edid = edid
-        riding.name_fr = name_fr
-        riding.province = prov
-        riding.current = True
-        riding.save()
-        sleep(.5)
+    with ThreadPoolExecutor(max_workers=RIDING_FETCH_WORKERS) as executor:
+        details = list(executor.map(_get_represent_json, riding_urls))
+    if archive:
+        with open(archive, 'w') as f:
+            json.dump(details, f)
+    return details
+
+
+def update_ridings_from_represent(boundary_set='federal-electoral-districts', archive=None) -> RidingRefreshStats:
+    """Make the ridings in a Represent boundary set the current ones.
+
+    Everything is fetched before the database is touched, so a failed download
+    leaves the existing ridings as they were."""
+    details = fetch_represent_ridings(boundary_set, archive=archive)
+    if not details:
+        raise ValueError("No ridings found in boundary set %s" % boundary_set)
+    stats = RidingRefreshStats(fetched=len(details))
+
+    # Key each boundary by the slug it's matched on; a slug seen twice would otherwise
+    # create one riding and then list that unsaved riding as changed
+    by_boundary_slug = {}
+    for riding_data in details:
+        slug = parsetools.slugify(riding_data['metadata']['ED_NAMEE'])
+        slug = Riding.objects.FIX_RIDING.get(slug, slug)
+        if slug in by_boundary_slug:
+            logger.warning("Skipping boundary %s: riding %s is already boundary %s",
+                           riding_data['external_id'], slug, by_boundary_slug[slug]['external_id'])
+            stats.duplicates += 1
+            continue
+        by_boundary_slug[slug] = riding_data
+
+    with transaction.atomic():
+        by_slug = {r.slug: r for r in Riding.objects.select_for_update()}
+        fields = ['name_en', 'name_fr', 'province', 'edid', 'current']
+        seen = set()
+        changed = []
+        created = []
+        for slug, riding_data in by_boundary_slug.items():
+            edid = int(riding_data['external_id'])
+            name = riding_data['metadata']['ED_NAMEE']
+            values = {
+                'name_en': name,  # just in case of slight punctuation differences
+                'name_fr': riding_data['metadata']['ED_NAMEF'],
+                'province': riding_data['metadata'].get('PROVCODE') or Riding.province_from_edid(edid),
+                'edid': edid,
+                'current': True,
+            }
+            riding = by_slug.get(slug)
+            if riding is None:
+                riding = Riding(slug=parsetools.slugify(name), **values)
+                created.append(riding)
+            elif any(getattr(riding, k) != v for k, v in values.items()):
+                for k, v in values.items():
+                    setattr(riding, k, v)
+                changed.append(riding)
+            else:
+                stats.unchanged += 1
+            if riding.pk:
+                seen.add(riding.pk)
+
+        stats.retired = Riding.objects.filter(current=True).exclude(pk__in=seen).update(current=False)
+        Riding.objects.bulk_update(changed, fields)
+        Riding.objects.bulk_create(created)
+    stats.created = len(created)
+    stats.updated = len(changed)
+    logger.info("Riding refresh: %s", stats)
+    return stats
 
 
 # This section of code lifted from
@@ -166,12 +252,6 @@ def scrape_mps_from_ourcommons():
     mp_data = (_scrape_ourcommons_row(row) for row in rows)
     return mp_data
 
-def is_photo_real(photo_url: str) -> bool:
-    """Sometimes the scraped photo is just a generic silhouette;
-    this will return False if that appears to be the case."""
-    photo_response = requests.get(photo_url)
-    return (photo_response.status_code == 200 and hashlib.sha1(photo_response.content).hexdigest() not in IMAGE_PLACEHOLDER_SHA1)
-
 def _scrape_ourcommons_row(row):
     d = {}
     d['name'] = row.xpath(
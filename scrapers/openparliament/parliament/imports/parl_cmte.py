@@ -1,14 +1,20 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import datetime
 import logging
 import re
+import threading
 import time
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
+from django.conf import settings
 from django.db import transaction
 
 import lxml.html
 import lxml.etree
 import requests
+from requests.adapters import HTTPAdapter
 
 from parliament.committees.models import (Committee, CommitteeMeeting,
     CommitteeActivity, CommitteeActivityInSession,
@@ -113,55 +119,254 @@ def _parse_date(d):
     )
 
 
+# Network fetches run on thread pools through one pooled HTTP session, with at most
+# PER_HOST_REQUESTS in flight to any host. Worker threads only fetch and parse;
+# every database write happens on the calling thread, one transaction per committee.
+COMMITTEE_WORKERS = getattr(settings, 'PARLIAMENT_COMMITTEE_WORKERS', 4)
+FETCH_WORKERS = getattr(settings, 'PARLIAMENT_COMMITTEE_FETCH_WORKERS', 8)
+PER_HOST_REQUESTS = getattr(settings, 'PARLIAMENT_COMMITTEE_PER_HOST', 4)
+REQUEST_TIMEOUT = 60
+
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS + COMMITTEE_WORKERS))
+_host_slots = defaultdict(lambda: threading.BoundedSemaphore(PER_HOST_REQUESTS))
+_host_slots_lock = threading.Lock()
+
+
+def _get(url):
+    with _host_slots_lock:
+        slot = _host_slots[urlparse(url).netloc]
+    with slot:
+        resp = _http.get(url, timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    return resp
+
+
+def _fetch_all(executor, fn, items):
+    """{item: fn(item)}, run on executor. fn must not itself wait on executor."""
+    futures = {item: executor.submit(fn, item) for item in items}
+    return {item: f.result() for item, f in futures.items()}
+
+
+def _prefetch(committee, session):
+    """Existing meetings by number, and the committee's activities by source ID and by name."""
+    return CommitteeFetch(
+        committee=committee,
+        session=session,
+        acronym=committee.get_acronym(session),
+        meetings={m.number: m for m in CommitteeMeeting.objects.filter(
+            committee=committee, session=session).select_related('evidence')},
+        activities_by_source_id={cais.source_id: cais.activity for cais in
+            CommitteeActivityInSession.objects.filter(
+                activity__committee=committee).select_related('activity')},
+        activities_by_name={a.name_en.lower(): a for a in
+            CommitteeActivity.objects.filter(committee=committee)},
+    )
+
+
 def import_committee_documents(session):
-    for comm in Committee.objects.filter(sessions=session).order_by('-parent'):
-        # subcommittees last
-        try:
-            import_committee_meetings(comm, session)
-        except requests.exceptions.HTTPError as e:
-            logger.exception("Error importing committee %s, #%s", comm, comm.id)
+    # subcommittees last
+    fetches = [_prefetch(comm, session)
+        for comm in Committee.objects.filter(sessions=session).order_by('-parent')]
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_pool, \
+            ThreadPoolExecutor(max_workers=COMMITTEE_WORKERS) as committee_pool:
+        futures = [(fetch, committee_pool.submit(_fetch_committee, fetch, fetch_pool))
+            for fetch in fetches]
+        for fetch, future in futures:
+            try:
+                future.result()
+                _save_committee_meetings(fetch)
+            except Exception:
+                # One committee's failure shouldn't stop the others
+                logger.exception("Error importing committee %s, #%s", fetch.committee, fetch.committee.id)
         #import_committee_reports(comm, session)
-        #time.sleep(1)
 
-COMMITTEE_MEETINGS_URL = 'https://www.%(domain)s.ca/Committees/en/%(acronym)s/Meetings?parl=%(parliamentnum)d&session=%(sessnum)d'
-@transaction.atomic
+
 def import_committee_meetings(committee, session):
+    fetch = _prefetch(committee, session)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_pool:
+        _fetch_committee(fetch, fetch_pool)
+    _save_committee_meetings(fetch)
+    return True
 
-    acronym = committee.get_acronym(session)
-    url = COMMITTEE_MEETINGS_URL % {'acronym': acronym,
+
+@dataclass
+class MeetingRow:
+    source_id: int
+    number: int
+    cancelled: bool = False
+    date: datetime.date | None = None
+    start_time: datetime.time | None = None
+    end_time: datetime.time | None = None
+    notice: bool = False
+    minutes: bool = False
+    webcast: bool = False
+    in_camera: bool = False
+    televised: bool = False
+    travel: bool = False
+    evidence_viewer_url: str | None = None
+    evidence: 'EvidenceXML | None' = None
+    activity_urls: list = field(default_factory=list)  # (name, url)
+
+
+@dataclass
+class EvidenceXML:
+    source_id: int
+    xml_url_en: str
+    xml_en: bytes
+    xml_fr: bytes
+
+
+@dataclass
+class ActivityPage:
+    name_en: str
+    name_fr: str | None = None  # only fetched if there's no activity with that name yet
+
+
+@dataclass
+class CommitteeFetch:
+    committee: Committee
+    session: Session
+    acronym: str
+    meetings: dict
+    activities_by_source_id: dict
+    activities_by_name: dict
+    rows: list = field(default_factory=list)
+    activity_pages: dict = field(default_factory=dict)  # source_id -> ActivityPage
+
+
+COMMITTEE_MEETINGS_URL = 'https://www.%(domain)s.ca/Committees/en/%(acronym)s/Meetings?parl=%(parliamentnum)d&session=%(sessnum)d'
+def _fetch_committee(fetch, fetch_pool):
+    """Download and parse everything needed to update this committee's meetings."""
+    committee, session = fetch.committee, fetch.session
+    url = COMMITTEE_MEETINGS_URL % {'acronym': fetch.acronym,
         'parliamentnum': session.parliamentnum,
         'sessnum': session.sessnum,
         'domain': 'parl' if committee.joint else 'ourcommons'}
-    resp = requests.get(url)
-    resp.raise_for_status()
-    root = lxml.html.fromstring(resp.text)
-    for mtg_row in root.cssselect('#meeting-accordion .accordion-item'):
-        source_id = mtg_row.get('id')
-        assert source_id.startswith('meeting-item-')
-        source_id = int(source_id.replace('meeting-item-', '').strip())
+    root = lxml.html.fromstring(_get(url).text)
+    fetch.rows = [_parse_meeting_row(mtg_row, url)
+        for mtg_row in root.cssselect('#meeting-accordion .accordion-item')]
+
+    need_evidence = {}
+    for row in fetch.rows:
+        existing = fetch.meetings.get(row.number)
+        if row.evidence_viewer_url and not (existing and existing.evidence_id):
+            need_evidence[row.evidence_viewer_url] = row
+    activity_urls = {}
+    for row in fetch.rows:
+        for name, activity_url in row.activity_urls:
+            try:
+                activity_id = _activity_id_from_url(activity_url)
+            except AttributeError:
+                continue # logged when saving
+            if activity_id not in fetch.activities_by_source_id:
+                activity_urls.setdefault(activity_id, activity_url)
+
+    # Evidence viewer pages and activity pages, then XML and French activity pages
+    xml_urls = {}
+    for viewer_url, xml_url in _fetch_all(fetch_pool, _get_evidence_xml_url,
+            need_evidence).items():
+        if xml_url is None:
+            if fetch.acronym not in ('REGS', 'BILI'):
+                # REGS never has XML
+                logger.error("No XML evidence for %s meeting #%s", committee, need_evidence[viewer_url].number)
+            continue
+        xml_urls[xml_url] = need_evidence[viewer_url]
+    fr_urls = {xml_url_en.replace('-E.', '-F.'): xml_url_en for xml_url_en in xml_urls}
+    assert all(u.upper().endswith('-F.XML') for u in fr_urls)
+    activity_names = {activity_id: name for activity_id, name in _fetch_all(
+            fetch_pool, lambda activity_id: _get_activity_name(activity_urls[activity_id]),
+            activity_urls).items()
+        if name is not None}
+    activity_fr_urls = {activity_urls[activity_id].replace('/en/', '/fr/'): activity_id
+        for activity_id, name in activity_names.items()
+        if name.lower() not in fetch.activities_by_name}
+
+    downloads = _fetch_all(fetch_pool, lambda u: _get(u).content, list(xml_urls) + list(fr_urls))
+    names_fr = _fetch_all(fetch_pool, _get_activity_name, activity_fr_urls)
+
+    for xml_url_en, row in xml_urls.items():
+        xml_en = downloads[xml_url_en]
+        source_id = int(lxml.etree.fromstring(xml_en).get('id'))
+        if not source_id:
+            source_id = int('9' + str(row.source_id))
+            logger.error("No source ID in evidence for %s, using constructed ID %s" % (
+                row.evidence_viewer_url, source_id))
+        row.evidence = EvidenceXML(source_id=source_id, xml_url_en=xml_url_en,
+            xml_en=xml_en, xml_fr=downloads[xml_url_en.replace('-E.', '-F.')])
+    for activity_id, name_en in activity_names.items():
+        fetch.activity_pages[activity_id] = ActivityPage(name_en=name_en)
+    for fr_url, activity_id in activity_fr_urls.items():
+        fetch.activity_pages[activity_id].name_fr = names_fr[fr_url]
+    return fetch
+
+
+def _parse_meeting_row(mtg_row, url):
+    source_id = mtg_row.get('id')
+    assert source_id.startswith('meeting-item-')
+    source_id = int(source_id.replace('meeting-item-', '').strip())
+
+    number = int(re.sub(r'\D', '', mtg_row.cssselect('.meeting-title .meeting-number')[0].text))
+    assert number > 0
+
+    row = MeetingRow(source_id=source_id, number=number)
+    row.cancelled = bool(mtg_row.cssselect('.meeting-title .icon-cancel'))
+    if row.cancelled:
+        return row
+
+    date_string = mtg_row.cssselect('.meeting-title .date-label')[0].text_content().strip()
+    if date_string in ('Earlier Today', 'Later Today', 'In Progress', 'Tomorrow', 'Yesterday', 'Suspended'):
+        match = re.search(r'-(20\d\d)-(\d\d)-(\d\d)', mtg_row.get('class'))
+        assert match
+        row.date = datetime.date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    else:
+        try:
+            row.date = _parse_date(date_string.partition(', ')[2]) # partition is to split off day of week
+        except ValueError:
+            raise Exception("Unrecognized date string %s for meeting #%s" % (date_string, number))
 
-        number = int(re.sub(r'\D', '', mtg_row.cssselect('.meeting-title .meeting-number')[0].text))
-        assert number > 0
+    timestring = mtg_row.cssselect('.the-time')[0].text_content()
+    match = re.search(r'(\d\d?):(\d\d) ([ap]\.?m\.?)(?: - (\d\d?):(\d\d) ([ap]\.?m\.?))?\s\(',
+        timestring, re.UNICODE)
+    row.start_time = datetime.time(_12hr(match.group(1), match.group(3)), int(match.group(2)))
+    if match.group(4):
+        row.end_time = datetime.time(_12hr(match.group(4), match.group(6)), int(match.group(5)))
 
-        cancelled = bool(mtg_row.cssselect('.meeting-title .icon-cancel'))
-        if cancelled:
-            try:
-                mtg = CommitteeMeeting.objects.get(committee=committee, session=session,
-                    number=number, source_id=source_id)
-                assert not mtg.evidence_id
-                mtg.delete()
+    row.notice = bool(mtg_row.cssselect('a.btn-meeting-notice'))
+    row.minutes = bool(mtg_row.cssselect('a.btn-meeting-minutes'))
+    evidence_link = mtg_row.cssselect('a.btn-meeting-evidence')
+    if evidence_link:
+        row.evidence_viewer_url = urljoin(url, evidence_link[0].get('href'))
+
+    row.webcast = bool(mtg_row.cssselect('.btn-meeting-parlvu'))
+    row.in_camera = bool(mtg_row.cssselect('.meeting-title i[title*="In Camera"]'))
+    row.televised = bool(mtg_row.cssselect('.meeting-title .icon-television'))
+    row.travel = bool(mtg_row.cssselect('.meeting-title .icon-plane'))
+
+    row.activity_urls = [(study_link.text.strip(), urljoin(url, study_link.get('href')))
+        for study_link in mtg_row.cssselect('.meeting-card-study a')]
+    return row
+
+
+@transaction.atomic
+def _save_committee_meetings(fetch):
+    committee, session = fetch.committee, fetch.session
+    for row in fetch.rows:
+        number, source_id = row.number, row.source_id
+        meeting = fetch.meetings.get(number)
+
+        if row.cancelled:
+            if meeting and meeting.source_id == source_id:
+                assert not meeting.evidence_id
+                meeting.delete()
+                del fetch.meetings[number]
                 logger.warning("Deleting %s cancelled meeting #%d source_id %s", committee, number, source_id)
-            except CommitteeMeeting.DoesNotExist:
-                pass
             continue
 
-        try:
-            meeting = CommitteeMeeting.objects.select_related('evidence').get(
-                committee=committee, session=session, number=number)
-        except CommitteeMeeting.DoesNotExist:
+        if meeting is None:
             meeting = CommitteeMeeting(committee=committee,
                 session=session, number=number)
-        
+
         if meeting.source_id:
             if meeting.source_id != source_id:
                 if meeting.evidence_id:
@@ -176,148 +381,120 @@ def import_committee_meetings(committee, session):
                         session=session, number=number)
         else:
             meeting.source_id = source_id
-            if meeting.id:
-                meeting.save()
-
-        date_string = mtg_row.cssselect('.meeting-title .date-label')[0].text_content().strip()
-        if date_string in ('Earlier Today', 'Later Today', 'In Progress', 'Tomorrow', 'Yesterday', 'Suspended'):
-            match = re.search(r'-(20\d\d)-(\d\d)-(\d\d)', mtg_row.get('class'))
-            assert match
-            meeting.date = datetime.date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
-        else:
-            try:
-                meeting.date = _parse_date(date_string.partition(', ')[2]) # partition is to split off day of week
-            except ValueError:
-                raise Exception("Unrecognized date string %s for meeting %r" % (date_string, meeting))
-        
-        timestring = mtg_row.cssselect('.the-time')[0].text_content()
-        match = re.search(r'(\d\d?):(\d\d) ([ap]\.?m\.?)(?: - (\d\d?):(\d\d) ([ap]\.?m\.?))?\s\(',
-            timestring, re.UNICODE)
-        meeting.start_time = datetime.time(_12hr(match.group(1), match.group(3)), int(match.group(2)))
-        if match.group(4):
-            meeting.end_time = datetime.time(_12hr(match.group(4), match.group(6)), int(match.group(5)))
-        
-        notice_link = mtg_row.cssselect('a.btn-meeting-notice')
-        if notice_link:
+
+        meeting.date = row.date
+        meeting.start_time = row.start_time
+        if row.end_time:
+            meeting.end_time = row.end_time
+        if row.notice:
             meeting.notice = 1
-        minutes_link = mtg_row.cssselect('a.btn-meeting-minutes')
-        if minutes_link:
+        if row.minutes:
             meeting.minutes = 1
-        
-        evidence_link = mtg_row.cssselect('a.btn-meeting-evidence')
-        if evidence_link and not meeting.evidence:
-            evidence_viewer_url = urljoin(url, evidence_link[0].get('href'))
-            try:
-                _download_evidence(meeting, evidence_viewer_url)
-            except NoXMLError:
-                if acronym not in ('REGS', 'BILI'):
-                    # REGS never has XML
-                    logger.error("No XML evidence for %s", meeting)
-        
-        meeting.webcast = bool(mtg_row.cssselect('.btn-meeting-parlvu'))
-        meeting.in_camera = bool(mtg_row.cssselect('.meeting-title i[title*="In Camera"]'))
+
+        if row.evidence and not meeting.evidence_id:
+            meeting.evidence = Document.objects.create(
+                source_id=row.evidence.source_id,
+                date=meeting.date,
+                session=session,
+                document_type=Document.EVIDENCE)
+            meeting.evidence.save_xml(row.evidence.xml_url_en, row.evidence.xml_en, row.evidence.xml_fr)
+
+        meeting.webcast = row.webcast
+        meeting.in_camera = row.in_camera
         if not meeting.televised:
-            meeting.televised = bool(mtg_row.cssselect('.meeting-title .icon-television'))
+            meeting.televised = row.televised
         if not meeting.travel:
-            meeting.travel = bool(mtg_row.cssselect('.meeting-title .icon-plane'))
-        
+            meeting.travel = row.travel
+
         meeting.save()
-        
-        for study_link in mtg_row.cssselect('.meeting-card-study a'):
-            name = study_link.text.strip()
+        fetch.meetings[number] = meeting
+
+        studies = []
+        for name, activity_url in row.activity_urls:
             try:
-                study = get_activity_by_url(urljoin(url, study_link.get('href')),
-                    committee=committee, session=session)
-                meeting.activities.add(study)
+                # A savepoint, so a failed activity doesn't abort the rest of the committee
+                with transaction.atomic():
+                    studies.append(_save_activity(fetch, _activity_id_from_url(activity_url)))
             except:
-                logger.exception("Error fetching committee activity for %r %s %s",
-                    committee, name, study_link.get('href'))
-    
-    return True
-
-class NoXMLError(Exception):
-    pass
+                logger.exception("Error saving committee activity for %r %s %s",
+                    committee, name, activity_url)
+        studies = [s for s in studies if s is not None]
+        if studies:
+            meeting.activities.add(*studies)
 
-def get_xml_url_from_documentviewer_url(url):
-    resp = requests.get(url)
-    resp.raise_for_status()
-    root = lxml.html.fromstring(resp.text)
-    try:
-        xml_button = root.cssselect('a.btn-export-xml')[0]
-    except IndexError:
-        raise NoXMLError
-    return urljoin(url, xml_button.get('href'))
-
-def _download_evidence(meeting, evidence_viewer_url):
-    xml_url_en = get_xml_url_from_documentviewer_url(evidence_viewer_url)
-    xml_url_fr = xml_url_en.replace('-E.', '-F.')
-    assert xml_url_fr.upper().endswith('-F.XML')
-    assert not meeting.evidence
-
-    resp = requests.get(xml_url_en)
-    resp.raise_for_status()
-    xml_en = resp.content
-
-    resp = requests.get(xml_url_fr)
-    resp.raise_for_status()
-    xml_fr = resp.content
+    return True
 
-    source_id = int(lxml.etree.fromstring(xml_en).get('id'))
-    if not source_id:
-        assert meeting.source_id
-        source_id = int('9' + str(meeting.source_id))
-        logger.error("No source ID in evidence for %s, using constructed ID %s" % (
-            evidence_viewer_url, source_id))
 
-    meeting.evidence = Document.objects.create(
-        source_id=source_id,
-        date=meeting.date,
-        session=meeting.session,
-        document_type=Document.EVIDENCE)
-    meeting.evidence.save_xml(xml_url_en, xml_en, xml_fr)
+def _activity_id_from_url(activity_url):
+    return int(re.search(r'(studyActivityId|Stac)=(\d+)', activity_url).group(2))
 
-def get_activity_by_url(activity_url, committee, session):
-    activity_id = int(re.search(r'(studyActivityId|Stac)=(\d+)', activity_url).group(2))
 
+def _save_activity(fetch, activity_id):
+    """The activity for a source ID, creating it from the fetched page if it's new.
+    Returns None if its pages couldn't be fetched."""
+    if activity_id in fetch.activities_by_source_id:
+        return fetch.activities_by_source_id[activity_id]
     try:
-        return CommitteeActivityInSession.objects.get(source_id=activity_id).activity
+        # May belong to another committee
+        activity = CommitteeActivityInSession.objects.get(source_id=activity_id).activity
+        fetch.activities_by_source_id[activity_id] = activity
+        return activity
     except CommitteeActivityInSession.DoesNotExist:
         pass
-
-    activity = CommitteeActivity(committee=committee)
-    activity.study = True # not parsing this at the moment
-    resp = requests.get(activity_url)
-    resp.raise_for_status()
-    root = lxml.html.fromstring(resp.text)
-
-    activity.name_en = root.cssselect('.core-content .study-title-label, .core-content .study-bill-label')[0].text.strip()[:500]
+    page = fetch.activity_pages.get(activity_id)
+    if page is None:
+        return None
 
     # See if this already exists for another session
-    try:
-        activity = CommitteeActivity.objects.get(
-            committee=activity.committee,
-            # study=activity.study,
-            name_en__iexact=activity.name_en
-        )
-    except CommitteeActivity.DoesNotExist:
-        url = activity_url.replace('/en/', '/fr/')
-        root = lxml.html.fromstring(requests.get(url).text)
-        activity.name_fr = root.cssselect('.core-content .study-title-label, .core-content .study-bill-label')[0].text.strip()[:500]
+    activity = fetch.activities_by_name.get(page.name_en.lower())
+    if activity is None:
+        if not page.name_fr:
+            # Its French page failed; try again on the next import
+            return None
+        activity = CommitteeActivity(committee=fetch.committee, name_en=page.name_en, name_fr=page.name_fr)
+        activity.study = True # not parsing this at the moment
         activity.save()
+        fetch.activities_by_name[page.name_en.lower()] = activity
+    fetch.activities_by_source_id[activity_id] = activity
 
     if CommitteeActivityInSession.objects.exclude(source_id=activity_id).filter(
-            session=session, activity=activity).exists():
+            session=fetch.session, activity=activity).exists():
         logger.info("Apparent duplicate activity ID for %s %s %s: %s" %
-            (activity, activity.committee, session, activity_id))
+            (activity, activity.committee, fetch.session, activity_id))
         return activity
-    
+
     CommitteeActivityInSession.objects.create(
-        session=session,
+        session=fetch.session,
         activity=activity,
         source_id=activity_id
     )
     return activity
 
+class NoXMLError(Exception):
+    pass
+
+def get_xml_url_from_documentviewer_url(url):
+    root = lxml.html.fromstring(_get(url).text)
+    try:
+        xml_button = root.cssselect('a.btn-export-xml')[0]
+    except IndexError:
+        raise NoXMLError
+    return urljoin(url, xml_button.get('href'))
+
+def _get_evidence_xml_url(evidence_viewer_url):
+    try:
+        return get_xml_url_from_documentviewer_url(evidence_viewer_url)
+    except NoXMLError:
+        return None
+
+def _get_activity_name(activity_url):
+    try:
+        root = lxml.html.fromstring(_get(activity_url).text)
+        return root.cssselect('.core-content .study-title-label, .core-content .study-bill-label')[0].text.strip()[:500]
+    except (requests.exceptions.RequestException, IndexError, AttributeError):
+        logger.exception("Error fetching committee activity %s", activity_url)
+        return None
+
 # The report scraper is for a previous version of parl.gc.ca, and has not been updated.
 #
 # COMMITTEE_REPORT_URL = 'http://www2.parl.gc.ca/CommitteeBusiness/ReportsResponses.aspx?Cmte=%(acronym)s&Language=E&Mode=1&Parl=%(parliamentnum)d&Ses=%(sessnum)d'
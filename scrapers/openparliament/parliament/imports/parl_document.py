@@ -5,22 +5,30 @@ These transcripts are either House Hansards, or House committee evidence.
 Most of the heavily-lifting code has been put in a separate module
 called alpheus.
 """
+from collections import defaultdict
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import datetime
 import difflib
+import hashlib
 import re
 import sys
 from xml.sax.saxutils import quoteattr
 
+from django.conf import settings
 from django.urls import reverse
-from django.db import transaction, models
+from django.db import connection, transaction, models
+from django.utils import timezone
 
 from lxml import etree
 import requests
+import requests.adapters
 
-from parliament.bills.models import Bill, VoteQuestion
+from parliament.bills.models import Bill, BillStats, VoteQuestion
+from parliament.core import generations
 from parliament.core.models import Politician, ElectedMember, Session
-from parliament.hansards.models import Statement, Document, OldSlugMapping
+from parliament.hansards.models import Statement, Document, DocumentSourceState, OldSlugMapping
 from . import alpheus
 from .legisinfo import OldBillException
 
@@ -30,6 +38,7 @@ logger = logging.getLogger(__name__)
 class ReimportException(Exception):
     pass
 
+@generations.batched_bumps()
 @transaction.atomic
 def import_document(document: Document, allow_reimport=True, prompt_on_slug_change=False,
                     xml_en: bytes | None = None, xml_fr: bytes | None = None):
@@ -110,11 +119,22 @@ def import_document(document: Document, allow_reimport=True, prompt_on_slug_chan
 
     _incorporate_french_document(document, statements, pdoc_fr)
 
+    # Bills whose BillStats this document affects
+    stats_bill_ids = {s.bill_debated_id for s in statements}
+    stats_bill_ids.update(b.id for s in statements for b in s._mentioned_bills)
+
     if old_statements:
         if was_multilingual and not document.multilingual:
             raise ReimportException("Document was multilingual but now isn't")
         _assign_slugs_on_reimport(
             document, statements, old_statements, prompt_on_slug_change)
+        # Politicians and bills dropped from the new version lose content too
+        generations.bump_scopes(('politician', s.politician_id) for s in old_statements)
+        generations.bump_scopes(('bill', s.bill_debated_id) for s in old_statements)
+        # and need their stats recounted
+        stats_bill_ids.update(s.bill_debated_id for s in old_statements)
+        stats_bill_ids.update(Statement.mentioned_bills.through.objects.filter(
+            statement__in=old_statements).values_list('bill_id', flat=True))
         document.statement_set.all().delete()
     else:
         Statement.set_slugs(statements)
@@ -127,6 +147,7 @@ def import_document(document: Document, allow_reimport=True, prompt_on_slug_chan
         if getattr(s, '_related_vote', False):
             s._related_vote.context_statement = s
             s._related_vote.save()
+        generations.bump(*s._mentioned_bills)
 
     bills_debated = set(s.bill_debated for s in statements 
                         if s.bill_debated and s.bill_debate_stage not in ('other', '1'))
@@ -135,6 +156,8 @@ def import_document(document: Document, allow_reimport=True, prompt_on_slug_chan
             bill.latest_debate_date = document.date
             bill.save()
 
+    BillStats.update_for_bills(stats_bill_ids)
+
     document.last_imported = datetime.datetime.now()
     if not (old_statements or document.first_imported):
         document.first_imported = document.last_imported
@@ -417,55 +440,174 @@ def fetch_debate_for_sitting(session, sitting_number, import_without_paragraph_i
         doc.save_xml(url_en, xml_en, xml_fr)
         logger.info("Saved sitting %s", doc.number)
 
-def _remove_whitespace(text: str) -> str:
-    return re.sub(r'\s+', '', text)
-
 def format_xml(xml_string: bytes) -> bytes:
     # Pretty-prints an XML bytestring
     return etree.tostring(
         etree.fromstring(xml_string, etree.XMLParser(remove_blank_text=True)),
         pretty_print=True, encoding='utf8', xml_declaration=True)     
 
+_WHITESPACE = re.compile(r'\s+')
+
+class _DigestTarget:
+    """lxml parser target that hashes the document as it's parsed, without building a tree.
+
+    Markup is hashed structurally, and text and attribute values with all whitespace removed.
+    This does risk missing changes to e.g. typos caused by missing whitespace,
+    but it avoids flagging many irrelevant whitespace changes.
+    """
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+
+    def _text(self, text: str):
+        self._hash.update(_WHITESPACE.sub('', text).encode('utf8'))
+
+    def start(self, tag, attrib):
+        self._hash.update(b'\x01' + tag.encode('utf8'))
+        for k, v in attrib.items():
+            self._hash.update(b'\x02' + k.encode('utf8') + b'\x03')
+            self._text(v)
+        self._hash.update(b'\x04')
+
+    def end(self, tag):
+        self._hash.update(b'\x05')
+
+    def data(self, data):
+        self._text(data)
+
+    def comment(self, text):
+        self._hash.update(b'\x06')
+        self._text(text)
+
+    def close(self) -> str:
+        return self._hash.hexdigest()
+
+def xml_digest(chunks: Iterable[bytes]) -> str:
+    """Whitespace-insensitive digest of an XML document, fed in chunks."""
+    parser = etree.XMLParser(target=_DigestTarget())
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+def _file_chunks(path, size=1 << 16):
+    with open(path, 'rb') as f:
+        while chunk := f.read(size):
+            yield chunk
+
+REIMPORT_WORKERS = getattr(settings, 'PARLIAMENT_REIMPORT_WORKERS', 6)
+_http = requests.Session()
+_http.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=REIMPORT_WORKERS))
+
+@dataclass
+class XMLCheck:
+    """The result of checking one language of a document against the source."""
+    url: str
+    state: DocumentSourceState
+    changed: bool = False
+    xml: bytes | None = None # only if the source returned a body
+    digest: str = ''
+    etag: str = ''
+    last_modified: str = ''
+
+def _check_xml(document: Document, lang: str, state: DocumentSourceState) -> XMLCheck:
+    # Runs on worker threads: the only database access is whatever get_xml_url needs
+    url = document.get_xml_url(lang)
+    check = XMLCheck(url=url, state=state, etag=state.etag, last_modified=state.last_modified)
+    headers = {}
+    if state.etag:
+        headers['If-None-Match'] = state.etag
+    if state.last_modified:
+        headers['If-Modified-Since'] = state.last_modified
+    resp = _http.get(url, headers=headers, stream=True, timeout=120)
+    resp.raise_for_status()
+    if not state.content_digest:
+        state.content_digest = xml_digest(_file_chunks(document.get_xml_path(lang)))
+    if resp.status_code == 304:
+        check.digest = state.content_digest
+        return check
+
+    body = []
+    def _body_chunks():
+        for chunk in resp.iter_content(1 << 16):
+            body.append(chunk)
+            yield chunk
+    check.digest = xml_digest(_body_chunks())
+    check.xml = b''.join(body).replace(b'\r\n', b'\n')
+    check.etag = resp.headers.get('ETag', '')
+    check.last_modified = resp.headers.get('Last-Modified', '')
+    check.changed = check.digest != state.content_digest
+    return check
+
+def fetch_xml_updates(document: Document, states: dict[str, DocumentSourceState] | None = None
+                      ) -> dict[str, XMLCheck]:
+    """Check both languages of a document for changes, without saving anything.
+    states is {lang: DocumentSourceState}, loaded from the database if not given."""
+    if states is None:
+        states = _get_source_states([document])[document.id]
+    return {lang: _check_xml(document, lang, states[lang]) for lang in ('en', 'fr')}
+
+def _get_source_states(documents: Iterable[Document]) -> dict[int, dict[str, DocumentSourceState]]:
+    states = defaultdict(dict)
+    for doc in documents:
+        for lang in ('en', 'fr'):
+            states[doc.id][lang] = DocumentSourceState(document=doc, language=lang)
+    for state in DocumentSourceState.objects.filter(document__in=list(states)):
+        states[state.document_id][state.language] = state
+    return states
+
+def _save_source_states(checks: dict[str, XMLCheck]):
+    now = timezone.now()
+    for check in checks.values():
+        state = check.state
+        state.etag = check.etag[:200]
+        state.last_modified = check.last_modified[:100]
+        state.content_digest = check.digest
+        state.checked = now
+        state.save()
+
 def check_for_xml_updates(document: Document, print_diff=True,
-                        reimport=False, prompt_on_slug_change=False, prompt_to_import=False):
+                        reimport=False, prompt_on_slug_change=False, prompt_to_import=False,
+                        checks: dict[str, XMLCheck] | None = None):
     assert document.downloaded
-    result = {}
-    xml_bytes = {}
-    xml_urls = {}
-
-    for lang in ('en', 'fr'):
-        url = xml_urls[lang] = document.get_xml_url(lang)
-        resp = requests.get(url)
-        resp.raise_for_status()
-        xml_bytes[lang] = resp.content.replace(b'\r\n', b'\n')
-        new_xml = format_xml(xml_bytes[lang]).decode('utf8')
-        old_xml = format_xml(document.get_cached_xml(lang)).decode('utf8')
-        # Check if a document has changed after normalizing XML and removing all whitespace.
-        # This does risk missing changes to e.g. typos caused by missing whitespace,
-        # but it avoids flagging many irrelevant whitespace changes.
-        changed = _remove_whitespace(new_xml) != _remove_whitespace(old_xml)
-        result[lang] = changed
-        if changed and print_diff:
+    if checks is None:
+        checks = fetch_xml_updates(document)
+    result = {lang: check.changed for lang, check in checks.items()}
+
+    if print_diff:
+        for lang, check in checks.items():
+            if not check.changed:
+                continue
+            new_xml = format_xml(check.xml).decode('utf8')
+            old_xml = format_xml(document.get_cached_xml(lang)).decode('utf8')
             print(document)
             diff = difflib.unified_diff(
                 [l.strip() for l in old_xml.splitlines()], 
                 [l.strip() for l in new_xml.splitlines()], n=0, lineterm='')
             print("\n".join(diff))
 
+    if not any(result.values()):
+        # Remember the validators, so next time an unchanged document is a 304
+        _save_source_states(checks)
+        return result
+
     if reimport and document.skip_redownload:
         print("Document is marked to skip redownload, skipping reimport")
         return result
 
-    if prompt_to_import and True in result.values():
+    if prompt_to_import:
         print("Import this document? (y/n)")
         if input().strip() != 'y':
             return result
         reimport = True
 
-    if reimport and True in result.values():
+    if reimport:
+        # A language that came back 304 is unchanged from the cached copy
+        xml_bytes = {lang: check.xml if check.xml is not None else document.get_cached_xml(lang)
+                     for lang, check in checks.items()}
         import_document(document, allow_reimport=True, prompt_on_slug_change=prompt_on_slug_change,
                         xml_en=xml_bytes['en'], xml_fr=xml_bytes['fr'])
-        document.save_xml(xml_urls['en'], xml_bytes['en'], xml_bytes['fr'], overwrite=True)
+        document.save_xml(checks['en'].url, xml_bytes['en'], xml_bytes['fr'], overwrite=True)
+        _save_source_states(checks)
         print("Reimported %r" % document)
     return result
 
@@ -476,27 +618,38 @@ def force_redownload(document: Document):
         return resp.content.replace(b'\r\n', b'\n')
     xml_en, xml_fr = _get('en'), _get('fr')
     document.save_xml(document.get_xml_url('en'), xml_en, xml_fr, overwrite=True)
+    DocumentSourceState.objects.filter(document=document).delete()
     return document.get_xml_path('en')
 
 def reimport_documents(documents: Iterable[Document], reimport=True, prompt_on_slug_change=False,
                        prompt_to_import=False, print_diff=False) -> list[Document]:
+    """Check documents for updates concurrently, then reimport the changed ones one at a time."""
+    documents = [doc for doc in documents if not doc.skip_redownload]
+    states = _get_source_states(documents)
     failures = []
-    for doc in documents:
-        if doc.skip_redownload:
-            continue
+
+    def _fetch(doc):
         try:
-            check_for_xml_updates(doc, reimport=reimport, print_diff=print_diff,
-                                  prompt_on_slug_change=prompt_on_slug_change, prompt_to_import=prompt_to_import)
-        except Exception as e:
-            logger.error("Error reimporting %r: %r", doc, e)
-            failures.append(doc)
+            return fetch_xml_updates(doc, states[doc.id])
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=REIMPORT_WORKERS) as executor:
+        futures = [(doc, executor.submit(_fetch, doc)) for doc in documents]
+        for doc, future in futures:
+            try:
+                check_for_xml_updates(doc, checks=future.result(), reimport=reimport, print_diff=print_diff,
+                                      prompt_on_slug_change=prompt_on_slug_change, prompt_to_import=prompt_to_import)
+            except Exception as e:
+                logger.error("Error reimporting %r: %r", doc, e)
+                failures.append(doc)
     return failures
 
 INTERVALS = [1,2,3,7,14,21,30,50,100,150,200,300,400,550,700,1000]
 def reimport_recent_documents(intervals=INTERVALS):
     today = datetime.date.today()
     target_dates = [today - datetime.timedelta(days=i) for i in intervals]
-    docs = Document.objects.filter(downloaded=True, skip_redownload=False).filter(
+    docs = Document.objects.filter(downloaded=True, skip_redownload=False).select_related('session').filter(
         models.Q(first_imported__date__in=target_dates) |
         models.Q(first_imported__isnull=True, date__in=target_dates))
     failures = reimport_documents(docs)
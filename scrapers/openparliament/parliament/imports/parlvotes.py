@@ -7,7 +7,7 @@ from django.db import transaction
 
 from parliament.bills.models import Bill, VoteQuestion, MemberVote
 from parliament.core.models import ElectedMember, Politician, Riding, Session
-from parliament.core import parsetools
+from parliament.core import generations, parsetools
 
 import logging
 logger = logging.getLogger(__name__)
@@ -15,6 +15,7 @@ logger = logging.getLogger(__name__)
 VOTELIST_URL = 'https://www.ourcommons.ca/members/{lang}/votes/xml'
 VOTEDETAIL_URL = 'https://www.ourcommons.ca/members/en/votes/{parliamentnum}/{sessnum}/{votenumber}/xml'
 
+@generations.batched_bumps()
 @transaction.atomic
 def import_votes():
     votelisturl_en = VOTELIST_URL.format(lang='en')
@@ -101,6 +102,6 @@ def import_votes():
             MemberVote(member=member, politician=pol, votequestion=votequestion, vote=ballot).save()
         votequestion.label_absent_members()
         votequestion.label_party_votes()
-        for mv in votequestion.membervote_set.all():
-            mv.save_activity()
+        generations.bump(votequestion.bill)
+        votequestion.save_member_activities()
     return True
\ No newline at end of file
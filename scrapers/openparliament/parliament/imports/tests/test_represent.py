@@ -0,0 +1,72 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase
+
+from parliament.core.models import Riding
+from parliament.imports import mps
+
+def boundary(edid, name_en, name_fr, province='NL'):
+    # The subset of a Represent boundary detail document that the importer reads
+    return {
+        'external_id': str(edid),
+        'name': name_en,
+        'metadata': {'ED_NAMEE': name_en, 'ED_NAMEF': name_fr, 'PROVCODE': province},
+    }
+
+class RidingRefreshTests(TestCase):
+
+    fixtures = ['ridings']
+
+    def test_update_from_archive(self):
+        current_before = Riding.objects.filter(current=True).count()
+        details = [
+            boundary(10001, 'Avalon', 'Avalon'),  # unchanged
+            boundary(10004, 'Labrador', 'Labrador (Terre-Neuve)'),  # changed
+            boundary(10099, 'Terra Nova--The Peninsulas', 'Terra Nova--Les Péninsules'),  # new
+            boundary(10098, 'Avalon', 'Avalon'),  # same slug as another boundary
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / 'ridings.json'
+            archive.write_text(json.dumps(details))
+            with mock.patch.object(mps, '_get_represent_json') as get_json:
+                stats = mps.update_ridings_from_represent(archive=str(archive))
+            get_json.assert_not_called()
+
+        self.assertEqual(stats, mps.RidingRefreshStats(
+            fetched=4, created=1, updated=1, unchanged=1, retired=current_before - 2, duplicates=1))
+
+        self.assertEqual(Riding.objects.filter(current=True).count(), 3)
+        avalon = Riding.objects.get(slug='avalon')
+        self.assertEqual(avalon.edid, 10001)
+        self.assertEqual(Riding.objects.get(slug='labrador').name_fr, 'Labrador (Terre-Neuve)')
+        created = Riding.objects.get(slug='terra-nova-the-peninsulas')
+        self.assertEqual((created.edid, created.province, created.current), (10099, 'NL', True))
+        self.assertFalse(Riding.objects.get(slug='st-john-s-east').current)
+
+    def test_fetch_writes_archive(self):
+        details = [boundary(10001, 'Avalon', 'Avalon')]
+        responses = {
+            '/boundaries/federal-electoral-districts/?limit=500': {
+                'objects': [{'url': '/boundaries/federal-electoral-districts/10001/'}]},
+            '/boundaries/federal-electoral-districts/10001/': details[0],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / 'ridings.json'
+            with mock.patch.object(mps, '_get_represent_json', side_effect=responses.__getitem__):
+                self.assertEqual(mps.fetch_represent_ridings(archive=str(archive)), details)
+            self.assertEqual(json.loads(archive.read_text()), details)
+            # Later runs read the archive instead of fetching
+            with mock.patch.object(mps, '_get_represent_json') as get_json:
+                self.assertEqual(mps.fetch_represent_ridings(archive=str(archive)), details)
+            get_json.assert_not_called()
+
+    def test_empty_boundary_set(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / 'ridings.json'
+            archive.write_text('[]')
+            with self.assertRaises(ValueError):
+                mps.update_ridings_from_represent(archive=str(archive))
+        self.assertTrue(Riding.objects.get(slug='avalon').current)
@@ -1,11 +1,13 @@
 import datetime
 import time
 
-from django.db import transaction, models
+from django.db import connection, transaction, models
 from django.conf import settings
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from parliament.imports import parlvotes, legisinfo, parl_document, parl_cmte
 from parliament.imports.mps import update_mps_from_ourcommons
+from parliament.bills.models import Bill, BillStats, MemberVote, PartyVote, VoteQuestion
 from parliament.core.models import Politician, Session
 from parliament.hansards.models import Document
 from parliament.activity import utils as activityutils
@@ -20,10 +22,56 @@ mps = update_mps_from_ourcommons
         
 def votes():
     parlvotes.import_votes()
+
+def votes_relabel_benchmark(parliamentnum=None):
+    """Re-run absence, party-line and activity labelling for every vote in a parliament
+    (the current one by default), print timings and query counts, then roll it all back."""
+    if parliamentnum is None:
+        parliamentnum = Session.objects.current().parliamentnum
+    vqs = list(VoteQuestion.objects.filter(session__parliamentnum=parliamentnum).order_by('date', 'number'))
+    timings = dict.fromkeys(('absent', 'party', 'activities'), 0.0)
+    with transaction.atomic():
+        # Undo the existing labels first, so the run is timed against freshly imported votes
+        membervotes = MemberVote.objects.filter(votequestion__in=vqs)
+        Activity.objects.filter(variety='membervote', guid__in=[
+            activityutils._guid(mv, 'membervote') for mv in membervotes.only('id')]).delete()
+        membervotes.filter(vote='A').delete()
+        membervotes.update(dissent=False)
+        PartyVote.objects.filter(votequestion__in=vqs).delete()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for vq in vqs:
+                t = time.perf_counter()
+                vq.label_absent_members()
+                timings['absent'] += time.perf_counter() - t
+                t = time.perf_counter()
+                vq.label_party_votes()
+                timings['party'] += time.perf_counter() - t
+                t = time.perf_counter()
+                vq.save_member_activities()
+                timings['activities'] += time.perf_counter() - t
+            total = time.perf_counter() - start
+        transaction.set_rollback(True)
+    print("Relabelled %d votes in parliament %s in %.2fs, %d queries" % (
+        len(vqs), parliamentnum, total, len(queries)))
+    for step, seconds in timings.items():
+        print("  %-12s %.2fs" % (step, seconds))
     
 def bills():
     legisinfo.import_bills(Session.objects.current())
 
+def bill_stats():
+    """Recompute BillStats for every bill; the Hansard import keeps them current after that."""
+    bill_ids = list(Bill.objects.values_list('id', flat=True))
+    for i in range(0, len(bill_ids), 500):
+        BillStats.update_for_bills(bill_ids[i:i + 500])
+
+def politician_feeds():
+    from parliament.politicians import googlenews, twit
+    print("News: %s" % googlenews.save_news())
+    if getattr(settings, 'TWITTER_OAUTH', None):
+        print("Twitter: %s" % twit.save_tweets())
+
 @transaction.atomic
 def prune_activities():
     for pol in Politician.objects.current():
@@ -84,12 +132,27 @@ def hansards():
 def reimport():
     parl_document.reimport_recent_documents()
     
+def sitemaps():
+    from parliament.core.sitemap import build_sitemaps
+    build_sitemaps()
+
 def corpus_for_debates():
     corpora.generate_for_debates()
 
 def corpus_for_committees():
     corpora.generate_for_committees()
 
+def term_timelines():
+    from parliament.text_analysis.timelines import build_term_timelines
+    build_term_timelines()
+
 def summaries():
     update_hansard_summaries()
     update_reading_summaries(Session.objects.current())
+
+def summaries_benchmark():
+    """Run the summary pipeline offline against the stub LLM, without saving anything.
+    Run it twice to see the cost of a regeneration where nothing has changed."""
+    from parliament.summaries.llm import llms
+    with override_settings(PARLIAMENT_LLM_OVERRIDE=llms.STUB):
+        update_hansard_summaries(regenerate=True, dry_run=True)
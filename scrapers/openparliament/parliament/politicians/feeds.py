@@ -0,0 +1,142 @@
+"""Concurrent refresher for per-politician news and social feeds.
+
+Feeds are fetched and parsed on a thread pool through one pooled HTTP session,
+with If-None-Match/If-Modified-Since validators remembered per feed URL, so
+an unchanged feed costs a 304 and no parsing. Items from every feed are saved
+as activities in one bulk insert on the calling thread.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from parliament.activity import utils as activity
+from parliament.core.models import Politician
+
+logger = logging.getLogger(__name__)
+
+FEED_WORKERS = getattr(settings, 'PARLIAMENT_FEED_WORKERS', 8)
+FEED_TIMEOUT = 30
+VALIDATOR_CACHE_SECONDS = 60 * 60 * 24 * 30
+RATE_LIMIT_MAX_WAIT = 15 * 60
+
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=FEED_WORKERS))
+
+
+@dataclass
+class FeedItem:
+    obj: Any  # what the activity template renders as obj
+    date: Any
+    guid: str
+
+
+@dataclass(eq=False)
+class Feed:
+    politician: Politician
+    variety: str  # activity variety, i.e. activity/<variety>.html
+    url: str
+    parse: Callable[[bytes], list[FeedItem]]  # runs on a worker thread; no database access
+    params: dict | None = None
+    auth: Any = None
+
+
+@dataclass
+class FeedStats:
+    feeds: int = 0
+    fetched: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    items: int = 0
+    new_items: int = 0
+    seconds: float = 0.0
+
+    def __str__(self):
+        return ("%d feeds in %.1fs: %d fetched, %d not modified, %d errors; "
+                "%d items, %d new") % (self.feeds, self.seconds, self.fetched, self.not_modified,
+                                      self.errors, self.items, self.new_items)
+
+
+@dataclass
+class _FeedResult:
+    status: str  # 'fetched', 'not_modified' or 'error'
+    items: list[FeedItem] = field(default_factory=list)
+    validators: dict | None = None
+
+
+def _validator_key(feed: Feed) -> str:
+    url = requests.Request('GET', feed.url, params=feed.params).prepare().url
+    return 'feedvalidators:' + hashlib.sha1(url.encode('utf8')).hexdigest()
+
+
+def _fetch(feed: Feed, validators: dict | None) -> _FeedResult:
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    try:
+        resp = _http.get(feed.url, params=feed.params, auth=feed.auth, headers=headers,
+                         timeout=FEED_TIMEOUT)
+        if resp.status_code == 429:
+            # Rate-limited: wait until the reset time, then retry once
+            reset = resp.headers.get('x-rate-limit-reset')
+            wait = int(reset) - time.time() if reset else int(resp.headers.get('Retry-After', 60))
+            time.sleep(min(max(wait, 10), RATE_LIMIT_MAX_WAIT))
+            resp = _http.get(feed.url, params=feed.params, auth=feed.auth, headers=headers,
+                             timeout=FEED_TIMEOUT)
+        if resp.status_code == 304:
+            return _FeedResult('not_modified')
+        resp.raise_for_status()
+        items = feed.parse(resp.content)
+    except Exception:
+        logger.exception("Error refreshing %s feed for %s", feed.variety, feed.politician)
+        return _FeedResult('error')
+    return _FeedResult('fetched', items, {
+        'etag': resp.headers.get('ETag', ''),
+        'last_modified': resp.headers.get('Last-Modified', ''),
+    })
+
+
+def refresh_feeds(feeds: list[Feed], workers: int = FEED_WORKERS) -> tuple[FeedStats, dict[Feed, list[FeedItem]]]:
+    """Fetch and parse feeds concurrently and save their new items as activities.
+
+    Returns stats, and the parsed items of each feed that was fetched."""
+    start = time.perf_counter()
+    stats = FeedStats(feeds=len(feeds))
+    keys = {feed: _validator_key(feed) for feed in feeds}
+    validators = cache.get_many(list(set(keys.values())))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(feeds)))) as executor:
+        results = dict(zip(feeds, executor.map(
+            lambda feed: _fetch(feed, validators.get(keys[feed])), feeds)))
+
+    fetched = {feed: r.items for feed, r in results.items() if r.status == 'fetched'}
+    stats.fetched = len(fetched)
+    stats.not_modified = sum(1 for r in results.values() if r.status == 'not_modified')
+    stats.errors = sum(1 for r in results.values() if r.status == 'error')
+    stats.items = sum(len(items) for items in fetched.values())
+
+    for variety in sorted({feed.variety for feed in fetched}):
+        stats.new_items += activity.save_activities(
+            ((item.obj, feed.politician, item.date, item.guid)
+             for feed, items in fetched.items() if feed.variety == variety
+             for item in items),
+            variety=variety)
+
+    # Only remember validators once the items are saved, so a failed run is refetched in full
+    cache.set_many({keys[feed]: results[feed].validators for feed in fetched
+                    if any(results[feed].validators.values())},
+                   VALIDATOR_CACHE_SECONDS)
+    stats.seconds = time.perf_counter() - start
+    logger.info("Feed refresh: %s", stats)
+    return stats, fetched
@@ -1,12 +1,14 @@
-import feedparser
 import datetime
+import email.utils
 import hashlib
+from urllib.parse import quote
 
-from django.utils.http import urlquote
-from BeautifulSoup import BeautifulSoup
 from django.utils.html import strip_tags
+import lxml.etree
+import lxml.html
 
-from parliament.activity import utils as activity
+from parliament.core.models import Politician
+from parliament.politicians.feeds import Feed, FeedItem, refresh_feeds
 
 import logging
 
@@ -14,7 +16,9 @@ logger = logging.getLogger(__name__)
 
 GOOGLE_NEWS_URL = 'https://news.google.ca/news?pz=1&cf=all&ned=ca&hl=en&as_maxm=3&q=%s&as_qdr=a&as_drrb=q&as_mind=25&as_minm=2&cf=all&as_maxd=27&scoring=n&output=rss'
 def get_feed(pol):
-    return feedparser.parse(GOOGLE_NEWS_URL % urlquote(get_query_string(pol)))
+    return Feed(politician=pol, variety='gnews',
+        url=GOOGLE_NEWS_URL % quote(get_query_string(pol)),
+        parse=lambda content: news_items_for_pol(pol, content))
     
 def get_query_string(pol):
     if 'googlenews_query' in pol.info():
@@ -27,32 +31,35 @@ def get_query_string(pol):
     q += ' AND ("MP" OR "Member of Parliament") location:canada'
     return q
     
-def news_items_for_pol(pol):
-    feed = get_feed(pol)
+def news_items_for_pol(pol, content: bytes) -> list[FeedItem]:
+    # Runs on a feed worker thread: no database access
     items = []
-    for i in feed['entries'][:10]:
-        if 'URL is deprecated' in i.title:
+    for i in lxml.etree.fromstring(content).findall('channel/item')[:10]:
+        title = i.findtext('title', '')
+        if 'URL is deprecated' in title:
             continue # temp fix
-        item = {'url': i.link}
-        title_elements = i.title.split('-')
+        item = {'url': i.findtext('link')}
+        title_elements = title.split('-')
         item['source'] = title_elements.pop().strip()
         item['title'] = '-'.join(title_elements).strip()
-        item['date'] = datetime.date(*i.updated_parsed[:3])
+        date = datetime.date(*email.utils.parsedate(i.findtext('pubDate'))[:3])
         h = hashlib.md5()
-        h.update(i.id)
-        item['guid'] = 'gnews_%s_%s' % (pol.id, h.hexdigest())
-        soup = BeautifulSoup(i.summary)
+        h.update((i.findtext('guid') or item['url']).encode('utf8'))
+        guid = 'gnews_%s_%s' % (pol.id, h.hexdigest())
         try:
-            item['summary'] = strip_tags(str(soup.findAll('font', size='-1')[1]))
+            summary = lxml.html.fromstring(i.findtext('description'))
+            item['summary'] = strip_tags(lxml.html.tostring(
+                summary.xpath('//font[@size="-1"]')[1], encoding='unicode'))
         except Exception as e:
             logger.exception("Error getting news for %s" % pol.slug)
             continue
         if pol.name not in item['summary']:
             continue
-        items.append(item)
+        items.append(FeedItem(obj=item, date=date, guid=guid))
     return items
-    
+
 def save_politician_news(pol):
-    items = news_items_for_pol(pol)
-    for item in items:
-        activity.save_activity(item, politician=pol, date=item['date'], guid=item['guid'], variety='gnews')
\ No newline at end of file
+    return refresh_feeds([get_feed(pol)])[0]
+
+def save_news():
+    return refresh_feeds([get_feed(pol) for pol in Politician.objects.current()])[0]
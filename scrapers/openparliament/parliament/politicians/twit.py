@@ -1,5 +1,6 @@
-import email
+import email.utils
 import datetime
+import json
 import time
 
 from django.conf import settings
@@ -9,16 +10,44 @@ import requests
 from requests_oauthlib import OAuth1
 
 from parliament.core.models import Politician
-from parliament.activity import utils as activity
+from parliament.politicians.feeds import Feed, FeedItem, refresh_feeds
 
 import logging
 logger = logging.getLogger(__name__)
 
+TIMELINE_URL = 'https://api.twitter.com/1.1/statuses/user_timeline.json'
+
+class _Timeline(list):
+    """Recent tweets as FeedItems, plus the account's current screen name."""
+    screen_name = None
+
+def _timeline_items(content: bytes, oldest: datetime.date) -> _Timeline:
+    # Runs on a feed worker thread: no database access
+    timeline = json.loads(content)
+    items = _Timeline()
+    if timeline:
+        # From the newest tweet, whatever its date, so renames are seen on quiet days too
+        items.screen_name = timeline[0]['user']['screen_name']
+    for tweet in reversed(timeline):
+        date = datetime.date.fromtimestamp(
+            email.utils.mktime_tz(
+                email.utils.parsedate_tz(tweet['created_at'])
+            )
+        ) # fuck you, time formats
+        if date < oldest:
+            continue
+
+        # Twitter apparently escapes < > but not & "
+        # so I'm clunkily unescaping lt and gt then reescaping in the template
+        text = tweet['text'].replace('&lt;', '<').replace('&gt;', '>')
+        items.append(FeedItem(obj={'text': text}, date=date, guid='twit_%s' % tweet['id']))
+    return items
+
 def save_tweets():
     OLDEST = datetime.date.today() - datetime.timedelta(days=1)
 
-    pols = Politician.objects.current()
-    for pol in pols:
+    feeds = []
+    for pol in Politician.objects.current():
         if 'twitter' not in pol.info():
             continue
         if 'twitter_id' in pol.info():
@@ -31,53 +60,34 @@ def save_tweets():
                 logger.error('Screen name appears to be invalid: %s', pol.info()['twitter'])
                 pol.del_info('twitter')
                 continue
+        feeds.append(Feed(politician=pol, variety='twitter', url=TIMELINE_URL,
+            params={'user_id': twitter_id, 'include_rts': False}, auth=_auth(),
+            parse=lambda content: _timeline_items(content, OLDEST)))
 
-        try:
-            timeline = twitter_api_request('statuses/user_timeline', {'user_id': twitter_id, 'include_rts': False})
-        except ObjectDoesNotExist:
-            logger.warning("Invalid twitter ID for %s", pol)
-            continue
-        except requests.HTTPError as e:
-            logger.exception("HTTPError for %s %s", pol, e)
-            continue
-        except requests.ConnectionError:
-            continue
-
-        if timeline and timeline[0]['user']['screen_name'] != pol.info()['twitter']:
+    stats, fetched = refresh_feeds(feeds)
+    for feed, items in fetched.items():
+        pol = feed.politician
+        if items.screen_name and items.screen_name != pol.info()['twitter']:
             # Changed screen name
-            new_name = timeline[0]['user']['screen_name']
+            new_name = items.screen_name
             logger.warning("Screen name change: new %s old %s", new_name, pol.info()['twitter'])
             pol.set_info('twitter', new_name)
+    return stats
 
-        timeline.reverse()
-        for tweet in timeline:
-            date = datetime.date.fromtimestamp(
-                email.utils.mktime_tz(
-                    email.utils.parsedate_tz(tweet['created_at'])
-                )
-            ) # fuck you, time formats
-            if date < OLDEST:
-                continue
-
-            guid = 'twit_%s' % tweet['id']
-            # Twitter apparently escapes < > but not & "
-            # so I'm clunkily unescaping lt and gt then reescaping in the template
-            text = tweet['text'].replace('&lt;', '<').replace('&gt;', '>')
-            activity.save_activity({'text': text}, politician=pol,
-                date=date, guid=guid, variety='twitter')
+def _auth():
+    return OAuth1(
+        settings.TWITTER_OAUTH['consumer_key'],
+        settings.TWITTER_OAUTH['consumer_secret'],
+        settings.TWITTER_OAUTH['token'],
+        settings.TWITTER_OAUTH['token_secret'],
+    )
             
 def get_id_from_screen_name(screen_name):
     return twitter_api_request('users/show', params={'screen_name': screen_name})['id']
         
 def twitter_api_request(endpoint, params=None):
     url = 'https://api.twitter.com/1.1/' + endpoint + '.json'
-    auth = OAuth1(
-        settings.TWITTER_OAUTH['consumer_key'],
-        settings.TWITTER_OAUTH['consumer_secret'],
-        settings.TWITTER_OAUTH['token'],
-        settings.TWITTER_OAUTH['token_secret'],
-    )
-    resp = requests.get(url, auth=auth, params=params)
+    resp = requests.get(url, auth=_auth(), params=params)
     if resp.status_code == 200:
         return resp.json()
     elif resp.status_code == 429:
@@ -7,12 +7,13 @@ from django.db.models import Sum, Max, Count
 from parliament.hansards.models import Statement
 from parliament.hansards.utils import get_major_speeches, group_by_party
 from parliament.bills.models import Bill
-from parliament.summaries.llm import get_llm_response, LLMProviderError, llms
+from parliament.summaries.llm import cache_if_valid, get_llm_response, LLMProviderError, llms
 from parliament.summaries.models import Summary
+from parliament.summaries.stats import stage, track_stats
 
 from .utils import (LinkError, get_transcript, call_llm_with_munged_urls,
                     load_json_response, check_markdown_links, retry, save_summary,
-                    check_length)
+                    check_length, parallel_map)
 
 logger = logging.getLogger(__name__)
 
@@ -73,83 +74,99 @@ BILL_READING_INSTRUCTIONS_PARTY_SCHEMA = {
     }
 }
 
-def create_reading_summary(bill: Bill, reading: Literal['2','3','report'], model: str | None = None) -> Summary:
+def create_reading_summary(bill: Bill, reading: Literal['2','3','report'], model: str | None = None,
+                           save: bool = True) -> Summary | None:
+    """The overall summary and each party's summary are generated in parallel.
+    With save=False, nothing is written to the database and None is returned."""
     identifier = bill.get_absolute_url()
-    statements = list(bill.get_debate_at_stage(reading).select_related('member', 'member__party'))
+    with stage('select'):
+        statements = list(bill.get_debate_at_stage(reading).select_related('member', 'member__party'))
     if not statements:
         raise ValueError("No statements provided")
     
     major_speeches = get_major_speeches(statements)
     major_speeches_by_party = group_by_party(major_speeches)
 
-    metadata = []
-    summary_parts = []
-
     # Get overall summary from major_speeches
-    resp, meta = get_llm_response(BILL_SUMMARY_FROM_SPEECHES, get_transcript(major_speeches, para_urls=True), temperature=0.7)
-    check_length(resp, 420)
-    summary_parts.append(resp)
-    metadata.append(meta)
+    def _get_overall_summary():
+        with cache_if_valid():
+            with stage('bill_overview'):
+                resp, meta = get_llm_response(BILL_SUMMARY_FROM_SPEECHES, get_transcript(major_speeches, para_urls=True), temperature=0.7)
+            check_length(resp, 420)
+        return resp, meta
 
     # For each party, get individual summary bullets
     @retry(2, (LinkError, json.JSONDecodeError, KeyError, LLMProviderError))
     def _get_party_summary(party_name, party_speeches):
         party_transcript = get_transcript(party_speeches, para_urls=True)
-        resp, meta = call_llm_with_munged_urls(BILL_READING_INSTRUCTIONS_PARTY, party_transcript,
-                                                json=BILL_READING_INSTRUCTIONS_PARTY_SCHEMA,
-                                                model=llms.THINKING, temperature=0.7)
+        with stage('bill_party'):
+            resp, meta = call_llm_with_munged_urls(BILL_READING_INSTRUCTIONS_PARTY, party_transcript,
+                                                    json=BILL_READING_INSTRUCTIONS_PARTY_SCHEMA,
+                                                    model=llms.THINKING, temperature=0.7)
         json_resp = load_json_response(resp)
         party_summary = f"**{party_name}**\n\n"
         for bullet in json_resp:
             party_summary += f"- [{bullet['headline']}]({bullet['source_paragraph_url']}): {bullet['summary']}\n"
         check_markdown_links(party_summary, party_transcript)
         check_length(party_summary, 1600)
-
-        summary_parts.append(party_summary)
-        metadata.append(meta)
+        return party_summary, meta
 
     # Start with the party of the bill's sponsor
+    parties = list(major_speeches_by_party.items())
     if bill.sponsor_member:
         sponsor_party = bill.sponsor_member.party.short_name
-        if sponsor_party in major_speeches_by_party:
-            _get_party_summary(sponsor_party, major_speeches_by_party[sponsor_party])
-            del major_speeches_by_party[sponsor_party]
+        parties.sort(key=lambda p: p[0] != sponsor_party)
 
-    for party_name, party_speeches in major_speeches_by_party.items():
-        _get_party_summary(party_name, party_speeches)
+    tasks = [_get_overall_summary] + [
+        (lambda party=party: _get_party_summary(*party)) for party in parties]
+    results = parallel_map(lambda task: task(), tasks)
+    summary_parts = [part for part, meta in results]
+    metadata = [meta for part, meta in results]
 
+    if not save:
+        return
     summary_text = "\n\n".join(summary_parts)
-    summary = save_summary('stage_' + reading,
-                            identifier, statements, metadata, summary_text=summary_text)
+    with stage('save'):
+        summary = save_summary('stage_' + reading,
+                                identifier, statements, metadata, summary_text=summary_text)
     return summary
 
-def update_reading_summaries(session):
-    debate_states = Statement.objects.filter(
-        document__document_type='D', document__session=session, procedural=False,
-        bill_debate_stage__in=('2', '3', 'report'))
-    debates_avail = debate_states.values('bill_debated', 'bill_debate_stage').annotate(
-        words=Sum("wordcount"), latest=Max("time"), count=Count("id"))
-    
-    tasks = []
-    
-    for row in debates_avail:
-        if row['words'] < 2000:
-            continue
-
-        bill = Bill.objects.get(id=row['bill_debated'])
-        try:
-            summary = Summary.objects.get(
-                summary_type='stage_' + row['bill_debate_stage'],
-                identifier=bill.get_absolute_url())
-            if row['count'] - summary.summarized_statement_count < 10:
-                continue
-        except Summary.DoesNotExist:
-            pass
-
-        tasks.append((bill, row['bill_debate_stage']))
-
+def update_reading_summaries(session, workers=None, dry_run=False):
+    with track_stats() as stats:
+        with stage('select'):
+            debate_states = Statement.objects.filter(
+                document__document_type='D', document__session=session, procedural=False,
+                bill_debate_stage__in=('2', '3', 'report'))
+            debates_avail = debate_states.values('bill_debated', 'bill_debate_stage').annotate(
+                words=Sum("wordcount"), latest=Max("time"), count=Count("id"))
+            
+            tasks = []
+            
+            for row in debates_avail:
+                if row['words'] < 2000:
+                    continue
+
+                bill = Bill.objects.get(id=row['bill_debated'])
+                try:
+                    summary = Summary.objects.get(
+                        summary_type='stage_' + row['bill_debate_stage'],
+                        identifier=bill.get_absolute_url())
+                    if row['count'] - summary.summarized_statement_count < 10:
+                        continue
+                except Summary.DoesNotExist:
+                    pass
+
+                tasks.append((bill, row['bill_debate_stage']))
+
+        if tasks:
+            print(f"{len(tasks)} summaries to generate")
+
+            def _summarize(task):
+                bill, reading = task
+                summ = create_reading_summary(bill, reading, save=not dry_run)
+                print(summ or f"{bill} stage {reading}")
+
+            parallel_map(_summarize, tasks, workers=workers)
     if tasks:
-        print(f"{len(tasks)} summaries to generate")
-        for bill, stage in tasks:
-            summ = create_reading_summary(bill, stage)
-            print(summ)
\ No newline at end of file
+        print(stats.report())
+    return stats
@@ -8,9 +8,10 @@ from parliament.hansards.models import Document
 from parliament.hansards.utils import get_hansard_sections
 from parliament.summaries.llm import get_llm_response, LLMProviderError, llms
 from parliament.summaries.models import Summary
+from parliament.summaries.stats import stage, track_stats
 from .utils import (LinkError, get_transcript, call_llm_with_munged_urls,
                     load_json_response, check_markdown_links, retry, save_summary,
-                    check_length, strip_markdown_links)
+                    check_length, strip_markdown_links, parallel_map)
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +30,17 @@ HANSARD_TOPIC_SUBHED_SCHEMA = {
     }
 }
 
-def create_hansard_topics_summary(document) -> Summary | None:
-    sections_obj = get_hansard_sections(document)
+def create_hansard_topics_summary(document, save=True) -> Summary | None:
+    """Sections are summarized in parallel. With save=False, nothing is written
+    to the database (for benchmarking), and None is returned."""
+    with stage('sections'):
+        sections_obj = get_hansard_sections(document)
     if not sections_obj:
         return
     llm_metadata = []
 
-    for section in sections_obj:
-        meta = _summarize_hansard_section(section, document)
+    section_metas = parallel_map(lambda section: _summarize_hansard_section(section, document), sections_obj)
+    for section, meta in zip(sections_obj, section_metas):
         if meta:
             if isinstance(meta, list):
                 llm_metadata.extend(meta)
@@ -46,21 +50,27 @@ def create_hansard_topics_summary(document) -> Summary | None:
         if 'all_slugs' in section:
             del section['all_slugs']
 
-    return save_summary('hansard_topics', document.get_absolute_url(), document.statement_set.all(),
-                  llm_metadata, summary_json=sections_obj)
+    if not save:
+        return
+    with stage('save'):
+        return save_summary('hansard_topics', document.get_absolute_url(), document.statement_set.all(),
+                      llm_metadata, summary_json=sections_obj)
 
 @retry(2, (LinkError, json.JSONDecodeError, KeyError, LLMProviderError))
 def _summarize_hansard_section(section, doc):
     statements = doc.statement_set.filter(slug__in=section['all_slugs'])
 
     if section['display_heading'].lower() in ('petitions', 'statements by members'):
-        return _summarize_subheds(section, statements)
+        with stage('subheds'):
+            return _summarize_subheds(section, statements)
     
     if section['display_heading'] == 'Question Period':
-        return _summarize_qp(section, statements)
+        with stage('qp'):
+            return _summarize_qp(section, statements)
     
     if section['display_heading'].lower() in ('adjournment proceedings', 'adjournment debates') and section['subheds']:
-        return _summarize_adjournment(section, statements)
+        with stage('adjournment'):
+            return _summarize_adjournment(section, statements)
     
     if section['subheds']:
         return
@@ -92,7 +102,8 @@ def _summarize_hansard_section(section, doc):
         instructions = strip_markdown_links(instructions)    
         
     transcript = get_transcript(statements, para_urls=False)
-    resp, meta = call_llm_with_munged_urls(instructions, transcript, model=llms.THINKING, temperature=0.7)
+    with stage('section'):
+        resp, meta = call_llm_with_munged_urls(instructions, transcript, model=llms.THINKING, temperature=0.7)
     check_markdown_links(resp, transcript)
     check_length(resp, 850)
     section['summary_text'] = resp
@@ -244,21 +255,36 @@ def _summarize_subheds(section, statements):
     meta['tag'] = f"subheds - {section_type}"
     return meta
 
-def update_hansard_summaries(n_most_recent=10, regenerate=False):
-    docs = Document.debates.filter(public=True).order_by('-date')[:n_most_recent]
-    for doc in docs:
-        try:
-            summary = Summary.objects.get(
-                summary_type='hansard_topics',
-                identifier=doc.get_absolute_url()
-            )
-            if (not regenerate) and abs(doc.statement_set.count() - summary.summarized_statement_count) < 10:
-                    continue
-        except Summary.DoesNotExist:
-            pass
-
-        try:
-            print(doc)
-            create_hansard_topics_summary(doc)
-        except Exception as e:
-            logger.exception(f"Error creating summary for {doc}: {e}")
\ No newline at end of file
+def update_hansard_summaries(n_most_recent=10, regenerate=False, workers=None, dry_run=False):
+    """Summarize recent debates, several at a time.
+
+    Regenerating is cheap when little has changed: LLM responses are cached by
+    their input, so only sections whose transcript changed go to the model.
+    """
+    with track_stats() as stats:
+        with stage('select'):
+            docs = list(Document.debates.filter(public=True).order_by('-date')[:n_most_recent])
+            todo = []
+            for doc in docs:
+                try:
+                    summary = Summary.objects.get(
+                        summary_type='hansard_topics',
+                        identifier=doc.get_absolute_url()
+                    )
+                    if (not regenerate) and abs(doc.statement_set.count() - summary.summarized_statement_count) < 10:
+                            continue
+                except Summary.DoesNotExist:
+                    pass
+                todo.append(doc)
+
+        def _summarize(doc):
+            try:
+                print(doc)
+                create_hansard_topics_summary(doc, save=not dry_run)
+            except Exception as e:
+                logger.exception(f"Error creating summary for {doc}: {e}")
+
+        parallel_map(_summarize, todo, workers=workers)
+    if todo:
+        print(stats.report())
+    return stats
@@ -1,4 +1,6 @@
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import json
 import logging
 import random
@@ -6,9 +8,16 @@ import re
 import string
 from time import sleep
 
+from django.conf import settings
+from django.db import connection
+
 from parliament.hansards.models import Statement
-from parliament.summaries.llm import get_llm_response, LLMProviderError
+from parliament.summaries.llm import get_llm_response, cache_if_valid, fresh_llm_responses, LLMProviderError
 from parliament.summaries.models import Summary
+from parliament.summaries.stats import stage
+
+# Threads per pool; the per-provider rate limit in llm.py still caps the request rate
+SUMMARY_WORKERS = getattr(settings, 'PARLIAMENT_SUMMARY_WORKERS', 4)
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +35,26 @@ def _statement_to_text(s: Statement, para_urls=True) -> str:
     return r + "\n\n" + s.text_plain(include_paragraph_urls=para_urls)
 
 def get_transcript(statements: Iterable[Statement], para_urls: bool) -> str:
-    return "\n\n----\n\n".join(_statement_to_text(s, para_urls=para_urls) for s in statements)
+    with stage('transcript'):
+        return "\n\n----\n\n".join(_statement_to_text(s, para_urls=para_urls) for s in statements)
+
+def parallel_map(fn, items: Iterable, workers: int | None = None) -> list:
+    """Like list(map(fn, items)), run on a thread pool. Each call runs in a copy of the
+    caller's context (so stats and stages carry over) and closes its DB connection after."""
+    items = list(items)
+    workers = workers or SUMMARY_WORKERS
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    def _call(item):
+        try:
+            return fn(item)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _call, item) for item in items]
+        return [f.result() for f in futures]
 
 def load_json_response(llm_response: str) -> dict:
     if llm_response.startswith('```json'):
@@ -45,7 +73,12 @@ def retry(times: int, exceptions: tuple[type[Exception], ...]):
             attempt = 0
             while attempt < times:
                 try:
-                    return func(*args, **kwargs)
+                    if attempt:
+                        # A cached response that failed validation would fail again
+                        with fresh_llm_responses(), cache_if_valid():
+                            return func(*args, **kwargs)
+                    with cache_if_valid():
+                        return func(*args, **kwargs)
                 except exceptions as e:
                     print(
                         'Exception %r when attempting to run %s, attempt '
@@ -54,7 +87,8 @@ def retry(times: int, exceptions: tuple[type[Exception], ...]):
                     attempt += 1
                     if isinstance(e, LLMProviderError):
                         sleep(45)
-            return func(*args, **kwargs)
+            with fresh_llm_responses(), cache_if_valid():
+                return func(*args, **kwargs)
         return newfn
     return decorator    
 
@@ -86,7 +120,12 @@ def save_summary(summary_type: str, identifier: str,
         check_markdown_links(summary_text, transcript)
 
     existing_summary = Summary.objects.filter(summary_type=summary_type, identifier=identifier)
-    if existing_summary.exists():
+    current = existing_summary.first()
+    if (current and current.summarized_statement_count == len(statements)
+            and current.summary_text == summary_text and current.summary_json == summary_json):
+        # Nothing changed (every LLM response came from the cache); keep the existing summary
+        return current
+    if current:
         existing_summary.update(summary_type=summary_type + '_archived_' + _gen_string(5))
     
     summary = Summary(summary_type=summary_type, identifier=identifier)
@@ -104,10 +143,10 @@ def save_summary(summary_type: str, identifier: str,
     summary.save()
     return summary
 
-def _gen_string(length=6):
+def _gen_string(length=6, rng=random):
     """Make a random string."""
     characters = string.ascii_letters + string.digits
-    return ''.join(random.choices(characters, k=length))
+    return ''.join(rng.choices(characters, k=length))
 
 def strip_markdown_links(s: str) -> str:
     """Remove markdown links from a string."""
@@ -125,8 +164,11 @@ def call_llm_with_munged_urls(instructions: str, text: str, model: str | None =
     # little modifications to the actual URLs. I found this occurred much less often if the URLs
     # were opaque random strings instead of the actual long, meaningful URLs. So this 
     # function substitutes URLs with random strings, and then substitutes them back in the response.
+    # The strings are seeded from the text, so the same transcript always gets the same
+    # substitutions and can be served from the LLM response cache.
     #
     # Same arguments and return values as get_llm_response.
+    rng = random.Random(text)
     urls = {}
     urls_lookup = {}
     def replace_url(match):
@@ -134,7 +176,7 @@ def call_llm_with_munged_urls(instructions: str, text: str, model: str | None =
         if url not in urls:
             new_url = None
             while new_url is None or new_url in urls_lookup:
-                new_url = "/st/" + _gen_string()
+                new_url = "/st/" + _gen_string(rng=rng)
             urls[url] = new_url
             urls_lookup[new_url] = url
         return urls[url]
@@ -1,69 +1,156 @@
-from collections import deque
-from functools import wraps
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
+import json as jsonlib
+import re
+import threading
 import time
 from typing import Literal
 
 from django.conf import settings
+from django.core.cache import caches
 
 import requests
 
+from parliament.summaries.stats import current_stage, current_stats
+
 class llms:
     QUICK = 'google:gemini-2.0-flash'
     THINKING = 'google:gemini-2.5-flash-preview-04-17'
     EXPERT = 'google:gemini-2.5-pro-exp-03-25'
+    STUB = 'stub:offline'
 
 class LLMProviderError(Exception):
     pass
 
+# Calls allowed per provider, as (n_calls, per_seconds); shared by every thread in the process
+RATE_LIMITS = getattr(settings, 'PARLIAMENT_LLM_RATE_LIMITS', {'google': (15, 75)})
+
+# Responses are cached by a hash of everything sent to the model, so regenerating
+# a summary only calls the model for the parts whose transcript has changed.
+LLM_CACHE_ALIAS = getattr(settings, 'PARLIAMENT_LLM_CACHE', 'default')
+LLM_CACHE_SECONDS = getattr(settings, 'PARLIAMENT_LLM_CACHE_SECONDS', 60 * 60 * 24 * 90)
+
+_refresh_cache = ContextVar('llm_refresh_cache', default=False)
+# Cache writes held back until the caller has validated the responses; see cache_if_valid()
+_pending_cache_writes = ContextVar('llm_pending_cache_writes', default=None)
+
 def get_llm_response(instructions: str, text: str, model: str | None = None,
                      chat_history: list[tuple[Literal["user", "model"], str]] = [],
                      json: bool | dict = False, temperature: float | None = None,
                      top_p: float | None = None) -> tuple[str, dict]:
     if model is None:
         model = llms.QUICK
+    # e.g. PARLIAMENT_LLM_OVERRIDE = llms.STUB to run the summary pipeline offline
+    model = getattr(settings, 'PARLIAMENT_LLM_OVERRIDE', None) or model
     provider, model = model.split(':', 1)
+    if provider not in ('google', 'or', 'stub'):
+        raise ValueError(f"Unknown provider: {provider}")
+
+    cache = caches[LLM_CACHE_ALIAS]
+    cache_key = _cache_key(provider, model, instructions, text, chat_history, json, temperature, top_p)
+    stats = current_stats()
+    if not _refresh_cache.get():
+        cached = cache.get(cache_key)
+        if cached is not None:
+            response_text, metadata = cached
+            metadata = dict(metadata, cached=True)
+            if stats:
+                stats.add_llm_call(current_stage(), 0.0, metadata, cached=True)
+            return (response_text, metadata)
+
+    waited = _get_bucket(provider).acquire()
+    start = time.perf_counter()
     if provider == 'google':
         response_text, metadata = _get_llm_response_google(instructions, text, model, chat_history, json,
                                                             temperature, top_p)
     elif provider == 'or':  
         response_text, metadata = _get_llm_response_openrouter(instructions, text, model, chat_history, json)
     else:
-        raise ValueError(f"Unknown provider: {provider}")
+        response_text, metadata = _get_llm_response_stub(instructions, text, model, chat_history, json)
+    if stats:
+        stats.add_llm_call(current_stage(), time.perf_counter() - start, metadata, waited=waited)
+    pending = _pending_cache_writes.get()
+    if pending is not None:
+        pending.append((cache_key, (response_text, metadata)))
+    else:
+        cache.set(cache_key, (response_text, metadata), LLM_CACHE_SECONDS)
 
     return (response_text, metadata)
 
-def rate_limit(n_calls: int, per: int):
+@contextmanager
+def cache_if_valid():
+    """Hold back caching of the responses received within this block until it exits
+    without an exception, so that a response which fails validation isn't cached."""
+    outer = _pending_cache_writes.get()
+    pending = []
+    token = _pending_cache_writes.set(pending)
+    try:
+        yield
+    finally:
+        _pending_cache_writes.reset(token)
+    # Only reached if the block succeeded
+    if outer is not None:
+        outer.extend(pending)
+    elif pending:
+        caches[LLM_CACHE_ALIAS].set_many(dict(pending), LLM_CACHE_SECONDS)
+
+@contextmanager
+def fresh_llm_responses():
+    """Within this block, ask the model again rather than reusing cached responses
+    (e.g. when retrying because a cached response failed validation)."""
+    token = _refresh_cache.set(True)
+    try:
+        yield
+    finally:
+        _refresh_cache.reset(token)
+
+def _cache_key(*request) -> str:
+    digest = hashlib.sha256(jsonlib.dumps(request, sort_keys=True, default=str).encode('utf8'))
+    return 'llm:' + digest.hexdigest()
+
+class TokenBucket:
     """
-    A decorator that limits the rate of function calls to n_calls every per seconds..
-    If the function is called more frequently, the decorator will make the caller
-    sleep until the rate limit allows another call.
+    Allows bursts of up to n_calls, refilling at n_calls every per seconds.
+    acquire() blocks the calling thread until a call is allowed.
     """
-    def decorator(func):
-        call_timestamps = deque()
-        
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            current_time = time.time()
-            
-            while call_timestamps and current_time - call_timestamps[0] > per:
-                call_timestamps.popleft()
-            
-            # If we've reached the limit, sleep until we can make another call
-            if len(call_timestamps) >= n_calls:
-                oldest_timestamp = call_timestamps[0]
-                sleep_time = per - (current_time - oldest_timestamp)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    current_time = time.time()
-            
-            call_timestamps.append(current_time)
-            return func(*args, **kwargs)
-        
-        return wrapper
-    
-    return decorator
-
-@rate_limit(n_calls=15, per=75)
+
+    def __init__(self, n_calls: int, per: float):
+        self.capacity = n_calls
+        self.rate = n_calls / per
+        self.tokens = float(n_calls)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, returning the number of seconds spent waiting for it."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class _Unlimited:
+    def acquire(self) -> float:
+        return 0.0
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def _get_bucket(provider: str) -> TokenBucket | _Unlimited:
+    with _buckets_lock:
+        if provider not in _buckets:
+            limit = RATE_LIMITS.get(provider)
+            _buckets[provider] = TokenBucket(*limit) if limit else _Unlimited()
+        return _buckets[provider]
+
 def _get_llm_response_google(instructions, text, model, chat_history, json,
                              temperature, top_p) -> tuple[str, dict]:
     api_key = settings.GEMINI_API_KEY
@@ -161,3 +248,39 @@ def _get_llm_response_openrouter(instructions, text, model, chat_history, json)
         }
     }
     return (response_text, metadata)
+
+def _get_llm_response_stub(instructions, text, model, chat_history, json) -> tuple[str, dict]:
+    """
+    Offline stand-in for benchmarking the summary pipeline. Sleeps for
+    PARLIAMENT_LLM_STUB_LATENCY seconds and returns deterministic output in the
+    requested shape, linking only to URLs found in the transcript.
+    """
+    time.sleep(getattr(settings, 'PARLIAMENT_LLM_STUB_LATENCY', 0.5))
+    urls = re.findall(r'URL: (\S+)', text) + re.findall(r'\n\[(/\S+)\] ', text) or ['/']
+    words = re.findall(r'[A-Za-z]{5,}', text)[:4] or ['members']
+    phrase = ' '.join(words).capitalize()
+
+    def from_schema(schema, name=''):
+        if schema.get('type') == 'ARRAY':
+            return [from_schema(schema['items']) for _ in range(min(2, len(urls)))]
+        if schema.get('type') == 'OBJECT':
+            return {k: from_schema(v, k) for k, v in schema['properties'].items()}
+        return urls[0] if 'url' in name else phrase
+
+    if isinstance(json, dict):
+        response = jsonlib.dumps(from_schema(json))
+    elif json and '"url"' in instructions:
+        response = jsonlib.dumps([{"url": url, "topic": phrase} for url in urls])
+    elif json:
+        response = jsonlib.dumps({"topic": phrase, "summary": f"Members discuss {phrase.lower()}."})
+    else:
+        response = f"Members discuss [{phrase.lower()}]({urls[0]})."
+    metadata = {
+        "model": model,
+        "provider": "stub",
+        "tokens": {
+            "request": (len(instructions) + len(text)) // 4,
+            "response": len(response) // 4,
+        }
+    }
+    return (response, metadata)
@@ -3,6 +3,8 @@ from django.utils.safestring import mark_safe
 
 from markdown import markdown
 
+from parliament.core import generations
+
 class Summary(models.Model):
     """
     Computer-generated summaries of House transcripts.
@@ -32,6 +34,13 @@ class Summary(models.Model):
 
     def __str__(self):
         return f"{self.summary_type} for {self.identifier}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The identifier is the URL of the summarized page; invalidate that page
+        scope = generations.page_scope(self.identifier)
+        if scope:
+            generations.bump_scopes([scope])
     
     def get_html(self) -> str:
         return mark_safe(markdown(self.summary_text))
@@ -43,7 +52,8 @@ class Summary(models.Model):
         if isinstance(meta, dict):
             meta = [meta]
         return sum(
-            sum(m.get('tokens', {}).values()) for m in meta if isinstance(m, dict)
+            sum(v or 0 for v in m.get('tokens', {}).values())
+            for m in meta if isinstance(m, dict) and not m.get('cached')  # cached: no new tokens spent
         )
     
 class SummaryPoll(models.Model):
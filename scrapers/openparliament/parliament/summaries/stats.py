@@ -0,0 +1,110 @@
+"""Per-stage timing and token accounting for summary generation.
+
+Wrap a run in track_stats(), and the parts of it in stage(); LLM calls made
+inside are recorded against the innermost stage. Worker threads share the
+caller's stats as long as they run in a copy of its context (see
+generation.utils.parallel_map).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import threading
+import time
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0  # summed over threads, so can exceed wall-clock time
+    runs: int = 0
+    llm_calls: int = 0
+    cached_calls: int = 0
+    llm_seconds: float = 0.0
+    rate_limit_seconds: float = 0.0
+    request_tokens: int = 0
+    response_tokens: int = 0
+    thought_tokens: int = 0
+
+
+class SummaryStats:
+
+    def __init__(self):
+        self.stages: dict[str, StageStats] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> StageStats:
+        if name not in self.stages:
+            self.stages[name] = StageStats()
+        return self.stages[name]
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            st = self._get(name)
+            st.seconds += seconds
+            st.runs += 1
+
+    def add_llm_call(self, name: str, seconds: float, metadata: dict, cached: bool = False,
+                     waited: float = 0.0) -> None:
+        tokens = metadata.get('tokens') or {}
+        with self._lock:
+            st = self._get(name)
+            st.llm_calls += 1
+            st.rate_limit_seconds += waited
+            if cached:
+                st.cached_calls += 1
+                return
+            st.llm_seconds += seconds
+            st.request_tokens += tokens.get('request') or 0
+            st.response_tokens += tokens.get('response') or 0
+            st.thought_tokens += tokens.get('thought') or 0
+
+    def report(self) -> str:
+        lines = ["%-24s %6s %9s %6s %6s %9s %9s %10s %10s %9s" % (
+            'stage', 'runs', 'seconds', 'calls', 'cached', 'llm secs', 'waited',
+            'req tok', 'resp tok', 'thought')]
+        for name, st in sorted(self.stages.items()):
+            lines.append("%-24s %6d %9.2f %6d %6d %9.2f %9.2f %10d %10d %9d" % (
+                name[:24], st.runs, st.seconds, st.llm_calls, st.cached_calls, st.llm_seconds,
+                st.rate_limit_seconds, st.request_tokens, st.response_tokens, st.thought_tokens))
+        lines.append("Total wall-clock time: %.2fs" % (time.perf_counter() - self.started))
+        return "\n".join(lines)
+
+
+_current_stats: ContextVar[SummaryStats | None] = ContextVar('summary_stats', default=None)
+_current_stage: ContextVar[str] = ContextVar('summary_stage', default='other')
+
+
+def current_stats() -> SummaryStats | None:
+    return _current_stats.get()
+
+
+def current_stage() -> str:
+    return _current_stage.get()
+
+
+@contextmanager
+def track_stats():
+    """Collect stats for the enclosed block, reusing an enclosing collector if there is one."""
+    stats = _current_stats.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = SummaryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    token = _current_stage.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.add_time(name, time.perf_counter() - start)
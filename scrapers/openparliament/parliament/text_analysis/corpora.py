@@ -16,9 +16,12 @@ def load_background_model(corpus_name, n):
     with open(_get_background_model_path(corpus_name, n), 'rb') as f:
         return pickle.load(f)
 
-def generate_background_models(corpus_name, statements, ngram_lengths=[1,2,3]):
+def generate_background_models(corpus_name, statements, ngram_lengths=[1,2,3], unigram_model=None):
     for n in ngram_lengths:
-        bg = FrequencyModel.from_statement_qs(statements, ngram=n, min_count=5 if n < 3 else 3)
+        if n == 1 and unigram_model is not None:
+            bg = unigram_model
+        else:
+            bg = FrequencyModel.from_statement_qs(statements, ngram=n, min_count=5 if n < 3 else 3)
         with open(_get_background_model_path(corpus_name, n), 'wb') as f:
             pickle.dump(bg, f, pickle.HIGHEST_PROTOCOL)
 
@@ -32,9 +35,13 @@ def generate_for_debates():
 
 def generate_for_old_debates():
     from parliament.hansards.models import Statement
+    from parliament.text_analysis import timelines
+    use_timelines = timelines.is_built()
     for year in range(1994, datetime.date.today().year):
         qs = Statement.objects.filter(document__document_type='D', time__year=year)
-        generate_background_models('debates-%d' % year, qs)
+        unigrams = timelines.frequency_model(
+            datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1), ['D']) if use_timelines else None
+        generate_background_models('debates-%d' % year, qs, unigram_model=unigrams)
 
 def generate_for_committees():
     from parliament.hansards.models import Statement
@@ -6,6 +6,8 @@ import itertools
 from operator import itemgetter
 import re
 
+from django.conf import settings
+
 STOPWORDS = frozenset(["i", "me", "my", "myself", "we", "our", "ours", "ourselves",
     "you", "your", "yours", "yourself", "yourselves", "he", "him", "his", "himself",
     "she", "her", "hers", "herself", "it", "its", "itself", "they", "them", "their",
@@ -102,8 +104,23 @@ class FrequencyModel(dict):
             return sorted(iter(self.items()), key=itemgetter(1), reverse=True)
         return nlargest(n, iter(self.items()), key=itemgetter(1))
 
+    @classmethod
+    def from_counts(cls, counts, total_count, min_count=1):
+        """Build from precomputed {item: count} and the total number of items."""
+        model = cls(())
+        model.count = total_count
+        if total_count:
+            model.update(
+                (k, v / float(total_count)) for k, v in counts.items() if v >= min_count
+            )
+        return model
+
     @classmethod
     def from_statement_qs(cls, qs, ngram=1, min_count=1):
+        # text_plain() needs only the stored plain text, or the HTML if that's not yet filled,
+        # in the language it defaults to
+        lang = settings.LANGUAGE_CODE
+        qs = qs.only('content_' + lang, 'content_plain_' + lang)
         it = statements_token_iterator(qs.iterator(), statement_separator='/')
         if ngram > 1:
             it = ngram_iterator(it, ngram)
@@ -0,0 +1,32 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('text_analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermTimeline',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50)),
+                ('document_type', models.CharField(max_length=1)),
+                ('counts', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), default=list, size=None)),
+            ],
+            options={
+                'unique_together': {('term', 'document_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TermTimelineState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_statement_id', models.IntegerField(default=0)),
+                ('updated', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -3,6 +3,7 @@ import json
 from operator import itemgetter
 
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
@@ -81,3 +82,27 @@ class TextAnalysis(models.Model):
             return
         onegrams = (w for w in d if w['text'].count(' ') == 0)
         return max(onegrams, key=itemgetter('score'))['text']
+
+
+class TermTimeline(models.Model):
+    """How often a word was used in each month, for one type of document; see timelines.py.
+
+    counts[i] is the count for the i-th month after timelines.EPOCH. The row
+    with an empty term holds the total word count per month."""
+
+    term = models.CharField(max_length=50)
+    document_type = models.CharField(max_length=1)
+    counts = ArrayField(models.IntegerField(), default=list)
+
+    class Meta:
+        unique_together = [('term', 'document_type')]
+
+    def __str__(self):
+        return "%s (%s)" % (self.term or '[total]', self.document_type)
+
+
+class TermTimelineState(models.Model):
+    """How far the term timelines have been built: statements up to last_statement_id are counted."""
+
+    last_statement_id = models.IntegerField(default=0)
+    updated = models.DateTimeField(blank=True, null=True)
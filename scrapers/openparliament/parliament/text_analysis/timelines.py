@@ -0,0 +1,168 @@
+"""Term timelines: how often each word is used, month by month.
+
+Each (term, document type) pair has one TermTimeline row holding an array of
+monthly counts, so "usage of X over time" is a single indexed lookup, and a
+background frequency model for any range of months is one aggregate query.
+
+build_term_timelines() counts only statements added since the last build and
+loads the merged arrays with COPY. Reimported documents get new statement IDs
+and so are counted again; an occasional rebuild=True run corrects for that.
+"""
+from collections import Counter, defaultdict
+import datetime
+import logging
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from parliament.hansards.models import Statement
+from parliament.text_analysis.frequencymodel import FrequencyModel, text_token_iterator
+from parliament.text_analysis.models import TermTimeline, TermTimelineState
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime.date(1994, 1, 1)
+TOTAL = ''  # term of the row holding total word counts
+MAX_TERM_LENGTH = 50
+STATEMENT_BATCH = 5000
+LOOKUP_BATCH = 5000
+
+
+def month_index(d: datetime.date) -> int:
+    return (d.year - EPOCH.year) * 12 + d.month - 1
+
+
+def month_start(index: int) -> datetime.date:
+    return datetime.date(EPOCH.year + index // 12, index % 12 + 1, 1)
+
+
+def _terms(text: str):
+    # The same filtering as FrequencyModel, so timeline counts and background models agree
+    for word in text_token_iterator(text):
+        if 2 < len(word) <= MAX_TERM_LENGTH and '/' not in word:
+            yield word
+
+
+def _count(after_id: int) -> tuple[dict, int]:
+    """{(term, document_type): Counter({month: count})} for statements with
+    IDs above after_id, and the highest statement ID seen."""
+    counts = defaultdict(Counter)
+    last_id = after_id
+    while True:
+        rows = list(Statement.objects.filter(id__gt=last_id).order_by('id').values_list(
+            'id', 'time', 'document__document_type', 'content_plain_en', 'content_en')[:STATEMENT_BATCH])
+        if not rows:
+            break
+        for statement_id, statement_time, document_type, text, html in rows:
+            month = month_index(statement_time)
+            # Statements not yet backfilled have no stored plain text
+            words = Counter(_terms(text or Statement.html_to_text(html)))
+            for word, n in words.items():
+                counts[(word, document_type)][month] += n
+            counts[(TOTAL, document_type)][month] += sum(words.values())
+        last_id = rows[-1][0]
+    return counts, last_id
+
+
+def _existing(keys) -> dict:
+    existing = {}
+    by_type = defaultdict(list)
+    for term, document_type in keys:
+        by_type[document_type].append(term)
+    for document_type, terms in by_type.items():
+        for i in range(0, len(terms), LOOKUP_BATCH):
+            existing.update(((term, document_type), counts) for term, counts in TermTimeline.objects.filter(
+                document_type=document_type, term__in=terms[i:i + LOOKUP_BATCH]).values_list('term', 'counts'))
+    return existing
+
+
+def _load(rows):
+    """Upsert (term, document_type, counts) rows through a COPY into a temporary table."""
+    table = TermTimeline._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE term_timeline_load "
+                       "(term varchar(%d), document_type varchar(1), counts integer[]) ON COMMIT DROP"
+                       % MAX_TERM_LENGTH)
+        with cursor.copy("COPY term_timeline_load (term, document_type, counts) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(
+            "INSERT INTO %s (term, document_type, counts) "
+            "SELECT term, document_type, counts FROM term_timeline_load "
+            "ON CONFLICT (term, document_type) DO UPDATE SET counts = EXCLUDED.counts" % table)
+
+
+@transaction.atomic
+def build_term_timelines(rebuild=False):
+    """Add statements created since the last build to the timelines (or, with
+    rebuild, recount everything). Returns the number of timelines written."""
+    start = time.perf_counter()
+    state, _ = TermTimelineState.objects.select_for_update().get_or_create(pk=1)
+    if rebuild:
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE %s" % TermTimeline._meta.db_table)
+        state.last_statement_id = 0
+
+    counts, last_id = _count(state.last_statement_id)
+    if counts:
+        existing = {} if rebuild else _existing(counts)
+        def _rows():
+            for key, months in counts.items():
+                merged = list(existing.get(key, []))
+                needed = max(months) + 1
+                if len(merged) < needed:
+                    merged.extend([0] * (needed - len(merged)))
+                for month, n in months.items():
+                    merged[month] += n
+                yield key + (merged,)
+        _load(_rows())
+
+    state.last_statement_id = last_id
+    state.updated = timezone.now()
+    state.save()
+    logger.info("Term timelines: %d updated in %.1fs, through statement #%d",
+                len(counts), time.perf_counter() - start, last_id)
+    return len(counts)
+
+
+def is_built() -> bool:
+    return TermTimelineState.objects.filter(last_statement_id__gt=0).exists()
+
+
+def _sum_arrays(arrays) -> list[int]:
+    total = []
+    for counts in arrays:
+        if len(counts) > len(total):
+            total.extend([0] * (len(counts) - len(total)))
+        for i, n in enumerate(counts):
+            total[i] += n
+    return total
+
+
+def term_timeline(term: str, document_types=('D',)) -> list[tuple[datetime.date, int, int]]:
+    """(month, uses of term, total words) for every month since EPOCH, for a usage-over-time chart."""
+    rows = defaultdict(list)
+    for t, counts in TermTimeline.objects.filter(
+            term__in=[term.lower(), TOTAL], document_type__in=document_types).values_list('term', 'counts'):
+        rows[t].append(counts)
+    totals = _sum_arrays(rows[TOTAL])
+    uses = _sum_arrays(rows[term.lower()])
+    uses.extend([0] * (len(totals) - len(uses)))
+    return [(month_start(i), uses[i], totals[i]) for i in range(len(totals))]
+
+
+def frequency_model(start: datetime.date, end: datetime.date, document_types=('D',),
+                    min_count=5) -> FrequencyModel:
+    """Unigram background model for statements from start up to (not including) end,
+    to month granularity."""
+    # Postgres arrays are 1-based and slices inclusive
+    first, last = month_index(start) + 1, month_index(end)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT t.term, SUM(c) FROM %s t, unnest(t.counts[%%s:%%s]) c "
+            "WHERE t.document_type = ANY(%%s) GROUP BY t.term" % TermTimeline._meta.db_table,
+            [first, last, list(document_types)])
+        counts = dict(cursor.fetchall())
+    total = counts.pop(TOTAL, 0)
+    return FrequencyModel.from_counts(counts, total, min_count=min_count)
@@ -2,11 +2,10 @@ from django.urls import include, path, re_path
 from django.conf.urls.static import static
 from django.conf import settings
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap as sitemap_view
 
 from parliament.core.api import docs as api_docs
 from parliament.core.api import no_robots
-from parliament.core.sitemap import sitemaps
+from parliament.core.sitemap import serve_sitemap
 from parliament.core.views import SiteNewsFeed, home, closed
 from parliament.hansards.views import document_redirect, speeches
 
@@ -28,7 +27,7 @@ urlpatterns = [
     path(r'labs/haiku/', include('parliament.haiku.urls')),
     re_path(r'^$', home),
     path('summaries/', include('parliament.summaries.urls')),
-    re_path(r'^sitemap\.xml$', sitemap_view, {'sitemaps': sitemaps}),
+    re_path(r'^(?P<path>sitemap(?:-[a-z]+-\d+)?\.xml(?:\.gz)?)$', serve_sitemap),
     re_path(r'^sitenews/rss/$', SiteNewsFeed(), name='sitenews_feed'),
     re_path(r'^robots\.txt$', no_robots),
     re_path(r'', include('parliament.legacy_urls')),
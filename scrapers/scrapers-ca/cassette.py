@@ -0,0 +1,375 @@
+"""
+Record and replay a jurisdiction's network traffic so scrapers can be run, and timed, offline.
+
+A cassette is a gzipped JSON-lines archive of interactions. While recording, every HTTP request
+sent through requests (``CanadianScraper.get``/``post``, ``lxmlize``, ``csv_reader``, ``cloudscrape``
+and bare ``requests.get``) and every FTP download in ``csv_reader`` is stored. While replaying, the
+same requests are answered from the archive in recorded order, and any request that was not
+recorded raises ``CassetteMiss`` instead of touching the network.
+"""
+
+import base64
+import ftplib
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from io import BytesIO, StringIO
+from zipfile import ZipFile
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+CASSETTE_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "_cassettes")
+IMPORT_CASSETTE = "_import"  # requests made while importing utils (styles of address)
+FORMAT_VERSION = 1
+
+# Describe the transfer, not the (already decoded) content that is stored.
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def _body_digest(body):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    elif not isinstance(body, bytes):  # e.g. a generator for streamed uploads
+        return None
+    return hashlib.sha1(body).hexdigest()  # noqa: S324
+
+
+class Cassette:
+    """Patch requests and FTP for the duration of a ``with`` block, recording or replaying traffic."""
+
+    def __init__(self, path, mode="replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.interactions = []
+        self.lookup_seconds = 0.0
+        self._queues = defaultdict(deque)
+        self._patches = []
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    def load(self):
+        if not os.path.exists(self.path):
+            raise CassetteMiss(f"{self.path} has not been recorded")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"{self.path}: unsupported cassette version {header.get('version')}")
+            self.interactions = [json.loads(line) for line in f]
+        self._queues.clear()
+        for interaction in self.interactions:
+            self._queues[self._key(interaction["method"], interaction["url"], interaction["body"])].append(interaction)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        header = {"version": FORMAT_VERSION, "recorded_at": datetime.now(timezone.utc).isoformat()}
+        with gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(json.dumps(header) + "\n")
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction) + "\n")
+
+    @staticmethod
+    def _key(method, url, body):
+        return (method.upper(), url, body)
+
+    def _record(self, method, url, body, **fields):
+        self.interactions.append({"method": method.upper(), "url": url, "body": body, **fields})
+
+    def _next(self, method, url, body):
+        """Return the next recorded interaction for a request; the last one repeats once exhausted."""
+        queue = self._queues.get(self._key(method, url, body))
+        if not queue:
+            raise CassetteMiss(f"{method} {url} is not in {self.path}")
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    # HTTP
+
+    def _send(self, adapter, request, **kwargs):
+        body = _body_digest(request.body)
+        if self.recording:
+            try:
+                response = self._real_send(adapter, request, **kwargs)
+                content = response.content  # reads streamed bodies too; iter_content() replays from memory
+            except requests.RequestException as e:
+                self._record(request.method, request.url, body, error=type(e).__name__, message=str(e))
+                raise
+            headers = [[k, v] for k, v in response.headers.items() if k.lower() not in _TRANSFER_HEADERS]
+            self._record(
+                request.method,
+                request.url,
+                body,
+                status=response.status_code,
+                reason=response.reason,
+                headers=headers,
+                content=base64.b64encode(content).decode("ascii"),
+            )
+            return response
+
+        start = time.perf_counter()
+        try:
+            interaction = self._next(request.method, request.url, body)
+            if "error" in interaction:
+                error_class = getattr(requests.exceptions, interaction["error"], requests.RequestException)
+                raise error_class(interaction["message"], request=request)
+            return self._build_response(request, interaction)
+        finally:
+            self.lookup_seconds += time.perf_counter() - start
+
+    @staticmethod
+    def _build_response(request, interaction):
+        content = base64.b64decode(interaction["content"])
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = BytesIO(content)
+        response._content = content
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    # FTP
+
+    def _ftp_factory(self):
+        cassette = self
+
+        class CassetteFTP:
+            def __init__(self, host="", *args, **kwargs):
+                self.host = host
+                self._ftp = ftplib.FTP(host, *args, **kwargs) if cassette.recording else None  # noqa: S321
+
+            def login(self, *args, **kwargs):
+                if self._ftp:
+                    return self._ftp.login(*args, **kwargs)
+                return "230 Login successful."
+
+            def retrbinary(self, cmd, callback, *args, **kwargs):
+                url = f"ftp://{self.host}/{cmd.split(' ', 1)[1].lstrip('/')}"
+                if self._ftp:
+                    blocks = []
+                    result = self._ftp.retrbinary(cmd, lambda block: blocks.append(block) or callback(block), *args, **kwargs)
+                    content = base64.b64encode(b"".join(blocks)).decode("ascii")
+                    cassette._record("RETR", url, None, status=226, reason=result, headers=[], content=content)
+                    return result
+                start = time.perf_counter()
+                interaction = cassette._next("RETR", url, None)
+                content = base64.b64decode(interaction["content"])
+                cassette.lookup_seconds += time.perf_counter() - start
+                callback(content)  # one block: csv_reader decodes each block separately
+                return interaction["reason"]
+
+            def quit(self):
+                if self._ftp:
+                    return self._ftp.quit()
+                return "221 Goodbye."
+
+        return CassetteFTP
+
+    # Patching
+
+    def _patch(self, target, name, value):
+        self._patches.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def __enter__(self):
+        if not self.recording:
+            self.load()
+        self._real_send = HTTPAdapter.send
+        cassette = self
+
+        def send(adapter, request, **kwargs):
+            return cassette._send(adapter, request, **kwargs)
+
+        # Patch the adapter, below redirects and retries, so every hop is a separate interaction.
+        self._patch(HTTPAdapter, "send", send)
+        ftp = self._ftp_factory()
+        self._patch(ftplib, "FTP", ftp)
+        if "utils" in sys.modules:  # utils binds FTP at import
+            self._patch(sys.modules["utils"], "FTP", ftp)
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._patches:
+            target, name, value = self._patches.pop()
+            setattr(target, name, value)
+        if self.recording:
+            self.save()
+        return False
+
+
+def cassette_path(module_name, directory=CASSETTE_DIR):
+    return os.path.join(directory, f"{module_name}.jsonl.gz")
+
+
+def import_utils(mode, directory=CASSETTE_DIR):
+    """Import utils under the import-time cassette, since it fetches styles of address on import."""
+    if "utils" in sys.modules:
+        return sys.modules["utils"]
+    with Cassette(cassette_path(IMPORT_CASSETTE, directory), mode):
+        return importlib.import_module("utils")
+
+
+def load_scraper(module_name):
+    """Return a jurisdiction module's person scraper, configured to run without throttling or caching."""
+    from pupa.scrape import Jurisdiction
+
+    module = importlib.import_module(module_name)
+    people = importlib.import_module(f"{module_name}.people")
+    jurisdiction_class = next(
+        obj
+        for obj in module.__dict__.values()
+        if isinstance(obj, type) and issubclass(obj, Jurisdiction) and obj.__module__ == module.__name__
+    )
+    scraper_class = next(obj for key, obj in people.__dict__.items() if "PersonScraper" in key)
+    scraper = scraper_class(jurisdiction_class(), tempfile.gettempdir())
+    scraper.requests_per_minute = 0
+    scraper.retry_attempts = 0
+    scraper.cache_storage = None  # a cache hit would bypass the cassette
+    return scraper
+
+
+def run_scrape(module_name):
+    """Exhaust a jurisdiction's scrape() and return the number of people it yielded."""
+    from pupa.scrape import Person
+
+    people = 0
+    for obj in load_scraper(module_name).scrape() or []:
+        for item in obj if hasattr(obj, "__iter__") else (obj,):
+            if isinstance(item, Person):
+                people += 1
+    return people
+
+
+def record(module_name, directory=CASSETTE_DIR):
+    import_utils("record", directory)
+    with Cassette(cassette_path(module_name, directory), "record") as cassette:
+        people = run_scrape(module_name)
+    return {"module": module_name, "people": people, "interactions": len(cassette.interactions)}
+
+
+def benchmark(module_name, directory=CASSETTE_DIR, repeat=3):
+    """Time a jurisdiction's scrape() under replay.
+
+    The best of ``repeat`` timed runs is reported, with the time spent answering requests from the
+    cassette subtracted as ``parse_seconds``; a separate run under tracemalloc measures peak memory
+    so that tracing does not distort the timings.
+    """
+    import_utils("replay", directory)
+    path = cassette_path(module_name, directory)
+    best = None
+    for _ in range(max(1, repeat)):
+        with Cassette(path, "replay") as cassette:
+            start, cpu_start = time.perf_counter(), time.process_time()
+            people = run_scrape(module_name)
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+        run = {"wall_seconds": wall, "cpu_seconds": cpu, "parse_seconds": wall - cassette.lookup_seconds}
+        if best is None or run["wall_seconds"] < best["wall_seconds"]:
+            best = run
+
+    tracemalloc.start()
+    try:
+        with Cassette(path, "replay"):
+            run_scrape(module_name)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "module": module_name,
+        "people": people,
+        "requests": len(cassette.interactions),
+        **{key: round(value, 4) for key, value in best.items()},
+        "people_per_second": round(people / best["parse_seconds"], 1) if best["parse_seconds"] > 0 else None,
+        "peak_memory_mb": round(peak / 2**20, 2),
+    }
+
+
+def source_size(module_name, directory=CASSETTE_DIR):
+    """Return the recorded size in bytes of a CSV scraper's source file, or None."""
+    scraper_class = next(
+        obj for key, obj in importlib.import_module(f"{module_name}.people").__dict__.items() if "PersonScraper" in key
+    )
+    url = getattr(scraper_class, "csv_url", None)
+    path = cassette_path(module_name, directory)
+    if not url or not os.path.exists(path):
+        return None
+    cassette = Cassette(path)
+    cassette.load()
+    sizes = [len(base64.b64decode(i["content"])) for i in cassette.interactions if i["url"] == url and "content" in i]
+    return max(sizes, default=None)
+
+
+def legacy_rows(scraper):
+    """The rows CSVScraper produced before streaming ingestion, as a baseline: agate converts
+    spreadsheets to an in-memory CSV string and ZIP members are decoded whole."""
+    import agate
+
+    extension = scraper.extension or os.path.splitext(scraper.csv_url)[1]
+    content = scraper.get(scraper.csv_url).content
+    if extension in (".xls", ".xlsx"):
+        data = StringIO()
+        reader = agate.Table.from_xls if extension == ".xls" else agate.Table.from_xlsx
+        reader(BytesIO(content)).to_csv(data)
+        data.seek(0)
+    elif extension == ".zip":
+        with ZipFile(BytesIO(content)).open(scraper.filename) as fp:
+            data = StringIO(fp.read().decode(scraper.encoding or "utf-8"))
+    else:
+        data = None
+    reader = scraper.csv_reader(
+        scraper.csv_url, delimiter=scraper.delimiter, header=True, encoding=scraper.encoding, skip_rows=scraper.skip_rows, data=data
+    )
+    reader.fieldnames = [scraper.header_converter(field) for field in reader.fieldnames]
+    return reader
+
+
+def benchmark_ingestion(module_name, directory=CASSETTE_DIR, repeat=3):
+    """Time and measure peak memory of reading a CSV scraper's rows, streaming versus the legacy baseline.
+
+    Rows are counted, not kept, so peak memory reflects what each ingestion path buffers.
+    """
+    import_utils("replay", directory)
+    path = cassette_path(module_name, directory)
+    result = {"module": module_name, "bytes": source_size(module_name, directory)}
+    for label, read in (("legacy", legacy_rows), ("streaming", lambda scraper: scraper.rows())):
+        best = None
+        for _ in range(max(1, repeat)):
+            with Cassette(path, "replay"):
+                scraper = load_scraper(module_name)
+                start = time.perf_counter()
+                rows = sum(1 for _ in read(scraper))
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        try:
+            with Cassette(path, "replay"):
+                for _ in read(load_scraper(module_name)):
+                    pass
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result[label] = {"rows": rows, "seconds": round(best, 4), "peak_memory_mb": round(peak / 2**20, 2)}
+    return result
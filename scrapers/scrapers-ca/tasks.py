@@ -385,6 +385,76 @@ def validate_spreadsheet(url, identifier_header, geographic_name_header):
             print(f"{identifier}: name: {division.name} not {row[geographic_name_header]}")
 
 
+@task
+def record_cassettes(module_name=""):
+    """Record a scraper's HTTP and FTP traffic to a cassette (all scrapers if none given)."""
+    import cassette
+
+    for name in [module_name] if module_name else sorted(module_names()):
+        try:
+            result = cassette.record(name)
+            print("{module:<60} {people:>5} people {interactions:>5} requests".format(**result))
+        except Exception as e:
+            print(f"{name:<60} {e}")
+
+
+@task
+def benchmark(module_name="", repeat=3):
+    """Time scrapers offline against their recorded cassettes (all recorded scrapers if none given)."""
+    import cassette
+
+    if module_name:
+        names = [module_name]
+    else:
+        names = sorted(
+            filename.removesuffix(".jsonl.gz")
+            for filename in os.listdir(cassette.CASSETTE_DIR)
+            if filename.endswith(".jsonl.gz") and not filename.startswith(cassette.IMPORT_CASSETTE)
+        )
+
+    print(f"{'module':<40} {'people':>6} {'parse s':>8} {'cpu s':>8} {'people/s':>9} {'peak MB':>8}")
+    for name in names:
+        try:
+            result = cassette.benchmark(name, repeat=int(repeat))
+        except Exception as e:
+            print(f"{name:<40} {e}")
+            continue
+        print(
+            "{module:<40} {people:>6} {parse_seconds:>8.3f} {cpu_seconds:>8.3f} "
+            "{people_per_second:>9} {peak_memory_mb:>8.2f}".format(**result)
+        )
+
+
+@task
+def benchmark_csv(module_name="", largest=10, repeat=3):
+    """Compare streaming and legacy CSV ingestion on the largest recorded CSV scraper sources."""
+    import cassette
+
+    if module_name:
+        names = [module_name]
+    else:
+        sizes = {}
+        for _module, name, klass in modules_and_module_names_and_classes():
+            if hasattr(klass, "csv_url"):
+                size = cassette.source_size(name)
+                if size:
+                    sizes[name] = size
+        names = sorted(sizes, key=sizes.get, reverse=True)[: int(largest)]
+
+    print(f"{'module':<40} {'MB':>6} {'rows':>6} {'legacy s':>9} {'stream s':>9} {'legacy MB':>10} {'stream MB':>10}")
+    for name in names:
+        try:
+            result = cassette.benchmark_ingestion(name, repeat=int(repeat))
+        except Exception as e:
+            print(f"{name:<40} {e}")
+            continue
+        legacy, streaming = result["legacy"], result["streaming"]
+        print(
+            f"{name:<40} {(result['bytes'] or 0) / 2**20:>6.2f} {streaming['rows']:>6} {legacy['seconds']:>9.3f} "
+            f"{streaming['seconds']:>9.3f} {legacy['peak_memory_mb']:>10.2f} {streaming['peak_memory_mb']:>10.2f}"
+        )
+
+
 def module_name_to_metadata(module_name):
     # Copied from reports.utils
     module = importlib.import_module(module_name)
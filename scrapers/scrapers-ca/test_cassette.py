@@ -0,0 +1,134 @@
+"""Cassettes must replay what they recorded, and nothing else, without touching the network."""
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import cassette
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Answer requests in-process, counting what reaches the "network"."""
+    sent = []
+
+    def send(adapter, request, **kwargs):
+        sent.append((request.method, request.url, request.body))
+        if "timeout" in request.url:
+            raise requests.ConnectTimeout("timed out", request=request)
+        body = request.body.encode() if isinstance(request.body, str) else request.body
+        content = f"{request.method} {request.url} {(body or b'').decode()} #{len(sent)}".encode()
+        response = requests.Response()
+        response.status_code = 404 if "missing" in request.url else 200
+        response.reason = "Not Found" if response.status_code == 404 else "OK"
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "text/plain; charset=utf-8", "Content-Length": str(len(content)), "X-Id": str(len(sent))}
+        )
+        response._content = content
+        response.url = request.url
+        response.request = request
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    return sent
+
+
+def record(path, *calls):
+    with cassette.Cassette(str(path), "record"):
+        return [call() for call in calls]
+
+
+def test_round_trip(tmp_path, server):
+    path = tmp_path / "example.jsonl.gz"
+    recorded = record(
+        path,
+        lambda: requests.get("https://example.com/people"),
+        lambda: requests.post("https://example.com/search", data={"q": "mayor"}),
+        lambda: requests.get("https://example.com/missing"),
+    )
+    server.clear()
+
+    with cassette.Cassette(str(path)) as replay:
+        replayed = [
+            requests.get("https://example.com/people"),
+            requests.post("https://example.com/search", data={"q": "mayor"}),
+            requests.get("https://example.com/missing"),
+        ]
+
+    assert server == []
+    assert len(replay.interactions) == 3
+    for before, after in zip(recorded, replayed):
+        assert after.status_code == before.status_code
+        assert after.reason == before.reason
+        assert after.content == before.content
+        assert after.text == before.text
+        assert after.headers["X-Id"] == before.headers["X-Id"]
+        assert "Content-Length" not in after.headers
+    assert b"".join(replayed[0].iter_content(4)) == recorded[0].content
+    with pytest.raises(requests.HTTPError):
+        replayed[2].raise_for_status()
+
+
+def test_recorded_error_is_raised(tmp_path, server):
+    path = tmp_path / "example.jsonl.gz"
+    with pytest.raises(requests.ConnectTimeout), cassette.Cassette(str(path), "record"):
+        requests.get("https://example.com/timeout")
+    server.clear()
+
+    with pytest.raises(requests.ConnectTimeout), cassette.Cassette(str(path)):
+        requests.get("https://example.com/timeout")
+    assert server == []
+
+
+def test_missing_cassette(tmp_path, server):
+    with pytest.raises(cassette.CassetteMiss), cassette.Cassette(str(tmp_path / "absent.jsonl.gz")):
+        requests.get("https://example.com/people")
+    assert server == []
+
+
+def test_unrecorded_request_misses(tmp_path, server):
+    path = tmp_path / "example.jsonl.gz"
+    record(path, lambda: requests.get("https://example.com/people?page=1"))
+    server.clear()
+
+    with cassette.Cassette(str(path)):
+        for method, url, data in [
+            ("GET", "https://example.com/people?page=2", None),  # query string
+            ("GET", "https://example.org/people?page=1", None),  # host
+            ("POST", "https://example.com/people?page=1", None),  # method
+            ("POST", "https://example.com/people?page=1", {"page": "1"}),  # body
+        ]:
+            with pytest.raises(cassette.CassetteMiss):
+                requests.request(method, url, data=data)
+    assert server == []
+
+
+def test_request_matching(tmp_path, server):
+    path = tmp_path / "example.jsonl.gz"
+    recorded = record(
+        path,
+        lambda: requests.get("https://example.com/page"),
+        lambda: requests.get("https://example.com/page"),
+        lambda: requests.post("https://example.com/page", data={"n": "1"}),
+        lambda: requests.post("https://example.com/page", data={"n": "2"}),
+    )
+    server.clear()
+
+    with cassette.Cassette(str(path)):
+        # POST bodies select their own responses, whatever the order
+        assert requests.post("https://example.com/page", data={"n": "2"}).content == recorded[3].content
+        assert requests.post("https://example.com/page", data={"n": "1"}).content == recorded[2].content
+        # Repeated requests replay in recorded order, and the last response repeats once exhausted
+        assert requests.get("https://example.com/page").content == recorded[0].content
+        assert requests.get("https://example.com/page").content == recorded[1].content
+        assert requests.get("https://example.com/page").content == recorded[1].content
+        # Methods are matched case-insensitively, as requests sends them upper-cased
+        assert requests.request("get", "https://example.com/page").content == recorded[1].content
+    assert server == []
+
+
+def test_patches_are_removed(tmp_path, server):
+    send = HTTPAdapter.send
+    record(tmp_path / "example.jsonl.gz", lambda: requests.get("https://example.com/people"))
+    assert HTTPAdapter.send is send
@@ -2,9 +2,10 @@ import csv
 import os
 import re
 from collections import defaultdict
-from datetime import datetime
+from datetime import date, datetime, time
 from ftplib import FTP
-from io import BytesIO, StringIO
+from io import BytesIO, StringIO, TextIOWrapper
+from tempfile import TemporaryFile
 from urllib.parse import unquote, urlparse
 from zipfile import ZipFile
 
@@ -12,6 +13,7 @@ import agate
 import agateexcel  # noqa: F401
 import cloudscraper
 import lxml.html
+import openpyxl
 import requests
 from lxml import etree
 from opencivicdata.divisions import Division
@@ -95,6 +97,10 @@ CONTACT_DETAIL_NOTE_MAP = {
 }
 SSL_VERIFY = "/usr/lib/ssl/certs/ca-certificates.crt" if os.getenv("SSL_VERIFY", "") else True
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Downloads larger than this, or of unknown length, are written to a temporary file instead of memory.
+DOWNLOAD_MEMORY_LIMIT = 32 << 20
+
 email_re = re.compile(r"([A-Za-z0-9._-]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,})")
 
 
@@ -385,34 +391,65 @@ class CSVScraper(CanadianScraper):
             return row["last name"] not in empty and row["first name"] not in empty
         return row["name"] not in empty
 
-    def scrape(self):
-        seat_numbers = defaultdict(lambda: defaultdict(int))
-
-        extension = self.extension if self.extension else os.path.splitext(self.csv_url)[1]
-        if extension in (".xls", ".xlsx"):
-            data = StringIO()
-            binary = BytesIO(self.get(self.csv_url).content)
-            if extension == ".xls":
-                table = agate.Table.from_xls(binary)
-            elif extension == ".xlsx":
-                table = agate.Table.from_xlsx(binary)
-            table.to_csv(data)
-            data.seek(0)
-        elif extension == ".zip":
-            basename = os.path.basename(self.csv_url)
-            if not self.encoding:
-                self.encoding = "utf-8"
+    def download(self, url):
+        """Stream a binary file, in large chunks, into a seekable in-memory or temporary file."""
+        response = self.get(url, stream=True)
+        size = response.headers.get("Content-Length")
+        if size and size.isdigit() and int(size) <= DOWNLOAD_MEMORY_LIMIT:
+            f = BytesIO()
+        else:
+            f = TemporaryFile()  # noqa: SIM115
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+        f.seek(0)
+        return f
+
+    def sheet_rows(self, f, extension):
+        """Yield a spreadsheet's rows as lists of strings, as agate's CSV export formatted them."""
+        if extension == ".xlsx":
+            # Read-only mode parses the sheet's XML as it is iterated, instead of loading every cell.
+            book = openpyxl.load_workbook(f, read_only=True, data_only=True)
             try:
-                response = requests.get(self.csv_url, stream=True)
-                with open(basename, "wb") as f:
-                    f.writelines(response.iter_content())
-                with ZipFile(basename).open(self.filename, "r") as fp:
-                    data = StringIO(fp.read().decode(self.encoding))
+                for values in book.active.iter_rows(values_only=True):
+                    yield [cell_to_string(value) for value in values]
             finally:
-                os.unlink(basename)
+                book.close()
         else:
-            data = None
-
+            # XLS is a binary format that xlrd reads whole, but the rows can skip the CSV round-trip.
+            table = agate.Table.from_xls(f)
+            csvify = [column_type.csvify for column_type in table.column_types]
+            yield list(table.column_names)
+            for row in table.rows:
+                yield [cell_to_string(function(value)) for function, value in zip(csvify, row)]
+
+    def rows(self):
+        """Yield the source's rows as dicts keyed by normalized column headers."""
+        extension = self.extension if self.extension else os.path.splitext(self.csv_url)[1]
+        if extension in (".xls", ".xlsx"):
+            with self.download(self.csv_url) as f:
+                rows = self.sheet_rows(f, extension)
+                for _ in range(self.skip_rows):
+                    next(rows, None)
+                header = [self.header_converter(value) for value in next(rows, [])]
+                width = len(header)
+                for values in rows:
+                    row = dict(zip(header, values))
+                    if len(values) < width:
+                        row.update((key, "") for key in header[len(values) :])
+                    elif len(values) > width:
+                        row[None] = values[width:]  # as csv.DictReader
+                    yield row
+            return
+
+        if extension == ".zip":
+            with self.download(self.csv_url) as f, ZipFile(f) as archive, archive.open(self.filename) as member:
+                data = TextIOWrapper(member, encoding=self.encoding or "utf-8", newline="")
+                yield from self.dict_rows(data)
+            return
+
+        yield from self.dict_rows(None)
+
+    def dict_rows(self, data):
         reader = self.csv_reader(
             self.csv_url,
             delimiter=self.delimiter,
@@ -422,7 +459,12 @@ class CSVScraper(CanadianScraper):
             data=data,
         )
         reader.fieldnames = [self.header_converter(field) for field in reader.fieldnames]
-        for row in reader:
+        yield from reader
+
+    def scrape(self):
+        seat_numbers = defaultdict(lambda: defaultdict(int))
+
+        for row in self.rows():
             # ca_qc_laval: "maire et president du comite executif", "conseiller et membre du comite executif"
             # ca_qc_montreal: "Conseiller de la ville; Membre…", "Maire d'arrondissement\nMembre…"
             if row.get("primary role"):
@@ -758,6 +800,19 @@ def province_or_territory_abbreviations():
     return province_or_territory_abbreviation_memo
 
 
+def cell_to_string(value):
+    """Format a spreadsheet cell value like agate's CSV export."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time(0) else value.isoformat()
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
 def clean_string(s):
     return re.sub(r" *\n *", "\n", whitespace_and_newline_re.sub(" ", str(s).translate(table)).strip())
 